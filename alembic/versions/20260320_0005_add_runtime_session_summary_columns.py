@@ -0,0 +1,64 @@
+"""add runtime session summary columns
+
+Revision ID: 20260320_0005
+Revises: 20260318_0004
+Create Date: 2026-03-20 10:00:00.000000
+"""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260320_0005"
+down_revision = "20260318_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("runtime_session_states", sa.Column("persona", sa.String(length=50), nullable=True))
+    op.add_column(
+        "runtime_session_states",
+        sa.Column("message_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_runtime_session_states_user_updated",
+        "runtime_session_states",
+        ["user_id", "updated_at", "session_id"],
+        unique=False,
+    )
+
+    # Backfill summaries for rows written before the columns existed.
+    table = sa.table(
+        "runtime_session_states",
+        sa.column("session_id", sa.String),
+        sa.column("payload_json", sa.Text),
+        sa.column("persona", sa.String),
+        sa.column("message_count", sa.Integer),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(table.c.session_id, table.c.payload_json)).fetchall()
+    for session_id, payload_json in rows:
+        try:
+            payload = json.loads(payload_json or "{}")
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(payload, dict):
+            continue
+        messages = payload.get("messages")
+        connection.execute(
+            table.update()
+            .where(table.c.session_id == session_id)
+            .values(
+                persona=str(payload.get("persona") or "").strip() or None,
+                message_count=len(messages) if isinstance(messages, list) else 0,
+            )
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runtime_session_states_user_updated", table_name="runtime_session_states")
+    op.drop_column("runtime_session_states", "message_count")
+    op.drop_column("runtime_session_states", "persona")
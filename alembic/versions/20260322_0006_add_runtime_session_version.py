@@ -0,0 +1,26 @@
+"""add runtime session version
+
+Revision ID: 20260322_0006
+Revises: 20260320_0005
+Create Date: 2026-03-22 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260322_0006"
+down_revision = "20260320_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "runtime_session_states",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("runtime_session_states", "version")
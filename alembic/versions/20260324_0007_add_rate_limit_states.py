@@ -0,0 +1,34 @@
+"""add rate limit states
+
+Revision ID: 20260324_0007
+Revises: 20260322_0006
+Create Date: 2026-03-24 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260324_0007"
+down_revision = "20260322_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_states",
+        sa.Column("subject_key", sa.String(length=255), nullable=False),
+        sa.Column("rule_name", sa.String(length=120), nullable=False),
+        sa.Column("tat", sa.Float(), nullable=False),
+        sa.Column("interval_seconds", sa.Float(), nullable=False),
+        sa.Column("window_seconds", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("subject_key", "rule_name"),
+    )
+    op.create_index("ix_rate_limit_states_tat", "rate_limit_states", ["tat"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_states_tat", table_name="rate_limit_states")
+    op.drop_table("rate_limit_states")
@@ -0,0 +1,40 @@
+"""add usage ledger entries
+
+Revision ID: 20260328_0009
+Revises: 20260326_0008
+Create Date: 2026-03-28 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260328_0009"
+down_revision = "20260326_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_ledger_entries",
+        sa.Column("bucket_start", sa.Integer(), nullable=False),
+        sa.Column("provider", sa.String(length=40), nullable=False),
+        sa.Column("mode", sa.String(length=40), nullable=False),
+        sa.Column("endpoint", sa.String(length=80), nullable=False),
+        sa.Column("tier", sa.String(length=20), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False),
+        sa.Column("cache_hits", sa.Integer(), nullable=False),
+        sa.Column("estimated_calls", sa.Integer(), nullable=False),
+        sa.Column("prompt_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("completion_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("audio_seconds", sa.Float(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("bucket_start", "provider", "mode", "endpoint", "tier"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("usage_ledger_entries")
@@ -0,0 +1,38 @@
+"""add brain health states
+
+Revision ID: 20260329_0010
+Revises: 20260328_0009
+Create Date: 2026-03-29 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20260329_0010"
+down_revision = "20260328_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "brain_health_states",
+        sa.Column("brain_name", sa.String(length=40), nullable=False),
+        sa.Column("worker_id", sa.String(length=120), nullable=False),
+        sa.Column("cooldown_until", sa.Float(), nullable=True),
+        sa.Column("cooldown_reason", sa.String(length=40), nullable=True),
+        sa.Column("avg_latency", sa.Float(), nullable=True),
+        sa.Column("p90_latency", sa.Float(), nullable=True),
+        sa.Column("calls", sa.Integer(), nullable=False),
+        sa.Column("timeouts", sa.Integer(), nullable=False),
+        sa.Column("failures", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("brain_name", "worker_id"),
+    )
+    op.create_index("ix_brain_health_states_updated_at", "brain_health_states", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_brain_health_states_updated_at", table_name="brain_health_states")
+    op.drop_table("brain_health_states")
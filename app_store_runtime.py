@@ -7,6 +7,9 @@ isolating the JWS parsing details needed for subscription sync and webhooks.
 from __future__ import annotations
 
 import base64
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any
 
@@ -18,6 +21,12 @@ from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
 
 ACTIVE_APP_STORE_STATUSES = {"active", "trial", "grace_period"}
 
+VALIDATED_CHAIN_CACHE_MAX_ENTRIES = 32
+# fingerprint key -> (leaf public key, chain valid from, chain valid until)
+_VALIDATED_CHAIN_CACHE: "OrderedDict[str, tuple[Any, datetime, datetime]]" = OrderedDict()
+_CHAIN_CACHE_LOCK = threading.Lock()
+_CHAIN_CACHE_STATS = {"hits": 0, "misses": 0, "validations": 0, "expired": 0}
+
 
 class AppStorePayloadError(ValueError):
     """Raised when an App Store signed payload is malformed or unsupported."""
@@ -73,22 +82,12 @@ def decode_app_store_signed_payload(
     if not isinstance(x5c, list) or not x5c:
         raise AppStorePayloadError("missing_certificate_chain")
 
-    try:
-        certificates = _decode_certificate_chain(x5c)
-    except Exception as exc:  # pragma: no cover - cryptography specifics vary by version
-        raise AppStorePayloadError("invalid_certificate_chain") from exc
-
-    _validate_certificate_chain(
-        certificates,
-        trusted_root_sha256s=trusted_root_sha256s,
-    )
-
-    certificate = certificates[0]
+    signing_key = _validated_chain_signing_key(x5c, trusted_root_sha256s=trusted_root_sha256s)
 
     try:
         payload = jwt.decode(
             token,
-            key=certificate.public_key(),
+            key=signing_key,
             algorithms=["ES256"],
             options={"verify_aud": False, "verify_iss": False},
         )
@@ -100,6 +99,104 @@ def decode_app_store_signed_payload(
     return payload
 
 
+def _certificate_validity(certificate: x509.Certificate) -> tuple[datetime, datetime]:
+    not_valid_before = getattr(certificate, "not_valid_before_utc", None) or certificate.not_valid_before.replace(tzinfo=timezone.utc)
+    not_valid_after = getattr(certificate, "not_valid_after_utc", None) or certificate.not_valid_after.replace(tzinfo=timezone.utc)
+    return not_valid_before, not_valid_after
+
+
+def _chain_cache_key(x5c: list[Any], normalized_roots: set[str]) -> str:
+    digest = hashlib.sha256()
+    for entry in x5c:
+        digest.update(hashlib.sha256(str(entry).encode("ascii", "ignore")).digest())
+    digest.update(b"|roots|")
+    digest.update(",".join(sorted(normalized_roots)).encode("ascii", "ignore"))
+    return digest.hexdigest()
+
+
+def _validated_chain_signing_key(
+    x5c: list[Any],
+    *,
+    trusted_root_sha256s: set[str] | None,
+):
+    """
+    Return the leaf public key of a validated x5c chain.
+
+    Apple reuses the same leaf/intermediate/root chain across notifications for
+    months, so successfully validated chains are remembered by certificate
+    fingerprints (plus the trusted-root set) until the earliest certificate expiry.
+    Only the JWS signature is then checked per payload.
+    """
+    normalized_roots = _normalize_root_fingerprints(trusted_root_sha256s)
+    cache_key = _chain_cache_key(x5c, normalized_roots)
+    now = datetime.now(timezone.utc)
+
+    with _CHAIN_CACHE_LOCK:
+        cached = _VALIDATED_CHAIN_CACHE.get(cache_key)
+        if cached is not None:
+            public_key, valid_from, valid_until = cached
+            if valid_from <= now <= valid_until:
+                _VALIDATED_CHAIN_CACHE.move_to_end(cache_key)
+                _CHAIN_CACHE_STATS["hits"] += 1
+                return public_key
+            del _VALIDATED_CHAIN_CACHE[cache_key]
+            _CHAIN_CACHE_STATS["expired"] += 1
+        _CHAIN_CACHE_STATS["misses"] += 1
+
+    try:
+        certificates = _decode_certificate_chain(x5c)
+    except Exception as exc:  # pragma: no cover - cryptography specifics vary by version
+        raise AppStorePayloadError("invalid_certificate_chain") from exc
+
+    _validate_certificate_chain(
+        certificates,
+        trusted_root_sha256s=trusted_root_sha256s,
+    )
+
+    windows = [_certificate_validity(certificate) for certificate in certificates]
+    public_key = certificates[0].public_key()
+    with _CHAIN_CACHE_LOCK:
+        _CHAIN_CACHE_STATS["validations"] += 1
+        _VALIDATED_CHAIN_CACHE[cache_key] = (
+            public_key,
+            max(start for start, _end in windows),
+            min(end for _start, end in windows),
+        )
+        _VALIDATED_CHAIN_CACHE.move_to_end(cache_key)
+        while len(_VALIDATED_CHAIN_CACHE) > VALIDATED_CHAIN_CACHE_MAX_ENTRIES:
+            _VALIDATED_CHAIN_CACHE.popitem(last=False)
+    return public_key
+
+
+def get_certificate_chain_cache_stats() -> dict[str, Any]:
+    with _CHAIN_CACHE_LOCK:
+        hits = _CHAIN_CACHE_STATS["hits"]
+        misses = _CHAIN_CACHE_STATS["misses"]
+        return {
+            "entries": len(_VALIDATED_CHAIN_CACHE),
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "chain_validations": _CHAIN_CACHE_STATS["validations"],
+            "expired": _CHAIN_CACHE_STATS["expired"],
+            "hit_rate": round(hits / (hits + misses), 3) if (hits + misses) else 0.0,
+        }
+
+
+def clear_certificate_chain_cache() -> None:
+    with _CHAIN_CACHE_LOCK:
+        _VALIDATED_CHAIN_CACHE.clear()
+        for key in _CHAIN_CACHE_STATS:
+            _CHAIN_CACHE_STATS[key] = 0
+
+
+def _normalize_root_fingerprints(trusted_root_sha256s: set[str] | None) -> set[str]:
+    return {
+        str(fingerprint or "").strip().lower()
+        for fingerprint in (trusted_root_sha256s or set())
+        if str(fingerprint or "").strip()
+    }
+
+
 def _decode_certificate_chain(x5c: list[Any]) -> list[x509.Certificate]:
     certificates: list[x509.Certificate] = []
     for entry in x5c:
@@ -159,15 +256,10 @@ def _validate_certificate_chain(
     trusted_root_sha256s: set[str] | None,
 ) -> None:
     now = datetime.now(timezone.utc)
-    normalized_roots = {
-        str(fingerprint or "").strip().lower()
-        for fingerprint in (trusted_root_sha256s or set())
-        if str(fingerprint or "").strip()
-    }
+    normalized_roots = _normalize_root_fingerprints(trusted_root_sha256s)
 
     for index, certificate in enumerate(certificates):
-        not_valid_before = getattr(certificate, "not_valid_before_utc", None) or certificate.not_valid_before.replace(tzinfo=timezone.utc)
-        not_valid_after = getattr(certificate, "not_valid_after_utc", None) or certificate.not_valid_after.replace(tzinfo=timezone.utc)
+        not_valid_before, not_valid_after = _certificate_validity(certificate)
         if not_valid_before > now or not_valid_after < now:
             raise AppStorePayloadError("certificate_out_of_validity_window")
 
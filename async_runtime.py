@@ -0,0 +1,304 @@
+"""
+Shared async runtime for provider calls.
+
+Brains used to build their own SDK HTTP clients, and callers drove async
+brain methods with a fresh event loop per request (`asyncio.run`,
+`new_event_loop`). Every call therefore paid for a new TCP + TLS handshake,
+and async connection pools could not be reused across loops.
+
+This module keeps, per process:
+
+- one long-lived asyncio loop on a daemon thread; sync code submits
+  coroutines with `run_coroutine` and consumes async iterators with
+  `iterate_async`, a queue-backed bridge with backpressure that cancels the
+  upstream iterator when the sync consumer goes away (client disconnect)
+- one pooled `httpx.Client` and one `httpx.AsyncClient` (keep-alive, bounded
+  connections) passed to the OpenAI/xAI/Anthropic SDKs, so Grok, OpenAI and
+  Claude calls reuse warm connections. The async client is only ever used
+  on the background loop, which its connection pool requires.
+
+It also carries the router's budget for the brain call running in the current
+context (`call_with_timeout_budget` / `current_call_timeout`), so provider
+HTTP timeouts can follow adaptive router timeouts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import logging
+import queue
+import threading
+import time
+from typing import Any, AsyncIterable, Awaitable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+
+import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_LOCK = threading.Lock()
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_SYNC_CLIENT: Optional[httpx.Client] = None
+_ASYNC_CLIENT: Optional[httpx.AsyncClient] = None
+_STREAM_STATS = {"active": 0, "completed": 0, "cancelled": 0, "timed_out": 0, "failed": 0}
+_STREAM_STATS_LOCK = threading.Lock()
+_CALL_TIMEOUT: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("brain_call_timeout", default=None)
+
+
+def _count_stream(name: str, delta: int = 1) -> None:
+    with _STREAM_STATS_LOCK:
+        _STREAM_STATS[name] += delta
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+    asyncio.set_event_loop(loop)
+    loop.call_soon(ready.set)
+    loop.run_forever()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting its thread on first use."""
+    global _LOOP, _LOOP_THREAD
+
+    loop = _LOOP
+    if loop is not None and _LOOP_THREAD is not None and _LOOP_THREAD.is_alive():
+        return loop
+    with _LOCK:
+        if _LOOP is None or _LOOP_THREAD is None or not _LOOP_THREAD.is_alive():
+            _LOOP = asyncio.new_event_loop()
+            ready = threading.Event()
+            _LOOP_THREAD = threading.Thread(
+                target=_run_loop,
+                args=(_LOOP, ready),
+                name="async-runtime",
+                daemon=True,
+            )
+            _LOOP_THREAD.start()
+            ready.wait(timeout=5)
+        return _LOOP
+
+
+def in_runtime_thread() -> bool:
+    return _LOOP_THREAD is not None and threading.current_thread() is _LOOP_THREAD
+
+
+def _bind_context(coro: Awaitable[T]) -> Awaitable[T]:
+    """Run `coro` with the caller's context variables (e.g. the usage ledger scope)."""
+    context = contextvars.copy_context()
+
+    async def _bound() -> T:
+        for var, value in context.items():
+            var.set(value)
+        return await coro
+
+    return _bound()
+
+
+def submit(coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+    """Schedule `coro` on the background loop without waiting for it."""
+    return asyncio.run_coroutine_threadsafe(_bind_context(coro), get_event_loop())
+
+
+def run_coroutine(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run `coro` on the background loop and block the calling thread for the result.
+
+    On timeout the coroutine is cancelled on the loop and TimeoutError is raised.
+    Must not be called from the loop thread itself (it would deadlock).
+    """
+    if in_runtime_thread():
+        close = getattr(coro, "close", None)
+        if callable(close):
+            close()
+        raise RuntimeError("run_coroutine called from the async runtime thread; await the coroutine instead")
+    future = submit(coro)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"coroutine did not finish within {timeout}s") from None
+
+
+def iterate_async(
+    async_iterable: AsyncIterable[T],
+    item_timeout: Optional[float] = None,
+    max_buffered: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[T]:
+    """
+    Consume an async iterator from sync code.
+
+    A single pump task on the background loop drains the iterator into a
+    thread-safe queue, so tokens cost one queue hand-off each instead of a
+    cross-thread round trip. At most `max_buffered` items wait in the queue;
+    beyond that the pump stops reading from the provider until the consumer
+    catches up. Closing the returned generator early (e.g. a client
+    disconnect ends a streaming response), an `item_timeout` or passing the
+    absolute `deadline` (time.monotonic()) cancels the pump, which closes the
+    async iterator on the loop.
+    """
+    if max_buffered is None:
+        max_buffered = int(getattr(config, "BRAIN_STREAM_MAX_BUFFERED_ITEMS", 32))
+    loop = get_event_loop()
+    events: "queue.Queue[tuple]" = queue.Queue()
+    slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def _pump() -> None:
+        slots["sem"] = semaphore = asyncio.Semaphore(max(1, int(max_buffered)))
+        iterator = async_iterable.__aiter__()
+        try:
+            while True:
+                await semaphore.acquire()
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    events.put(("end", None))
+                    return
+                events.put(("item", item))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            events.put(("error", exc))
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if callable(aclose):
+                try:
+                    await aclose()
+                except Exception:
+                    logger.debug("Closing async iterator failed", exc_info=True)
+
+    def _release_slot() -> None:
+        semaphore = slots.get("sem")
+        if semaphore is not None:
+            semaphore.release()
+
+    pump = asyncio.run_coroutine_threadsafe(_bind_context(_pump()), loop)
+    _count_stream("active")
+    outcome = "cancelled"
+    try:
+        while True:
+            wait = item_timeout
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+                wait = remaining if wait is None else min(wait, remaining)
+            try:
+                kind, value = events.get(timeout=wait)
+            except queue.Empty:
+                outcome = "timed_out"
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError("async iterator did not finish before its deadline") from None
+                raise TimeoutError(f"async iterator produced nothing within {item_timeout}s") from None
+            if kind == "end":
+                outcome = "completed"
+                return
+            if kind == "error":
+                outcome = "failed"
+                raise value
+            loop.call_soon_threadsafe(_release_slot)
+            yield value
+    finally:
+        if not pump.done():
+            pump.cancel()
+        _count_stream("active", -1)
+        _count_stream(outcome)
+
+
+def call_with_timeout_budget(fn, timeout: Optional[float]):
+    """Run `fn` with `timeout` as the current brain call budget (see `current_call_timeout`)."""
+    token = _CALL_TIMEOUT.set(timeout)
+    try:
+        return fn()
+    finally:
+        _CALL_TIMEOUT.reset(token)
+
+
+def current_call_timeout() -> Optional[float]:
+    """Router budget of the brain call running in this context, or None outside one."""
+    return _CALL_TIMEOUT.get()
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max(1, int(getattr(config, "BRAIN_HTTP_MAX_CONNECTIONS", 64))),
+        max_keepalive_connections=max(0, int(getattr(config, "BRAIN_HTTP_MAX_KEEPALIVE_CONNECTIONS", 16))),
+        keepalive_expiry=float(getattr(config, "BRAIN_HTTP_KEEPALIVE_EXPIRY_SECONDS", 60.0)),
+    )
+
+
+def _default_timeout() -> httpx.Timeout:
+    # SDKs pass their own per-request timeouts; this only covers requests that do not.
+    return httpx.Timeout(float(getattr(config, "BRAIN_HTTP_DEFAULT_TIMEOUT_SECONDS", 30.0)), connect=5.0)
+
+
+def shared_http_client() -> httpx.Client:
+    """Pooled sync client shared by every brain SDK (keep-alive across providers)."""
+    global _SYNC_CLIENT
+
+    client = _SYNC_CLIENT
+    if client is not None and not client.is_closed:
+        return client
+    with _LOCK:
+        if _SYNC_CLIENT is None or _SYNC_CLIENT.is_closed:
+            _SYNC_CLIENT = httpx.Client(limits=_http_limits(), timeout=_default_timeout(), follow_redirects=True)
+        return _SYNC_CLIENT
+
+
+def shared_async_http_client() -> httpx.AsyncClient:
+    """Pooled async client; only use it from coroutines running on `get_event_loop()`."""
+    global _ASYNC_CLIENT
+
+    client = _ASYNC_CLIENT
+    if client is not None and not client.is_closed:
+        return client
+    with _LOCK:
+        if _ASYNC_CLIENT is None or _ASYNC_CLIENT.is_closed:
+            _ASYNC_CLIENT = httpx.AsyncClient(limits=_http_limits(), timeout=_default_timeout(), follow_redirects=True)
+        return _ASYNC_CLIENT
+
+
+def get_runtime_stats() -> Dict[str, Any]:
+    loop = _LOOP
+    return {
+        "loop_running": bool(loop is not None and loop.is_running()),
+        "pending_tasks": len(asyncio.all_tasks(loop)) if loop is not None and loop.is_running() else 0,
+        "sync_client_open": bool(_SYNC_CLIENT is not None and not _SYNC_CLIENT.is_closed),
+        "async_client_open": bool(_ASYNC_CLIENT is not None and not _ASYNC_CLIENT.is_closed),
+        "streams": get_stream_stats(),
+    }
+
+
+def get_stream_stats() -> Dict[str, int]:
+    with _STREAM_STATS_LOCK:
+        return dict(_STREAM_STATS)
+
+
+def shutdown() -> None:
+    """Close pooled clients and stop the loop (registered at exit)."""
+    global _SYNC_CLIENT, _ASYNC_CLIENT, _LOOP, _LOOP_THREAD
+
+    with _LOCK:
+        sync_client, async_client = _SYNC_CLIENT, _ASYNC_CLIENT
+        loop, thread = _LOOP, _LOOP_THREAD
+        _SYNC_CLIENT = _ASYNC_CLIENT = None
+        _LOOP = _LOOP_THREAD = None
+
+    if sync_client is not None:
+        sync_client.close()
+    if loop is not None and thread is not None and thread.is_alive():
+        if async_client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(async_client.aclose(), loop).result(timeout=5)
+            except Exception:
+                logger.debug("Closing shared async HTTP client failed", exc_info=True)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+
+atexit.register(shutdown)
@@ -4,21 +4,28 @@ Phase 1 launch auth keeps Apple available by default and enables Google when con
 Issues JWT tokens for session management
 """
 
+import atexit
 import os
 import json
 import logging
+import math
 import secrets
 import hashlib
 import threading
 import time
 import uuid
 import jwt
+from collections import OrderedDict
 import requests
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from functools import wraps
 from flask import request, jsonify, g
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 import config
+from jwks_cache import JWKSCache
 
 logger = logging.getLogger(__name__)
 
@@ -142,6 +149,12 @@ def _resolve_jwt_secret() -> str:
 
 JWT_SECRET = _resolve_jwt_secret()
 
+# Verified access-token claims keyed by token hash, served until the token's exp.
+_JWT_CACHE: "OrderedDict[str, tuple[dict, float]]" = OrderedDict()
+_JWT_CACHE_LOCK = threading.Lock()
+_JWT_CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+JWT_VERIFY_CACHE_NO_EXP_TTL_SECONDS = 300
+
 
 class AppleTokenVerificationError(ValueError):
     """Structured Apple token verification error with telemetry-friendly reason code."""
@@ -179,6 +192,10 @@ def decode_jwt(token: str) -> dict:
     """
     Decode and verify a JWT token.
 
+    Successful verifications are cached by token hash until `exp`, so the
+    auth guards, rate-limit subject lookups and `get_request_auth_user_id`
+    share one HMAC check per token lifetime.
+
     Args:
         token: JWT token string
 
@@ -189,7 +206,64 @@ def decode_jwt(token: str) -> dict:
         jwt.ExpiredSignatureError: If token has expired
         jwt.InvalidTokenError: If token is invalid
     """
-    return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    cache_key = _jwt_cache_key(token)
+    now_ts = time.time()
+    with _JWT_CACHE_LOCK:
+        cached = _JWT_CACHE.get(cache_key)
+        if cached is not None:
+            payload, expires_at = cached
+            if now_ts < expires_at:
+                _JWT_CACHE.move_to_end(cache_key)
+                _JWT_CACHE_STATS["hits"] += 1
+                return dict(payload)
+            # Past exp: fall through so jwt.decode raises ExpiredSignatureError.
+            del _JWT_CACHE[cache_key]
+        _JWT_CACHE_STATS["misses"] += 1
+
+    payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+
+    max_entries = max(0, int(getattr(config, "JWT_VERIFY_CACHE_MAX_ENTRIES", 4096)))
+    if max_entries:
+        expires_at = now_ts + JWT_VERIFY_CACHE_NO_EXP_TTL_SECONDS
+        if isinstance(payload.get("exp"), (int, float)):
+            expires_at = float(payload["exp"])
+        with _JWT_CACHE_LOCK:
+            _JWT_CACHE[cache_key] = (dict(payload), expires_at)
+            _JWT_CACHE.move_to_end(cache_key)
+            while len(_JWT_CACHE) > max_entries:
+                _JWT_CACHE.popitem(last=False)
+                _JWT_CACHE_STATS["evictions"] += 1
+    return payload
+
+
+def _jwt_cache_key(token: str) -> str:
+    # The secret is part of the key so a rotated secret never serves claims verified under the old one.
+    return hashlib.sha256(f"{JWT_SECRET}\0{token or ''}".encode("utf-8")).hexdigest()
+
+
+def get_jwt_cache_stats() -> dict:
+    """Hit/miss counters for the verified access-token cache."""
+    with _JWT_CACHE_LOCK:
+        hits = _JWT_CACHE_STATS["hits"]
+        misses = _JWT_CACHE_STATS["misses"]
+        entries = len(_JWT_CACHE)
+        evictions = _JWT_CACHE_STATS["evictions"]
+    total_lookups = hits + misses
+    return {
+        "entries": entries,
+        "max_entries": max(0, int(getattr(config, "JWT_VERIFY_CACHE_MAX_ENTRIES", 4096))),
+        "cache_hits": hits,
+        "cache_misses": misses,
+        "evictions": evictions,
+        "hit_rate": round(hits / total_lookups, 3) if total_lookups else 0.0,
+    }
+
+
+def clear_jwt_cache() -> None:
+    with _JWT_CACHE_LOCK:
+        _JWT_CACHE.clear()
+        for key in _JWT_CACHE_STATS:
+            _JWT_CACHE_STATS[key] = 0
 
 
 def _hash_token(raw_token: str) -> str:
@@ -388,11 +462,26 @@ def require_mobile_auth(f):
     return decorated
 
 
+# user_id -> (tier, expires_at). Short-lived per worker; writes through the subscription
+# helpers in main.py invalidate this worker's entry once their transaction commits.
+# Other workers are not notified and may serve the old tier until their entry expires,
+# so SUBSCRIPTION_TIER_CACHE_TTL_SECONDS bounds cross-worker staleness and should stay short.
+_SUBSCRIPTION_TIER_CACHE: dict[str, tuple[str, float]] = {}
+_SUBSCRIPTION_TIER_CACHE_LOCK = threading.Lock()
+_SUBSCRIPTION_TIER_CACHE_MAX_ENTRIES = 10_000
+
 # Compatibility vestige for local tests that referenced the old in-memory store.
 _RATE_LIMIT_STORE: dict[str, list[float]] = {}
 _RATE_LIMIT_LOCK = threading.Lock()
 _RATE_LIMIT_CLEANUP_LOCK = threading.Lock()
 _LAST_RATE_LIMIT_CLEANUP_AT = 0.0
+# Hybrid backend: (subject_key, rule_name, window_start) -> synced/pending hit counts.
+_HYBRID_RATE_LIMIT_COUNTERS: dict[tuple[str, str, int], dict[str, int]] = {}
+_RATE_LIMIT_FLUSH_LOCK = threading.Lock()
+_LAST_RATE_LIMIT_FLUSH_AT = 0.0
+_RATE_LIMIT_FLUSHER: threading.Thread | None = None
+_RATE_LIMIT_FLUSHER_STOP = threading.Event()
+_RATE_LIMIT_FLUSH_WAKE = threading.Event()
 
 
 def _request_ip_address() -> str:
@@ -438,28 +527,129 @@ def get_request_refresh_token_user_id() -> str | None:
     return str(record.user_id or "").strip() or None
 
 
+def _subscription_tier_cache_ttl() -> float:
+    return max(0.0, float(getattr(config, "SUBSCRIPTION_TIER_CACHE_TTL_SECONDS", 30)))
+
+
+def _cache_subscription_tier(user_id: str, tier: str, now_ts: float) -> None:
+    ttl = _subscription_tier_cache_ttl()
+    if ttl <= 0:
+        return
+    with _SUBSCRIPTION_TIER_CACHE_LOCK:
+        _SUBSCRIPTION_TIER_CACHE[user_id] = (tier, now_ts + ttl)
+        if len(_SUBSCRIPTION_TIER_CACHE) > _SUBSCRIPTION_TIER_CACHE_MAX_ENTRIES:
+            expired = [key for key, (_tier, expires_at) in _SUBSCRIPTION_TIER_CACHE.items() if expires_at <= now_ts]
+            for key in expired:
+                del _SUBSCRIPTION_TIER_CACHE[key]
+            while len(_SUBSCRIPTION_TIER_CACHE) > _SUBSCRIPTION_TIER_CACHE_MAX_ENTRIES:
+                _SUBSCRIPTION_TIER_CACHE.pop(next(iter(_SUBSCRIPTION_TIER_CACHE)))
+
+
+def invalidate_user_subscription_tier(user_id: str | None = None) -> None:
+    """Drop the cached tier for one user, or for everyone when `user_id` is None."""
+    with _SUBSCRIPTION_TIER_CACHE_LOCK:
+        if user_id is None:
+            _SUBSCRIPTION_TIER_CACHE.clear()
+            return
+        _SUBSCRIPTION_TIER_CACHE.pop(str(user_id).strip(), None)
+
+
+_PENDING_TIER_INVALIDATIONS_KEY = "pending_subscription_tier_invalidations"
+
+
+def invalidate_user_subscription_tier_on_commit(session, user_id: str | None) -> None:
+    """
+    Drop the cached tier for `user_id` after `session` commits.
+
+    Invalidating before the commit lets a concurrent request re-cache the old
+    tier from the not-yet-committed row; a rollback leaves the cache as is.
+    """
+    normalized_user_id = str(user_id or "").strip()
+    if normalized_user_id:
+        session.info.setdefault(_PENDING_TIER_INVALIDATIONS_KEY, set()).add(normalized_user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_pending_tier_invalidations(session) -> None:
+    for user_id in session.info.pop(_PENDING_TIER_INVALIDATIONS_KEY, ()):
+        invalidate_user_subscription_tier(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_tier_invalidations(session) -> None:
+    session.info.pop(_PENDING_TIER_INVALIDATIONS_KEY, None)
+
+
 def resolve_user_subscription_tier(user_id: str | None) -> str:
     normalized_user_id = str(user_id or "").strip()
     if not normalized_user_id:
         return "free"
 
-    from database import db, User, UserSubscription, user_has_active_app_store_subscription
-
     if config.user_has_premium_override(user_id=normalized_user_id):
         return "premium"
 
+    now_ts = time.time()
+    with _SUBSCRIPTION_TIER_CACHE_LOCK:
+        cached = _SUBSCRIPTION_TIER_CACHE.get(normalized_user_id)
+    if cached is not None and cached[1] > now_ts:
+        return cached[0]
+
+    from database import db, User, UserSubscription, user_has_active_app_store_subscription
+
     user = db.session.get(User, normalized_user_id)
     if user is not None and config.user_has_premium_override(user_id=normalized_user_id, email=user.email):
-        return "premium"
+        tier = "premium"
+    else:
+        subscription = UserSubscription.query.filter_by(user_id=normalized_user_id).first()
+        raw_tier = str(getattr(subscription, "tier", "") or "").strip().lower()
+        if raw_tier == "premium" or user_has_active_app_store_subscription(normalized_user_id):
+            tier = "premium"
+        else:
+            tier = "free"
 
-    subscription = UserSubscription.query.filter_by(user_id=normalized_user_id).first()
-    raw_tier = str(getattr(subscription, "tier", "") or "").strip().lower()
-    if raw_tier == "premium":
-        return "premium"
+    _cache_subscription_tier(normalized_user_id, tier, now_ts)
+    return tier
 
-    if user_has_active_app_store_subscription(normalized_user_id):
-        return "premium"
-    return "free"
+
+def resolve_user_subscription_tiers(user_ids) -> dict[str, str]:
+    """
+    Resolve tiers for many users with three queries in total (admin/reporting use).
+
+    Same precedence as `resolve_user_subscription_tier`; results refresh the cache.
+    """
+    normalized_ids = list(dict.fromkeys(str(user_id or "").strip() for user_id in user_ids or ()))
+    normalized_ids = [user_id for user_id in normalized_ids if user_id]
+    if not normalized_ids:
+        return {}
+
+    from database import db, User, UserSubscription, users_with_active_app_store_subscription
+
+    emails: dict[str, str | None] = {}
+    premium_records: set[str] = set()
+    app_store_active: set[str] = set()
+    for offset in range(0, len(normalized_ids), 500):
+        chunk = normalized_ids[offset:offset + 500]
+        emails.update(db.session.query(User.id, User.email).filter(User.id.in_(chunk)).all())
+        premium_records.update(
+            row.user_id
+            for row in db.session.query(UserSubscription.user_id, UserSubscription.tier)
+            .filter(UserSubscription.user_id.in_(chunk))
+            .all()
+            if str(row.tier or "").strip().lower() == "premium"
+        )
+        app_store_active.update(users_with_active_app_store_subscription(chunk))
+
+    now_ts = time.time()
+    tiers: dict[str, str] = {}
+    for user_id in normalized_ids:
+        premium = (
+            config.user_has_premium_override(user_id=user_id, email=emails.get(user_id))
+            or user_id in premium_records
+            or user_id in app_store_active
+        )
+        tiers[user_id] = "premium" if premium else "free"
+        _cache_subscription_tier(user_id, tiers[user_id], now_ts)
+    return tiers
 
 
 def _rate_limit_rule_name(prefix: str, window_seconds: int) -> str:
@@ -482,8 +672,12 @@ def _rate_limit_retry_after(now_ts: float, window_seconds: int) -> int | None:
 
 
 def _cleanup_rate_limit_counters_if_due(now_ts: float) -> None:
+    """Inline fallback for expired-counter cleanup when the maintenance scheduler is off."""
     global _LAST_RATE_LIMIT_CLEANUP_AT
 
+    if bool(getattr(config, "MAINTENANCE_SCHEDULER_ENABLED", True)):
+        return
+
     retention = max(3600, int(getattr(config, "RATE_LIMIT_RETENTION_SECONDS", 7 * 24 * 3600)))
     cleanup_interval = min(300, retention)
     if now_ts - _LAST_RATE_LIMIT_CLEANUP_AT < cleanup_interval:
@@ -493,12 +687,11 @@ def _cleanup_rate_limit_counters_if_due(now_ts: float) -> None:
         if now_ts - _LAST_RATE_LIMIT_CLEANUP_AT < cleanup_interval:
             return
 
-        from database import RateLimitCounter, db
+        from database import db
+        from maintenance import purge_expired_rate_limits
 
-        cutoff = datetime.fromtimestamp(max(0, now_ts - retention), tz=timezone.utc).replace(tzinfo=None)
         try:
-            RateLimitCounter.query.filter(RateLimitCounter.updated_at < cutoff).delete(synchronize_session=False)
-            db.session.commit()
+            purge_expired_rate_limits(now_ts)
         except Exception:
             db.session.rollback()
             logger.debug("Rate limit counter cleanup failed", exc_info=True)
@@ -506,20 +699,34 @@ def _cleanup_rate_limit_counters_if_due(now_ts: float) -> None:
             _LAST_RATE_LIMIT_CLEANUP_AT = now_ts
 
 
-def _increment_rate_limit_counter(subject_key: str, rule_name: str, window_seconds: int, now_ts: float) -> int:
+def _add_rate_limit_counts(
+    increments: list[tuple[str, str, int, int, int]],
+    now_ts: float,
+) -> dict[tuple[str, str, int], int]:
+    """
+    Add hits to (subject_key, rule_name, window_start, window_seconds, amount) counters in one transaction.
+
+    Returns the stored count per (subject_key, rule_name, window_start) after the update.
+    """
     from database import RateLimitCounter, db
 
+    if not increments:
+        return {}
+
     now_dt = datetime.fromtimestamp(now_ts, tz=timezone.utc).replace(tzinfo=None)
-    window_start = _rate_limit_window_start(now_ts, window_seconds)
-    values = {
-        "subject_key": subject_key,
-        "rule_name": rule_name,
-        "window_start": window_start,
-        "window_seconds": int(window_seconds),
-        "count": 1,
-        "created_at": now_dt,
-        "updated_at": now_dt,
-    }
+    rows = []
+    for subject_key, rule_name, window_start, window_seconds, amount in increments:
+        rows.append(
+            {
+                "subject_key": subject_key,
+                "rule_name": rule_name,
+                "window_start": int(window_start),
+                "window_seconds": int(window_seconds),
+                "count": int(amount),
+                "created_at": now_dt,
+                "updated_at": now_dt,
+            }
+        )
     table = RateLimitCounter.__table__
     bind = db.session.get_bind()
     dialect_name = bind.dialect.name if bind is not None else ""
@@ -532,38 +739,305 @@ def _increment_rate_limit_counter(subject_key: str, rule_name: str, window_secon
         else:
             raise RuntimeError("dialect_fallback")
 
-        stmt = dialect_insert(table).values(**values)
+        stmt = dialect_insert(table).values(rows)
         stmt = stmt.on_conflict_do_update(
             index_elements=["subject_key", "rule_name", "window_start"],
             set_={
-                "count": table.c.count + 1,
+                "count": table.c.count + stmt.excluded.count,
                 "updated_at": now_dt,
             },
-        ).returning(table.c.count)
-        count = int(db.session.execute(stmt).scalar_one())
+        ).returning(table.c.subject_key, table.c.rule_name, table.c.window_start, table.c.count)
+        counts = {
+            (row.subject_key, row.rule_name, int(row.window_start)): int(row.count)
+            for row in db.session.execute(stmt)
+        }
         db.session.commit()
-        return count
+        return counts
     except Exception:
         db.session.rollback()
 
-    row = db.session.get(
-        RateLimitCounter,
+    counts = {}
+    for values in rows:
+        key = (values["subject_key"], values["rule_name"], values["window_start"])
+        row = db.session.get(
+            RateLimitCounter,
+            {
+                "subject_key": key[0],
+                "rule_name": key[1],
+                "window_start": key[2],
+            },
+        )
+        if row is None:
+            row = RateLimitCounter(**values)
+            db.session.add(row)
+        else:
+            row.count = int(row.count or 0) + values["count"]
+            row.updated_at = now_dt
+        counts[key] = int(row.count)
+    db.session.commit()
+    return counts
+
+
+def _rate_limit_algorithm() -> str:
+    algorithm = str(getattr(config, "RATE_LIMIT_ALGORITHM", "fixed_window") or "fixed_window").strip().lower()
+    return algorithm if algorithm in {"fixed_window", "gcra"} else "fixed_window"
+
+
+def _gcra_usage(tat: float, now_ts: float, interval: float) -> int:
+    """Requests currently held against the rule, derived from its theoretical arrival time."""
+    return max(1, math.ceil((tat - now_ts) / interval - 1e-9))
+
+
+def _apply_gcra_rules(
+    subject_key: str,
+    rules: list[tuple[str, int, int]],
+    now_ts: float,
+) -> dict[str, tuple[int, int | None]]:
+    """
+    Generic cell rate algorithm over `rate_limit_states`, one row per subject and rule.
+
+    Each rule emits one request every window/limit seconds with a burst of `limit`.
+    Allowed hits advance the stored theoretical arrival time (TAT) through a single
+    conditional upsert; rejected hits leave it untouched. Returns (count, retry_after)
+    per rule name, where count exceeds the limit only for rejected hits.
+    """
+    from sqlalchemy import func, select, tuple_
+    from database import RateLimitState, db
+
+    now_dt = datetime.fromtimestamp(now_ts, tz=timezone.utc).replace(tzinfo=None)
+    specs = {
+        rule_name: (limit, window, float(window) / float(limit))
+        for rule_name, limit, window in rules
+    }
+    rows = [
         {
             "subject_key": subject_key,
             "rule_name": rule_name,
-            "window_start": window_start,
-        },
-    )
-    if row is None:
-        row = RateLimitCounter(**values)
-        db.session.add(row)
-        count = 1
-    else:
-        row.count = int(row.count or 0) + 1
-        row.updated_at = now_dt
-        count = row.count
-    db.session.commit()
-    return int(count)
+            "tat": now_ts + interval,
+            "interval_seconds": interval,
+            "window_seconds": window,
+            "updated_at": now_dt,
+        }
+        for rule_name, (_limit, window, interval) in specs.items()
+    ]
+    table = RateLimitState.__table__
+    bind = db.session.get_bind()
+    dialect_name = bind.dialect.name if bind is not None else ""
+
+    allowed: dict[str, float] = {}
+    try:
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            greatest = func.max
+        elif dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            greatest = func.greatest
+        else:
+            raise RuntimeError("dialect_fallback")
+
+        stmt = dialect_insert(table).values(rows)
+        excluded = stmt.excluded
+        # excluded.tat is now + interval, so this is max(tat, now) + interval.
+        next_tat = greatest(table.c.tat + excluded.interval_seconds, excluded.tat)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["subject_key", "rule_name"],
+            set_={
+                "tat": next_tat,
+                "interval_seconds": excluded.interval_seconds,
+                "window_seconds": excluded.window_seconds,
+                "updated_at": now_dt,
+            },
+            where=next_tat <= excluded.tat - excluded.interval_seconds + excluded.window_seconds + 1e-6,
+        ).returning(table.c.rule_name, table.c.tat)
+        allowed = {row.rule_name: float(row.tat) for row in db.session.execute(stmt)}
+
+        rejected = [rule_name for rule_name in specs if rule_name not in allowed]
+        current: dict[str, float] = {}
+        if rejected:
+            current = {
+                row.rule_name: float(row.tat)
+                for row in db.session.execute(
+                    select(table.c.rule_name, table.c.tat).where(
+                        tuple_(table.c.subject_key, table.c.rule_name).in_(
+                            [(subject_key, rule_name) for rule_name in rejected]
+                        )
+                    )
+                )
+            }
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        allowed, current = {}, {}
+        for values in rows:
+            rule_name = values["rule_name"]
+            _limit, window, interval = specs[rule_name]
+            row = db.session.get(RateLimitState, {"subject_key": subject_key, "rule_name": rule_name})
+            if row is None:
+                db.session.add(RateLimitState(**values))
+                allowed[rule_name] = values["tat"]
+                continue
+            next_value = max(float(row.tat), now_ts) + interval
+            if next_value - now_ts <= window + 1e-6:
+                row.tat = next_value
+                row.interval_seconds = interval
+                row.window_seconds = window
+                row.updated_at = now_dt
+                allowed[rule_name] = next_value
+            else:
+                current[rule_name] = float(row.tat)
+        db.session.commit()
+
+    results: dict[str, tuple[int, int | None]] = {}
+    for rule_name, (limit, window, interval) in specs.items():
+        if rule_name in allowed:
+            results[rule_name] = (min(limit, _gcra_usage(allowed[rule_name], now_ts, interval)), None)
+            continue
+        tat = current.get(rule_name, now_ts + window)
+        # The next hit fits once max(tat, now) + interval - now <= window.
+        retry_after = max(1, math.ceil(tat + interval - window - now_ts))
+        results[rule_name] = (limit + 1, retry_after)
+    return results
+
+
+def _rate_limit_storage_backend() -> str:
+    backend = str(getattr(config, "RATE_LIMIT_STORAGE_BACKEND", "database") or "database").strip().lower()
+    return backend if backend in {"database", "hybrid"} else "database"
+
+
+def flush_rate_limit_counters(now_ts: float | None = None) -> int:
+    """
+    Reconcile unsynced hybrid-mode hits to `rate_limit_counters` in one transaction.
+
+    Each flushed key learns the cluster-wide count for its window, so the next local
+    decision includes hits recorded by other workers. Returns the number of keys flushed.
+    """
+    global _LAST_RATE_LIMIT_FLUSH_AT
+
+    now_ts = time.time() if now_ts is None else now_ts
+    with _RATE_LIMIT_FLUSH_LOCK:
+        with _RATE_LIMIT_LOCK:
+            batch = [
+                (key, entry["window_seconds"], entry["pending"])
+                for key, entry in _HYBRID_RATE_LIMIT_COUNTERS.items()
+                if entry["pending"] > 0
+            ]
+            _LAST_RATE_LIMIT_FLUSH_AT = now_ts
+
+        counts: dict[tuple[str, str, int], int] = {}
+        if batch:
+            increments = [
+                (subject_key, rule_name, window_start, window_seconds, pending)
+                for (subject_key, rule_name, window_start), window_seconds, pending in batch
+            ]
+            try:
+                counts = _add_rate_limit_counts(increments, now_ts)
+            except Exception:
+                logger.warning("Rate limit counter reconciliation failed; keeping local counts", exc_info=True)
+                return 0
+
+        with _RATE_LIMIT_LOCK:
+            for key, _window_seconds, pending in batch:
+                entry = _HYBRID_RATE_LIMIT_COUNTERS.get(key)
+                if entry is None:
+                    continue
+                entry["pending"] = max(0, entry["pending"] - pending)
+                if key in counts:
+                    entry["synced"] = counts[key]
+            for key, entry in list(_HYBRID_RATE_LIMIT_COUNTERS.items()):
+                window_end = key[2] + entry["window_seconds"]
+                if entry["pending"] == 0 and entry["window_seconds"] > 0 and window_end <= now_ts:
+                    del _HYBRID_RATE_LIMIT_COUNTERS[key]
+        return len(batch)
+
+
+def _rate_limit_flusher_running() -> bool:
+    return _RATE_LIMIT_FLUSHER is not None and _RATE_LIMIT_FLUSHER.is_alive()
+
+
+def start_rate_limit_flusher(app) -> bool:
+    """
+    Reconcile hybrid-mode counters on a daemon thread so limited requests stay in memory.
+
+    The thread flushes every RATE_LIMIT_HYBRID_FLUSH_INTERVAL_SECONDS and as soon as a
+    request marks a key over RATE_LIMIT_HYBRID_MAX_UNSYNCED. Without it (database
+    backend, scripts, tests) a due flush still runs inline on the request.
+    """
+    global _RATE_LIMIT_FLUSHER
+
+    if _rate_limit_storage_backend() != "hybrid":
+        return False
+    if _rate_limit_flusher_running():
+        return True
+    interval = max(0.1, float(getattr(config, "RATE_LIMIT_HYBRID_FLUSH_INTERVAL_SECONDS", 2.0)))
+
+    def _flush_once() -> None:
+        with app.app_context():
+            flush_rate_limit_counters()
+
+    def _loop() -> None:
+        while not _RATE_LIMIT_FLUSHER_STOP.is_set():
+            _RATE_LIMIT_FLUSH_WAKE.wait(interval)
+            _RATE_LIMIT_FLUSH_WAKE.clear()
+            if _RATE_LIMIT_FLUSHER_STOP.is_set():
+                return
+            try:
+                _flush_once()
+            except Exception:
+                logger.warning("Rate limit flush tick failed", exc_info=True)
+
+    def _final_flush() -> None:
+        _RATE_LIMIT_FLUSHER_STOP.set()
+        _RATE_LIMIT_FLUSH_WAKE.set()
+        try:
+            _flush_once()
+        except Exception:
+            logger.debug("Final rate limit flush failed", exc_info=True)
+
+    _RATE_LIMIT_FLUSHER_STOP.clear()
+    _RATE_LIMIT_FLUSHER = threading.Thread(target=_loop, name="rate-limit-flush", daemon=True)
+    _RATE_LIMIT_FLUSHER.start()
+    atexit.register(_final_flush)
+    return True
+
+
+def _count_hybrid_rate_limit_hits(
+    subject_key: str,
+    rules: list[tuple[str, int]],
+    now_ts: float,
+) -> list[int]:
+    """Record one local hit per (rule_name, window_seconds) and return the estimated counts."""
+    keys = [
+        (subject_key, rule_name, _rate_limit_window_start(now_ts, window_seconds), int(window_seconds))
+        for rule_name, window_seconds in rules
+    ]
+    max_unsynced = max(1, int(getattr(config, "RATE_LIMIT_HYBRID_MAX_UNSYNCED", 5)))
+    flush_interval = max(0.0, float(getattr(config, "RATE_LIMIT_HYBRID_FLUSH_INTERVAL_SECONDS", 2.0)))
+
+    flush_due = now_ts - _LAST_RATE_LIMIT_FLUSH_AT >= flush_interval
+    with _RATE_LIMIT_LOCK:
+        for subject, rule_name, window_start, window_seconds in keys:
+            key = (subject, rule_name, window_start)
+            entry = _HYBRID_RATE_LIMIT_COUNTERS.get(key)
+            if entry is None:
+                entry = {"window_seconds": window_seconds, "synced": 0, "pending": 0}
+                _HYBRID_RATE_LIMIT_COUNTERS[key] = entry
+            entry["pending"] += 1
+            flush_due = flush_due or entry["pending"] >= max_unsynced
+
+    if flush_due:
+        if _rate_limit_flusher_running():
+            _RATE_LIMIT_FLUSH_WAKE.set()
+        else:
+            flush_rate_limit_counters(now_ts)
+
+    counts = []
+    with _RATE_LIMIT_LOCK:
+        for subject, rule_name, window_start, _window_seconds in keys:
+            entry = _HYBRID_RATE_LIMIT_COUNTERS.get((subject, rule_name, window_start)) or {"synced": 0, "pending": 0}
+            # synced is the last cluster-wide count seen, so this never over-counts; it can
+            # under-count by hits other workers have not flushed yet.
+            counts.append(int(entry["synced"]) + int(entry["pending"]))
+    return counts
 
 
 def _resolve_rate_limit_subject(*, scope: str, key_func=None) -> str | None:
@@ -593,6 +1067,132 @@ def _rate_limit_response(retry_after: int | None):
     return response
 
 
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    tripped_rule: str | None = None
+    retry_after: int | None = None
+    counts: tuple[tuple[str, int], ...] = ()
+
+
+class RateLimitPolicy:
+    """
+    All rate-limit windows for one endpoint, evaluated together.
+
+    The subject is resolved once and every window is counted in a single upsert
+    round-trip (or a single local update on the hybrid backend). Rules keep the
+    `<key_prefix>:<window_seconds>` counter names used by `rate_limit`, so
+    switching an endpoint between the two keeps its existing counters.
+    """
+
+    def __init__(
+        self,
+        key_prefix: str,
+        rules,
+        *,
+        scope: str = "auto",
+        key_func=None,
+    ):
+        self.key_prefix = key_prefix
+        self.scope = scope
+        self.key_func = key_func
+        self.rules: tuple[tuple[str, int, int], ...] = tuple(
+            (_rate_limit_rule_name(key_prefix, window_seconds), max(1, int(limit)), int(window_seconds))
+            for limit, window_seconds in rules
+        )
+        if not self.rules:
+            raise ValueError("RateLimitPolicy needs at least one rule")
+        rule_names = [rule_name for rule_name, _limit, _window in self.rules]
+        if len(set(rule_names)) != len(rule_names):
+            raise ValueError(f"Duplicate rate limit windows for {key_prefix}")
+
+    def evaluate(self) -> RateLimitDecision | None:
+        """Count one hit against every rule; None when limiting is off or there is no subject."""
+        if not bool(getattr(config, "RATE_LIMIT_ENABLED", True)):
+            return None
+
+        if _testing_bypass_enabled(
+            "RATE_LIMIT_BYPASS_FOR_TESTS",
+            bool(getattr(config, "RATE_LIMIT_BYPASS_FOR_TESTS", False)),
+        ):
+            return None
+
+        subject = _resolve_rate_limit_subject(scope=self.scope, key_func=self.key_func)
+        if not subject:
+            return None
+
+        now_ts = time.time()
+        _cleanup_rate_limit_counters_if_due(now_ts)
+
+        subject_key = f"{self.scope}:{subject}"
+        results = self._count_hits(subject_key, now_ts)
+
+        observed = tuple((rule[0], count) for rule, (count, _retry) in zip(self.rules, results))
+        tripped = [
+            (retry_after or 0, rule_name)
+            for (rule_name, limit, _window), (count, retry_after) in zip(self.rules, results)
+            if count > limit
+        ]
+        if not tripped:
+            return RateLimitDecision(allowed=True, counts=observed)
+        # Report the rule that stays closed longest so Retry-After is actually sufficient.
+        retry_after, rule_name = max(tripped)
+        return RateLimitDecision(
+            allowed=False,
+            tripped_rule=rule_name,
+            retry_after=retry_after or None,
+            counts=observed,
+        )
+
+    def _count_hits(self, subject_key: str, now_ts: float) -> list[tuple[int, int | None]]:
+        """Return (count, retry_after) per rule, in rule order, after recording this hit."""
+        if _rate_limit_storage_backend() == "hybrid":
+            counts = _count_hybrid_rate_limit_hits(
+                subject_key,
+                [(rule_name, window) for rule_name, _limit, window in self.rules],
+                now_ts,
+            )
+            return [(count, _rate_limit_retry_after(now_ts, rule[2])) for rule, count in zip(self.rules, counts)]
+
+        results: dict[str, tuple[int, int | None]] = {}
+        fixed_rules = list(self.rules)
+        if _rate_limit_algorithm() == "gcra":
+            # Windowless rules (lifetime caps) have no rate to smooth and stay on counters.
+            gcra_rules = [rule for rule in self.rules if rule[2] > 0]
+            fixed_rules = [rule for rule in self.rules if rule[2] <= 0]
+            if gcra_rules:
+                results.update(_apply_gcra_rules(subject_key, gcra_rules, now_ts))
+        if fixed_rules:
+            stored = _add_rate_limit_counts(
+                [
+                    (subject_key, rule_name, _rate_limit_window_start(now_ts, window), window, 1)
+                    for rule_name, _limit, window in fixed_rules
+                ],
+                now_ts,
+            )
+            for rule_name, _limit, window in fixed_rules:
+                count = stored[(subject_key, rule_name, _rate_limit_window_start(now_ts, window))]
+                results[rule_name] = (count, _rate_limit_retry_after(now_ts, window))
+        return [results[rule_name] for rule_name, _limit, _window in self.rules]
+
+    def enforce(self):
+        decision = self.evaluate()
+        if decision is None or decision.allowed:
+            return None
+        logger.info("Rate limit exceeded: rule=%s scope=%s", decision.tripped_rule, self.scope)
+        return _rate_limit_response(decision.retry_after)
+
+    def __call__(self, f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            limited = self.enforce()
+            if limited is not None:
+                return limited
+            return f(*args, **kwargs)
+
+        return decorated
+
+
 def enforce_rate_limit(
     limit: int,
     window_seconds: int,
@@ -601,31 +1201,12 @@ def enforce_rate_limit(
     scope: str = "auto",
     key_func=None,
 ):
-    enforced = bool(getattr(config, "RATE_LIMIT_ENABLED", True))
-    if not enforced:
-        return None
-
-    if _testing_bypass_enabled(
-        "RATE_LIMIT_BYPASS_FOR_TESTS",
-        bool(getattr(config, "RATE_LIMIT_BYPASS_FOR_TESTS", False)),
-    ):
-        return None
-
-    subject = _resolve_rate_limit_subject(scope=scope, key_func=key_func)
-    if not subject:
-        return None
-
-    max_requests = max(1, int(limit))
-    window = int(window_seconds)
-    now_ts = time.time()
-    _cleanup_rate_limit_counters_if_due(now_ts)
-
-    rule_name = _rate_limit_rule_name(key_prefix, window)
-    subject_key = f"{scope}:{subject}"
-    count = _increment_rate_limit_counter(subject_key, rule_name, window, now_ts)
-    if count <= max_requests:
-        return None
-    return _rate_limit_response(_rate_limit_retry_after(now_ts, window))
+    return RateLimitPolicy(
+        key_prefix,
+        [(limit, window_seconds)],
+        scope=scope,
+        key_func=key_func,
+    ).enforce()
 
 
 def rate_limit(
@@ -637,32 +1218,52 @@ def rate_limit(
     key_func=None,
 ) -> callable:
     """
-    Database-backed fixed-window rate limiter shared across workers.
-    """
+    Database-backed rate limiter shared across workers.
 
-    def decorator(f):
-        @wraps(f)
-        def decorated(*args, **kwargs):
-            limited = enforce_rate_limit(
-                limit,
-                window_seconds,
-                key_prefix=key_prefix,
-                scope=scope,
-                key_func=key_func,
-            )
-            if limited is not None:
-                return limited
-            return f(*args, **kwargs)
+    Fixed windows by default; RATE_LIMIT_ALGORITHM=gcra smooths them into one
+    GCRA row per subject and rule. With RATE_LIMIT_STORAGE_BACKEND=hybrid the decision is made from per-worker
+    counters and the counts reach the database in batched flushes. Endpoints with
+    several windows should use `rate_limit_policy` instead of stacking this.
+    """
+    return RateLimitPolicy(key_prefix, [(limit, window_seconds)], scope=scope, key_func=key_func)
 
-        return decorated
 
-    return decorator
+def rate_limit_policy(
+    *,
+    key_prefix: str,
+    rules,
+    scope: str = "auto",
+    key_func=None,
+) -> RateLimitPolicy:
+    """Decorator form of `RateLimitPolicy`: `rules` is an iterable of (limit, window_seconds)."""
+    return RateLimitPolicy(key_prefix, rules, scope=scope, key_func=key_func)
 
 
 # ============================================
 # PROVIDER TOKEN VERIFICATION
 # ============================================
 
+APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Shared per worker; nothing is fetched until the first sign-in needs a key.
+_APPLE_JWKS = JWKSCache(
+    APPLE_JWKS_URL,
+    default_ttl_seconds=max(60, int(getattr(config, "IDENTITY_JWKS_DEFAULT_TTL_SECONDS", 3600))),
+    kid_miss_min_interval_seconds=max(1, int(getattr(config, "IDENTITY_JWKS_KID_MISS_MIN_INTERVAL_SECONDS", 30))),
+)
+_GOOGLE_JWKS = JWKSCache(
+    GOOGLE_JWKS_URL,
+    default_ttl_seconds=max(60, int(getattr(config, "IDENTITY_JWKS_DEFAULT_TTL_SECONDS", 3600))),
+    kid_miss_min_interval_seconds=max(1, int(getattr(config, "IDENTITY_JWKS_KID_MISS_MIN_INTERVAL_SECONDS", 30))),
+)
+
+
+def get_identity_jwks_stats() -> dict:
+    return {"apple": _APPLE_JWKS.stats(), "google": _GOOGLE_JWKS.stats()}
+
+
 def _resolve_google_client_ids() -> list[str]:
     configured = list(getattr(config, "GOOGLE_CLIENT_IDS", []) or [])
     normalized = [item.strip() for item in configured if str(item).strip()]
@@ -689,22 +1290,20 @@ def verify_google_token(id_token: str) -> dict:
         ValueError: If token is invalid
     """
     try:
-        from google.oauth2 import id_token as google_id_token
-        from google.auth.transport import requests as google_requests
-
         allowed_client_ids = _resolve_google_client_ids()
         if not allowed_client_ids:
             raise ValueError("GOOGLE_CLIENT_IDS not configured")
 
-        idinfo = google_id_token.verify_oauth2_token(
+        signing_key = _GOOGLE_JWKS.get_signing_key_from_jwt(id_token)
+        idinfo = jwt.decode(
             id_token,
-            google_requests.Request(),
-            None
+            signing_key.key,
+            algorithms=["RS256"],
+            audience=allowed_client_ids,
+            options={"verify_iss": False},
         )
-
-        token_audience = str(idinfo.get("aud") or "").strip()
-        if token_audience not in allowed_client_ids:
-            raise ValueError("Google token audience mismatch")
+        if idinfo.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError("Google token issuer mismatch")
 
         return {
             "provider_id": idinfo["sub"],
@@ -712,30 +1311,6 @@ def verify_google_token(id_token: str) -> dict:
             "display_name": idinfo.get("name", ""),
             "avatar_url": idinfo.get("picture", "")
         }
-    except ImportError:
-        # Fallback: verify via Google's tokeninfo endpoint
-        allowed_client_ids = _resolve_google_client_ids()
-        if not allowed_client_ids:
-            raise ValueError("GOOGLE_CLIENT_IDS not configured")
-
-        response = requests.get(
-            f"https://oauth2.googleapis.com/tokeninfo?id_token={id_token}",
-            timeout=10
-        )
-        if response.status_code != 200:
-            raise ValueError(f"Google token verification failed: {response.text}")
-
-        data = response.json()
-        token_audience = str(data.get("aud") or data.get("azp") or "").strip()
-        if token_audience not in allowed_client_ids:
-            raise ValueError("Google token audience mismatch")
-
-        return {
-            "provider_id": data["sub"],
-            "email": data.get("email", ""),
-            "display_name": data.get("name", ""),
-            "avatar_url": data.get("picture", "")
-        }
     except Exception as e:
         logger.error(f"Google token verification error: {e}")
         raise ValueError(f"Invalid Google token: {str(e)}")
@@ -774,8 +1349,7 @@ def verify_apple_token(
         ValueError: If token is invalid
     """
     try:
-        signing_key_client = jwt.PyJWKClient("https://appleid.apple.com/auth/keys")
-        signing_key = signing_key_client.get_signing_key_from_jwt(identity_token)
+        signing_key = _APPLE_JWKS.get_signing_key_from_jwt(identity_token)
         decoded = jwt.decode(
             identity_token,
             signing_key.key,
@@ -15,11 +15,12 @@ from database import db, EmailAuthCode, User, UserSettings
 from email_sender import send_account_welcome_email, send_sign_in_code_email
 from email_service import sendLoginEmail, sendPasswordReset
 from auth import (
+    RateLimitPolicy,
     create_jwt,
-    enforce_rate_limit,
     get_request_refresh_token_user_id,
     require_auth,
     rate_limit,
+    rate_limit_policy,
     issue_auth_tokens,
     rotate_refresh_token,
     revoke_refresh_family,
@@ -195,21 +196,14 @@ def _enforce_register_rate_limit_if_new_user(provider: str, provider_info: dict)
     if _find_existing_user(provider, provider_info) is not None:
         return None
 
-    limited = enforce_rate_limit(
-        getattr(config, "AUTH_REGISTER_RATE_LIMIT_PER_10_MINUTES", 3),
-        10 * 60,
-        key_prefix="auth.register",
+    return RateLimitPolicy(
+        "auth.register",
+        (
+            (getattr(config, "AUTH_REGISTER_RATE_LIMIT_PER_10_MINUTES", 3), 10 * 60),
+            (getattr(config, "AUTH_REGISTER_RATE_LIMIT_PER_DAY", 10), 24 * 3600),
+        ),
         scope="ip",
-    )
-    if limited is not None:
-        return limited
-
-    return enforce_rate_limit(
-        getattr(config, "AUTH_REGISTER_RATE_LIMIT_PER_DAY", 10),
-        24 * 3600,
-        key_prefix="auth.register",
-        scope="ip",
-    )
+    ).enforce()
 
 
 def _normalize_email(raw_value) -> str:
@@ -296,6 +290,9 @@ def _email_provider_info(email: str) -> dict:
 
 
 def _prune_expired_email_auth_codes() -> None:
+    # The maintenance scheduler purges expired codes in the background when enabled.
+    if bool(getattr(config, "MAINTENANCE_SCHEDULER_ENABLED", True)):
+        return
     EmailAuthCode.query.filter(EmailAuthCode.expires_at < _utcnow_naive()).delete()
     db.session.commit()
 
@@ -306,17 +303,13 @@ def _prune_expired_email_auth_codes() -> None:
 
 
 @auth_bp.route("/email/request-code", methods=["POST"])
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20),
-    window_seconds=3600,
-    key_prefix="auth.email.request",
-    scope="ip",
-)
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5),
-    window_seconds=60,
+@rate_limit_policy(
     key_prefix="auth.email.request",
     scope="ip",
+    rules=(
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5), 60),
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20), 3600),
+    ),
 )
 def auth_email_request_code():
     if not _provider_enabled("email"):
@@ -367,17 +360,13 @@ def auth_email_request_code():
 
 
 @auth_bp.route("/email/verify", methods=["POST"])
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20),
-    window_seconds=3600,
-    key_prefix="auth.email.verify",
-    scope="ip",
-)
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5),
-    window_seconds=60,
+@rate_limit_policy(
     key_prefix="auth.email.verify",
     scope="ip",
+    rules=(
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5), 60),
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20), 3600),
+    ),
 )
 def auth_email_verify():
     if not _provider_enabled("email"):
@@ -419,6 +408,7 @@ def auth_email_verify():
 
     auth_code = (
         EmailAuthCode.query.filter_by(email=email, used_at=None)
+        .filter(EmailAuthCode.expires_at >= _utcnow_naive())
         .order_by(EmailAuthCode.created_at.desc())
         .first()
     )
@@ -480,17 +470,13 @@ def auth_email_password_reset():
     return jsonify({"success": True, "email_sent": True}), 200
 
 @auth_bp.route("/apple", methods=["POST"])
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20),
-    window_seconds=3600,
-    key_prefix="auth.login",
-    scope="ip",
-)
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5),
-    window_seconds=60,
+@rate_limit_policy(
     key_prefix="auth.login",
     scope="ip",
+    rules=(
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5), 60),
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20), 3600),
+    ),
 )
 def auth_apple():
     """
@@ -568,17 +554,13 @@ def auth_apple():
 
 
 @auth_bp.route("/google", methods=["POST"])
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20),
-    window_seconds=3600,
-    key_prefix="auth.login",
-    scope="ip",
-)
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5),
-    window_seconds=60,
+@rate_limit_policy(
     key_prefix="auth.login",
     scope="ip",
+    rules=(
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5), 60),
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20), 3600),
+    ),
 )
 def auth_google():
     """
@@ -632,17 +614,13 @@ def auth_google():
 
 
 @auth_bp.route("/facebook", methods=["POST"])
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20),
-    window_seconds=3600,
-    key_prefix="auth.login",
-    scope="ip",
-)
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5),
-    window_seconds=60,
+@rate_limit_policy(
     key_prefix="auth.login",
     scope="ip",
+    rules=(
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5), 60),
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20), 3600),
+    ),
 )
 def auth_facebook():
     """
@@ -696,17 +674,13 @@ def auth_facebook():
 
 
 @auth_bp.route("/vipps", methods=["POST"])
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20),
-    window_seconds=3600,
-    key_prefix="auth.login",
-    scope="ip",
-)
-@rate_limit(
-    limit=getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5),
-    window_seconds=60,
+@rate_limit_policy(
     key_prefix="auth.login",
     scope="ip",
+    rules=(
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_MINUTE", 5), 60),
+        (getattr(config, "AUTH_LOGIN_RATE_LIMIT_PER_HOUR", 20), 3600),
+    ),
 )
 def auth_vipps():
     """
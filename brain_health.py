@@ -0,0 +1,430 @@
+"""
+Shared brain health and cooldown state across workers.
+
+`BrainRouter` keeps cooldowns and latency stats per process, so every gunicorn
+worker (and every instance) used to rediscover a dead or quota-limited
+provider by timing out on it itself. `SharedBrainHealth` publishes each
+worker's view to a shared store and merges everyone else's back in:
+
+- setting a cooldown wakes the sync thread, which writes it straight away in
+  its own app context (never on the request's session), so one worker's
+  timeout steers the other workers away within one sync interval
+- latency summaries (avg, p90, call/timeout/failure counts) give cold workers
+  a cluster-wide latency estimate; they are only re-published when latency
+  moves by BRAIN_SHARED_HEALTH_LATENCY_CHANGE_RATIO, timeouts or failures
+  grow, or BRAIN_SHARED_HEALTH_STATS_SECONDS have passed
+- reads on the routing path only touch the in-memory merged view; the
+  background sync thread (`start_brain_health_sync`) refreshes active
+  cooldowns every BRAIN_SHARED_HEALTH_SYNC_SECONDS and reloads every row
+  only once per BRAIN_SHARED_HEALTH_STATS_SECONDS
+
+Backends: "database" (`brain_health_states`, one row per brain and worker) and
+"memory", a process-local stand-in for single-worker deployments and tests.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_STAT_FIELDS = ("avg_latency", "p90_latency", "calls", "timeouts", "failures")
+
+# Stand-in store for the "memory" backend: (brain_name, worker_id) -> row
+_MEMORY_ROWS: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_MEMORY_LOCK = threading.Lock()
+
+
+def _naive_utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(max(0.0, timestamp), tz=timezone.utc).replace(tzinfo=None)
+
+
+class SharedBrainHealth:
+    """Per-worker publisher plus merged cluster view of brain health."""
+
+    def __init__(
+        self,
+        *,
+        backend: str = "database",
+        worker_id: Optional[str] = None,
+        stale_seconds: float = 600.0,
+        stats_interval_seconds: float = 30.0,
+        latency_change_ratio: float = 0.2,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.backend = str(backend or "off").strip().lower()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stale_seconds = max(1.0, float(stale_seconds))
+        self.stats_interval_seconds = max(0.0, float(stats_interval_seconds))
+        self.latency_change_ratio = max(0.0, float(latency_change_ratio))
+        self._clock = clock
+        self._lock = threading.Lock()
+        # This worker's rows, keyed by brain name; dirty ones are written on the next sync.
+        self._local: Dict[str, Dict[str, Any]] = {}
+        self._dirty: set = set()
+        # Merged view of every worker's rows, as of the last sync.
+        self._remote: List[Dict[str, Any]] = []
+        self._last_full_reload: Optional[float] = None
+        # brain name -> (stats as last staged for a push, when)
+        self._published_stats: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._stats = {
+            "syncs": 0,
+            "full_reloads": 0,
+            "sync_failures": 0,
+            "cooldowns_published": 0,
+            "stats_published": 0,
+        }
+        # Set when a cooldown needs to go out before the next scheduled sync.
+        self.wake = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend in {"database", "memory"}
+
+    def _row(self, brain_name: str) -> Dict[str, Any]:
+        row = self._local.get(brain_name)
+        if row is None:
+            row = self._local[brain_name] = {
+                "brain_name": brain_name,
+                "worker_id": self.worker_id,
+                "cooldown_until": None,
+                "cooldown_reason": None,
+                "avg_latency": None,
+                "p90_latency": None,
+                "calls": 0,
+                "timeouts": 0,
+                "failures": 0,
+            }
+        return row
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish_cooldown(self, brain_name: str, until: float, reason: str) -> None:
+        """Share a cooldown; the sync thread is woken to write it right away."""
+        if not self.enabled:
+            return
+        with self._lock:
+            row = self._row(brain_name)
+            row["cooldown_until"] = float(until)
+            row["cooldown_reason"] = str(reason or "failure")[:40]
+            self._dirty.add(brain_name)
+            self._stats["cooldowns_published"] += 1
+        if self.backend == "memory":
+            self.push()
+        self.wake.set()
+
+    def publish_stats(self, brain_name: str, now_ts: Optional[float] = None, **stats: Any) -> bool:
+        """
+        Stage this worker's latency summary for `brain_name` for the next sync.
+
+        Only marked for a push when it changed materially (see `_stats_changed`)
+        or the last push is BRAIN_SHARED_HEALTH_STATS_SECONDS old. Returns True
+        when staged.
+        """
+        if not self.enabled:
+            return False
+        now_ts = self._clock() if now_ts is None else now_ts
+        with self._lock:
+            row = self._row(brain_name)
+            for name in _STAT_FIELDS:
+                if name in stats:
+                    row[name] = stats[name]
+            current = {name: row[name] for name in _STAT_FIELDS}
+            previous = self._published_stats.get(brain_name)
+            if previous is not None and not self._stats_changed(previous[0], current):
+                if now_ts - previous[1] < self.stats_interval_seconds:
+                    return False
+            self._published_stats[brain_name] = (current, now_ts)
+            self._dirty.add(brain_name)
+            self._stats["stats_published"] += 1
+        return True
+
+    def _stats_changed(self, previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+        """More timeouts/failures, or a latency moved by more than latency_change_ratio."""
+        for name in ("timeouts", "failures"):
+            if int(current.get(name) or 0) > int(previous.get(name) or 0):
+                return True
+        for name in ("avg_latency", "p90_latency"):
+            old, new = previous.get(name), current.get(name)
+            if (old is None) != (new is None):
+                return True
+            if old and abs(float(new) - float(old)) > float(old) * self.latency_change_ratio:
+                return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Reading (routing path: in-memory only)
+    # ------------------------------------------------------------------
+
+    def cooldown(self, brain_name: str, now_ts: Optional[float] = None) -> Optional[Tuple[float, str, str]]:
+        """
+        Latest active cooldown for `brain_name` set by another worker: (until, reason, worker_id).
+
+        This worker's own cooldowns are skipped; the router already holds them locally.
+        """
+        now_ts = self._clock() if now_ts is None else now_ts
+        best = None
+        with self._lock:
+            for row in self._remote:
+                until = row.get("cooldown_until")
+                if row["worker_id"] == self.worker_id:
+                    continue
+                if row["brain_name"] != brain_name or until is None or until <= now_ts:
+                    continue
+                if best is None or until > best[0]:
+                    best = (float(until), str(row.get("cooldown_reason") or "failure"), row["worker_id"])
+        return best
+
+    def cluster_latency(self, brain_name: str) -> Optional[float]:
+        """Call-weighted average latency for `brain_name` over every worker with samples."""
+        weighted = 0.0
+        calls = 0
+        with self._lock:
+            for row in self._remote:
+                if row["brain_name"] != brain_name or not row.get("calls") or row.get("avg_latency") is None:
+                    continue
+                weighted += float(row["avg_latency"]) * int(row["calls"])
+                calls += int(row["calls"])
+        return weighted / calls if calls else None
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def push(self, now_ts: Optional[float] = None) -> bool:
+        """Write this worker's dirty rows. Needs an app context for the database backend."""
+        now_ts = self._clock() if now_ts is None else now_ts
+        with self._lock:
+            rows = [dict(self._local[name]) for name in self._dirty]
+            self._dirty.clear()
+        if not rows:
+            return True
+        try:
+            if self.backend == "memory":
+                with _MEMORY_LOCK:
+                    for row in rows:
+                        _MEMORY_ROWS[(row["brain_name"], row["worker_id"])] = {**row, "updated_ts": now_ts}
+            else:
+                _upsert_health_rows(rows, now_ts)
+            return True
+        except Exception:
+            logger.warning("Shared brain health push failed; retrying on next sync", exc_info=True)
+            with self._lock:
+                self._dirty.update(row["brain_name"] for row in rows)
+                self._stats["sync_failures"] += 1
+            return False
+
+    def sync(self, now_ts: Optional[float] = None) -> bool:
+        """
+        Push this worker's dirty rows and refresh the merged view.
+
+        Every row is reloaded once per stats interval; in between only rows
+        with an active cooldown are read and overlaid on the last full view.
+        """
+        if not self.enabled:
+            return False
+        now_ts = self._clock() if now_ts is None else now_ts
+        if not self.push(now_ts):
+            return False
+        with self._lock:
+            full = self._last_full_reload is None or now_ts - self._last_full_reload >= self.stats_interval_seconds
+        try:
+            if self.backend == "memory":
+                with _MEMORY_LOCK:
+                    remote = [
+                        dict(row)
+                        for row in _MEMORY_ROWS.values()
+                        if row.get("updated_ts", 0.0) >= now_ts - self.stale_seconds
+                        and (full or (row.get("cooldown_until") or 0.0) > now_ts)
+                    ]
+            elif full:
+                remote = _load_health_rows(now_ts - self.stale_seconds)
+            else:
+                remote = _load_health_rows(now_ts - self.stale_seconds, cooldown_active_at=now_ts)
+        except Exception:
+            logger.warning("Shared brain health reload failed", exc_info=True)
+            with self._lock:
+                self._stats["sync_failures"] += 1
+            return False
+        with self._lock:
+            if full:
+                self._remote = remote
+                self._last_full_reload = now_ts
+                self._stats["full_reloads"] += 1
+            else:
+                merged = {(row["brain_name"], row["worker_id"]): row for row in self._remote}
+                for row in remote:
+                    key = (row["brain_name"], row["worker_id"])
+                    merged[key] = {
+                        **merged.get(key, row),
+                        "cooldown_until": row["cooldown_until"],
+                        "cooldown_reason": row["cooldown_reason"],
+                    }
+                self._remote = list(merged.values())
+            self._stats["syncs"] += 1
+        return True
+
+    def snapshot(self, now_ts: Optional[float] = None) -> Dict[str, Any]:
+        now_ts = self._clock() if now_ts is None else now_ts
+        with self._lock:
+            remote = [dict(row) for row in self._remote]
+            stats = dict(self._stats)
+        brains: Dict[str, Dict[str, Any]] = {}
+        for row in remote:
+            entry = brains.setdefault(row["brain_name"], {"workers": 0, "calls": 0, "timeouts": 0, "failures": 0})
+            entry["workers"] += 1
+            for name in ("calls", "timeouts", "failures"):
+                entry[name] += int(row.get(name) or 0)
+        for brain_name, entry in brains.items():
+            cooldown = self.cooldown(brain_name, now_ts)
+            latency = self.cluster_latency(brain_name)
+            entry["avg_latency"] = round(latency, 3) if latency is not None else None
+            entry["cooldown_remaining"] = round(cooldown[0] - now_ts, 1) if cooldown else 0.0
+            entry["cooldown_reason"] = cooldown[1] if cooldown else None
+        return {"backend": self.backend, "worker_id": self.worker_id, "brains": brains, **stats}
+
+
+def _upsert_health_rows(rows: List[Dict[str, Any]], now_ts: float) -> None:
+    from database import BrainHealthState, db
+
+    now_dt = _naive_utc(now_ts)
+    values = [
+        {
+            "brain_name": row["brain_name"][:40],
+            "worker_id": row["worker_id"][:120],
+            "cooldown_until": row.get("cooldown_until"),
+            "cooldown_reason": row.get("cooldown_reason"),
+            "avg_latency": row.get("avg_latency"),
+            "p90_latency": row.get("p90_latency"),
+            "calls": int(row.get("calls") or 0),
+            "timeouts": int(row.get("timeouts") or 0),
+            "failures": int(row.get("failures") or 0),
+            "updated_at": now_dt,
+        }
+        for row in rows
+    ]
+    table = BrainHealthState.__table__
+    bind = db.session.get_bind()
+    dialect_name = bind.dialect.name if bind is not None else ""
+    value_columns = ("cooldown_until", "cooldown_reason", *_STAT_FIELDS, "updated_at")
+
+    if dialect_name in {"sqlite", "postgresql"}:
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        try:
+            stmt = dialect_insert(table).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["brain_name", "worker_id"],
+                set_={name: stmt.excluded[name] for name in value_columns},
+            )
+            db.session.execute(stmt)
+            db.session.commit()
+            return
+        except Exception:
+            db.session.rollback()
+            raise
+
+    for item in values:
+        row = db.session.get(BrainHealthState, {"brain_name": item["brain_name"], "worker_id": item["worker_id"]})
+        if row is None:
+            db.session.add(BrainHealthState(**item))
+            continue
+        for name in value_columns:
+            setattr(row, name, item[name])
+    db.session.commit()
+
+
+def _load_health_rows(fresh_after_ts: float, cooldown_active_at: Optional[float] = None) -> List[Dict[str, Any]]:
+    from database import BrainHealthState
+
+    query = BrainHealthState.query.filter(BrainHealthState.updated_at >= _naive_utc(fresh_after_ts))
+    if cooldown_active_at is not None:
+        query = query.filter(BrainHealthState.cooldown_until > float(cooldown_active_at))
+    rows = query.all()
+    return [
+        {
+            "brain_name": row.brain_name,
+            "worker_id": row.worker_id,
+            "cooldown_until": row.cooldown_until,
+            "cooldown_reason": row.cooldown_reason,
+            "avg_latency": row.avg_latency,
+            "p90_latency": row.p90_latency,
+            "calls": row.calls,
+            "timeouts": row.timeouts,
+            "failures": row.failures,
+        }
+        for row in rows
+    ]
+
+
+_SHARED_HEALTH: Optional[SharedBrainHealth] = None
+_SHARED_HEALTH_LOCK = threading.Lock()
+
+
+def get_shared_brain_health() -> SharedBrainHealth:
+    global _SHARED_HEALTH
+    with _SHARED_HEALTH_LOCK:
+        if _SHARED_HEALTH is None:
+            _SHARED_HEALTH = SharedBrainHealth(
+                backend=str(getattr(config, "BRAIN_SHARED_HEALTH_BACKEND", "database")),
+                stale_seconds=float(getattr(config, "BRAIN_SHARED_HEALTH_STALE_SECONDS", 600)),
+                stats_interval_seconds=float(getattr(config, "BRAIN_SHARED_HEALTH_STATS_SECONDS", 30)),
+                latency_change_ratio=float(getattr(config, "BRAIN_SHARED_HEALTH_LATENCY_CHANGE_RATIO", 0.2)),
+            )
+        return _SHARED_HEALTH
+
+
+# ------------------------------------------------------------------
+# Sync thread
+# ------------------------------------------------------------------
+
+_SYNC_THREAD: Optional[threading.Thread] = None
+_SYNC_STOP = threading.Event()
+
+
+def start_brain_health_sync(app, before_sync: Optional[Callable[[], None]] = None) -> bool:
+    """
+    Sync the shared view every BRAIN_SHARED_HEALTH_SYNC_SECONDS (0 disables).
+
+    `before_sync` lets the router stage its latest latency stats first.
+    """
+    global _SYNC_THREAD
+
+    interval = float(getattr(config, "BRAIN_SHARED_HEALTH_SYNC_SECONDS", 2.0))
+    registry = get_shared_brain_health()
+    if interval <= 0 or not registry.enabled:
+        return False
+    if _SYNC_THREAD is not None and _SYNC_THREAD.is_alive():
+        return True
+
+    def _loop() -> None:
+        while not _SYNC_STOP.is_set():
+            registry.wake.wait(interval)
+            registry.wake.clear()
+            if _SYNC_STOP.is_set():
+                return
+            try:
+                if before_sync is not None:
+                    before_sync()
+                with app.app_context():
+                    registry.sync()
+            except Exception:
+                logger.warning("Shared brain health sync tick failed", exc_info=True)
+
+    _SYNC_STOP.clear()
+    _SYNC_THREAD = threading.Thread(target=_loop, name="brain-health-sync", daemon=True)
+    _SYNC_THREAD.start()
+    return True
@@ -3,14 +3,39 @@
 # Routes coaching requests to the configured AI brain
 #
 
-import asyncio
+import contextvars
 import os
 import random
 import re
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
-from typing import Dict, Any, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError, wait
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
 import config
+from async_runtime import call_with_timeout_budget, iterate_async, run_coroutine
+from brain_health import get_shared_brain_health
+from cue_cache import CueCache, build_cue_cache_key
+from latency_histogram import LatencyHistogram
+from prompt_cache import get_prompt_cache_stats
+from talk_streaming import sentences_from_tokens
+from usage_ledger import get_usage_ledger, record_usage
+
+
+@dataclass
+class RouteResult:
+    """Outcome of one routed call: the text plus how it was produced."""
+
+    text: str
+    provider: str = "unknown"
+    source: str = "unknown"
+    status: str = "unknown"
+    mode: Optional[str] = None
+    latency_ms: float = 0.0
+    attempts: List[Dict[str, Any]] = field(default_factory=list)
+    cache_hit: bool = False
+    meta: Dict[str, Any] = field(default_factory=dict)
 
 
 class BrainRouter:
@@ -194,16 +219,24 @@ class BrainRouter:
         self.claude_brain = None  # STEP 4: Keep Claude brain for patterns
         self.brain_pool = {}
         self.brain_stats = {}
+        # Latest outcome per brain, for observability/skip reasons only. The outcome a
+        # request acts on is kept per thread (see _call_outcome).
         self.brain_last_outcome = {}
+        # session_id -> deque(maxlen=BRAIN_RECENT_CUE_WINDOW); deque appends are atomic.
         self._recent_outputs_by_session = {}
+        # Route meta and per-call outcomes are request-scoped: each request runs its
+        # routing on its own thread, so concurrent requests never see each other's meta.
+        self._route_local = threading.local()
+        self.cue_cache = CueCache(
+            variants=getattr(config, "BRAIN_CUE_CACHE_VARIANTS", 3),
+            ttl_seconds=getattr(config, "BRAIN_CUE_CACHE_TTL_SECONDS", 1800),
+            max_keys=getattr(config, "BRAIN_CUE_CACHE_MAX_KEYS", 2000),
+        )
         self.brain_cooldowns = {}
-        self.last_route_meta = {
-            "provider": "uninitialized",
-            "source": "none",
-            "status": "uninitialized",
-            "mode": None,
-            "timestamp": None,
-        }
+        # Cooldowns and latency summaries published by other workers/instances.
+        self.shared_health = get_shared_brain_health()
+        # (brain_name, mode) -> LatencyHistogram; mode "all" aggregates every mode.
+        self.latency_histograms = {}
         self._talk_policy_rotation_state = {}
         strict_enabled = bool(getattr(config, "COACH_TALK_STRICT_SAFETY_ENABLED", True))
         rotate_enabled = bool(getattr(config, "COACH_TALK_POLICY_ROTATE_ENABLED", True))
@@ -211,7 +244,12 @@ class BrainRouter:
             f"🛡️ COACH_TALK_POLICY enabled={str(strict_enabled).lower()} "
             f"rotate={str(rotate_enabled).lower()}"
         )
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        # Sync provider calls run here; async ones run on the shared async runtime loop.
+        # Sized for hedged calls: a cancelled loser keeps its worker until the provider returns.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(getattr(config, "BRAIN_EXECUTOR_MAX_WORKERS", 16))),
+            thread_name_prefix="brain-call",
+        )
         self._initialize_brain()
 
         # STEP 4: Initialize Claude brain for hybrid mode if enabled
@@ -296,6 +334,75 @@ class BrainRouter:
             return "en"
         return "en"
 
+    @property
+    def last_route_meta(self) -> Dict[str, Any]:
+        meta = getattr(self._route_local, "meta", None)
+        if meta is None:
+            meta = {
+                "provider": "uninitialized",
+                "source": "none",
+                "status": "uninitialized",
+                "mode": None,
+                "timestamp": None,
+            }
+        return meta
+
+    @last_route_meta.setter
+    def last_route_meta(self, meta: Dict[str, Any]) -> None:
+        self._route_local.meta = meta
+
+    def _call_outcome(self, brain_name: str) -> Dict[str, Any]:
+        """Outcome of this thread's latest call to `brain_name`."""
+        outcomes = getattr(self._route_local, "outcomes", None) or {}
+        if brain_name in outcomes:
+            return dict(outcomes[brain_name])
+        return dict(self.brain_last_outcome.get(brain_name, {}))
+
+    def _set_call_outcome(self, brain_name: str, outcome: Dict[str, Any]) -> None:
+        self.brain_last_outcome[brain_name] = outcome
+        outcomes = getattr(self._route_local, "outcomes", None)
+        if outcomes is None:
+            outcomes = self._route_local.outcomes = {}
+        outcomes[brain_name] = outcome
+
+    def _routed(self, fn, *args, **kwargs) -> RouteResult:
+        """Run a routing entry point and package its text with this call's route meta."""
+        self._route_local.outcomes = {}
+        self.last_route_meta = {
+            "provider": "unknown",
+            "source": "unknown",
+            "status": "unknown",
+            "mode": None,
+            "timestamp": time.time(),
+        }
+        started = time.perf_counter()
+        text = fn(*args, **kwargs)
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        meta = self.get_last_route_meta()
+        return RouteResult(
+            text=text,
+            provider=str(meta.get("provider") or "unknown"),
+            source=str(meta.get("source") or "unknown"),
+            status=str(meta.get("status") or "unknown"),
+            mode=meta.get("mode"),
+            latency_ms=round(latency_ms, 1),
+            attempts=list(meta.get("attempted") or []),
+            cache_hit=str(meta.get("source") or "") == "ai_cache",
+            meta=meta,
+        )
+
+    def route_coaching_response(self, *args, **kwargs) -> RouteResult:
+        """`get_coaching_response` returning a RouteResult."""
+        return self._routed(self.get_coaching_response, *args, **kwargs)
+
+    def route_question_response(self, *args, **kwargs) -> RouteResult:
+        """`get_question_response` returning a RouteResult."""
+        return self._routed(self.get_question_response, *args, **kwargs)
+
+    def route_zone_event_rewrite(self, *args, **kwargs) -> RouteResult:
+        """`rewrite_zone_event_text` returning a RouteResult."""
+        return self._routed(self.rewrite_zone_event_text, *args, **kwargs)
+
     def _set_last_route_meta(self, **kwargs) -> None:
         meta = {
             "provider": "unknown",
@@ -317,7 +424,7 @@ class BrainRouter:
 
         Keeps Q&A snappy while allowing a bit more thinking time.
         """
-        base_timeout = self._get_brain_timeout(brain_name, "chat")
+        base_timeout = self._get_brain_timeout(brain_name, "chat", latency_mode="question_qa")
         default_cap = float(getattr(config, "COACH_QA_TIMEOUT_SECONDS", 5.0))
         cap = default_cap
         if timeout_cap_seconds is not None:
@@ -693,17 +800,42 @@ class BrainRouter:
             context=context,
             user_name=user_name,
         )
-        response = asyncio.run(
+        response = run_coroutine(
             brain.chat(
                 messages=[{"role": "user", "content": question}],
                 system_prompt=system_prompt,
                 temperature=0.25,
                 max_tokens=self._qa_max_tokens(),
                 timeout=max(0.8, float(timeout) - 0.2),
-            )
+            ),
+            timeout=timeout,
         )
         return self._trim_to_sentence_limit(response, max_sentences=self._qa_max_sentences())
 
+    def _question_candidate_brains(self, restrict_brains: Optional[list[str]] = None) -> list[str]:
+        """Grok first, then other AI brains (or only `restrict_brains`); never config."""
+        if restrict_brains:
+            candidate_brains = []
+            seen = set()
+            for brain_name in restrict_brains:
+                normalized_brain = str(brain_name or "").strip().lower()
+                if not normalized_brain or normalized_brain == "config" or normalized_brain in seen:
+                    continue
+                seen.add(normalized_brain)
+                candidate_brains.append(normalized_brain)
+            return candidate_brains or ["grok"]
+
+        candidate_brains = ["grok"]
+        if self.use_priority_routing and self.priority_brains:
+            for brain_name in self.priority_brains:
+                if brain_name in {"grok", "config"}:
+                    continue
+                if brain_name not in candidate_brains:
+                    candidate_brains.append(brain_name)
+        elif self.brain_type not in {"priority", "config", "grok"}:
+            candidate_brains.append(self.brain_type)
+        return candidate_brains
+
     def get_question_response(
         self,
         question: str,
@@ -743,30 +875,7 @@ class BrainRouter:
             return policy_reply.strip()
 
         attempted = []
-        if restrict_brains:
-            candidate_brains = []
-            seen = set()
-            for brain_name in restrict_brains:
-                normalized_brain = str(brain_name or "").strip().lower()
-                if not normalized_brain or normalized_brain == "config" or normalized_brain in seen:
-                    continue
-                seen.add(normalized_brain)
-                candidate_brains.append(normalized_brain)
-            if not candidate_brains:
-                candidate_brains = ["grok"]
-        else:
-            candidate_brains = ["grok"]
-
-            if self.use_priority_routing and self.priority_brains:
-                for brain_name in self.priority_brains:
-                    if brain_name in {"grok", "config"}:
-                        continue
-                    if brain_name not in candidate_brains:
-                        candidate_brains.append(brain_name)
-            elif self.brain_type not in {"priority", "config", "grok"}:
-                candidate_brains.append(self.brain_type)
-
-        for brain_name in candidate_brains:
+        for brain_name in self._question_candidate_brains(restrict_brains):
             if not self._is_brain_available(brain_name):
                 reason = self._get_skip_reason(brain_name)
                 attempted.append({"brain": brain_name, "status": "skipped", "reason": reason})
@@ -787,7 +896,7 @@ class BrainRouter:
                 user_name=user_name,
                 timeout=timeout,
             )
-            result = self._call_brain_with_timeout(brain_name, fn, timeout)
+            result = self._call_brain_with_timeout(brain_name, fn, timeout, mode="question_qa")
             result = self._trim_to_sentence_limit(result, max_sentences=self._qa_max_sentences())
 
             if result:
@@ -802,7 +911,7 @@ class BrainRouter:
                 )
                 return result
 
-            outcome = dict(self.brain_last_outcome.get(brain_name, {}))
+            outcome = self._call_outcome(brain_name)
             attempted.append(
                 {
                     "brain": brain_name,
@@ -821,6 +930,209 @@ class BrainRouter:
         )
         return fallback
 
+    def _stream_answer_with_brain(
+        self,
+        brain: Any,
+        *,
+        question: str,
+        language: str,
+        persona: Optional[str],
+        context: str,
+        user_name: Optional[str],
+        timeout: float,
+        deadline: Optional[float] = None,
+    ):
+        system_prompt = self._build_qa_system_prompt(
+            language=language,
+            persona=persona,
+            context=context,
+            user_name=user_name,
+        )
+        tokens = iterate_async(
+            brain.stream_chat(
+                messages=[{"role": "user", "content": question}],
+                system_prompt=system_prompt,
+                temperature=0.25,
+                max_tokens=self._qa_max_tokens(),
+                timeout=max(0.8, float(timeout) - 0.2),
+            ),
+            item_timeout=timeout,
+            deadline=deadline,
+        )
+        return sentences_from_tokens(
+            tokens,
+            min_chars=int(getattr(config, "TALK_STREAM_MIN_SENTENCE_CHARS", 12)),
+        )
+
+    def _split_sentences(self, text: str) -> list[str]:
+        trimmed = self._trim_to_sentence_limit(text, max_sentences=self._qa_max_sentences())
+        return [part.strip() for part in re.split(r"(?<=[.!?])\s+", trimmed) if part.strip()]
+
+    def stream_question_response(
+        self,
+        question: str,
+        *,
+        language: str = "en",
+        persona: Optional[str] = None,
+        context: str = "chat",
+        user_name: Optional[str] = None,
+        timeout_cap_seconds: Optional[float] = None,
+        restrict_brains: Optional[list[str]] = None,
+    ):
+        """
+        Sentence-by-sentence variant of `get_question_response`.
+
+        Brains that support streaming are read token by token and each sentence
+        is yielded as soon as it ends; other brains answer in one call and their
+        sentences are yielded together. Route meta is set on this thread before
+        the first sentence is yielded. A brain that fails before its first
+        sentence falls through to the next candidate, like the blocking path.
+
+        `timeout_cap_seconds` bounds the whole answer, not each token: candidates
+        share one deadline, a stream still running at the deadline is cut after
+        the sentences already sent, and once it passes only the config fallback
+        is left.
+        """
+        prompt = (question or "").strip()
+        lang = self._normalize_language(language)
+        if not prompt:
+            self._set_last_route_meta(
+                provider="config",
+                source="config_fallback",
+                status="empty_question_fallback",
+                mode="question_qa",
+            )
+            yield from self._split_sentences(self._qa_fallback(lang))
+            return
+
+        policy_reply, policy_status = self._qa_policy_response(prompt, lang, context=context)
+        if policy_reply:
+            self._set_last_route_meta(
+                provider="policy",
+                source="domain_guard",
+                status=policy_status or "policy_refusal",
+                mode="question_qa",
+            )
+            yield from self._split_sentences(policy_reply)
+            return
+
+        max_sentences = self._qa_max_sentences()
+        attempted = []
+        deadline = None
+        if timeout_cap_seconds is not None:
+            try:
+                deadline = time.monotonic() + max(0.8, float(timeout_cap_seconds))
+            except (TypeError, ValueError):
+                deadline = None
+        for brain_name in self._question_candidate_brains(restrict_brains):
+            if deadline is not None and time.monotonic() >= deadline:
+                attempted.append({"brain": brain_name, "status": "skipped", "reason": "deadline"})
+                continue
+            if not self._is_brain_available(brain_name):
+                attempted.append({"brain": brain_name, "status": "skipped", "reason": self._get_skip_reason(brain_name)})
+                continue
+
+            brain = self._get_brain_instance(brain_name)
+            if brain is None:
+                attempted.append({"brain": brain_name, "status": "unavailable"})
+                continue
+
+            timeout = self._qa_timeout_for(brain_name, timeout_cap_seconds=timeout_cap_seconds)
+            if deadline is not None:
+                timeout = max(0.1, min(timeout, deadline - time.monotonic()))
+            supports_streaming = hasattr(brain, "stream_chat") and bool(
+                getattr(brain, "supports_streaming", lambda: False)()
+            )
+            if not supports_streaming:
+                fn = lambda brain=brain, timeout=timeout: self._answer_question_with_brain(
+                    brain,
+                    question=prompt,
+                    language=lang,
+                    persona=persona,
+                    context=context,
+                    user_name=user_name,
+                    timeout=timeout,
+                )
+                sentences = self._split_sentences(self._call_brain_with_timeout(brain_name, fn, timeout, mode="question_qa"))
+                if sentences:
+                    self._set_last_route_meta(
+                        provider=brain_name,
+                        source="ai_qna",
+                        status="success",
+                        mode="question_qa",
+                        timeout=timeout,
+                        attempted=attempted + [{"brain": brain_name, "status": "success"}],
+                    )
+                    yield from sentences
+                    return
+                outcome = self._call_outcome(brain_name)
+                attempted.append({"brain": brain_name, "status": outcome.get("status", "empty_response"), "timeout": timeout})
+                continue
+
+            start = time.time()
+            emitted = []
+            sentences = self._stream_answer_with_brain(
+                brain,
+                question=prompt,
+                language=lang,
+                persona=persona,
+                context=context,
+                user_name=user_name,
+                timeout=timeout,
+                deadline=deadline,
+            )
+            try:
+                for sentence in sentences:
+                    if "[error" in sentence.lower():
+                        raise RuntimeError(sentence)
+                    if not emitted:
+                        self._set_last_route_meta(
+                            provider=brain_name,
+                            source="ai_qna",
+                            status="success",
+                            mode="question_qa",
+                            timeout=timeout,
+                            streamed=True,
+                            first_sentence_ms=int(round((time.time() - start) * 1000)),
+                            attempted=attempted + [{"brain": brain_name, "status": "success"}],
+                        )
+                    emitted.append(sentence)
+                    yield sentence
+                    if len(emitted) >= max_sentences:
+                        break
+            except TimeoutError:
+                if emitted and deadline is not None and time.monotonic() >= deadline:
+                    # Answer budget spent mid-answer: keep what was sent, the brain did not stall.
+                    self._record_call_success(brain_name, " ".join(emitted), time.time() - start, timeout, mode="question_qa")
+                    return
+                self._record_call_timeout(brain_name, time.time() - start, timeout, cancelled=True, mode="question_qa")
+                if emitted:
+                    return
+                attempted.append({"brain": brain_name, "status": "timeout", "timeout": timeout})
+                continue
+            except Exception as e:
+                self._record_call_failure(brain_name, e, time.time() - start, timeout, mode="question_qa")
+                if emitted:
+                    return
+                attempted.append({"brain": brain_name, "status": self._call_outcome(brain_name).get("status", "failure"), "timeout": timeout})
+                continue
+            finally:
+                sentences.close()
+
+            self._record_call_success(brain_name, " ".join(emitted), time.time() - start, timeout, mode="question_qa")
+            if emitted:
+                return
+            attempted.append({"brain": brain_name, "status": "empty", "timeout": timeout})
+
+        self._set_last_route_meta(
+            provider="config",
+            source="config_fallback",
+            status="all_question_brains_failed_or_skipped",
+            mode="question_qa",
+            attempted=attempted,
+        )
+        yield from self._split_sentences(self._qa_fallback(lang))
+
     @staticmethod
     def _normalize_repeat_key(text: str) -> str:
         """Normalize text for repetition checks."""
@@ -843,11 +1155,49 @@ class BrainRouter:
         cleaned = (text or "").strip()
         if not cleaned:
             return
-        bucket = self._recent_outputs_by_session.setdefault(session_id, [])
-        bucket.append(cleaned)
         window = self._recent_output_window()
-        if len(bucket) > window:
-            del bucket[:-window]
+        bucket = self._recent_outputs_by_session.get(session_id)
+        if bucket is None:
+            # setdefault keeps one deque per session when two requests race here.
+            bucket = self._recent_outputs_by_session.setdefault(session_id, deque(maxlen=window))
+        elif bucket.maxlen != window:
+            bucket = self._recent_outputs_by_session[session_id] = deque(bucket, maxlen=window)
+        bucket.append(cleaned)
+
+    def _cue_cache_key(
+        self,
+        breath_data: Dict[str, Any],
+        phase: str,
+        language: str,
+        persona: Optional[str],
+    ) -> Optional[tuple]:
+        if not bool(getattr(config, "BRAIN_CUE_CACHE_ENABLED", True)):
+            return None
+        # Config-only routing is already free; only cache provider-written cues.
+        if not (self.use_priority_routing and self.priority_brains) and self.brain is None:
+            return None
+        return build_cue_cache_key(breath_data, phase, language, persona)
+
+    def _get_cached_cue(self, cache_key: Optional[tuple], breath_data: Dict[str, Any]) -> Optional[str]:
+        if cache_key is None:
+            return None
+        session_id = breath_data.get("session_id")
+        recent = self._get_recent_outputs(session_id) + list(breath_data.get("recent_coach_cues") or [])
+        cached = self.cue_cache.get(cache_key, recent)
+        if cached is None:
+            return None
+        self._record_recent_output(session_id, cached)
+        record_usage("cue_cache", mode="realtime_coach", cache_hit=True)
+        self._set_last_route_meta(
+            provider="cue_cache",
+            source="ai_cache",
+            status="success",
+            mode="realtime_coach",
+        )
+        return cached
+
+    def get_cue_cache_stats(self) -> Dict[str, Any]:
+        return self.cue_cache.stats()
 
     def _rewrite_if_recent_repeat(
         self,
@@ -933,32 +1283,51 @@ class BrainRouter:
             self.brain_pool[brain_name] = None
             return None
 
-    def _set_cooldown(self, brain_name: str, seconds: Optional[float] = None):
+    def _set_cooldown(self, brain_name: str, seconds: Optional[float] = None, reason: Optional[str] = None):
         cooldown = seconds if seconds is not None else getattr(config, "BRAIN_COOLDOWN_SECONDS", 60)
         self.brain_cooldowns[brain_name] = time.time() + cooldown
+        # Runtime cooldowns are shared so other workers skip the brain too; init
+        # failures (missing key, import error) stay local.
+        if reason:
+            self.shared_health.publish_cooldown(brain_name, self.brain_cooldowns[brain_name], reason)
+
+    def _shared_cooldown(self, brain_name: str):
+        if brain_name == "config":
+            return None
+        return self.shared_health.cooldown(brain_name)
+
+    def _observed_avg_latency(self, brain_name: str) -> Optional[float]:
+        """Local EMA latency; falls back to the cluster average before this worker has samples."""
+        local = self.brain_stats.get(brain_name, {}).get("avg_latency")
+        if local:
+            return local
+        return self.shared_health.cluster_latency(brain_name)
 
     def _is_brain_available(self, brain_name: str) -> bool:
         self._prune_expired_cooldowns()
         cooldown_until = self.brain_cooldowns.get(brain_name)
         if cooldown_until and time.time() < cooldown_until:
             return False
+        if self._shared_cooldown(brain_name):
+            return False
 
         usage = getattr(config, "BRAIN_USAGE", {}).get(brain_name, 0.0)
         usage_limit = getattr(config, "USAGE_LIMIT", 0.9)
         if usage >= usage_limit:
             return False
+        if brain_name != "config" and get_usage_ledger().budget_exhausted():
+            return False
 
-        stats = self.brain_stats.get(brain_name, {})
-        avg_latency = stats.get("avg_latency")
+        avg_latency = self._observed_avg_latency(brain_name)
         slow_threshold = self._get_slow_threshold(brain_name)
         if slow_threshold and avg_latency and avg_latency > slow_threshold:
             return False
 
         return True
 
-    def _get_brain_timeout(self, brain_name: str, mode: str) -> float:
+    def _configured_brain_timeout(self, brain_name: str, mode: str) -> float:
         """
-        Resolve timeout for a given brain/mode.
+        Resolve the configured timeout for a given brain/mode.
 
         Priority:
         1) BRAIN_MODE_TIMEOUTS[mode][brain_name]
@@ -981,13 +1350,57 @@ class BrainRouter:
 
         return float(getattr(config, "BRAIN_TIMEOUT", 1.2))
 
-    def _get_slow_threshold(self, brain_name: str) -> Optional[float]:
-        """Resolve slow-threshold with optional per-brain override."""
+    def _adaptive_latency_bound(self, brain_name: str, mode: str, configured: float, percentile: float) -> float:
+        """
+        Derive a latency budget from the observed percentile for brain/mode.
+
+        observed * BRAIN_ADAPTIVE_HEADROOM, clamped to
+        [BRAIN_ADAPTIVE_MIN_SECONDS, configured * BRAIN_ADAPTIVE_MAX_FACTOR].
+        Returns `configured` until BRAIN_ADAPTIVE_MIN_SAMPLES calls are in the window.
+        """
+        if not bool(getattr(config, "BRAIN_ADAPTIVE_TIMEOUTS_ENABLED", True)):
+            return configured
+        histogram = self.latency_histograms.get((brain_name, mode))
+        if histogram is None or histogram.count() < max(1, int(getattr(config, "BRAIN_ADAPTIVE_MIN_SAMPLES", 30))):
+            return configured
+        observed = histogram.percentile(percentile)
+        if observed is None:
+            return configured
+        ceiling = configured * max(0.1, float(getattr(config, "BRAIN_ADAPTIVE_MAX_FACTOR", 1.0)))
+        floor = min(ceiling, float(getattr(config, "BRAIN_ADAPTIVE_MIN_SECONDS", 0.8)))
+        budget = observed * max(1.0, float(getattr(config, "BRAIN_ADAPTIVE_HEADROOM", 1.3)))
+        return round(max(floor, min(ceiling, budget)), 3)
+
+    def _get_brain_timeout(self, brain_name: str, mode: str, latency_mode: Optional[str] = None) -> float:
+        """
+        Timeout for a brain/mode: the configured value, tightened (or widened up to
+        BRAIN_ADAPTIVE_MAX_FACTOR) from the observed BRAIN_ADAPTIVE_TIMEOUT_PERCENTILE
+        of `latency_mode` (defaults to `mode`).
+        """
+        configured = self._configured_brain_timeout(brain_name, mode)
+        return self._adaptive_latency_bound(
+            brain_name,
+            latency_mode or mode,
+            configured,
+            float(getattr(config, "BRAIN_ADAPTIVE_TIMEOUT_PERCENTILE", 0.99)),
+        )
+
+    def _get_slow_threshold(self, brain_name: str, mode: str = "all") -> Optional[float]:
+        """Resolve slow-threshold with optional per-brain override, adapted from observed latency."""
         per_brain_thresholds = getattr(config, "BRAIN_SLOW_THRESHOLDS", {}) or {}
         if isinstance(per_brain_thresholds, dict) and brain_name in per_brain_thresholds:
-            return float(per_brain_thresholds[brain_name])
-        threshold = getattr(config, "BRAIN_SLOW_THRESHOLD", None)
-        return float(threshold) if threshold is not None else None
+            configured = float(per_brain_thresholds[brain_name])
+        else:
+            threshold = getattr(config, "BRAIN_SLOW_THRESHOLD", None)
+            if threshold is None:
+                return None
+            configured = float(threshold)
+        return self._adaptive_latency_bound(
+            brain_name,
+            mode,
+            configured,
+            float(getattr(config, "BRAIN_ADAPTIVE_SLOW_PERCENTILE", 0.9)),
+        )
 
     def _get_skip_reason(self, brain_name: str) -> str:
         """Return a human-readable reason why this brain is unavailable."""
@@ -1002,32 +1415,73 @@ class BrainRouter:
             if outcome.get("status") == "quota_limited":
                 return f"quota_cooldown ({remaining:.0f}s remaining)"
             return f"cooldown ({remaining:.0f}s remaining)"
+        shared = self._shared_cooldown(brain_name)
+        if shared:
+            return f"shared_cooldown ({shared[1]}, {shared[0] - time.time():.0f}s remaining)"
 
         usage = getattr(config, "BRAIN_USAGE", {}).get(brain_name, 0.0)
         usage_limit = getattr(config, "USAGE_LIMIT", 0.9)
         if usage >= usage_limit:
             return f"usage_limit ({usage:.0%} >= {usage_limit:.0%})"
+        if brain_name != "config" and get_usage_ledger().budget_exhausted():
+            return "tier_budget_exhausted"
 
-        stats = self.brain_stats.get(brain_name, {})
-        avg_latency = stats.get("avg_latency")
+        avg_latency = self._observed_avg_latency(brain_name)
         slow_threshold = self._get_slow_threshold(brain_name)
         if slow_threshold and avg_latency and avg_latency > slow_threshold:
             return f"too_slow (avg {avg_latency:.3f}s > {slow_threshold}s)"
 
         return "unknown"
 
-    def _record_latency(self, brain_name: str, latency: float):
+    def _record_latency(self, brain_name: str, latency: float, mode: Optional[str] = None):
         stats = self.brain_stats.setdefault(brain_name, {"calls": 0, "avg_latency": 0.0, "timeouts": 0, "failures": 0, "last_used": None})
         stats["calls"] += 1
         stats["last_used"] = time.time()
         # Exponential moving average — decays old values so a single timeout doesn't permanently disable a brain
         decay = getattr(config, "BRAIN_LATENCY_DECAY_FACTOR", 0.9)
         stats["avg_latency"] = (stats["avg_latency"] * decay) + (latency * (1 - decay))
+        self._record_latency_sample(brain_name, latency, mode)
+
+    def _record_latency_sample(self, brain_name: str, latency: float, mode: Optional[str] = None) -> None:
+        for histogram_mode in ("all", mode) if mode and mode != "all" else ("all",):
+            self._latency_histogram(brain_name, histogram_mode).record(latency)
+
+    def _latency_histogram(self, brain_name: str, mode: str) -> LatencyHistogram:
+        key = (brain_name, mode)
+        histogram = self.latency_histograms.get(key)
+        if histogram is None:
+            histogram = self.latency_histograms.setdefault(
+                key,
+                LatencyHistogram(window_seconds=float(getattr(config, "BRAIN_LATENCY_HISTOGRAM_WINDOW_SECONDS", 900))),
+            )
+        return histogram
+
+    def _latency_percentile(self, brain_name: str, percentile: float, mode: str = "all") -> Optional[float]:
+        histogram = self.latency_histograms.get((brain_name, mode))
+        return histogram.percentile(percentile) if histogram is not None else None
+
+    def _hedge_delay(self, brain_name: str, timeout: float, mode: str = "all") -> Optional[float]:
+        """Seconds to wait on `brain_name` before hedging; None when hedging does not apply."""
+        if not bool(getattr(config, "BRAIN_HEDGING_ENABLED", True)):
+            return None
+        histogram = self.latency_histograms.get((brain_name, mode))
+        if histogram is None or histogram.count() < max(1, int(getattr(config, "BRAIN_HEDGE_MIN_SAMPLES", 20))):
+            return None
+        observed = histogram.percentile(float(getattr(config, "BRAIN_HEDGE_PERCENTILE", 0.9)))
+        if observed is None:
+            return None
+        delay = max(float(getattr(config, "BRAIN_HEDGE_MIN_DELAY_SECONDS", 0.3)), observed)
+        return delay if delay < timeout else None
+
+    def _bump_brain_stat(self, brain_name: str, key: str) -> None:
+        stats = self.brain_stats.setdefault(brain_name, {"calls": 0, "avg_latency": 0.0, "timeouts": 0, "failures": 0})
+        stats[key] = stats.get(key, 0) + 1
 
     def _record_failure(self, brain_name: str, cooldown_seconds: Optional[float] = None):
         stats = self.brain_stats.setdefault(brain_name, {"calls": 0, "avg_latency": 0.0, "timeouts": 0, "failures": 0})
         stats["failures"] += 1
-        self._set_cooldown(brain_name, seconds=cooldown_seconds)
+        reason = "quota_limited" if cooldown_seconds is not None else "failure"
+        self._set_cooldown(brain_name, seconds=cooldown_seconds, reason=reason)
 
     def _get_failure_cooldown_seconds(self, brain_name: str, error: Exception) -> Optional[float]:
         """
@@ -1070,59 +1524,215 @@ class BrainRouter:
     def _record_timeout(self, brain_name: str):
         stats = self.brain_stats.setdefault(brain_name, {"calls": 0, "avg_latency": 0.0, "timeouts": 0, "failures": 0})
         stats["timeouts"] += 1
-        self._set_cooldown(brain_name, seconds=getattr(config, "BRAIN_TIMEOUT_COOLDOWN_SECONDS", 30))
+        self._set_cooldown(brain_name, seconds=getattr(config, "BRAIN_TIMEOUT_COOLDOWN_SECONDS", 30), reason="timeout")
 
-    def _call_brain_with_timeout(self, brain_name: str, fn, timeout: float):
-        start = time.time()
-        future = self._executor.submit(fn)
-        try:
-            result = future.result(timeout=timeout)
-            latency = time.time() - start
-            self._record_latency(brain_name, latency)
-            self.brain_last_outcome[brain_name] = {
+    def _record_call_success(self, brain_name: str, result, latency: float, timeout: float, mode: Optional[str] = None) -> None:
+        self._record_latency(brain_name, latency, mode)
+        self._set_call_outcome(
+            brain_name,
+            {
                 "status": "success" if result else "empty",
                 "latency": latency,
                 "timeout": timeout,
-            }
-            success = bool(result)
-            print(f"[BRAIN] {brain_name} | latency={latency:.3f}s | success={success}")
-            return result
-        except TimeoutError:
-            latency = time.time() - start
-            cancelled = future.cancel()  # Best-effort; returns False if already running
-            self._record_timeout(brain_name)
-            self.brain_last_outcome[brain_name] = {
+            },
+        )
+        print(f"[BRAIN] {brain_name} | latency={latency:.3f}s | success={bool(result)}")
+
+    def _record_call_timeout(
+        self,
+        brain_name: str,
+        latency: float,
+        timeout: float,
+        cancelled: bool,
+        mode: Optional[str] = None,
+    ) -> None:
+        self._record_timeout(brain_name)
+        # The real latency is at least the timeout; without this sample the adaptive
+        # budget only ever sees the fast calls and can never widen again.
+        self._record_latency_sample(brain_name, max(latency, timeout), mode)
+        self._set_call_outcome(
+            brain_name,
+            {
                 "status": "timeout",
                 "latency": latency,
                 "timeout": timeout,
                 "cancelled": cancelled,
-            }
-            print(f"[BRAIN] {brain_name} | TIMEOUT after {latency:.3f}s | cancelled={cancelled}")
-            return None
-        except Exception as e:
-            latency = time.time() - start
-            failure_cooldown = self._get_failure_cooldown_seconds(brain_name, e)
-            self._record_failure(brain_name, cooldown_seconds=failure_cooldown)
-            failure_status = "quota_limited" if failure_cooldown is not None else "failure"
-            self.brain_last_outcome[brain_name] = {
+            },
+        )
+        print(f"[BRAIN] {brain_name} | TIMEOUT after {latency:.3f}s | cancelled={cancelled}")
+
+    def _record_call_failure(
+        self,
+        brain_name: str,
+        error: Exception,
+        latency: float,
+        timeout: float,
+        mode: Optional[str] = None,
+    ) -> None:
+        if isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower():
+            # Provider HTTP timeout fired just before ours: same budget, same outcome.
+            self._record_call_timeout(brain_name, latency, timeout, cancelled=False, mode=mode)
+            return
+        failure_cooldown = self._get_failure_cooldown_seconds(brain_name, error)
+        self._record_failure(brain_name, cooldown_seconds=failure_cooldown)
+        failure_status = "quota_limited" if failure_cooldown is not None else "failure"
+        self._set_call_outcome(
+            brain_name,
+            {
                 "status": failure_status,
                 "latency": latency,
                 "timeout": timeout,
-                "error": f"{type(e).__name__}: {e}",
+                "error": f"{type(error).__name__}: {error}",
                 "cooldown_seconds": failure_cooldown,
-            }
-            print(f"[BRAIN] {brain_name} | FAILURE after {latency:.3f}s | {type(e).__name__}: {e}")
+            },
+        )
+        print(f"[BRAIN] {brain_name} | FAILURE after {latency:.3f}s | {type(error).__name__}: {error}")
+
+    def _call_brain_with_timeout(self, brain_name: str, fn, timeout: float, mode: Optional[str] = None):
+        start = time.time()
+        # Workers inherit the request's context (usage ledger scope); the budget
+        # lets provider clients size their HTTP timeout to this call.
+        future = self._executor.submit(contextvars.copy_context().run, call_with_timeout_budget, fn, timeout)
+        try:
+            result = future.result(timeout=timeout)
+            self._record_call_success(brain_name, result, time.time() - start, timeout, mode)
+            return result
+        except TimeoutError:
+            cancelled = future.cancel()  # Best-effort; returns False if already running
+            self._record_call_timeout(brain_name, time.time() - start, timeout, cancelled, mode)
+            return None
+        except Exception as e:
+            self._record_call_failure(brain_name, e, time.time() - start, timeout, mode)
             return None
 
-    def _get_priority_response(
+    def _call_brains_hedged(
         self,
-        breath_data: Dict[str, Any],
-        phase: str,
-        mode: str,
-        language: str,
-        persona: Optional[str]
-    ) -> str:
-        attempted = []
+        primary,
+        backups,
+        attempted: list,
+        mode: str = "all",
+        max_in_flight: Optional[int] = None,
+    ):
+        """
+        Run `primary` and hedge onto `backups` for tail-latency control.
+
+        `primary` is (brain_name, fn, timeout); `backups` yields more of those, or
+        ("config", None, None) to mark the end of the AI brains. A backup starts
+        when a running call passes its hedge delay (observed latency percentile)
+        or fails outright. The first truthy answer wins and the rest are
+        cancelled; losers keep feeding latency samples if they finish later.
+
+        Returns (brain_name, result, timeout, config_reached); brain_name is None
+        when no brain produced an answer.
+        """
+        limit = max(1, int(max_in_flight or getattr(config, "BRAIN_HEDGE_MAX_IN_FLIGHT", 2)))
+        in_flight = {}
+        state = {"config_reached": False, "exhausted": False}
+
+        def _launch(candidate, is_hedge: bool) -> None:
+            brain_name, fn, timeout = candidate
+            start = time.time()
+            future = self._executor.submit(contextvars.copy_context().run, call_with_timeout_budget, fn, timeout)
+            delay = self._hedge_delay(brain_name, timeout, mode)
+            in_flight[future] = {
+                "brain": brain_name,
+                "start": start,
+                "timeout": timeout,
+                "hedge_at": start + delay if delay is not None else None,
+                "is_hedge": is_hedge,
+            }
+            if is_hedge:
+                self._bump_brain_stat(brain_name, "hedges")
+                print(f"[BRAIN] {brain_name} | HEDGE launched")
+
+        def _next_backup():
+            if state["exhausted"]:
+                return None
+            for candidate in backups:
+                if candidate[0] == "config":
+                    state["config_reached"] = True
+                    break
+                return candidate
+            state["exhausted"] = True
+            return None
+
+        def _abandon(future, info, status: str) -> None:
+            future.cancel()
+            attempted.append({"brain": info["brain"], "status": status, "timeout": info["timeout"], "hedge": info["is_hedge"]})
+
+            def _late_latency(done_future, brain_name=info["brain"], start=info["start"]):
+                if not done_future.cancelled() and done_future.exception() is None:
+                    self._record_latency(brain_name, time.time() - start, mode)
+
+            future.add_done_callback(_late_latency)
+
+        _launch(primary, is_hedge=False)
+        while in_flight:
+            now = time.time()
+            checkpoints = []
+            for info in in_flight.values():
+                checkpoints.append(info["start"] + info["timeout"])
+                if info["hedge_at"] is not None:
+                    checkpoints.append(info["hedge_at"])
+            done, _ = wait(list(in_flight), timeout=max(0.0, min(checkpoints) - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                info = in_flight.pop(future)
+                brain_name, timeout = info["brain"], info["timeout"]
+                latency = time.time() - info["start"]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self._record_call_failure(brain_name, e, latency, timeout, mode)
+                    result = None
+                else:
+                    self._record_call_success(brain_name, result, latency, timeout, mode)
+
+                if result:
+                    if info["is_hedge"]:
+                        self._bump_brain_stat(brain_name, "hedge_wins")
+                    for other_future, other_info in list(in_flight.items()):
+                        in_flight.pop(other_future)
+                        _abandon(other_future, other_info, "hedge_lost")
+                    attempted.append({"brain": brain_name, "status": "success", "timeout": timeout, "hedge": info["is_hedge"]})
+                    return brain_name, result, timeout, state["config_reached"]
+
+                outcome = self._call_outcome(brain_name)
+                attempted.append({"brain": brain_name, "status": outcome.get("status", "failed"), "timeout": timeout, "hedge": info["is_hedge"]})
+                replacement = _next_backup()
+                if replacement is not None:
+                    _launch(replacement, is_hedge=bool(in_flight))
+
+            now = time.time()
+            for future, info in list(in_flight.items()):
+                if future.done():
+                    continue
+                if now >= info["start"] + info["timeout"]:
+                    in_flight.pop(future)
+                    cancelled = future.cancel()
+                    self._record_call_timeout(info["brain"], now - info["start"], info["timeout"], cancelled, mode)
+                    attempted.append({"brain": info["brain"], "status": "timeout", "timeout": info["timeout"], "hedge": info["is_hedge"]})
+                    replacement = _next_backup()
+                    if replacement is not None:
+                        _launch(replacement, is_hedge=bool(in_flight))
+                elif info["hedge_at"] is not None and now >= info["hedge_at"]:
+                    info["hedge_at"] = None
+                    if len(in_flight) >= limit:
+                        continue
+                    backup = _next_backup()
+                    if backup is not None:
+                        self._bump_brain_stat(info["brain"], "hedge_triggers")
+                        _launch(backup, is_hedge=True)
+
+        return None, None, None, state["config_reached"]
+
+    def _priority_candidates(self, breath_data: Dict[str, Any], phase: str, mode: str, attempted: list):
+        """
+        Yield (brain_name, fn, timeout) for each usable AI brain in priority order.
+
+        Stops with ("config", None, None) at the first "config" entry. Skipped and
+        unavailable brains are recorded in `attempted` as the iterator advances.
+        """
         for brain_name in self.priority_brains:
             if not self._is_brain_available(brain_name):
                 reason = self._get_skip_reason(brain_name)
@@ -1131,14 +1741,8 @@ class BrainRouter:
                 continue
 
             if brain_name == "config":
-                self._set_last_route_meta(
-                    provider="config",
-                    source="config",
-                    status="config_selected",
-                    mode=mode,
-                    attempted=attempted + [{"brain": "config", "status": "selected"}],
-                )
-                return self._get_config_response(breath_data, phase, language=language, persona=persona)
+                yield "config", None, None
+                return
 
             brain = self._get_brain_instance(brain_name)
             if brain is None:
@@ -1146,12 +1750,48 @@ class BrainRouter:
                 continue
 
             if mode == "realtime_coach":
-                fn = lambda: brain.get_realtime_coaching(breath_data, phase)
+                fn = lambda brain=brain: brain.get_realtime_coaching(breath_data, phase)
             else:
-                fn = lambda: brain.get_coaching_response(breath_data, phase)
+                fn = lambda brain=brain: brain.get_coaching_response(breath_data, phase)
+
+            yield brain_name, fn, self._get_brain_timeout(brain_name, mode)
 
-            timeout = self._get_brain_timeout(brain_name, mode)
-            result = self._call_brain_with_timeout(brain_name, fn, timeout)
+    def _get_priority_response(
+        self,
+        breath_data: Dict[str, Any],
+        phase: str,
+        mode: str,
+        language: str,
+        persona: Optional[str]
+    ) -> str:
+        attempted = []
+        candidates = self._priority_candidates(breath_data, phase, mode, attempted)
+        config_reached = False
+        for brain_name, fn, timeout in candidates:
+            if brain_name == "config":
+                config_reached = True
+                break
+
+            if self._hedge_delay(brain_name, timeout, mode) is not None:
+                winner, result, winner_timeout, config_reached = self._call_brains_hedged(
+                    (brain_name, fn, timeout),
+                    candidates,
+                    attempted,
+                    mode=mode,
+                )
+                if winner is not None:
+                    self._set_last_route_meta(
+                        provider=winner,
+                        source="ai",
+                        status="success",
+                        mode=mode,
+                        timeout=winner_timeout,
+                        attempted=attempted,
+                    )
+                    return result
+                break
+
+            result = self._call_brain_with_timeout(brain_name, fn, timeout, mode=mode)
             if result:
                 attempted.append({"brain": brain_name, "status": "success"})
                 self._set_last_route_meta(
@@ -1163,7 +1803,7 @@ class BrainRouter:
                     attempted=attempted,
                 )
                 return result
-            outcome = dict(self.brain_last_outcome.get(brain_name, {}))
+            outcome = self._call_outcome(brain_name)
             attempted.append(
                 {
                     "brain": brain_name,
@@ -1172,6 +1812,16 @@ class BrainRouter:
                 }
             )
 
+        if config_reached:
+            self._set_last_route_meta(
+                provider="config",
+                source="config",
+                status="config_selected",
+                mode=mode,
+                attempted=attempted + [{"brain": "config", "status": "selected"}],
+            )
+            return self._get_config_response(breath_data, phase, language=language, persona=persona)
+
         self._set_last_route_meta(
             provider="config",
             source="config_fallback",
@@ -1231,9 +1881,17 @@ class BrainRouter:
             local_breath_data["persona"] = persona
         if user_name:
             local_breath_data["user_name"] = user_name
+        cue_cache_key = None
+        if mode == "realtime_coach":
+            cue_cache_key = self._cue_cache_key(local_breath_data, phase, language, persona)
+            cached = self._get_cached_cue(cue_cache_key, local_breath_data)
+            if cached is not None:
+                return cached
         if self.use_priority_routing and self.priority_brains:
             result = self._get_priority_response(local_breath_data, phase, mode, language, persona)
             if mode == "realtime_coach":
+                if self.last_route_meta.get("source") == "ai":
+                    self.cue_cache.put(cue_cache_key, result)
                 session_id = local_breath_data.get("session_id")
                 result = self._rewrite_if_recent_repeat(
                     text=result,
@@ -1251,6 +1909,7 @@ class BrainRouter:
             if self.brain is not None:
                 try:
                     result = self.brain.get_realtime_coaching(local_breath_data, phase)
+                    self.cue_cache.put(cue_cache_key, result)
                     session_id = local_breath_data.get("session_id")
                     result = self._rewrite_if_recent_repeat(
                         text=result,
@@ -1415,17 +2074,51 @@ class BrainRouter:
             s = self.brain_stats.get(brain_name, {})
             cooldown_until = self.brain_cooldowns.get(brain_name)
             on_cooldown = bool(cooldown_until and time.time() < cooldown_until)
+            shared_cooldown = self._shared_cooldown(brain_name)
             stats[brain_name] = {
                 "calls": s.get("calls", 0),
                 "timeouts": s.get("timeouts", 0),
                 "failures": s.get("failures", 0),
                 "avg_latency": round(s.get("avg_latency", 0), 3),
+                "hedges": s.get("hedges", 0),
+                "hedge_wins": s.get("hedge_wins", 0),
+                "hedge_win_rate": round(s.get("hedge_wins", 0) / s["hedges"], 3) if s.get("hedges") else 0.0,
+                "hedge_triggers": s.get("hedge_triggers", 0),
                 "last_used": s.get("last_used"),
                 "on_cooldown": on_cooldown,
+                "on_shared_cooldown": bool(shared_cooldown),
+                "shared_cooldown_reason": shared_cooldown[1] if shared_cooldown else None,
                 "available": self._is_brain_available(brain_name),
             }
         return stats
 
+    def publish_health_stats(self) -> None:
+        """Stage this worker's per-brain latency summary for the shared health sync."""
+        for brain_name, stats in list(self.brain_stats.items()):
+            if brain_name == "config":
+                continue
+            self.shared_health.publish_stats(
+                brain_name,
+                avg_latency=stats.get("avg_latency") if stats.get("calls") else None,
+                p90_latency=self._latency_percentile(brain_name, 0.9),
+                calls=stats.get("calls", 0),
+                timeouts=stats.get("timeouts", 0),
+                failures=stats.get("failures", 0),
+            )
+
+    def get_latency_histograms(self) -> Dict[str, Any]:
+        """Per-brain, per-mode latency percentiles plus the budgets derived from them."""
+        report: Dict[str, Any] = {}
+        for (brain_name, mode), histogram in sorted(self.latency_histograms.items()):
+            snapshot = histogram.snapshot()
+            if mode == "all":
+                snapshot["slow_threshold"] = self._get_slow_threshold(brain_name)
+            else:
+                configured_mode = "chat" if mode == "question_qa" else ("realtime_coach" if mode == "zone_rewrite" else mode)
+                snapshot["timeout"] = self._get_brain_timeout(brain_name, configured_mode, latency_mode=mode)
+            report.setdefault(brain_name, {})[mode] = snapshot
+        return report
+
     def health_check(self) -> Dict[str, Any]:
         """
         Check health of active brain.
@@ -1447,7 +2140,12 @@ class BrainRouter:
             "healthy": True,
             "message": "OK",
             "brain_stats": self.get_brain_stats(),
-            "pool_status": pool_status
+            "pool_status": pool_status,
+            "latency_histograms": self.get_latency_histograms(),
+            "cue_cache": self.get_cue_cache_stats(),
+            "prompt_cache": get_prompt_cache_stats(),
+            "usage": get_usage_ledger().summary(),
+            "shared_health": self.shared_health.snapshot(),
         }
 
         if self.brain is not None:
@@ -1493,6 +2191,7 @@ class BrainRouter:
         persona: Optional[str] = None,
         coaching_style: str = "normal",
         event_type: Optional[str] = None,
+        tone: Optional[str] = None,
     ) -> str:
         """
         Optional Phase-4 language layer for deterministic zone events.
@@ -1529,15 +2228,16 @@ class BrainRouter:
                 attempted.append({"brain": brain_name, "status": "unavailable"})
                 continue
 
-            timeout = min(timeout_cap, self._get_brain_timeout(brain_name, "realtime_coach"))
+            timeout = min(timeout_cap, self._get_brain_timeout(brain_name, "realtime_coach", latency_mode="zone_rewrite"))
             fn = lambda: brain.rewrite_zone_event_text(
                 seed,
                 language=language,
                 persona=persona,
                 coaching_style=coaching_style,
                 event_type=event_type,
+                tone=tone,
             )
-            rewritten = self._call_brain_with_timeout(brain_name, fn, timeout)
+            rewritten = self._call_brain_with_timeout(brain_name, fn, timeout, mode="zone_rewrite")
             cleaned = (rewritten or "").strip()
             if cleaned:
                 attempted.append({"brain": brain_name, "status": "success", "timeout": timeout})
@@ -1552,7 +2252,7 @@ class BrainRouter:
                 )
                 return cleaned
 
-            outcome = dict(self.brain_last_outcome.get(brain_name, {}))
+            outcome = self._call_outcome(brain_name)
             attempted.append(
                 {
                     "brain": brain_name,
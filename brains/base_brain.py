@@ -6,6 +6,9 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, AsyncIterator, List
 
+import prompt_cache
+from usage_ledger import record_response_usage
+
 
 class BaseBrain(ABC):
     """
@@ -97,7 +100,30 @@ class BaseBrain(ABC):
 
         if emotional_mode not in {"supportive", "pressing", "intense", "peak"}:
             emotional_mode = self._infer_emotional_mode(emotional_intensity)
+        if isinstance(emotional_intensity, (int, float)):
+            # Directives only carry the rounded value; key on it so nearby readings share a prompt.
+            emotional_intensity = round(float(emotional_intensity), 2)
+        else:
+            emotional_intensity = None
+
+        return prompt_cache.compiled(
+            "persona_directives",
+            (lang, persona, realtime, emotional_mode, emotional_trend, emotional_intensity, safety_override),
+            lambda: self._compile_persona_directives(
+                lang, persona, realtime, emotional_mode, emotional_trend, emotional_intensity, safety_override
+            ),
+        )
 
+    @staticmethod
+    def _compile_persona_directives(
+        lang: str,
+        persona: str,
+        realtime: bool,
+        emotional_mode: str,
+        emotional_trend: str,
+        emotional_intensity: Optional[float],
+        safety_override: bool,
+    ) -> str:
         if lang == "no":
             if persona == "toxic_mode":
                 lines = [
@@ -165,6 +191,26 @@ class BaseBrain(ABC):
 
         return "\n\nPersona directives:\n- " + "\n- ".join(lines)
 
+    def _record_usage(self, response: Any, mode: str, prompt: Any = None, completion: Any = None) -> None:
+        """Report one provider call to the usage ledger (tokens from `response`, else estimated)."""
+        if completion is None and response is not None:
+            try:
+                if getattr(response, "choices", None):
+                    completion = response.choices[0].message.content
+                elif getattr(response, "content", None):
+                    completion = response.content[0].text
+                else:
+                    completion = getattr(response, "text", None)
+            except Exception:
+                completion = None
+        record_response_usage(
+            self.get_provider_name(),
+            response,
+            mode=mode,
+            prompt_text=prompt,
+            completion_text=completion,
+        )
+
     @staticmethod
     def _infer_emotional_mode(emotional_intensity: Any) -> str:
         """Infer persona mode from emotional intensity if explicit mode is missing."""
@@ -194,6 +240,7 @@ class BaseBrain(ABC):
         persona: Optional[str] = None,
         coaching_style: str = "normal",
         event_type: Optional[str] = None,
+        tone: Optional[str] = None,
     ) -> str:
         """
         Optional provider hook for zone-event phrasing.
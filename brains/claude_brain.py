@@ -8,6 +8,7 @@ import random
 from typing import Dict, Any, Optional, AsyncIterator, List
 from anthropic import Anthropic, AsyncAnthropic
 from .base_brain import BaseBrain
+from async_runtime import shared_async_http_client, shared_http_client
 import config
 from persona_manager import get_coach_prompt
 
@@ -26,9 +27,9 @@ class ClaudeBrain(BaseBrain):
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
 
         # Sync client for legacy coaching
-        self.client = Anthropic(api_key=self.api_key)
-        # Async client for streaming chat
-        self.async_client = AsyncAnthropic(api_key=self.api_key)
+        self.client = Anthropic(api_key=self.api_key, http_client=shared_http_client())
+        # Async client for streaming chat (runs on the shared async runtime loop)
+        self.async_client = AsyncAnthropic(api_key=self.api_key, http_client=shared_async_http_client())
 
         # claude-3-haiku is cheapest ($0.25/$1.25 per 1M tokens)
         # For short coaching cues, Haiku is fast + cheap enough
@@ -87,6 +88,7 @@ class ClaudeBrain(BaseBrain):
                     {"role": "user", "content": user_message}
                 ]
             )
+            self._record_usage(message, "realtime_coach", [system_prompt, user_message])
 
             response = message.content[0].text.strip()
 
@@ -164,6 +166,7 @@ class ClaudeBrain(BaseBrain):
                     {"role": "user", "content": user_message}
                 ]
             )
+            self._record_usage(message, "chat", [system_prompt, user_message])
 
             response = message.content[0].text.strip()
             return response
@@ -262,8 +265,13 @@ Give ONE short coaching message (max 7 words):"""
                 system=system_prompt or "",
                 messages=messages
             ) as stream:
-                async for text in stream.text_stream:
-                    yield text
+                streamed = []
+                try:
+                    async for text in stream.text_stream:
+                        streamed.append(text)
+                        yield text
+                finally:
+                    self._record_usage(None, "chat_stream", [system_prompt, messages], "".join(streamed))
 
         except Exception as e:
             print(f"Claude streaming error: {e}")
@@ -295,6 +303,7 @@ Give ONE short coaching message (max 7 words):"""
                 system=system_prompt or "",
                 messages=messages
             )
+            self._record_usage(message, "chat", [system_prompt, messages])
             return message.content[0].text
 
         except Exception as e:
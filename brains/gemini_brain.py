@@ -5,6 +5,7 @@
 # Docs: https://ai.google.dev/gemini-api/docs
 #
 
+import asyncio
 import os
 import random
 import warnings
@@ -104,6 +105,7 @@ class GeminiBrain(BaseBrain):
                     "temperature": 0.9
                 }
             )
+            self._record_usage(response, "realtime_coach", [system_prompt, user_message])
 
             message = (response.text or "").strip()
             if not message:
@@ -172,6 +174,7 @@ class GeminiBrain(BaseBrain):
                     "temperature": 0.8
                 }
             )
+            self._record_usage(response, "chat", [system_prompt, user_message])
             message = (response.text or "").strip()
             if not message:
                 raise ValueError("Empty Gemini response")
@@ -273,7 +276,9 @@ Give ONE short coaching message (max 7 words):"""
 
         model = self._make_model()
         try:
-            response = model.generate_content(
+            # The SDK call and its chunk iterator block; keep them off the shared event loop.
+            response = await asyncio.to_thread(
+                model.generate_content,
                 prompt,
                 stream=True,
                 generation_config={
@@ -281,10 +286,20 @@ Give ONE short coaching message (max 7 words):"""
                     "max_output_tokens": max_tokens
                 }
             )
-            for chunk in response:
-                text = getattr(chunk, "text", "") or ""
-                if text:
-                    yield text
+            chunks = iter(response)
+            streamed = []
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    text = getattr(chunk, "text", "") or ""
+                    if text:
+                        streamed.append(text)
+                        yield text
+            finally:
+                # Estimated from what was generated, like the other brains' streams (also on disconnect).
+                self._record_usage(None, "chat_stream", prompt, "".join(streamed))
         except Exception as e:
             print(f"Gemini streaming error: {e}")
             # Fallback to non-streaming response
@@ -306,13 +321,15 @@ Give ONE short coaching message (max 7 words):"""
         max_tokens = kwargs.get("max_tokens", 512)
 
         model = self._make_model()
-        response = model.generate_content(
+        response = await asyncio.to_thread(
+            model.generate_content,
             prompt,
             generation_config={
                 "temperature": temperature,
                 "max_output_tokens": max_tokens
             }
         )
+        self._record_usage(response, "chat", prompt)
         return (response.text or "").strip()
 
     def get_provider_name(self) -> str:
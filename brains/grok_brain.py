@@ -14,7 +14,9 @@ import re
 from typing import Dict, Any, Optional, AsyncIterator, List
 from openai import OpenAI, AsyncOpenAI
 from .base_brain import BaseBrain
+from async_runtime import current_call_timeout, shared_async_http_client, shared_http_client
 import config
+import prompt_cache
 from persona_manager import get_coach_prompt
 
 
@@ -58,17 +60,29 @@ class GrokBrain(BaseBrain):
             base_url=self.XAI_BASE_URL,
             max_retries=0,
             timeout=self.request_timeout,
+            http_client=shared_http_client(),
         )
-        # Async client for streaming chat
+        # Async client for streaming chat (runs on the shared async runtime loop)
         self.async_client = AsyncOpenAI(
             api_key=self.api_key,
             base_url=self.XAI_BASE_URL,
             max_retries=0,
             timeout=self.request_timeout,
+            http_client=shared_async_http_client(),
         )
 
     def _timeout_for_mode(self, mode: str) -> float:
-        """Resolve provider HTTP timeout for this mode."""
+        """
+        Resolve provider HTTP timeout for this mode.
+
+        Inside a routed call this is the router's (possibly adaptive) budget
+        minus BRAIN_CLIENT_TIMEOUT_MARGIN_SECONDS; otherwise the configured value.
+        """
+        margin = float(getattr(config, "BRAIN_CLIENT_TIMEOUT_MARGIN_SECONDS", 0.25))
+        budget = current_call_timeout()
+        if budget is not None:
+            return max(1.0, float(budget) - margin)
+
         mode_timeouts = getattr(config, "BRAIN_MODE_TIMEOUTS", {}) or {}
         if isinstance(mode_timeouts, dict):
             per_mode = mode_timeouts.get(mode, {})
@@ -84,7 +98,6 @@ class GrokBrain(BaseBrain):
 
         per_brain = getattr(config, "BRAIN_TIMEOUTS", {}) or {}
         base = float(per_brain.get("grok", getattr(config, "BRAIN_TIMEOUT", 6.0)))
-        margin = float(getattr(config, "BRAIN_CLIENT_TIMEOUT_MARGIN_SECONDS", 0.25))
         return max(1.0, base - margin)
 
     # ============================================
@@ -152,6 +165,7 @@ class GrokBrain(BaseBrain):
                 ],
                 timeout=self._timeout_for_mode("realtime_coach"),
             )
+            self._record_usage(response, "realtime_coach", [system_prompt, user_message])
 
             message = response.choices[0].message.content.strip()
 
@@ -182,13 +196,9 @@ class GrokBrain(BaseBrain):
     ) -> str:
         """Build system prompt for REALTIME COACH mode using endurance coach personality."""
 
-        # Use the shared endurance coach personality with realtime constraints
-        base_prompt = get_coach_prompt(mode="realtime_coach", language=language)
-
-        # Add current context
-        context = f"\n\nCurrent context:\n- Phase: {phase.upper()}\n- Breathing intensity: {intensity}"
-        context += "\n- Response format: 2-5 words, one actionable cue."
-        context += self.build_persona_directives(
+        # Stable prefix first (coach prompt, state, persona directives/rules) so it is
+        # byte-identical across calls in the same state; per-call details follow it.
+        directives = self.build_persona_directives(
             {
                 "persona": persona,
                 "training_level": training_level,
@@ -200,7 +210,24 @@ class GrokBrain(BaseBrain):
             language=language,
             mode="realtime_coach",
         )
-        context += self._get_realtime_persona_rules(persona, training_level)
+
+        def _build_prefix() -> str:
+            # Use the shared endurance coach personality with realtime constraints
+            base_prompt = get_coach_prompt(mode="realtime_coach", language=language)
+
+            # Add current context
+            prefix = f"\n\nCurrent context:\n- Phase: {phase.upper()}\n- Breathing intensity: {intensity}"
+            prefix += "\n- Response format: 2-5 words, one actionable cue."
+            prefix += directives
+            prefix += self._get_realtime_persona_rules(persona, training_level)
+            return base_prompt + prefix
+
+        prefix = prompt_cache.compiled(
+            "grok_realtime_prefix",
+            (phase, intensity, language, self._normalize_persona(persona), directives),
+            _build_prefix,
+        )
+        context = ""
 
         if coaching_reason:
             context += f"\n- Decision reason: {coaching_reason}"
@@ -220,7 +247,9 @@ class GrokBrain(BaseBrain):
         if user_name:
             context += f"\n- Athlete's name: {user_name}. Use their name at MOST once or twice during the entire workout — never on back-to-back messages. Most messages should NOT include the name."
 
-        return base_prompt + context
+        prompt = prefix + context
+        prompt_cache.record_prompt_bytes("grok_realtime", prompt)
+        return prompt
 
     def get_coaching_response(
         self,
@@ -272,6 +301,7 @@ class GrokBrain(BaseBrain):
                 ],
                 timeout=self._timeout_for_mode("chat"),
             )
+            self._record_usage(response, "chat", [system_prompt, user_message])
 
             message = response.choices[0].message.content.strip()
             return message
@@ -416,6 +446,7 @@ Give ONE short coaching message (max 7 words):"""
         persona: Optional[str] = None,
         coaching_style: str = "normal",
         event_type: Optional[str] = None,
+        tone: Optional[str] = None,
     ) -> str:
         """
         Rephrase deterministic zone-event text without changing intent or action.
@@ -447,7 +478,8 @@ Give ONE short coaching message (max 7 words):"""
                 f"Event: {event_type or 'zone_event'}\n"
                 f"Persona: {persona_key}\n"
                 f"Style: {style}\n"
-                f"Original: {seed}\n"
+                + (f"Tone: {tone}\n" if tone else "")
+                + f"Original: {seed}\n"
                 "Omskriv med samme betydning:"
             )
         else:
@@ -461,7 +493,8 @@ Give ONE short coaching message (max 7 words):"""
                 f"Event: {event_type or 'zone_event'}\n"
                 f"Persona: {persona_key}\n"
                 f"Style: {style}\n"
-                f"Original: {seed}\n"
+                + (f"Tone: {tone}\n" if tone else "")
+                + f"Original: {seed}\n"
                 "Rewrite with identical meaning:"
             )
 
@@ -475,6 +508,7 @@ Give ONE short coaching message (max 7 words):"""
             ],
             timeout=self._timeout_for_mode("realtime_coach"),
         )
+        self._record_usage(response, "zone_rewrite", [system_prompt, user_prompt])
 
         rewritten = (response.choices[0].message.content or "").strip()
         if not rewritten:
@@ -537,9 +571,15 @@ Give ONE short coaching message (max 7 words):"""
                 timeout=kwargs.get("timeout", self._timeout_for_mode("chat")),
             )
 
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            streamed = []
+            try:
+                async for chunk in stream:
+                    if chunk.choices[0].delta.content:
+                        streamed.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Streams carry no usage block; estimate from what was generated (also on disconnect).
+                self._record_usage(None, "chat_stream", full_messages, "".join(streamed))
 
         except Exception as e:
             print(f"Grok streaming error: {e}")
@@ -574,6 +614,7 @@ Give ONE short coaching message (max 7 words):"""
                 max_tokens=kwargs.get("max_tokens", 2048),
                 timeout=kwargs.get("timeout", self._timeout_for_mode("chat")),
             )
+            self._record_usage(response, "chat", full_messages)
             return response.choices[0].message.content
 
         except Exception as e:
@@ -8,6 +8,7 @@ import random
 from typing import Dict, Any, Optional, AsyncIterator, List
 from openai import OpenAI, AsyncOpenAI
 from .base_brain import BaseBrain
+from async_runtime import shared_async_http_client, shared_http_client
 import config
 from persona_manager import get_coach_prompt
 
@@ -26,9 +27,9 @@ class OpenAIBrain(BaseBrain):
             raise ValueError("OPENAI_API_KEY not found in environment")
 
         # Sync client for legacy coaching
-        self.client = OpenAI(api_key=self.api_key)
-        # Async client for streaming chat
-        self.async_client = AsyncOpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, http_client=shared_http_client())
+        # Async client for streaming chat (runs on the shared async runtime loop)
+        self.async_client = AsyncOpenAI(api_key=self.api_key, http_client=shared_async_http_client())
 
         # gpt-4o-mini is cheapest ($0.15/$0.60 per 1M tokens) with great quality
         self.model = "gpt-4o-mini"
@@ -86,6 +87,7 @@ class OpenAIBrain(BaseBrain):
                     {"role": "user", "content": user_message}
                 ]
             )
+            self._record_usage(response, "realtime_coach", [system_prompt, user_message])
 
             message = response.choices[0].message.content.strip()
 
@@ -163,6 +165,7 @@ class OpenAIBrain(BaseBrain):
                     {"role": "user", "content": user_message}
                 ]
             )
+            self._record_usage(response, "chat", [system_prompt, user_message])
 
             message = response.choices[0].message.content.strip()
             return message
@@ -267,9 +270,15 @@ Give ONE short coaching message (max 7 words):"""
                 stream=True
             )
 
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            streamed = []
+            try:
+                async for chunk in stream:
+                    if chunk.choices[0].delta.content:
+                        streamed.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Streams carry no usage block; estimate from what was generated (also on disconnect).
+                self._record_usage(None, "chat_stream", full_messages, "".join(streamed))
 
         except Exception as e:
             print(f"OpenAI streaming error: {e}")
@@ -305,6 +314,7 @@ Give ONE short coaching message (max 7 words):"""
                 temperature=kwargs.get("temperature", 0.8),
                 max_tokens=kwargs.get("max_tokens", 2048)
             )
+            self._record_usage(response, "chat", full_messages)
             return response.choices[0].message.content
 
         except Exception as e:
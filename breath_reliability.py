@@ -9,6 +9,7 @@ Single source of truth for:
 
 from __future__ import annotations
 
+from collections import deque
 from typing import Any, Dict, Iterable, List, Optional
 
 
@@ -47,7 +48,7 @@ def derive_breath_quality_samples(
 ) -> List[float]:
     samples: List[float] = []
 
-    if isinstance(recent_samples, (list, tuple)):
+    if isinstance(recent_samples, (list, tuple, deque)):
         for value in recent_samples:
             parsed = _coerce_float(value)
             if parsed is None:
@@ -176,6 +176,8 @@ class BreathingTimeline:
         self.current_phase: str = "prep"
         self.prep_safety_given: bool = False
         self.prep_start_time: int = 0
+        # Set when cue state changes; cleared once the owning session is persisted.
+        self.dirty: bool = False
 
     def get_breathing_cue(
         self,
@@ -196,7 +198,9 @@ class BreathingTimeline:
         Returns:
             Coaching message string, or None if not time yet
         """
-        self.current_phase = phase
+        if self.current_phase != phase:
+            self.current_phase = phase
+            self.dirty = True
         timeline = BREATHING_TIMELINE.get(phase)
         if not timeline:
             return None
@@ -208,6 +212,7 @@ class BreathingTimeline:
 
         self.last_cue_time = elapsed_seconds
         self.cues_given += 1
+        self.dirty = True
 
         # Prep phase: special handling for countdown + safety
         if phase == "prep":
@@ -344,3 +349,4 @@ class BreathingTimeline:
         self.current_phase = "prep"
         self.prep_safety_given = False
         self.prep_start_time = 0
+        self.dirty = True
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import asyncio
 import json
 from typing import Any
 
 from flask import Blueprint, Response, jsonify, request, stream_with_context
 import config
+from async_runtime import iterate_async, run_coroutine
 from auth import require_mobile_auth, rate_limit
 
 
@@ -223,39 +223,28 @@ def create_chat_blueprint(
 
             def generate():
                 """SSE generator function."""
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
                 full_response = ""
+                tokens = None
 
                 try:
-
-                    async def stream_tokens():
-                        nonlocal full_response
-                        # Get streaming brain
-                        if brain_router.brain and brain_router.brain.supports_streaming():
-                            async for token in brain_router.brain.stream_chat(
-                                messages=messages, system_prompt=system_prompt
-                            ):
-                                full_response += token
-                                yield f"data: {json.dumps({'token': token})}\n\n"
-                        else:
-                            # Fallback for non-streaming brains
-                            response = brain_router.get_coaching_response(
-                                {"intensity": "moderate", "volume": 50, "tempo": 20},
-                                "intense",
-                            )
-                            full_response = response
-                            yield f"data: {json.dumps({'token': response})}\n\n"
-
-                    # Run async generator
-                    async_gen = stream_tokens()
-                    while True:
-                        try:
-                            chunk = loop.run_until_complete(async_gen.__anext__())
-                            yield chunk
-                        except StopAsyncIteration:
-                            break
+                    if brain_router.brain and brain_router.brain.supports_streaming():
+                        # Tokens are produced on the shared async runtime loop; the bounded
+                        # buffer keeps a slow client from letting the provider run ahead.
+                        tokens = iterate_async(
+                            brain_router.brain.stream_chat(messages=messages, system_prompt=system_prompt),
+                            item_timeout=getattr(config, "CHAT_STREAM_ITEM_TIMEOUT_SECONDS", 30.0),
+                        )
+                        for token in tokens:
+                            full_response += token
+                            yield f"data: {json.dumps({'token': token})}\n\n"
+                    else:
+                        # Fallback for non-streaming brains
+                        response = brain_router.get_coaching_response(
+                            {"intensity": "moderate", "volume": 50, "tempo": 20},
+                            "intense",
+                        )
+                        full_response = response
+                        yield f"data: {json.dumps({'token': response})}\n\n"
 
                     # Send done signal
                     yield f"data: {json.dumps({'done': True})}\n\n"
@@ -264,11 +253,16 @@ def create_chat_blueprint(
                     session_manager.add_message(session_id, "assistant", full_response)
                     logger.info("Stream complete: %s chars", len(full_response))
 
+                except GeneratorExit:
+                    # Client went away: stop reading from the provider.
+                    logger.info("Stream cancelled by client: session=%s after %s chars", session_id, len(full_response))
+                    raise
                 except Exception as e:
                     logger.error(f"Streaming error: {e}", exc_info=True)
                     yield f"data: {json.dumps({'error': str(e)})}\n\n"
                 finally:
-                    loop.close()
+                    if tokens is not None:
+                        tokens.close()
 
             return Response(
                 stream_with_context(generate()),
@@ -329,9 +323,7 @@ def create_chat_blueprint(
 
             # Get response
             if brain_router.brain:
-                loop = asyncio.new_event_loop()
-                response = loop.run_until_complete(brain_router.brain.chat(messages, system_prompt))
-                loop.close()
+                response = run_coroutine(brain_router.brain.chat(messages, system_prompt))
             else:
                 # Fallback to config brain
                 response = brain_router.get_coaching_response(
@@ -363,21 +355,36 @@ def create_chat_blueprint(
     @require_mobile_auth
     def list_sessions():
         """
-        List all sessions.
+        List sessions, most recently updated first.
 
         Query params:
         - user_id: Filter by user (optional)
+        - limit: Page size (default: 50, max: 200)
+        - cursor: `next_cursor` from the previous page (optional)
 
         Returns:
         {
-            "sessions": [...]
+            "sessions": [...],
+            "next_cursor": "..." | null
         }
         """
         try:
             user_id = request.args.get("user_id")
-            sessions = session_manager.list_sessions(user_id)
+            try:
+                limit = max(1, min(200, int(request.args.get("limit", 50))))
+            except (ValueError, TypeError):
+                limit = 50
+
+            try:
+                page = session_manager.list_sessions_page(
+                    user_id,
+                    limit=limit,
+                    cursor=request.args.get("cursor"),
+                )
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
 
-            return jsonify({"sessions": sessions}), 200
+            return jsonify(page), 200
 
         except Exception as e:
             logger.error(f"Error listing sessions: {e}", exc_info=True)
@@ -136,6 +136,8 @@ POSTHOG_API_KEY = (os.getenv("POSTHOG_API_KEY", "") or "").strip()
 POSTHOG_HOST = (os.getenv("POSTHOG_HOST", "https://us.i.posthog.com") or "https://us.i.posthog.com").strip()
 APP_STORE_BUNDLE_IDS = _env_csv_set("APP_STORE_BUNDLE_IDS", ["com.coachi.app"])
 APP_STORE_TRUSTED_ROOT_SHA256S = _env_csv_set("APP_STORE_TRUSTED_ROOT_SHA256S", [])
+# Per-worker cache for resolved subscription tiers; subscription writes invalidate it directly.
+SUBSCRIPTION_TIER_CACHE_TTL_SECONDS = _env_int("SUBSCRIPTION_TIER_CACHE_TTL_SECONDS", 30)
 APP_STORE_SERVER_NOTIFICATIONS_ENABLED = _env_bool("APP_STORE_SERVER_NOTIFICATIONS_ENABLED", False)
 APP_STORE_SERVER_NOTIFICATIONS_VERIFY_SIGNATURE = _env_bool(
     "APP_STORE_SERVER_NOTIFICATIONS_VERIFY_SIGNATURE",
@@ -192,6 +194,12 @@ XAI_VOICE_AGENT_VAD_SILENCE_DURATION_MS = _env_int("XAI_VOICE_AGENT_VAD_SILENCE_
 JWT_ACCESS_TOKEN_MAX_DAYS = _env_int("JWT_ACCESS_TOKEN_MAX_DAYS", 7)
 JWT_REFRESH_TOKEN_MAX_DAYS = _env_int("JWT_REFRESH_TOKEN_MAX_DAYS", 7)
 JWT_SECRET_MAX_AGE_DAYS = _env_int("JWT_SECRET_MAX_AGE_DAYS", 90)
+# Verified access-token claims cached per worker until exp (0 disables).
+JWT_VERIFY_CACHE_MAX_ENTRIES = _env_int("JWT_VERIFY_CACHE_MAX_ENTRIES", 4096)
+# Apple/Google signing keys: TTL when the provider sends no Cache-Control max-age, and the
+# minimum gap between refetches triggered by an unknown key id.
+IDENTITY_JWKS_DEFAULT_TTL_SECONDS = _env_int("IDENTITY_JWKS_DEFAULT_TTL_SECONDS", 3600)
+IDENTITY_JWKS_KID_MISS_MIN_INTERVAL_SECONDS = _env_int("IDENTITY_JWKS_KID_MISS_MIN_INTERVAL_SECONDS", 30)
 APPLE_AUTH_ENABLED = _env_bool("APPLE_AUTH_ENABLED", True)
 EMAIL_AUTH_ENABLED = _env_bool("EMAIL_AUTH_ENABLED", True)
 GOOGLE_AUTH_ENABLED = _env_bool("GOOGLE_AUTH_ENABLED", True)
@@ -215,14 +223,41 @@ AUDIO_SIGNATURE_BYPASS_FOR_TESTS = _env_bool("AUDIO_SIGNATURE_BYPASS_FOR_TESTS",
 
 # Database-backed API rate limits (fixed windows, shared across workers).
 RATE_LIMIT_ENABLED = _env_bool("RATE_LIMIT_ENABLED", True)
-RATE_LIMIT_STORAGE_BACKEND = (os.getenv("RATE_LIMIT_STORAGE_BACKEND", "database") or "database").strip().lower()
+# "database" upserts a counter row per request; "hybrid" enforces from per-worker counters
+# and reconciles them to the same table in batches.
+_raw_rate_limit_storage_backend = (os.getenv("RATE_LIMIT_STORAGE_BACKEND", "database") or "database").strip().lower()
+RATE_LIMIT_STORAGE_BACKEND = (
+    _raw_rate_limit_storage_backend if _raw_rate_limit_storage_backend in {"database", "hybrid"} else "database"
+)
+# Hybrid mode: a background thread flushes local counts at least this often, and as soon as
+# one key has this many unsynced hits. Cross-worker overshoot per window is bounded by
+# workers x (max unsynced hits + hits arriving before the flush lands).
+RATE_LIMIT_HYBRID_FLUSH_INTERVAL_SECONDS = _env_float("RATE_LIMIT_HYBRID_FLUSH_INTERVAL_SECONDS", 2.0)
+RATE_LIMIT_HYBRID_MAX_UNSYNCED = _env_int("RATE_LIMIT_HYBRID_MAX_UNSYNCED", 5)
+# "fixed_window" keeps one counter row per subject x rule x window; "gcra" keeps a single
+# theoretical-arrival-time row per subject x rule and removes window-boundary bursts.
+# The hybrid backend always counts fixed windows.
+_raw_rate_limit_algorithm = (os.getenv("RATE_LIMIT_ALGORITHM", "fixed_window") or "fixed_window").strip().lower()
+RATE_LIMIT_ALGORITHM = _raw_rate_limit_algorithm if _raw_rate_limit_algorithm in {"fixed_window", "gcra"} else "fixed_window"
 _raw_runtime_session_storage_backend = (
     os.getenv("RUNTIME_SESSION_STORAGE_BACKEND", "database") or "database"
 ).strip().lower()
 RUNTIME_SESSION_STORAGE_BACKEND = (
     _raw_runtime_session_storage_backend if _raw_runtime_session_storage_backend in {"memory", "database"} else "database"
 )
+# Multi-worker mode: validate cached runtime sessions against the stored version on every
+# read so ticks for one workout can land on any worker. Writes are always compare-and-swap.
+RUNTIME_SESSION_SHARED_STORE = _env_bool("RUNTIME_SESSION_SHARED_STORE", False)
 RATE_LIMIT_RETENTION_SECONDS = _env_int("RATE_LIMIT_RETENTION_SECONDS", 7 * 24 * 3600)
+# Idle runtime sessions older than this are purged by the maintenance scheduler (0 keeps them).
+RUNTIME_SESSION_RETENTION_SECONDS = _env_int("RUNTIME_SESSION_RETENTION_SECONDS", 30 * 24 * 3600)
+# Expired refresh tokens are kept this long past expiry before being purged.
+REFRESH_TOKEN_RETENTION_SECONDS = _env_int("REFRESH_TOKEN_RETENTION_SECONDS", 7 * 24 * 3600)
+# Background housekeeping (expired rows, TTS cache files) on one leader-elected thread.
+# When disabled, the old inline cleanup on request paths is used instead.
+MAINTENANCE_SCHEDULER_ENABLED = _env_bool("MAINTENANCE_SCHEDULER_ENABLED", True)
+MAINTENANCE_TICK_SECONDS = _env_int("MAINTENANCE_TICK_SECONDS", 60)
+MAINTENANCE_DELETE_CHUNK_SIZE = _env_int("MAINTENANCE_DELETE_CHUNK_SIZE", 1000)
 API_RATE_LIMIT_PER_HOUR = _env_int("API_RATE_LIMIT_PER_HOUR", 100)
 AUTH_RATE_LIMIT_PER_HOUR = _env_int("AUTH_RATE_LIMIT_PER_HOUR", 40)
 REFRESH_RATE_LIMIT_PER_HOUR = _env_int("REFRESH_RATE_LIMIT_PER_HOUR", 60)
@@ -592,6 +627,11 @@ COACH_TALK_WAKE_TIMEOUT_SECONDS = _env_float("COACH_TALK_WAKE_TIMEOUT_SECONDS",
 COACH_TALK_BUTTON_TIMEOUT_SECONDS = _env_float("COACH_TALK_BUTTON_TIMEOUT_SECONDS", 2.0)
 TALK_STT_ENABLED = _env_bool("TALK_STT_ENABLED", False)
 TALK_CONTEXT_SUMMARY_ENABLED = _env_bool("TALK_CONTEXT_SUMMARY_ENABLED", True)
+# Sentence-pipelined talk answers (SSE): TTS for sentence i overlaps generation of sentence i+1.
+TALK_SENTENCE_STREAMING_ENABLED = _env_bool("TALK_SENTENCE_STREAMING_ENABLED", True)
+TALK_STREAM_TTS_WORKERS = _env_int("TALK_STREAM_TTS_WORKERS", 2)
+TALK_STREAM_MIN_SENTENCE_CHARS = _env_int("TALK_STREAM_MIN_SENTENCE_CHARS", 12)
+TALK_STREAM_STALL_SECONDS = _env_float("TALK_STREAM_STALL_SECONDS", 8.0)
 COACH_QA_MAX_TOKENS = _env_int("COACH_QA_MAX_TOKENS", 80)
 COACH_QA_MAX_SENTENCES = _env_int("COACH_QA_MAX_SENTENCES", 3)
 COACH_TALK_ALLOWED_TRIGGER_SOURCES = ("wake_word", "button")
@@ -633,15 +673,80 @@ GROK_CLIENT_TIMEOUT_SECONDS = _env_float(
     max(1.0, float(BRAIN_TIMEOUTS.get("grok", BRAIN_TIMEOUT)) - BRAIN_CLIENT_TIMEOUT_MARGIN_SECONDS),
 )
 USAGE_LIMIT = _env_float("USAGE_LIMIT", 0.9)  # skip brain if usage >= this (optional BRAIN_USAGE map)
+# Token/cost ledger (usage_ledger.py): hourly aggregates flushed per worker to usage_ledger_entries.
+USAGE_LEDGER_ENABLED = _env_bool("USAGE_LEDGER_ENABLED", True)
+USAGE_LEDGER_FLUSH_INTERVAL_SECONDS = _env_float("USAGE_LEDGER_FLUSH_INTERVAL_SECONDS", 30.0)
+# USD per million tokens, used for cost estimates only.
+USAGE_PRICES_PER_MILLION_TOKENS = _env_json_dict(
+    "USAGE_PRICES_PER_MILLION_TOKENS_JSON",
+    {
+        "grok": {"input": 0.30, "output": 0.50},
+        "openai": {"input": 0.15, "output": 0.60},
+        "claude": {"input": 0.80, "output": 4.00},
+        "claude_sonnet": {"input": 3.00, "output": 15.00},
+        "gemini": {"input": 0.10, "output": 0.40},
+    },
+)
+USAGE_STT_PRICE_PER_MINUTE = _env_float("USAGE_STT_PRICE_PER_MINUTE", 0.003)
+# Assumed bitrate to price compressed STT uploads when neither the provider nor a WAV header gives a duration.
+USAGE_STT_FALLBACK_BITRATE_KBPS = _env_float("USAGE_STT_FALLBACK_BITRATE_KBPS", 64.0)
+# e.g. {"free": 0.05, "premium": 1.0}: AI brains are skipped for a tier once its daily spend reaches the budget.
+USAGE_DAILY_BUDGET_USD_BY_TIER = _env_json_dict("USAGE_DAILY_BUDGET_USD_BY_TIER_JSON", {})
 BRAIN_COOLDOWN_SECONDS = _env_float("BRAIN_COOLDOWN_SECONDS", 60)
 BRAIN_TIMEOUT_COOLDOWN_SECONDS = _env_float("BRAIN_TIMEOUT_COOLDOWN_SECONDS", 30)
 BRAIN_INIT_RETRY_SECONDS = _env_float("BRAIN_INIT_RETRY_SECONDS", 5)  # Short cooldown for init failures (API key missing, import error)
 BRAIN_QUOTA_COOLDOWN_SECONDS = _env_float("BRAIN_QUOTA_COOLDOWN_SECONDS", 300)  # Longer cooldown for provider quota failures
+# Cooldowns and latency summaries shared across workers: "database", "memory" (single process) or "off".
+BRAIN_SHARED_HEALTH_BACKEND = os.getenv("BRAIN_SHARED_HEALTH_BACKEND", "database").strip().lower()
+BRAIN_SHARED_HEALTH_SYNC_SECONDS = max(0.0, _env_float("BRAIN_SHARED_HEALTH_SYNC_SECONDS", 2.0))  # 0 disables the sync thread
+BRAIN_SHARED_HEALTH_STALE_SECONDS = max(60.0, _env_float("BRAIN_SHARED_HEALTH_STALE_SECONDS", 600.0))
+# Latency stats are re-published (and every row reloaded) at most this often unless they move materially.
+BRAIN_SHARED_HEALTH_STATS_SECONDS = max(0.0, _env_float("BRAIN_SHARED_HEALTH_STATS_SECONDS", 30.0))
+BRAIN_SHARED_HEALTH_LATENCY_CHANGE_RATIO = max(0.0, _env_float("BRAIN_SHARED_HEALTH_LATENCY_CHANGE_RATIO", 0.2))
 BRAIN_SLOW_THRESHOLD = _env_float("BRAIN_SLOW_THRESHOLD", 3.0)  # seconds avg latency before skipping (must be > BRAIN_TIMEOUT)
 # Per-brain slow-threshold overrides. Grok should not be marked slow at 4-5s.
 BRAIN_SLOW_THRESHOLDS = _env_json_dict("BRAIN_SLOW_THRESHOLDS_JSON", {"grok": 6.5})
 BRAIN_LATENCY_DECAY_FACTOR = _env_float("BRAIN_LATENCY_DECAY_FACTOR", 0.9)  # Decay old avg_latency toward recent readings
+# Hedged requests: once the running brain passes its observed latency percentile, start the
+# next healthy brain in BRAIN_PRIORITY in parallel and keep whichever answers first.
+BRAIN_HEDGING_ENABLED = _env_bool("BRAIN_HEDGING_ENABLED", True)
+BRAIN_HEDGE_PERCENTILE = _env_float("BRAIN_HEDGE_PERCENTILE", 0.9)
+BRAIN_HEDGE_MIN_SAMPLES = _env_int("BRAIN_HEDGE_MIN_SAMPLES", 20)  # no hedging until this many latencies are observed
+BRAIN_HEDGE_MIN_DELAY_SECONDS = _env_float("BRAIN_HEDGE_MIN_DELAY_SECONDS", 0.3)
+BRAIN_HEDGE_MAX_IN_FLIGHT = _env_int("BRAIN_HEDGE_MAX_IN_FLIGHT", 2)
+# Adaptive budgets: per brain and mode (realtime_coach/chat/question_qa/zone_rewrite) a rolling
+# latency histogram tightens timeouts and slow thresholds to observed percentiles * headroom,
+# bounded by [BRAIN_ADAPTIVE_MIN_SECONDS, configured value * BRAIN_ADAPTIVE_MAX_FACTOR].
+# Timeouts are recorded as samples at the timeout value, so a provider that keeps timing out
+# widens its budget (up to MAX_FACTOR) instead of only ever tightening it. Provider HTTP
+# timeouts (e.g. GROK_CLIENT_TIMEOUT_SECONDS) still cap a single call; raise them to let
+# a brain use budgets above its configured timeout.
+BRAIN_LATENCY_HISTOGRAM_WINDOW_SECONDS = _env_float("BRAIN_LATENCY_HISTOGRAM_WINDOW_SECONDS", 900)
+BRAIN_ADAPTIVE_TIMEOUTS_ENABLED = _env_bool("BRAIN_ADAPTIVE_TIMEOUTS_ENABLED", True)
+BRAIN_ADAPTIVE_MIN_SAMPLES = _env_int("BRAIN_ADAPTIVE_MIN_SAMPLES", 30)
+BRAIN_ADAPTIVE_TIMEOUT_PERCENTILE = _env_float("BRAIN_ADAPTIVE_TIMEOUT_PERCENTILE", 0.99)
+BRAIN_ADAPTIVE_SLOW_PERCENTILE = _env_float("BRAIN_ADAPTIVE_SLOW_PERCENTILE", 0.9)
+BRAIN_ADAPTIVE_HEADROOM = _env_float("BRAIN_ADAPTIVE_HEADROOM", 1.3)
+BRAIN_ADAPTIVE_MIN_SECONDS = _env_float("BRAIN_ADAPTIVE_MIN_SECONDS", 0.8)
+BRAIN_ADAPTIVE_MAX_FACTOR = _env_float("BRAIN_ADAPTIVE_MAX_FACTOR", 2.0)
+# Shared provider transport (async_runtime.py): one pooled keep-alive HTTP client per process
+# for the Grok/OpenAI/Claude SDKs, plus the worker pool for sync brain calls.
+BRAIN_EXECUTOR_MAX_WORKERS = _env_int("BRAIN_EXECUTOR_MAX_WORKERS", 16)
+BRAIN_HTTP_MAX_CONNECTIONS = _env_int("BRAIN_HTTP_MAX_CONNECTIONS", 64)
+BRAIN_HTTP_MAX_KEEPALIVE_CONNECTIONS = _env_int("BRAIN_HTTP_MAX_KEEPALIVE_CONNECTIONS", 16)
+BRAIN_HTTP_KEEPALIVE_EXPIRY_SECONDS = _env_float("BRAIN_HTTP_KEEPALIVE_EXPIRY_SECONDS", 60.0)
+BRAIN_HTTP_DEFAULT_TIMEOUT_SECONDS = _env_float("BRAIN_HTTP_DEFAULT_TIMEOUT_SECONDS", 30.0)
+# Streaming bridge: items buffered ahead of a slow consumer, and max wait for the next token.
+BRAIN_STREAM_MAX_BUFFERED_ITEMS = _env_int("BRAIN_STREAM_MAX_BUFFERED_ITEMS", 32)
+CHAT_STREAM_ITEM_TIMEOUT_SECONDS = _env_float("CHAT_STREAM_ITEM_TIMEOUT_SECONDS", 30.0)
 BRAIN_RECENT_CUE_WINDOW = _env_int("BRAIN_RECENT_CUE_WINDOW", 4)  # Anti-repetition memory per session
+# Realtime cue cache: provider cues are stored per quantized coaching state (phase, intensity,
+# persona, language, style, ...) with several variants per state, rotated against the
+# session's recent cues. A state is served from cache once it holds BRAIN_CUE_CACHE_VARIANTS cues.
+BRAIN_CUE_CACHE_ENABLED = _env_bool("BRAIN_CUE_CACHE_ENABLED", True)
+BRAIN_CUE_CACHE_VARIANTS = _env_int("BRAIN_CUE_CACHE_VARIANTS", 3)
+BRAIN_CUE_CACHE_TTL_SECONDS = _env_float("BRAIN_CUE_CACHE_TTL_SECONDS", 1800)
+BRAIN_CUE_CACHE_MAX_KEYS = _env_int("BRAIN_CUE_CACHE_MAX_KEYS", 2000)
 # Latency-aware response strategy:
 # - If expected brain latency is high, return fast config fallback cue immediately.
 # - Force one richer AI follow-up cue on the next tick.
@@ -658,6 +763,10 @@ USE_HYBRID_BRAIN = _env_bool("USE_HYBRID_BRAIN", False)  # Disabled by default:
 HYBRID_CLAUDE_FOR_PATTERNS = _env_bool("HYBRID_CLAUDE_FOR_PATTERNS", False)
 HYBRID_CONFIG_FOR_SPEED = _env_bool("HYBRID_CONFIG_FOR_SPEED", True)
 USE_STRATEGIC_BRAIN = _env_bool("USE_STRATEGIC_BRAIN", False)
+# Strategic insights run on background workers per session, never inside a tick.
+STRATEGIC_INSIGHT_WORKERS = max(1, _env_int("STRATEGIC_INSIGHT_WORKERS", 1))
+STRATEGIC_INSIGHT_FIRST_AFTER_SECONDS = max(0, _env_int("STRATEGIC_INSIGHT_FIRST_AFTER_SECONDS", 120))
+STRATEGIC_INSIGHT_INTERVAL_SECONDS = max(30, _env_int("STRATEGIC_INSIGHT_INTERVAL_SECONDS", 180))
 
 # ============================================
 # CONTINUOUS COACHING SETTINGS
@@ -870,6 +979,11 @@ ZONE_EVENT_LLM_REWRITE_ALLOWED_EVENTS = _env_csv_list(
         "max_silence_override",
     ],
 )
+# Offline rewrite bank (tools/build_zone_rewrite_bank.py): verified rewrites per zone-event
+# input are served with rotation before any live LLM rewrite is attempted.
+ZONE_EVENT_REWRITE_BANK_ENABLED = _env_bool("ZONE_EVENT_REWRITE_BANK_ENABLED", True)
+ZONE_EVENT_REWRITE_BANK_PATH = _resolve_repo_path(os.getenv("ZONE_EVENT_REWRITE_BANK_PATH"), "zone_rewrite_bank.json")
+ZONE_EVENT_REWRITE_BANK_VARIANTS = _env_int("ZONE_EVENT_REWRITE_BANK_VARIANTS", 4)  # rewrites generated per input
 
 # Phase 5: personalization is analytics/insight only in v1 (no decision mutation).
 ZONE_PERSONALIZATION_ENABLED = _env_bool("ZONE_PERSONALIZATION_ENABLED", True)
@@ -0,0 +1,162 @@
+"""
+Quantized-state cache for realtime coaching cues.
+
+Realtime cues depend on a small set of coarse inputs (phase, intensity,
+persona, language, coaching style, ...), so the same state recurs many times
+per workout and across users. Like `StrategicBrain._build_cache_key`, a state
+is reduced to a key; unlike it, each key keeps several provider-written
+variants so repeated states still sound varied:
+
+- a key is only served once it holds `variants` distinct cues (the first
+  calls for a state go to the provider and fill the slots)
+- variants rotate per key, skipping cues the session said recently
+- when every variant was said recently the caller goes to the provider, and
+  the fresh cue replaces the oldest variant
+- keys expire after `ttl_seconds` and the least recently used key is evicted
+  beyond `max_keys`
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").strip().lower().split())
+
+
+def _bucket(value: Any, step: float = 0.25) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return round(round(number / step) * step, 2)
+
+
+def build_cue_cache_key(
+    breath_data: Dict[str, Any],
+    phase: str,
+    language: str,
+    persona: Optional[str],
+) -> Optional[Tuple]:
+    """
+    Reduce a realtime coaching request to its cache key.
+
+    Returns None for states that must always reach the provider (safety
+    overrides, critical breathing).
+    """
+    data = breath_data or {}
+    intensity = str(data.get("intensity") or "moderate").strip().lower()
+    if intensity == "critical" or data.get("safety_override"):
+        return None
+
+    def _text(name: str) -> str:
+        return str(data.get(name) or "").strip().lower()
+
+    return (
+        str(phase or "intense").strip().lower(),
+        intensity,
+        str(language or "en").strip().lower(),
+        str(persona or data.get("persona") or "").strip().lower(),
+        _text("coaching_style"),
+        _text("training_level"),
+        _text("persona_mode"),
+        _text("coaching_reason"),
+        _text("emotional_trend"),
+        _bucket(data.get("emotional_intensity")),
+        _text("user_name"),
+    )
+
+
+class CueCache:
+    """Bounded LRU of quantized state -> rotating cue variants."""
+
+    def __init__(
+        self,
+        *,
+        variants: int = 3,
+        ttl_seconds: float = 1800.0,
+        max_keys: int = 2000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.variants = max(1, int(variants))
+        self.ttl_seconds = max(1.0, float(ttl_seconds))
+        self.max_keys = max(1, int(max_keys))
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> {"created_at": float, "cues": [str], "cursor": int}
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "fills": 0, "repeat_misses": 0, "stores": 0, "evictions": 0}
+
+    def _live_entry(self, key: Tuple, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry["created_at"] >= self.ttl_seconds:
+            del self._entries[key]
+            self._stats["evictions"] += 1
+            return None
+        return entry
+
+    def get(self, key: Optional[Tuple], recent: Iterable[str] = ()) -> Optional[str]:
+        """Next variant for `key` that is not in `recent`, or None when the provider should be called."""
+        if key is None:
+            return None
+        recent_norm = {_normalize(item) for item in recent}
+        with self._lock:
+            entry = self._live_entry(key, self._clock())
+            if entry is None or len(entry["cues"]) < self.variants:
+                self._stats["misses"] += 1
+                self._stats["fills"] += 1
+                return None
+            cues = entry["cues"]
+            for offset in range(len(cues)):
+                index = (entry["cursor"] + offset) % len(cues)
+                if _normalize(cues[index]) not in recent_norm:
+                    entry["cursor"] = index + 1
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return cues[index]
+            self._stats["misses"] += 1
+            self._stats["repeat_misses"] += 1
+            return None
+
+    def put(self, key: Optional[Tuple], cue: str) -> None:
+        """Store a provider cue as a variant of `key` (oldest variant drops out when full)."""
+        cleaned = (cue or "").strip()
+        if key is None or not cleaned:
+            return
+        now = self._clock()
+        with self._lock:
+            entry = self._live_entry(key, now)
+            if entry is None:
+                entry = {"created_at": now, "cues": [], "cursor": 0}
+                self._entries[key] = entry
+            if _normalize(cleaned) in {_normalize(item) for item in entry["cues"]}:
+                self._entries.move_to_end(key)
+                return
+            entry["cues"].append(cleaned)
+            if len(entry["cues"]) > self.variants:
+                del entry["cues"][: len(entry["cues"]) - self.variants]
+                entry["cursor"] = 0
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "keys": len(self._entries),
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
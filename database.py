@@ -49,6 +49,30 @@ def user_has_active_app_store_subscription(user_id: str | None) -> bool:
     return active_state is not None
 
 
+def users_with_active_app_store_subscription(user_ids) -> set[str]:
+    """Bulk form of `user_has_active_app_store_subscription`: the subset of ids with an active state."""
+    normalized_ids = sorted({uid for uid in (_normalized_user_id(value) for value in user_ids or ()) if uid})
+    if not normalized_ids:
+        return set()
+
+    now = _utcnow_naive()
+    rows = (
+        db.session.query(AppStoreSubscriptionState.user_id)
+        .filter(
+            AppStoreSubscriptionState.user_id.in_(normalized_ids),
+            AppStoreSubscriptionState.status.in_(tuple(ACTIVE_APP_STORE_STATUSES)),
+            db.or_(
+                AppStoreSubscriptionState.expires_at.is_(None),
+                AppStoreSubscriptionState.expires_at > now,
+            ),
+            AppStoreSubscriptionState.revocation_date.is_(None),
+        )
+        .distinct()
+        .all()
+    )
+    return {row.user_id for row in rows}
+
+
 def get_database_url():
     """Get database URL from environment or default to SQLite"""
     configured = (os.getenv("DATABASE_URL") or "").strip()
@@ -286,7 +310,7 @@ class RefreshToken(db.Model):
     user_id = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=False, index=True)
     token_hash = db.Column(db.String(64), nullable=False, unique=True, index=True)
     family_id = db.Column(db.String(36), nullable=False, index=True)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     created_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive)
     last_used_at = db.Column(db.DateTime, nullable=True)
     revoked_at = db.Column(db.DateTime, nullable=True, index=True)
@@ -381,16 +405,91 @@ class RateLimitCounter(db.Model):
     updated_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive, onupdate=_utcnow_naive, index=True)
 
 
+class RateLimitState(db.Model):
+    """GCRA state: one row per subject and rule holding the theoretical arrival time (epoch seconds)."""
+
+    __tablename__ = "rate_limit_states"
+
+    subject_key = db.Column(db.String(255), primary_key=True)
+    rule_name = db.Column(db.String(120), primary_key=True)
+    tat = db.Column(db.Float, nullable=False, index=True)
+    interval_seconds = db.Column(db.Float, nullable=False)
+    window_seconds = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive, onupdate=_utcnow_naive)
+
+
+class MaintenanceLease(db.Model):
+    """Leader lease for background maintenance: whoever holds an unexpired row runs the jobs."""
+
+    __tablename__ = "maintenance_leases"
+
+    name = db.Column(db.String(64), primary_key=True)
+    holder = db.Column(db.String(128), nullable=False)
+    expires_at = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive, onupdate=_utcnow_naive)
+
+
+# ============================================
+# USAGE LEDGER MODEL
+# ============================================
+
+class UsageLedgerEntry(db.Model):
+    """Hourly token/cost aggregates per provider, mode, endpoint and subscription tier."""
+
+    __tablename__ = "usage_ledger_entries"
+
+    bucket_start = db.Column(db.Integer, primary_key=True)
+    provider = db.Column(db.String(40), primary_key=True)
+    mode = db.Column(db.String(40), primary_key=True)
+    endpoint = db.Column(db.String(80), primary_key=True)
+    tier = db.Column(db.String(20), primary_key=True)
+    calls = db.Column(db.Integer, nullable=False, default=0)
+    cache_hits = db.Column(db.Integer, nullable=False, default=0)
+    estimated_calls = db.Column(db.Integer, nullable=False, default=0)
+    prompt_tokens = db.Column(db.BigInteger, nullable=False, default=0)
+    completion_tokens = db.Column(db.BigInteger, nullable=False, default=0)
+    audio_seconds = db.Column(db.Float, nullable=False, default=0.0)
+    cost_usd = db.Column(db.Float, nullable=False, default=0.0)
+    created_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive)
+    updated_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive, onupdate=_utcnow_naive)
+
+
+class BrainHealthState(db.Model):
+    """One worker's view of one brain: shared cooldown plus latency summary."""
+
+    __tablename__ = "brain_health_states"
+
+    brain_name = db.Column(db.String(40), primary_key=True)
+    worker_id = db.Column(db.String(120), primary_key=True)
+    cooldown_until = db.Column(db.Float, nullable=True)
+    cooldown_reason = db.Column(db.String(40), nullable=True)
+    avg_latency = db.Column(db.Float, nullable=True)
+    p90_latency = db.Column(db.Float, nullable=True)
+    calls = db.Column(db.Integer, nullable=False, default=0)
+    timeouts = db.Column(db.Integer, nullable=False, default=0)
+    failures = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive, index=True)
+
+
 # ============================================
 # RUNTIME SESSION STATE MODEL
 # ============================================
 
 class RuntimeSessionState(db.Model):
     __tablename__ = "runtime_session_states"
+    __table_args__ = (
+        # Keyset pagination for session listings: (user_id, updated_at DESC, session_id DESC).
+        db.Index("ix_runtime_session_states_user_updated", "user_id", "updated_at", "session_id"),
+    )
 
     session_id = db.Column(db.String(128), primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=True, index=True)
     payload_json = db.Column(db.Text, nullable=False)
+    # Summary columns maintained on every write so listings never decode payload_json.
+    persona = db.Column(db.String(50), nullable=True)
+    message_count = db.Column(db.Integer, nullable=False, default=0)
+    # Optimistic concurrency token: bumped on every write, compared on guarded writes.
+    version = db.Column(db.Integer, nullable=False, default=1)
     created_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive)
     updated_at = db.Column(db.DateTime, nullable=False, default=_utcnow_naive, onupdate=_utcnow_naive, index=True)
 
@@ -19,6 +19,7 @@ from datetime import datetime
 import logging
 import config
 from locale_config import get_voice_id as locale_get_voice_id, get_tts_language_code
+from maintenance import maintenance_scheduler_running
 
 logger = logging.getLogger(__name__)
 _ELEVENLABS_CLIENT_CLASS = None
@@ -26,6 +27,54 @@ _VOICE_SETTINGS_CLASS = None
 ElevenLabs = None
 VoiceSettings = None
 
+def _cache_files_in(cache_dir):
+    files = []
+    if not cache_dir or not os.path.isdir(cache_dir):
+        return files
+    for name in os.listdir(cache_dir):
+        if not (name.startswith("tts_") and name.endswith(".mp3")):
+            continue
+        path = os.path.join(cache_dir, name)
+        if os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+def cleanup_cache_dir(cache_dir):
+    """Drop cached clips past TTS_AUDIO_CACHE_MAX_AGE_SECONDS, then the oldest beyond MAX_FILES."""
+    files = _cache_files_in(cache_dir)
+    if not files:
+        return 0
+
+    now = time.time()
+    max_age = max(0, int(getattr(config, "TTS_AUDIO_CACHE_MAX_AGE_SECONDS", 14 * 24 * 3600)))
+    max_files = max(1, int(getattr(config, "TTS_AUDIO_CACHE_MAX_FILES", 1000)))
+
+    removed = 0
+    if max_age > 0:
+        for path in files:
+            try:
+                if (now - os.path.getmtime(path)) > max_age:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+
+    remaining = _cache_files_in(cache_dir)
+    if len(remaining) > max_files:
+        remaining.sort(key=lambda p: os.path.getmtime(p))
+        for path in remaining[: len(remaining) - max_files]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+
+    if removed:
+        logger.info("TTS cache cleanup removed %s file(s)", removed)
+    return removed
+
+
 # TTS model selection — flash_v2_5 is fastest + cheapest + supports Norwegian
 TTS_MODEL = "eleven_flash_v2_5"
 
@@ -373,18 +422,12 @@ class ElevenLabsTTS:
         return os.path.join(self.cache_dir, f"tts_{cache_key}.mp3")
 
     def _cache_files(self):
-        files = []
-        if not os.path.isdir(self.cache_dir):
-            return files
-        for name in os.listdir(self.cache_dir):
-            if not (name.startswith("tts_") and name.endswith(".mp3")):
-                continue
-            path = os.path.join(self.cache_dir, name)
-            if os.path.isfile(path):
-                files.append(path)
-        return files
+        return _cache_files_in(self.cache_dir)
 
     def _maybe_cleanup_cache(self):
+        # The maintenance scheduler sweeps the cache directory in every process it runs in.
+        if maintenance_scheduler_running():
+            return
         interval = max(1, int(getattr(config, "TTS_AUDIO_CACHE_CLEANUP_INTERVAL_WRITES", 25)))
         self._writes_since_cleanup += 1
         if self._writes_since_cleanup < interval:
@@ -393,37 +436,7 @@ class ElevenLabsTTS:
         self.cleanup_cache()
 
     def cleanup_cache(self):
-        files = self._cache_files()
-        if not files:
-            return 0
-
-        now = time.time()
-        max_age = max(0, int(getattr(config, "TTS_AUDIO_CACHE_MAX_AGE_SECONDS", 14 * 24 * 3600)))
-        max_files = max(1, int(getattr(config, "TTS_AUDIO_CACHE_MAX_FILES", 1000)))
-
-        removed = 0
-        if max_age > 0:
-            for path in files:
-                try:
-                    if (now - os.path.getmtime(path)) > max_age:
-                        os.remove(path)
-                        removed += 1
-                except OSError:
-                    continue
-
-        remaining = self._cache_files()
-        if len(remaining) > max_files:
-            remaining.sort(key=lambda p: os.path.getmtime(p))
-            for path in remaining[: len(remaining) - max_files]:
-                try:
-                    os.remove(path)
-                    removed += 1
-                except OSError:
-                    continue
-
-        if removed:
-            logger.info("TTS cache cleanup removed %s file(s)", removed)
-        return removed
+        return cleanup_cache_dir(self.cache_dir)
 
     def get_cache_stats(self):
         files = self._cache_files()
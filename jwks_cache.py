@@ -0,0 +1,189 @@
+"""
+Process-wide JSON Web Key Set cache for third-party identity tokens.
+
+Sign in with Apple and Google ID tokens are verified against the provider's
+published key set. Fetching that set on every sign-in puts an outbound HTTPS
+round-trip in front of each login, so `JWKSCache` keeps it per worker:
+
+- fresh until the `Cache-Control: max-age` the provider sent (or a default TTL)
+- stale-while-revalidate: past expiry the cached keys keep serving while one
+  background refresh runs, up to `stale_ttl_seconds`
+- an unknown `kid` (key rotation) triggers an immediate refetch, at most once
+  per `kid_miss_min_interval_seconds`
+- the fetcher is injectable so tests can serve a local key set offline
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import jwt
+import requests
+
+logger = logging.getLogger(__name__)
+
+JWKSFetcher = Callable[[str], Tuple[Dict[str, Any], Optional[float]]]
+
+_MAX_AGE_PATTERN = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def parse_cache_control_max_age(header_value: Optional[str]) -> Optional[float]:
+    if not header_value:
+        return None
+    match = _MAX_AGE_PATTERN.search(header_value)
+    if not match:
+        return None
+    return float(match.group(1))
+
+
+def fetch_jwks_over_http(url: str, timeout_seconds: float = 5.0) -> Tuple[Dict[str, Any], Optional[float]]:
+    """Default fetcher: GET the key set and return (payload, max_age_seconds)."""
+    response = requests.get(url, timeout=timeout_seconds)
+    response.raise_for_status()
+    return response.json(), parse_cache_control_max_age(response.headers.get("Cache-Control"))
+
+
+def _run_in_thread(task: Callable[[], None]) -> None:
+    threading.Thread(target=task, name="jwks-refresh", daemon=True).start()
+
+
+class JWKSCache:
+    """Cached signing keys for one JWKS URL; `get_signing_key_from_jwt` mirrors `jwt.PyJWKClient`."""
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        fetcher: Optional[JWKSFetcher] = None,
+        default_ttl_seconds: float = 3600.0,
+        stale_ttl_seconds: float = 24 * 3600.0,
+        kid_miss_min_interval_seconds: float = 30.0,
+        scheduler: Callable[[Callable[[], None]], None] = _run_in_thread,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.url = url
+        self._fetcher = fetcher or fetch_jwks_over_http
+        self._default_ttl_seconds = float(default_ttl_seconds)
+        self._stale_ttl_seconds = float(stale_ttl_seconds)
+        self._kid_miss_min_interval_seconds = float(kid_miss_min_interval_seconds)
+        self._scheduler = scheduler
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._expires_at = 0.0
+        self._last_kid_miss_fetch_at: Optional[float] = None
+        self._refresh_in_flight = False
+        self._stats = {
+            "fetches": 0,
+            "fetch_failures": 0,
+            "background_refreshes": 0,
+            "kid_miss_refetches": 0,
+            "kid_miss_throttled": 0,
+            "hits": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> bool:
+        """Fetch the key set now. Returns False (keeping the old keys) on failure."""
+        with self._fetch_lock:
+            try:
+                payload, max_age = self._fetcher(self.url)
+                key_set = jwt.PyJWKSet.from_dict(payload)
+            except Exception as exc:
+                with self._lock:
+                    self._stats["fetch_failures"] += 1
+                logger.warning("JWKS fetch failed for %s: %s", self.url, exc)
+                return False
+
+            keys = {key.key_id: key for key in key_set.keys if key.key_id}
+            ttl = self._default_ttl_seconds if max_age is None else max(0.0, float(max_age))
+            with self._lock:
+                self._keys = keys
+                self._expires_at = self._clock() + ttl
+                self._stats["fetches"] += 1
+            return True
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refresh_in_flight:
+                return
+            self._refresh_in_flight = True
+            self._stats["background_refreshes"] += 1
+
+        def _task() -> None:
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refresh_in_flight = False
+
+        try:
+            self._scheduler(_task)
+        except Exception:
+            with self._lock:
+                self._refresh_in_flight = False
+            logger.warning("Could not schedule JWKS refresh for %s", self.url, exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        now = self._clock()
+        with self._lock:
+            loaded = bool(self._keys)
+            fresh = now < self._expires_at
+            servable = loaded and now < self._expires_at + self._stale_ttl_seconds
+
+        if not servable:
+            self.refresh()
+        elif not fresh:
+            self._refresh_in_background()
+
+        with self._lock:
+            key = self._keys.get(kid) if kid else None
+            if key is not None:
+                self._stats["hits"] += 1
+                return key
+            last_miss_fetch = self._last_kid_miss_fetch_at
+            throttled = (
+                last_miss_fetch is not None
+                and now - last_miss_fetch < self._kid_miss_min_interval_seconds
+            )
+            if throttled:
+                self._stats["kid_miss_throttled"] += 1
+            else:
+                self._last_kid_miss_fetch_at = now
+                self._stats["kid_miss_refetches"] += 1
+
+        if not throttled and kid:
+            # The provider may have rotated keys since our last fetch.
+            self.refresh()
+            with self._lock:
+                key = self._keys.get(kid)
+            if key is not None:
+                return key
+
+        raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+
+    def get_signing_key_from_jwt(self, token: str) -> jwt.PyJWK:
+        header = jwt.get_unverified_header(token)
+        return self.get_signing_key(header.get("kid"))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "url": self.url,
+                "keys": len(self._keys),
+                "expires_in_seconds": round(self._expires_at - self._clock(), 1) if self._keys else None,
+                **self._stats,
+            }
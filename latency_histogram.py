@@ -0,0 +1,110 @@
+"""
+Rolling latency histograms with fixed relative precision (HDR-style).
+
+Values land in exponentially sized buckets, so every recorded latency is
+represented within `precision` (5% by default) whether it took 40ms or 40s,
+and memory stays bounded regardless of call volume. The window rolls by
+time slices: samples older than `window_seconds` fall out as whole slices
+expire, so percentiles track the provider's current behaviour.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class LatencyHistogram:
+    """Time-windowed histogram of latencies in seconds."""
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float = 900.0,
+        slices: int = 5,
+        min_value: float = 0.001,
+        max_value: float = 120.0,
+        precision: float = 0.05,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.window_seconds = max(1.0, float(window_seconds))
+        self.slice_seconds = self.window_seconds / max(1, int(slices))
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self._log_growth = math.log1p(float(precision))
+        self._max_index = self._index_for(self.max_value)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (slice_start, {bucket_index: count}), oldest first
+        self._slices: deque = deque()
+
+    def _index_for(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.ceil(math.log(value / self.min_value) / self._log_growth))
+
+    def _value_for(self, index: int) -> float:
+        """Upper bound of a bucket."""
+        return self.min_value * math.exp(index * self._log_growth)
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._slices and self._slices[0][0] + self.slice_seconds <= cutoff:
+            self._slices.popleft()
+
+    def record(self, value: float) -> None:
+        now = self._clock()
+        index = min(self._max_index, self._index_for(max(0.0, float(value))))
+        with self._lock:
+            self._expire(now)
+            if not self._slices or now >= self._slices[-1][0] + self.slice_seconds:
+                self._slices.append((now, {}))
+            buckets = self._slices[-1][1]
+            buckets[index] = buckets.get(index, 0) + 1
+
+    def _merged(self) -> Dict[int, int]:
+        merged: Dict[int, int] = {}
+        with self._lock:
+            self._expire(self._clock())
+            for _start, buckets in self._slices:
+                for index, count in buckets.items():
+                    merged[index] = merged.get(index, 0) + count
+        return merged
+
+    @staticmethod
+    def _rank_value(ordered: List[tuple], total: int, percentile: float) -> int:
+        rank = max(1, int(math.ceil(min(1.0, max(0.0, percentile)) * total)))
+        seen = 0
+        for index, count in ordered:
+            seen += count
+            if seen >= rank:
+                return index
+        return ordered[-1][0]
+
+    def count(self) -> int:
+        return sum(self._merged().values())
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Latency at the given quantile (0-1), or None when the window is empty."""
+        merged = self._merged()
+        if not merged:
+            return None
+        ordered = sorted(merged.items())
+        total = sum(merged.values())
+        return self._value_for(self._rank_value(ordered, total, percentile))
+
+    def snapshot(self, percentiles: Iterable[float] = (0.5, 0.9, 0.99)) -> Dict[str, Any]:
+        merged = self._merged()
+        ordered = sorted(merged.items())
+        total = sum(merged.values())
+        snapshot: Dict[str, Any] = {"count": total, "window_seconds": self.window_seconds}
+        for percentile in percentiles:
+            key = f"p{int(round(percentile * 100))}"
+            snapshot[key] = round(self._value_for(self._rank_value(ordered, total, percentile)), 3) if total else None
+        snapshot["max"] = round(self._value_for(ordered[-1][0]), 3) if total else None
+        # Non-empty buckets as [upper_bound_seconds, count].
+        snapshot["buckets"] = [[round(self._value_for(index), 4), count] for index, count in ordered]
+        return snapshot
@@ -1,6 +1,6 @@
 # main.py - MAIN FILE FOR TRENINGSCOACH BACKEND
 
-from flask import Flask, request, send_file, jsonify, g
+from flask import Flask, Response, request, send_file, jsonify, g, has_request_context, stream_with_context
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
@@ -46,23 +46,34 @@ from database import (
 )  # Import database initialization + models
 from auth_routes import auth_bp  # Import auth blueprint
 from auth import (
+    RateLimitPolicy,
     enforce_rate_limit,
     get_request_auth_user_id,
+    invalidate_user_subscription_tier_on_commit,
     rate_limit,
+    rate_limit_policy,
     require_auth,
     require_mobile_auth,
     resolve_user_subscription_tier,
+    start_rate_limit_flusher,
 )
 from norwegian_phrase_quality import rewrite_norwegian_phrase
 from coaching_engine import validate_coaching_text, get_template_message
-from breathing_timeline import BreathingTimeline
 from breath_reliability import summarize_breath_quality, derive_breath_quality_samples
+from rolling_metrics import running_ema
+from maintenance import get_maintenance_stats, start_maintenance_scheduler
+from brain_health import start_brain_health_sync
 from running_personalization import RunningPersonalizationStore
 from zone_event_motor import (
     evaluate_zone_tick,
     normalize_coaching_style,
     normalize_interval_template,
 )
+from zone_rewrite_bank import get_zone_rewrite_bank
+from talk_streaming import stream_sentence_audio
+from strategic_brain import get_strategic_brain
+from strategic_insights import StrategicInsightScheduler
+import usage_ledger
 from web_routes import create_web_blueprint
 from chat_routes import create_chat_blueprint
 from locale_config import get_voice_id as locale_voice_id
@@ -229,6 +240,7 @@ brain_router = BrainRouter()
 session_manager = SessionManager(
     storage_backend=getattr(config, "RUNTIME_SESSION_STORAGE_BACKEND", "database"),
     app=app,
+    shared_store=bool(getattr(config, "RUNTIME_SESSION_SHARED_STORE", False)),
 )
 user_memory = UserMemory()  # STEP 5: Initialize user memory
 voice_intelligence = VoiceIntelligence()  # STEP 6: Initialize voice intelligence
@@ -240,6 +252,10 @@ _breath_analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix
 _breath_analysis_lock = Lock()
 _breath_analysis_skip_until = 0.0
 _talk_stt_lock = Lock()
+_talk_tts_executor = ThreadPoolExecutor(
+    max_workers=max(1, int(getattr(config, "TALK_STREAM_TTS_WORKERS", 2))),
+    thread_name_prefix="talk-tts",
+)
 _talk_stt_quota_skip_until = 0.0
 running_personalization = RunningPersonalizationStore(
     storage_path=getattr(config, "ZONE_PERSONALIZATION_STORAGE_PATH", "instance/zone_personalization.json"),
@@ -260,7 +276,17 @@ else:
     logger.info("ℹ️ Librosa pre-warm deferred until first breath-analysis request")
 
 strategic_brain = None
+strategic_insight_scheduler = None
 if getattr(config, "USE_STRATEGIC_BRAIN", False):
+    # Insights are generated per session on background workers; ticks only read ready results.
+    strategic_insight_scheduler = StrategicInsightScheduler(
+        store=session_manager.set_strategic_insight,
+        brain_factory=get_strategic_brain,
+        app=app,
+        max_workers=getattr(config, "STRATEGIC_INSIGHT_WORKERS", 1),
+        first_after_seconds=getattr(config, "STRATEGIC_INSIGHT_FIRST_AFTER_SECONDS", 120),
+        interval_seconds=getattr(config, "STRATEGIC_INSIGHT_INTERVAL_SECONDS", 180),
+    )
     logger.info("ℹ️ Strategic Brain enabled in config but deferred until first strategic call")
 else:
     logger.info("ℹ️ Strategic Brain disabled via config (USE_STRATEGIC_BRAIN=False)")
@@ -537,6 +563,7 @@ def _update_user_subscription_tier_record(*, user_id: str | None, status: str |
         db.session.add(subscription)
     else:
         subscription.tier = resolved_tier
+    invalidate_user_subscription_tier_on_commit(db.session, normalized_user_id)
     return resolved_tier
 
 
@@ -566,6 +593,7 @@ def _upsert_app_store_subscription_state(
         state = AppStoreSubscriptionState(original_transaction_id=original_transaction_id)
         db.session.add(state)
 
+    previous_user_id = state.user_id
     resolved_user_id = str(user_id or "").strip() or None
     if resolved_user_id and db.session.get(User, resolved_user_id) is not None:
         state.user_id = resolved_user_id
@@ -593,6 +621,9 @@ def _upsert_app_store_subscription_state(
     if notification_signed_at is not None:
         state.last_notification_signed_at = notification_signed_at
 
+    if previous_user_id and previous_user_id != state.user_id:
+        # Ownership moved; the previous owner's cached tier may still say premium.
+        invalidate_user_subscription_tier_on_commit(db.session, previous_user_id)
     _update_user_subscription_tier_record(user_id=state.user_id, status=state.status)
     return state
 
@@ -938,21 +969,16 @@ def _enforce_coach_talk_rate_limits(
 
     subscription_tier = resolve_user_subscription_tier(normalized_subject)
     if subscription_tier == "premium":
-        for limit, window_seconds in (
-            (getattr(config, "COACH_TALK_PREMIUM_RATE_LIMIT_PER_MINUTE", 15), 60),
-            (getattr(config, "COACH_TALK_PREMIUM_RATE_LIMIT_PER_HOUR", 25), 3600),
-            (getattr(config, "COACH_TALK_PREMIUM_RATE_LIMIT_PER_DAY", 25), 24 * 3600),
-        ):
-            limited = enforce_rate_limit(
-                limit,
-                window_seconds,
-                key_prefix="api.coach.talk.premium",
-                scope="user",
-                key_func=lambda subject=normalized_subject: subject,
-            )
-            if limited is not None:
-                return limited
-        return None
+        return RateLimitPolicy(
+            "api.coach.talk.premium",
+            (
+                (getattr(config, "COACH_TALK_PREMIUM_RATE_LIMIT_PER_MINUTE", 15), 60),
+                (getattr(config, "COACH_TALK_PREMIUM_RATE_LIMIT_PER_HOUR", 25), 3600),
+                (getattr(config, "COACH_TALK_PREMIUM_RATE_LIMIT_PER_DAY", 25), 24 * 3600),
+            ),
+            scope="user",
+            key_func=lambda subject=normalized_subject: subject,
+        ).enforce()
 
     normalized_session_id = str(talk_session_id or "").strip()
     if normalized_session_id:
@@ -1235,25 +1261,21 @@ def _append_recent_zone_event(session_id: str, zone_tick: dict | None, coach_tex
     if not isinstance(zone_tick, dict):
         return
 
-    session = session_manager.get_session(normalized_session)
-    if session is None:
-        return
-    metadata = session.setdefault("metadata", {})
-    history = metadata.setdefault("recent_zone_events", [])
-    if not isinstance(history, list):
-        history = []
-        metadata["recent_zone_events"] = history
-
-    history.append(
-        {
-            "event_type": str(zone_tick.get("primary_event_type") or zone_tick.get("event_type") or "").strip(),
-            "text": text,
-            "timestamp": _utcnow_iso_z(),
-        }
-    )
+    entry = {
+        "event_type": str(zone_tick.get("primary_event_type") or zone_tick.get("event_type") or "").strip(),
+        "text": text,
+        "timestamp": _utcnow_iso_z(),
+    }
     max_items = max(1, int(getattr(config, "TALK_RECENT_ZONE_EVENT_LIMIT", 3)))
-    metadata["recent_zone_events"] = history[-max_items:]
-    session_manager.save_session(normalized_session, session)
+
+    def _apply(session: dict) -> None:
+        metadata = session.setdefault("metadata", {})
+        history = metadata.get("recent_zone_events")
+        if not isinstance(history, list):
+            history = []
+        metadata["recent_zone_events"] = (history + [entry])[-max_items:]
+
+    session_manager.update_session(normalized_session, _apply)
 
 
 def _recent_zone_event_context(session_id: str, limit: int = 3) -> list[dict]:
@@ -1379,6 +1401,38 @@ def fallback_talk_prompt(language: str, workout_context: dict | None = None) ->
     return "How am I doing right now?"
 
 
+def _stt_audio_seconds(transcript, filepath: str) -> float:
+    """
+    Billable audio length for an STT call.
+
+    Prefers what the provider reports (verbose `duration`, or duration-type `usage`),
+    then the WAV header, then file size at USAGE_STT_FALLBACK_BITRATE_KBPS for
+    compressed uploads (mp3/m4a) whose length is not in a cheap-to-read header.
+    """
+    reported = getattr(transcript, "duration", None)
+    usage = getattr(transcript, "usage", None)
+    if reported is None and usage is not None and getattr(usage, "type", None) == "duration":
+        reported = getattr(usage, "seconds", None)
+    try:
+        if reported is not None and float(reported) > 0:
+            return float(reported)
+    except (TypeError, ValueError):
+        pass
+    try:
+        with wave.open(filepath, "rb") as handle:
+            frames, rate = handle.getnframes(), handle.getframerate()
+        if rate:
+            return frames / float(rate)
+    except Exception:
+        pass
+    try:
+        size_bytes = os.path.getsize(filepath)
+    except OSError:
+        return 0.0
+    bitrate_kbps = max(1.0, float(getattr(config, "USAGE_STT_FALLBACK_BITRATE_KBPS", 64.0)))
+    return size_bytes * 8.0 / (bitrate_kbps * 1000.0)
+
+
 def transcribe_talk_audio(filepath: str, language: str, timeout_seconds: float) -> tuple[str | None, str]:
     """
     Best-effort speech-to-text for /coach/talk multipart audio.
@@ -1424,6 +1478,11 @@ def transcribe_talk_audio(filepath: str, language: str, timeout_seconds: float)
                 file=audio_handle,
                 language=normalize_language_code(language),
             )
+        usage_ledger.record_usage(
+            "openai_stt",
+            mode="stt",
+            audio_seconds=_stt_audio_seconds(transcript, filepath),
+        )
         text = str(getattr(transcript, "text", "") or "").strip()
         if not text:
             return None, "stt_empty"
@@ -2167,15 +2226,51 @@ def _normalize_personalization_user_id(
     return slug[:128]
 
 
-def _should_allow_zone_llm_rewrite(event_type: str) -> bool:
-    if not bool(getattr(config, "ZONE_EVENT_LLM_REWRITE_ENABLED", False)):
-        return False
+def _is_zone_rewrite_event(event_type: str) -> bool:
     allowed = set(getattr(config, "ZONE_EVENT_LLM_REWRITE_ALLOWED_EVENTS", []))
     if not allowed:
         return False
     return (event_type or "") in allowed
 
 
+def _should_allow_zone_llm_rewrite(event_type: str) -> bool:
+    if not bool(getattr(config, "ZONE_EVENT_LLM_REWRITE_ENABLED", False)):
+        return False
+    return _is_zone_rewrite_event(event_type)
+
+
+def _pick_banked_zone_rewrite(
+    *,
+    seed: str,
+    language: str,
+    persona: str,
+    coaching_style: str,
+    event_type: str,
+) -> str | None:
+    """Next precomputed rewrite for this zone event, re-verified against the live seed."""
+    if not bool(getattr(config, "ZONE_EVENT_REWRITE_BANK_ENABLED", True)) or not _is_zone_rewrite_event(event_type):
+        return None
+    banked = get_zone_rewrite_bank().pick(event_type, language, persona, coaching_style, seed)
+    if not banked:
+        return None
+    verified, verify_reason = verify_zone_event_rewrite(
+        original_event=seed,
+        rewritten_phrase=banked,
+        event_type=event_type or "zone_event",
+        language=language,
+    )
+    if not verified:
+        logger.info(
+            "ZONE_REWRITE_AUDIT event=%s decision=bank_rejected reason=%s original=%r rewritten=%r",
+            event_type or "zone_event",
+            verify_reason,
+            seed,
+            banked,
+        )
+        return None
+    return banked
+
+
 def _maybe_rephrase_zone_event_text(
     *,
     base_text: str,
@@ -2183,9 +2278,13 @@ def _maybe_rephrase_zone_event_text(
     persona: str,
     coaching_style: str,
     event_type: str,
+    tone: str | None = None,
 ) -> tuple[str, dict]:
     """
     Optional Phase-4 phrasing layer for deterministic zone event text.
+
+    A strategic `tone` skips the tone-neutral rewrite bank so the LLM rewrite
+    can apply it; the verifier still pins the meaning to the seed.
     """
     seed = (base_text or "").strip()
     if not seed:
@@ -2196,6 +2295,24 @@ def _maybe_rephrase_zone_event_text(
             "mode": "deterministic_zone",
         }
 
+    banked = None
+    if not (tone and _should_allow_zone_llm_rewrite(event_type)):
+        banked = _pick_banked_zone_rewrite(
+            seed=seed,
+            language=language,
+            persona=persona,
+            coaching_style=coaching_style,
+            event_type=event_type,
+        )
+    if banked:
+        usage_ledger.record_usage("zone_event_bank", mode="zone_rewrite", cache_hit=True)
+        return banked, {
+            "provider": "system",
+            "source": "zone_event_bank",
+            "status": "bank_hit",
+            "mode": "deterministic_zone",
+        }
+
     if not _should_allow_zone_llm_rewrite(event_type):
         return seed, {
             "provider": "system",
@@ -2205,14 +2322,15 @@ def _maybe_rephrase_zone_event_text(
         }
 
     try:
-        rewritten = brain_router.rewrite_zone_event_text(
+        route = brain_router.route_zone_event_rewrite(
             seed,
             language=language,
             persona=persona,
             coaching_style=coaching_style,
             event_type=event_type,
+            tone=tone,
         )
-        cleaned = (rewritten or "").strip()
+        cleaned = (route.text or "").strip()
         if not cleaned:
             return seed, {
                 "provider": "system",
@@ -2257,9 +2375,8 @@ def _maybe_rephrase_zone_event_text(
                 "mode": "deterministic_zone",
             }
 
-        route_meta = brain_router.get_last_route_meta()
-        provider = route_meta.get("provider") or "system"
-        status = route_meta.get("status") or "rewrite_success"
+        provider = route.meta.get("provider") or "system"
+        status = route.meta.get("status") or "rewrite_success"
         return cleaned, {
             "provider": provider,
             "source": "zone_event_llm",
@@ -2809,24 +2926,46 @@ def _extract_recent_spoken_cues(coaching_history, limit: int = 4) -> list:
 
 
 def _get_or_create_session_timeline(session_id: str):
-    """Return per-session breathing timeline state."""
-    session = session_manager.get_session(session_id)
-    if not session:
-        return None
+    """
+    Return per-session breathing timeline state.
 
-    metadata = session.setdefault("metadata", {})
-    timeline = metadata.get("breathing_timeline")
-    if isinstance(timeline, dict):
-        timeline = BreathingTimeline.from_dict(timeline)
-        metadata["breathing_timeline"] = timeline
-        session_manager.save_session(session_id, session)
-    if timeline is None:
-        timeline = BreathingTimeline()
-        metadata["breathing_timeline"] = timeline
-        session_manager.save_session(session_id, session)
+    The continuous tick stores it with its workout-state commit; the end-of-request
+    flush only writes timelines still dirty after that (early returns, other routes).
+    """
+    timeline = session_manager.get_breathing_timeline(session_id)
+    if timeline is not None and has_request_context():
+        touched = g.setdefault("breathing_timeline_sessions", set())
+        touched.add(str(session_id or "").strip())
     return timeline
 
 
+@app.before_request
+def _begin_usage_scope():
+    # Resolved once per request (cached per user) so every provider call is attributed to a tier.
+    tier = None
+    try:
+        tier = resolve_user_subscription_tier(get_request_auth_user_id())
+    except Exception as exc:
+        db.session.rollback()
+        logger.debug("Usage scope tier lookup failed: %s", exc)
+    usage_ledger.set_scope(endpoint=request.endpoint or request.path, tier=tier)
+
+
+@app.teardown_request
+def _end_usage_scope(_error=None):
+    usage_ledger.clear_scope()
+
+
+@app.after_request
+def _flush_breathing_timelines(response):
+    for session_id in g.pop("breathing_timeline_sessions", ()):
+        try:
+            session_manager.flush_breathing_timeline(session_id)
+        except Exception as exc:
+            logger.warning("Breathing timeline flush failed (session=%s): %s", session_id, exc)
+    return response
+
+
 def _ensure_latency_strategy_state(workout_state: dict) -> dict:
     """Ensure per-session latency strategy state exists with safe defaults."""
     if workout_state is None:
@@ -2913,11 +3052,16 @@ def _score_intensity(resp_rate: float, volume: float, regularity: float, quality
 
     return round(score, 3), round(confidence, 3)
 
-def _smooth_breath_metrics(breath_data: dict, breath_history: list) -> dict:
-    """Smooth key breath metrics across recent history using EMA."""
+def _smooth_breath_metrics(breath_data: dict, breath_history: list, breath_aggregates: dict = None) -> dict:
+    """Smooth key breath metrics using EMA.
+
+    Folds the current reading into the running EMA kept in the session's
+    `breath_aggregates`. Metrics without a running value yet (older sessions)
+    fall back to an EMA over the last BREATH_SMOOTHING_WINDOW history entries.
+    """
     alpha = getattr(config, "BREATH_SMOOTHING_ALPHA", 0.5)
     window = getattr(config, "BREATH_SMOOTHING_WINDOW", 4)
-    recent = breath_history[-window:] if breath_history else []
+    recent = None
 
     def series(key):
         values = [h.get(key) for h in recent if h.get(key) is not None]
@@ -2927,7 +3071,13 @@ def _smooth_breath_metrics(breath_data: dict, breath_history: list) -> dict:
     smoothed = {}
     for key in ("respiratory_rate", "volume", "breath_regularity", "inhale_exhale_ratio",
                 "signal_quality", "dominant_frequency"):
-        smoothed_value = _ema(series(key), alpha)
+        previous = running_ema(breath_aggregates, key)
+        if previous is not None:
+            smoothed_value = _ema([previous, breath_data.get(key)], alpha)
+        else:
+            if recent is None:
+                recent = breath_history[-window:] if breath_history else []
+            smoothed_value = _ema(series(key), alpha)
         if smoothed_value is not None:
             smoothed[key] = round(float(smoothed_value), 3)
 
@@ -3193,6 +3343,18 @@ chat_bp = create_chat_blueprint(
 app.register_blueprint(chat_bp)
 _log_memory_checkpoint("chat_blueprint_registered")
 
+# Expired-row and cache-file housekeeping runs here instead of on request paths.
+start_maintenance_scheduler(app)
+usage_ledger.start_usage_ledger_flusher(app)
+start_rate_limit_flusher(app)
+start_brain_health_sync(app, before_sync=brain_router.publish_health_stats)
+
+
+@app.route('/maintenance/stats', methods=['GET'])
+def maintenance_stats():
+    """Expose per-job maintenance run counts and durations."""
+    return jsonify(get_maintenance_stats()), 200
+
 @app.route('/tts/cache/stats', methods=['GET'])
 def tts_cache_stats():
     """Expose ElevenLabs audio cache stats for tuning/observability."""
@@ -3283,19 +3445,14 @@ def analyze():
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/coach/continuous', methods=['POST'])
-@rate_limit(
-    limit=getattr(config, "CONTINUOUS_RATE_LIMIT_PER_HOUR", 500),
-    window_seconds=3600,
-    key_prefix="api.coach.continuous",
-    scope="user",
-    key_func=_mobile_rate_limit_subject_from_request,
-)
-@rate_limit(
-    limit=getattr(config, "CONTINUOUS_RATE_LIMIT_PER_MINUTE", 30),
-    window_seconds=60,
+@rate_limit_policy(
     key_prefix="api.coach.continuous",
     scope="user",
     key_func=_mobile_rate_limit_subject_from_request,
+    rules=(
+        (getattr(config, "CONTINUOUS_RATE_LIMIT_PER_MINUTE", 30), 60),
+        (getattr(config, "CONTINUOUS_RATE_LIMIT_PER_HOUR", 500), 3600),
+    ),
 )
 @require_mobile_auth
 def coach_continuous():
@@ -3462,37 +3619,46 @@ def coach_continuous():
             # STEP 5: Inject user memory at session start (once)
             memory_summary = user_memory.get_memory_summary(bootstrap_user_id)
             logger.info(f"Memory: {memory_summary}")
-            session = session_manager.get_session(session_id) or {}
-            session.setdefault("metadata", {})["memory"] = memory_summary
-            session_manager.save_session(session_id, session)
+            session_manager.update_session(
+                session_id,
+                lambda fresh_session: fresh_session.setdefault("metadata", {}).update(memory=memory_summary),
+            )
 
             # Mark that this is the first breath of the workout
-            workout_state = session_manager.get_workout_state(session_id)
-            if workout_state is not None:
-                workout_state["is_first_breath"] = True
-                session_manager.save_workout_state(session_id, workout_state)
+            def _mark_first_breath(fresh_session: dict) -> None:
+                if fresh_session.get("workout_state") is not None:
+                    fresh_session["workout_state"]["is_first_breath"] = True
+
+            session_manager.update_session(session_id, _mark_first_breath)
+
+        def _apply_tick_metadata(fresh_session: dict) -> None:
+            fresh_meta = fresh_session.setdefault("metadata", {})
+            fresh_meta["workout_mode"] = workout_mode
+            fresh_meta["coaching_style"] = coaching_style
+            fresh_meta["interval_template"] = interval_template
+            if user_name:
+                fresh_meta["user_name"] = user_name
+            if user_profile_id:
+                fresh_meta["user_profile_id"] = user_profile_id
+            if auth_user_id:
+                fresh_meta["user_id"] = auth_user_id
+            fresh_meta["personalization_user_id"] = _normalize_personalization_user_id(
+                explicit_profile_id=fresh_meta.get("user_profile_id", ""),
+                current_user_id=fresh_meta.get("user_id", "unknown"),
+                user_name=fresh_meta.get("user_name", ""),
+            )
 
-        session = session_manager.get_session(session_id) or {}
+        # Compare-and-swap so a tick served by another worker is never overwritten.
+        session = session_manager.update_session(session_id, _apply_tick_metadata) or {}
         session_meta = session.setdefault("metadata", {})
-        session_meta["workout_mode"] = workout_mode
-        session_meta["coaching_style"] = coaching_style
-        session_meta["interval_template"] = interval_template
-        if user_name:
-            session_meta["user_name"] = user_name
-        else:
+        if not user_name:
             user_name = session_meta.get("user_name", "")
-        if user_profile_id:
-            session_meta["user_profile_id"] = user_profile_id
-        if auth_user_id:
-            session_meta["user_id"] = auth_user_id
         current_user_id = session_meta.get("user_id", "unknown")
-        personalization_user_id = _normalize_personalization_user_id(
+        personalization_user_id = session_meta.get("personalization_user_id") or _normalize_personalization_user_id(
             explicit_profile_id=session_meta.get("user_profile_id", ""),
             current_user_id=current_user_id,
             user_name=user_name,
         )
-        session_meta["personalization_user_id"] = personalization_user_id
-        session_manager.save_session(session_id, session)
 
         runtime_profile_user_id = _coerce_profile_user_id(
             get_request_auth_user_id() or user_profile_id or session_meta.get("user_profile_id") or current_user_id
@@ -3614,6 +3780,8 @@ def coach_continuous():
         coaching_context = session_manager.get_coaching_context_with_emotion(session_id)
         last_breath = session_manager.get_last_breath_analysis(session_id)
         workout_state = session_manager.get_workout_state(session_id)
+        # Baseline for the end-of-tick commit, which only replays what this tick changed.
+        workout_state_baseline = session_manager.snapshot_workout_state(workout_state)
         if workout_state is not None:
             workout_state["workout_mode"] = workout_mode
             workout_state["coaching_style"] = coaching_style
@@ -3681,7 +3849,11 @@ def coach_continuous():
             "intensity_confidence": breath_data.get("intensity_confidence")
         }
 
-        smoothed = _smooth_breath_metrics(breath_data, coaching_context.get("breath_history", []))
+        smoothed = _smooth_breath_metrics(
+            breath_data,
+            coaching_context.get("breath_history", []),
+            coaching_context.get("breath_aggregates"),
+        )
         smoothing_applied = bool(smoothed) and (breath_data.get("signal_quality", 0) or 0) >= 0.2
 
         if smoothing_applied:
@@ -3936,6 +4108,20 @@ def coach_continuous():
         }
         pattern_insight = None
         strategic_guidance = None
+        strategic_guidance_used = False
+        if strategic_insight_scheduler is not None:
+            # Only peek: silent ticks must not use up the insight. It is taken
+            # below once a spoken cue actually uses its tone or phrase.
+            strategic_guidance = session_manager.peek_strategic_insight(session_id)
+            strategic_insight_scheduler.maybe_schedule(
+                session_id,
+                phase=phase,
+                elapsed_seconds=elapsed_seconds,
+                breath_history=coaching_context.get("breath_history", []),
+                coaching_history=coaching_context.get("coaching_history", []),
+                language=language,
+                last_generated_elapsed=session_manager.get_strategic_insight_elapsed(session_id),
+            )
         recent_cues = _extract_recent_spoken_cues(
             coaching_context.get("coaching_history", []),
             limit=getattr(config, "BRAIN_RECENT_CUE_WINDOW", 4),
@@ -3980,7 +4166,20 @@ def coach_continuous():
                     persona=persona,
                     coaching_style=coaching_style,
                     event_type=zone_event_type,
+                    tone=(strategic_guidance or {}).get("tone"),
+                )
+                strategic_guidance_used = bool(
+                    (strategic_guidance or {}).get("tone") and brain_meta.get("source") == "zone_event_llm"
                 )
+            elif (strategic_guidance or {}).get("suggested_phrase"):
+                coach_text = str(strategic_guidance["suggested_phrase"]).strip()
+                brain_meta = {
+                    "provider": "system",
+                    "source": "strategic_insight",
+                    "status": "suggested_phrase",
+                    "mode": "realtime_coach",
+                }
+                strategic_guidance_used = True
             else:
                 coach_text = _phase_fallback_text(
                     language=language,
@@ -4000,6 +4199,15 @@ def coach_continuous():
                     zone_event_type,
                 )
 
+        if strategic_guidance_used:
+            session_manager.take_strategic_insight(session_id)
+            # Recorded with the breath sample, so the next insight call sees it.
+            breath_data["strategic_guidance"] = {
+                key: strategic_guidance.get(key)
+                for key in ("strategy", "tone", "message_goal", "suggested_phrase")
+                if strategic_guidance.get(key)
+            }
+
         validation_shadow = bool(getattr(config, "COACHING_VALIDATION_SHADOW_MODE", True))
         validation_enforce = bool(getattr(config, "COACHING_VALIDATION_ENFORCE", False))
         if speak_decision and (validation_shadow or validation_enforce):
@@ -4072,14 +4280,6 @@ def coach_continuous():
             audio_url = f"/download/{relative_path}"
             tts_ms = (time.perf_counter() - tts_started) * 1000.0
 
-        # Update session state
-        session_manager.update_workout_state(
-            session_id=session_id,
-            breath_analysis=breath_data,
-            coaching_output=coach_text if speak_decision else None,
-            phase=phase,
-            elapsed_seconds=elapsed_seconds
-        )
         if zone_mode_active and speak_decision and zone_tick is not None and coach_text:
             _append_recent_zone_event(session_id, zone_tick, coach_text)
 
@@ -4191,8 +4391,17 @@ def coach_continuous():
                         personalization_tip,
                     )
 
+        # Update session state: this tick's edits plus history appends, in one guarded write
+        tick_update = dict(
+            breath_analysis=breath_data,
+            coaching_output=coach_text if speak_decision else None,
+            phase=phase,
+            elapsed_seconds=elapsed_seconds,
+        )
         if workout_state is not None:
-            session_manager.save_workout_state(session_id, workout_state)
+            session_manager.commit_workout_tick(session_id, workout_state, workout_state_baseline, **tick_update)
+        else:
+            session_manager.update_workout_state(session_id=session_id, **tick_update)
 
         # Response
         response_data = {
@@ -4236,6 +4445,7 @@ def coach_continuous():
             "personalization_tip": personalization_tip,
             "recovery_line": recovery_line,
             "recovery_baseline_seconds": recovery_baseline_seconds,
+            "strategic_guidance": strategic_guidance if strategic_guidance_used else None,
             "workout_context_summary": (
                 zone_tick.get("workout_context_summary")
                 if isinstance(zone_tick, dict)
@@ -5055,6 +5265,167 @@ def mobile_analytics():
 # TALK TO COACH (Conversational + Voice)
 # ============================================
 
+def _talk_stream_requested(form, payload, response_mode: str) -> bool:
+    if not bool(getattr(config, "TALK_SENTENCE_STREAMING_ENABLED", True)):
+        return False
+    if response_mode == "stream":
+        return True
+    raw = (form.get("stream_audio") if form is not None else None) or (payload or {}).get("stream_audio")
+    return str(raw or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _stream_coach_talk_response(
+    *,
+    prompt_for_router: str,
+    language: str,
+    persona: str,
+    context: str,
+    phase: str,
+    intensity: str,
+    user_name: str,
+    workout_context: dict,
+    timeout_budget: float,
+    restrict_question_brains,
+    talk_session_id: str,
+    contract_version: str,
+    trigger_source: str,
+    stt_source: str,
+    started_at: float,
+):
+    """
+    Sentence-pipelined `/coach/talk` answer as server-sent events.
+
+    Each answer sentence is sent to TTS as soon as the model finishes it, so
+    the client can start playback of sentence 1 while later sentences are
+    still being generated. The same workout guardrails as the blocking path
+    apply per sentence; a sentence that fails them is replaced by the workout
+    fallback and ends the answer.
+    """
+    mode = "workout_talk" if context == "workout" else "chat_talk"
+    state = {"provider": "config", "fallback_used": False, "sentences": []}
+    workout_fallback_statuses = {"all_question_brains_failed_or_skipped", "empty_question_fallback"}
+
+    def _answer_sentences():
+        # Runs on the stream producer thread; route meta is thread-local, so read it here.
+        stream = brain_router.stream_question_response(
+            prompt_for_router,
+            language=language,
+            persona=persona,
+            context=context,
+            user_name=user_name or None,
+            timeout_cap_seconds=timeout_budget,
+            restrict_brains=restrict_question_brains,
+        )
+        try:
+            for sentence in stream:
+                meta = brain_router.get_last_route_meta()
+                provider = str(meta.get("provider") or "config").strip().lower()
+                status = str(meta.get("status") or "").strip().lower()
+                state["provider"] = provider
+                if status and status != "success":
+                    state["fallback_used"] = True
+                if context == "workout" and (status in workout_fallback_statuses or provider not in {"grok", "policy"}):
+                    state["fallback_used"] = True
+                    yield workout_talk_fallback(language, workout_context)
+                    return
+                text = enforce_language_consistency(
+                    sentence,
+                    language,
+                    phase=phase if context == "workout" else None,
+                )
+                if not text:
+                    continue
+                if context == "workout" and _response_claims_invalid_hr(language, text, workout_context):
+                    state["fallback_used"] = True
+                    yield workout_talk_fallback(language, workout_context)
+                    return
+                yield text
+        finally:
+            stream.close()
+        if context == "workout":
+            progress_hint = _format_workout_progress_hint(language, workout_context)
+            if progress_hint:
+                yield progress_hint
+
+    def _synthesize(text: str):
+        try:
+            voice_file = generate_voice(
+                text,
+                language=language,
+                persona=persona,
+                emotional_mode=_infer_emotional_mode(intensity),
+            )
+            return f"/download/{os.path.relpath(voice_file, OUTPUT_FOLDER)}"
+        except Exception as exc:
+            logger.warning("Coach talk stream TTS failed: %s", exc)
+            return None
+
+    def generate():
+        first_audio_ms = None
+        try:
+            pipeline = stream_sentence_audio(
+                _answer_sentences(),
+                _synthesize,
+                executor=_talk_tts_executor,
+                timeout=float(getattr(config, "TALK_STREAM_STALL_SECONDS", 8.0)),
+                # The router stops generating at timeout_budget and falls back to config
+                # text; the extra second lets that fallback through before we stop listening.
+                deadline=time.monotonic() + float(timeout_budget) + 1.0,
+            )
+            for index, (text, audio_url) in enumerate(pipeline):
+                if first_audio_ms is None:
+                    first_audio_ms = int(round((time.perf_counter() - started_at) * 1000))
+                state["sentences"].append(text)
+                event = {"type": "sentence", "index": index, "text": text, "audio_url": audio_url}
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as exc:
+            logger.warning("Coach talk stream interrupted: %s", exc)
+            state["fallback_used"] = True
+            if not state["sentences"]:
+                text = workout_talk_fallback(language, workout_context)
+                state["sentences"].append(text)
+                event = {"type": "sentence", "index": 0, "text": text, "audio_url": _synthesize(text)}
+                yield f"data: {json.dumps(event)}\n\n"
+
+        coach_text = " ".join(state["sentences"]).strip()
+        latency_ms = int(round((time.perf_counter() - started_at) * 1000))
+        logger.info(
+            "Coach talk stream response trigger=%s latency_ms=%s first_audio_ms=%s provider=%s mode=%s sentences=%s fallback_used=%s",
+            trigger_source,
+            latency_ms,
+            first_audio_ms,
+            state["provider"],
+            mode,
+            len(state["sentences"]),
+            state["fallback_used"],
+        )
+        _record_talk_session_message(talk_session_id, "assistant", coach_text)
+        done = {
+            "type": "done",
+            "contract_version": contract_version,
+            "text": coach_text,
+            "personality": persona,
+            "trigger_source": trigger_source,
+            "provider": state["provider"],
+            "mode": mode,
+            "latency_ms": latency_ms,
+            "first_audio_ms": first_audio_ms,
+            "fallback_used": state["fallback_used"],
+            "stt_source": stt_source,
+            "policy_blocked": False,
+        }
+        yield f"data: {json.dumps(done)}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @app.route('/coach/talk', methods=['POST'])
 @require_mobile_auth
 def coach_talk():
@@ -5371,8 +5742,27 @@ def coach_talk():
             # and only fall back to config if Grok fails or times out.
             restrict_question_brains = ["grok"]
 
+        if is_question and _talk_stream_requested(form, payload, response_mode):
+            return _stream_coach_talk_response(
+                prompt_for_router=prompt_for_router,
+                language=language,
+                persona=persona,
+                context=context,
+                phase=phase,
+                intensity=intensity,
+                user_name=user_name,
+                workout_context=workout_context,
+                timeout_budget=timeout_budget,
+                restrict_question_brains=restrict_question_brains,
+                talk_session_id=talk_session_id,
+                contract_version=contract_version,
+                trigger_source=trigger_source,
+                stt_source=stt_source,
+                started_at=started_at,
+            )
+
         if is_question:
-            coach_text = brain_router.get_question_response(
+            route = brain_router.route_question_response(
                 prompt_for_router,
                 language=language,
                 persona=persona,
@@ -5383,7 +5773,7 @@ def coach_talk():
             )
         else:
             # Backward-compatible non-QA route (rare for workout talk).
-            coach_text = brain_router.get_coaching_response(
+            route = brain_router.route_coaching_response(
                 {"intensity": intensity, "volume": 50, "tempo": 20},
                 phase,
                 mode="chat",
@@ -5391,7 +5781,8 @@ def coach_talk():
                 persona=persona,
             )
 
-        route_meta = brain_router.get_last_route_meta()
+        coach_text = route.text
+        route_meta = route.meta
         route_provider = str(route_meta.get("provider") or "config").strip().lower()
         route_status = str(route_meta.get("status") or "").strip().lower()
         if route_status and route_status != "success":
@@ -0,0 +1,382 @@
+"""
+Background maintenance for expired rows and cache files.
+
+Housekeeping used to run inline on request paths: rate-limit counter cleanup
+inside limited requests, email-code pruning during sign-in, and TTS cache
+sweeps after audio writes. `MaintenanceScheduler` moves all of it to one
+daemon thread per worker:
+
+- each job runs on its own interval and is timed (per-job duration metrics)
+- a lease row in `maintenance_leases` elects a single leader across workers
+  and instances, so only one process deletes rows at a time; jobs marked
+  `local` (the TTS cache directory is per host/container) run in every process
+- deletes run in primary-key chunks with a commit per chunk, keeping lock
+  times short on large tables
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_LEASE_NAME = "maintenance"
+
+
+@dataclass(frozen=True)
+class MaintenanceJob:
+    name: str
+    # now_ts -> number of rows/files removed
+    run: Callable[[float], int]
+    interval_seconds: float
+    # Local-disk jobs run in every process; database jobs only on the lease holder.
+    local: bool = False
+
+
+def _naive_utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(max(0.0, timestamp), tz=timezone.utc).replace(tzinfo=None)
+
+
+def _chunk_size() -> int:
+    return max(1, int(getattr(config, "MAINTENANCE_DELETE_CHUNK_SIZE", 1000)))
+
+
+def delete_in_chunks(model, *criteria, chunk_size: Optional[int] = None) -> int:
+    """Delete rows matching `criteria` in primary-key batches, committing after each batch."""
+    from sqlalchemy import delete, select, tuple_
+    from database import db
+
+    table = model.__table__
+    pk_columns = list(table.primary_key.columns)
+    key = pk_columns[0] if len(pk_columns) == 1 else tuple_(*pk_columns)
+    batch_size = chunk_size or _chunk_size()
+
+    removed = 0
+    while True:
+        batch = select(*pk_columns).where(*criteria).limit(batch_size)
+        result = db.session.execute(delete(table).where(key.in_(batch)))
+        db.session.commit()
+        deleted = max(0, int(result.rowcount or 0))
+        removed += deleted
+        if deleted < batch_size:
+            return removed
+
+
+# ------------------------------------------------------------------
+# Jobs
+# ------------------------------------------------------------------
+
+def purge_expired_rate_limits(now_ts: float) -> int:
+    from database import RateLimitCounter, RateLimitState
+
+    retention = max(3600, int(getattr(config, "RATE_LIMIT_RETENTION_SECONDS", 7 * 24 * 3600)))
+    removed = delete_in_chunks(RateLimitCounter, RateLimitCounter.updated_at < _naive_utc(now_ts - retention))
+    # A GCRA row whose TAT has passed holds no remaining usage.
+    removed += delete_in_chunks(RateLimitState, RateLimitState.tat < now_ts)
+    return removed
+
+
+def purge_expired_email_auth_codes(now_ts: float) -> int:
+    from database import EmailAuthCode
+
+    return delete_in_chunks(EmailAuthCode, EmailAuthCode.expires_at < _naive_utc(now_ts))
+
+
+def purge_expired_refresh_tokens(now_ts: float) -> int:
+    from database import RefreshToken
+
+    # Keep expired rows for a while so reuse of a rotated token can still be traced.
+    retention = max(0, int(getattr(config, "REFRESH_TOKEN_RETENTION_SECONDS", 7 * 24 * 3600)))
+    return delete_in_chunks(RefreshToken, RefreshToken.expires_at < _naive_utc(now_ts - retention))
+
+
+def purge_stale_runtime_sessions(now_ts: float) -> int:
+    from database import RuntimeSessionState
+
+    retention = int(getattr(config, "RUNTIME_SESSION_RETENTION_SECONDS", 30 * 24 * 3600))
+    if retention <= 0:
+        return 0
+    return delete_in_chunks(RuntimeSessionState, RuntimeSessionState.updated_at < _naive_utc(now_ts - retention))
+
+
+def purge_stale_brain_health(now_ts: float) -> int:
+    from database import BrainHealthState
+
+    # Rows from workers that stopped syncing; readers already ignore them.
+    retention = max(60.0, float(getattr(config, "BRAIN_SHARED_HEALTH_STALE_SECONDS", 600)))
+    return delete_in_chunks(BrainHealthState, BrainHealthState.updated_at < _naive_utc(now_ts - retention))
+
+
+def purge_tts_audio_cache(_now_ts: float) -> int:
+    if not bool(getattr(config, "TTS_AUDIO_CACHE_ENABLED", False)):
+        return 0
+    from elevenlabs_tts import cleanup_cache_dir
+
+    return cleanup_cache_dir(str(getattr(config, "TTS_AUDIO_CACHE_DIR", "")))
+
+
+def build_default_jobs() -> List[MaintenanceJob]:
+    return [
+        MaintenanceJob("rate_limits", purge_expired_rate_limits, 300),
+        MaintenanceJob("email_auth_codes", purge_expired_email_auth_codes, 600),
+        MaintenanceJob("refresh_tokens", purge_expired_refresh_tokens, 3600),
+        MaintenanceJob("runtime_sessions", purge_stale_runtime_sessions, 3600),
+        MaintenanceJob("brain_health", purge_stale_brain_health, 600),
+        MaintenanceJob("tts_audio_cache", purge_tts_audio_cache, 3600, local=True),
+    ]
+
+
+# ------------------------------------------------------------------
+# Leader lease
+# ------------------------------------------------------------------
+
+def try_acquire_lease(name: str, holder: str, lease_seconds: float, now_ts: float) -> bool:
+    """Take or renew the named lease; True when `holder` owns it afterwards."""
+    from database import MaintenanceLease, db
+
+    table = MaintenanceLease.__table__
+    values = {
+        "name": name,
+        "holder": holder,
+        "expires_at": now_ts + lease_seconds,
+        "updated_at": _naive_utc(now_ts),
+    }
+    bind = db.session.get_bind()
+    dialect_name = bind.dialect.name if bind is not None else ""
+    try:
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            raise RuntimeError("dialect_fallback")
+
+        stmt = dialect_insert(table).values(values)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={
+                "holder": excluded.holder,
+                "expires_at": excluded.expires_at,
+                "updated_at": excluded.updated_at,
+            },
+            where=(table.c.holder == excluded.holder) | (table.c.expires_at < now_ts),
+        ).returning(table.c.holder)
+        acquired = db.session.execute(stmt).first() is not None
+        db.session.commit()
+        return acquired
+    except Exception:
+        db.session.rollback()
+        lease = db.session.get(MaintenanceLease, name)
+        if lease is None:
+            db.session.add(MaintenanceLease(**values))
+        elif lease.holder == holder or float(lease.expires_at) < now_ts:
+            lease.holder = holder
+            lease.expires_at = values["expires_at"]
+            lease.updated_at = values["updated_at"]
+        else:
+            db.session.rollback()
+            return False
+        try:
+            db.session.commit()
+            return True
+        except Exception:
+            db.session.rollback()
+            return False
+
+
+def release_lease(name: str, holder: str) -> None:
+    from database import MaintenanceLease, db
+
+    try:
+        MaintenanceLease.query.filter_by(name=name, holder=holder).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.debug("Maintenance lease release failed", exc_info=True)
+
+
+# ------------------------------------------------------------------
+# Scheduler
+# ------------------------------------------------------------------
+
+class MaintenanceScheduler:
+    """Runs maintenance jobs on one daemon thread; only the lease holder touches the database."""
+
+    def __init__(
+        self,
+        app,
+        jobs: Optional[List[MaintenanceJob]] = None,
+        *,
+        tick_seconds: float = 60.0,
+        lease_seconds: Optional[float] = None,
+        holder: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.app = app
+        self.jobs = list(jobs if jobs is not None else build_default_jobs())
+        self.tick_seconds = max(1.0, float(tick_seconds))
+        self.lease_seconds = float(lease_seconds or max(3 * self.tick_seconds, 180.0))
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_run_at: Dict[str, float] = {}
+        self._is_leader = False
+        self._ticks = 0
+        self._job_stats: Dict[str, Dict[str, Any]] = {
+            job.name: {
+                "runs": 0,
+                "failures": 0,
+                "removed_total": 0,
+                "last_removed": 0,
+                "last_duration_ms": 0.0,
+                "max_duration_ms": 0.0,
+                "total_duration_ms": 0.0,
+                "last_run_at": None,
+            }
+            for job in self.jobs
+        }
+
+    def run_pending(self) -> Dict[str, int]:
+        """
+        Run every due local job, plus every due database job if this process holds
+        the lease. Returns removed counts per job run.
+        """
+        now_ts = self._clock()
+        results: Dict[str, int] = {}
+        with self.app.app_context():
+            is_leader = False
+            if any(not job.local for job in self.jobs):
+                try:
+                    is_leader = try_acquire_lease(MAINTENANCE_LEASE_NAME, self.holder, self.lease_seconds, now_ts)
+                except Exception:
+                    logger.warning("Maintenance lease check failed", exc_info=True)
+            with self._lock:
+                self._ticks += 1
+                self._is_leader = is_leader
+
+            for job in self.jobs:
+                if not (job.local or is_leader):
+                    continue
+                last_run_at = self._last_run_at.get(job.name)
+                if last_run_at is not None and now_ts - last_run_at < job.interval_seconds:
+                    continue
+                self._last_run_at[job.name] = now_ts
+                results[job.name] = self._run_job(job, now_ts)
+        return results
+
+    def _run_job(self, job: MaintenanceJob, now_ts: float) -> int:
+        from database import db
+
+        started = time.perf_counter()
+        removed = 0
+        failed = False
+        try:
+            removed = int(job.run(now_ts) or 0)
+        except Exception:
+            failed = True
+            db.session.rollback()
+            logger.warning("Maintenance job %s failed", job.name, exc_info=True)
+        duration_ms = (time.perf_counter() - started) * 1000.0
+
+        with self._lock:
+            stats = self._job_stats.setdefault(job.name, {})
+            stats["runs"] = stats.get("runs", 0) + 1
+            stats["failures"] = stats.get("failures", 0) + int(failed)
+            stats["removed_total"] = stats.get("removed_total", 0) + removed
+            stats["last_removed"] = removed
+            stats["last_duration_ms"] = round(duration_ms, 2)
+            stats["max_duration_ms"] = round(max(stats.get("max_duration_ms", 0.0), duration_ms), 2)
+            stats["total_duration_ms"] = round(stats.get("total_duration_ms", 0.0) + duration_ms, 2)
+            stats["last_run_at"] = now_ts
+        if removed:
+            logger.info("Maintenance job %s removed %s item(s) in %.1fms", job.name, removed, duration_ms)
+        return removed
+
+    def _loop(self) -> None:
+        while not self._stop_event.wait(self.tick_seconds):
+            try:
+                self.run_pending()
+            except Exception:
+                logger.warning("Maintenance tick failed", exc_info=True)
+
+    def start(self) -> bool:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._loop, name="maintenance", daemon=True)
+            self._thread.start()
+        logger.info("Maintenance scheduler started (tick=%ss holder=%s)", self.tick_seconds, self.holder)
+        return True
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if self._is_leader:
+            with self.app.app_context():
+                release_lease(MAINTENANCE_LEASE_NAME, self.holder)
+            self._is_leader = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": bool(self._thread is not None and self._thread.is_alive()),
+                "leader": self._is_leader,
+                "holder": self.holder,
+                "ticks": self._ticks,
+                "tick_seconds": self.tick_seconds,
+                "jobs": {name: dict(values) for name, values in self._job_stats.items()},
+            }
+
+
+_SCHEDULER: Optional[MaintenanceScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def maintenance_scheduler_enabled() -> bool:
+    return bool(getattr(config, "MAINTENANCE_SCHEDULER_ENABLED", True))
+
+
+def maintenance_scheduler_running() -> bool:
+    """True when this process runs the scheduler thread (and with it the local-disk jobs)."""
+    scheduler = _SCHEDULER
+    return bool(scheduler is not None and scheduler.stats()["running"])
+
+
+def start_maintenance_scheduler(app) -> Optional[MaintenanceScheduler]:
+    """Start the process-wide scheduler once; None when disabled by config."""
+    global _SCHEDULER
+
+    if not maintenance_scheduler_enabled():
+        return None
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = MaintenanceScheduler(
+                app,
+                tick_seconds=float(getattr(config, "MAINTENANCE_TICK_SECONDS", 60)),
+            )
+        _SCHEDULER.start()
+        return _SCHEDULER
+
+
+def get_maintenance_stats() -> Dict[str, Any]:
+    scheduler = _SCHEDULER
+    if scheduler is None:
+        return {"enabled": maintenance_scheduler_enabled(), "running": False}
+    return {"enabled": maintenance_scheduler_enabled(), **scheduler.stats()}
@@ -8,6 +8,8 @@
 
 from typing import List, Optional, Dict
 
+import prompt_cache
+
 
 # Shared endurance coach prompt compatibility surface.
 # Kept here so personas and prompt policy live in one place.
@@ -134,10 +136,13 @@ def get_coach_prompt(mode: str = "chat", language: str = "en") -> str:
     """
     Backward-compatible prompt accessor used by brain adapters.
     """
-    base_prompt = NORDIC_ENDURANCE_COACH_PERSONALITY if language == "no" else ENDURANCE_COACH_PERSONALITY
-    if mode == "realtime_coach":
-        return f"{base_prompt}\n\n{REALTIME_COACH_PROMPT}"
-    return base_prompt
+    def _build() -> str:
+        base_prompt = NORDIC_ENDURANCE_COACH_PERSONALITY if language == "no" else ENDURANCE_COACH_PERSONALITY
+        if mode == "realtime_coach":
+            return f"{base_prompt}\n\n{REALTIME_COACH_PROMPT}"
+        return base_prompt
+
+    return prompt_cache.compiled("coach_prompt", (mode, language), _build)
 
 
 # =============================================================================
@@ -568,6 +573,16 @@ Vær støttende, tydelig og hjelpsom.
         if safety_override:
             emotional_mode = "supportive"
 
+        prompt = prompt_cache.compiled(
+            "persona_system",
+            (persona, language, emotional_mode or None),
+            lambda: cls._build_system_prompt(persona, language, emotional_mode),
+        )
+        prompt_cache.record_prompt_bytes("persona_system", prompt)
+        return prompt
+
+    @classmethod
+    def _build_system_prompt(cls, persona: str, language: str, emotional_mode: Optional[str]) -> str:
         # Select language variant for base prompt
         if language == "no":
             prompt = cls.PERSONAS_NO.get(persona, cls.PERSONAS_NO.get("default", cls.PERSONAS["default"]))
@@ -604,6 +619,11 @@ Vær støttende, tydelig og hjelpsom.
         persona_modifiers = modifiers.get(persona, {})
         return persona_modifiers.get(mode)
 
+    @classmethod
+    def reload_prompts(cls) -> None:
+        """Drop compiled prompts after persona or modifier definitions change at runtime."""
+        prompt_cache.invalidate()
+
     @classmethod
     def list_personas(cls) -> List[str]:
         """List all available personas (excluding 'default')."""
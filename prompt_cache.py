@@ -0,0 +1,107 @@
+"""
+Compiled system-prompt cache with prompt-size metrics.
+
+Persona prompts, coach prompts and persona directives are pure functions of a
+handful of coarse inputs (persona, language, mode, emotional mode, ...), yet
+they were rebuilt from string fragments on every brain call. `compiled`
+memoizes each build per `(surface, key)`; the same inputs always yield the
+identical string, which also keeps the prompt prefix byte-stable so
+provider-side prompt caching can reuse it.
+
+`record_prompt_bytes` tracks how large the final prompts sent to providers
+are, per surface, so prompt growth shows up in `/brain/health`.
+
+Call `invalidate` after persona definitions change at runtime
+(`PersonaManager.reload_prompts`).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_DEFAULT_MAX_ENTRIES = 512
+
+
+class PromptCache:
+    """Bounded LRU of compiled prompt strings, grouped by surface."""
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._surfaces: Dict[str, Dict[str, int]] = {}
+
+    def _surface(self, surface: str) -> Dict[str, int]:
+        stats = self._surfaces.get(surface)
+        if stats is None:
+            stats = {"hits": 0, "misses": 0, "calls": 0, "bytes_total": 0, "bytes_last": 0, "bytes_max": 0}
+            self._surfaces[surface] = stats
+        return stats
+
+    def compiled(self, surface: str, key: Hashable, build: Callable[[], str]) -> str:
+        """Return the cached prompt for `(surface, key)`, building it on first use."""
+        cache_key = (surface, key)
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if cached is not None:
+                self._entries.move_to_end(cache_key)
+                self._surface(surface)["hits"] += 1
+                return cached
+        prompt = build()
+        with self._lock:
+            self._surface(surface)["misses"] += 1
+            self._entries[cache_key] = prompt
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return prompt
+
+    def record_bytes(self, surface: str, prompt: str) -> None:
+        size = len((prompt or "").encode("utf-8"))
+        with self._lock:
+            stats = self._surface(surface)
+            stats["calls"] += 1
+            stats["bytes_total"] += size
+            stats["bytes_last"] = size
+            stats["bytes_max"] = max(stats["bytes_max"], size)
+
+    def invalidate(self, surface: Optional[str] = None) -> None:
+        with self._lock:
+            if surface is None:
+                self._entries.clear()
+                return
+            for cache_key in [item for item in self._entries if item[0] == surface]:
+                del self._entries[cache_key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            surfaces = {}
+            for surface, stats in self._surfaces.items():
+                lookups = stats["hits"] + stats["misses"]
+                surfaces[surface] = {
+                    **stats,
+                    "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+                    "bytes_avg": int(stats["bytes_total"] / stats["calls"]) if stats["calls"] else 0,
+                }
+            return {"entries": len(self._entries), "surfaces": surfaces}
+
+
+_PROMPT_CACHE = PromptCache()
+
+
+def compiled(surface: str, key: Hashable, build: Callable[[], str]) -> str:
+    return _PROMPT_CACHE.compiled(surface, key, build)
+
+
+def record_prompt_bytes(surface: str, prompt: str) -> None:
+    _PROMPT_CACHE.record_bytes(surface, prompt)
+
+
+def invalidate(surface: Optional[str] = None) -> None:
+    _PROMPT_CACHE.invalidate(surface)
+
+
+def get_prompt_cache_stats() -> Dict[str, Any]:
+    return _PROMPT_CACHE.stats()
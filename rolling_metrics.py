@@ -0,0 +1,110 @@
+"""
+Fixed-size rolling aggregates for per-session workout histories.
+
+`workout_state` is persisted as JSON on every tick, so everything here is plain
+dicts and lists. Histories are bounded in place (`append_bounded`) and per-metric
+aggregates (EMA, min/max, count) are folded in one raw sample at a time, which
+keeps both the per-tick cost and the stored payload constant no matter how long
+the workout runs.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, MutableSequence, Optional
+
+BREATH_HISTORY_CAPACITY = 10
+COACHING_HISTORY_CAPACITY = 10
+
+BREATH_AGGREGATE_KEYS = (
+    "respiratory_rate",
+    "volume",
+    "breath_regularity",
+    "inhale_exhale_ratio",
+    "signal_quality",
+    "dominant_frequency",
+    "intensity_score",
+)
+
+
+def append_bounded(history: MutableSequence, item: Any, capacity: int) -> None:
+    """Append `item` and drop the oldest entries so at most `capacity` remain."""
+    history.append(item)
+    overflow = len(history) - max(1, int(capacity))
+    if overflow > 0:
+        del history[:overflow]
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def fold_metric(
+    aggregate: Optional[Dict[str, Any]],
+    value: Any,
+    *,
+    alpha: float,
+) -> Dict[str, Any]:
+    """Fold one sample into a metric aggregate; `None` samples are ignored."""
+    current = aggregate if isinstance(aggregate, dict) else {}
+    sample = _as_float(value)
+    if sample is None:
+        return current
+
+    previous_ema = _as_float(current.get("ema"))
+    previous_min = _as_float(current.get("min"))
+    previous_max = _as_float(current.get("max"))
+
+    current["count"] = int(current.get("count") or 0) + 1
+    current["ema"] = sample if previous_ema is None else (alpha * sample) + ((1 - alpha) * previous_ema)
+    current["min"] = sample if previous_min is None else min(previous_min, sample)
+    current["max"] = sample if previous_max is None else max(previous_max, sample)
+    # Dropped fields still stored by older sessions.
+    current.pop("window", None)
+    current.pop("median", None)
+    return current
+
+
+def update_breath_aggregates(
+    aggregates: Optional[Dict[str, Any]],
+    entry: Dict[str, Any],
+    *,
+    alpha: float,
+    raw: Optional[Dict[str, Any]] = None,
+    keys: Iterable[str] = BREATH_AGGREGATE_KEYS,
+) -> Dict[str, Any]:
+    """
+    Fold a stored breath-history entry into the session's rolling aggregates.
+
+    Metrics are taken from `raw`, the unsmoothed reading, when given: the
+    stored entry already carries smoothed values, and folding those would
+    smooth twice. Intensity counts follow the stored entry.
+    """
+    aggregates = aggregates if isinstance(aggregates, dict) else {}
+    metrics = aggregates.setdefault("metrics", {})
+    samples = raw if isinstance(raw, dict) else entry
+    for key in keys:
+        folded = fold_metric(metrics.get(key), samples.get(key), alpha=alpha)
+        if folded:
+            metrics[key] = folded
+
+    intensity = entry.get("intensity")
+    if intensity:
+        counts = aggregates.setdefault("intensity_counts", {})
+        counts[intensity] = int(counts.get(intensity) or 0) + 1
+    aggregates["samples"] = int(aggregates.get("samples") or 0) + 1
+    return aggregates
+
+
+def running_ema(aggregates: Optional[Dict[str, Any]], key: str) -> Optional[float]:
+    """Return the maintained EMA for `key`, or None when nothing was folded yet."""
+    if not isinstance(aggregates, dict):
+        return None
+    metric = (aggregates.get("metrics") or {}).get(key)
+    if not isinstance(metric, dict):
+        return None
+    return _as_float(metric.get("ema"))
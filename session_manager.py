@@ -3,14 +3,26 @@
 # Manages conversation sessions and message history
 #
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+from collections import deque
 from datetime import datetime, timezone
 from dataclasses import dataclass, asdict
+import base64
+import copy
 import json
+import threading
 
 from flask import has_app_context
 
+import config
 from breathing_timeline import BreathingTimeline
+from rolling_metrics import (
+    BREATH_HISTORY_CAPACITY,
+    COACHING_HISTORY_CAPACITY,
+    append_bounded,
+    update_breath_aggregates,
+)
+from zone_engine_state import ZoneEngineState
 
 
 @dataclass
@@ -143,6 +155,10 @@ class EmotionalState:
         return cls(**filtered)
 
 
+class SessionVersionConflict(RuntimeError):
+    """Raised when a guarded session write keeps losing to concurrent writers."""
+
+
 class SessionManager:
     """
     Manages conversation sessions and memory.
@@ -154,20 +170,33 @@ class SessionManager:
     - Manage context windows
     """
 
-    def __init__(self, storage_backend="memory", app=None):
+    DEFAULT_UPDATE_ATTEMPTS = 4
+
+    def __init__(self, storage_backend="memory", app=None, shared_store: bool = False):
         """
         Initialize session manager.
 
         Args:
             storage_backend: "memory" (default) or "database"
             app: Optional Flask app used to resolve a DB engine outside request/app context
+            shared_store: Validate cached sessions against the stored version before
+                serving them, so several workers can serve ticks for the same session
         """
         self.sessions: Dict[str, Dict] = {}
         normalized_backend = str(storage_backend or "memory").strip().lower()
         self.storage_backend = normalized_backend if normalized_backend in {"memory", "database"} else "memory"
         self.app = app
+        self.shared_store = bool(shared_store)
         self._database_storage_disabled_reason: Optional[str] = None
         self._database_runtime_table_verified = False
+        # Version of each cached session as last read from / written to storage.
+        self._session_versions: Dict[str, int] = {}
+        self._session_locks: Dict[str, threading.RLock] = {}
+        self._session_locks_guard = threading.Lock()
+        # Materialized breathing timelines, one per session, reused across ticks.
+        self._timelines: Dict[str, BreathingTimeline] = {}
+        # Session version each cached timeline was last read at / written with.
+        self._timeline_versions: Dict[str, int] = {}
 
     @staticmethod
     def _utcnow_naive() -> datetime:
@@ -266,6 +295,11 @@ class SessionManager:
                 "__type__": "BreathingTimeline",
                 "payload": value.to_dict(),
             }
+        if isinstance(value, ZoneEngineState):
+            return {
+                "__type__": "ZoneEngineState",
+                "payload": value.to_dict(),
+            }
         raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
     def _decode_special_types(self, value: Any):
@@ -275,35 +309,93 @@ class SessionManager:
             marker = str(value.get("__type__") or "").strip()
             if marker == "BreathingTimeline":
                 return BreathingTimeline.from_dict(value.get("payload"))
+            if marker == "ZoneEngineState":
+                return ZoneEngineState.from_dict(value.get("payload"))
             return {key: self._decode_special_types(item) for key, item in value.items()}
         return value
 
-    def _persist_session_record(self, session_id: str, session: Dict) -> None:
+    @staticmethod
+    def _session_summary_columns(session: Dict) -> tuple:
+        persona = str(session.get("persona") or "").strip() or None
+        messages = session.get("messages")
+        message_count = len(messages) if isinstance(messages, list) else 0
+        return persona, message_count
+
+    def _persist_session_record(
+        self,
+        session_id: str,
+        session: Dict,
+        expected_version: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Write a session row and return its new version.
+
+        With `expected_version` the write is a compare-and-swap: it only lands if
+        the stored version still matches (0 means "must not exist yet"), otherwise
+        SessionVersionConflict is raised. Returns None when nothing was persisted.
+        """
         if not self._database_runtime_table_ready():
-            return
+            return None
 
         from database import RuntimeSessionState
+        from sqlalchemy import select
+        from sqlalchemy.exc import IntegrityError
 
         normalized_session_id = self._normalize_session_id(session_id)
         if not normalized_session_id:
-            return
+            return None
 
         now = self._utcnow_naive()
         payload_json = json.dumps(session, default=self._encode_special_types, ensure_ascii=True)
         user_id = str(session.get("user_id") or "").strip() or None
+        persona, message_count = self._session_summary_columns(session)
         values = {
             "session_id": normalized_session_id,
             "user_id": user_id,
             "payload_json": payload_json,
+            "persona": persona,
+            "message_count": message_count,
+            "version": 1,
             "created_at": now,
             "updated_at": now,
         }
+        updated_values = {
+            "user_id": user_id,
+            "payload_json": payload_json,
+            "persona": persona,
+            "message_count": message_count,
+            "updated_at": now,
+        }
         table = RuntimeSessionState.__table__
         bind = self._database_bind()
         if bind is None:
-            return
+            return None
         dialect_name = bind.dialect.name if bind is not None else ""
 
+        if expected_version is not None:
+            try:
+                with bind.begin() as connection:
+                    if expected_version <= 0:
+                        connection.execute(table.insert().values(**values))
+                        return 1
+                    updated = connection.execute(
+                        table.update()
+                        .where(
+                            table.c.session_id == normalized_session_id,
+                            table.c.version == expected_version,
+                        )
+                        .values(version=expected_version + 1, **updated_values)
+                    ).rowcount
+            except IntegrityError:
+                raise SessionVersionConflict(normalized_session_id)
+            except Exception as exc:
+                if self._is_missing_runtime_table_error(exc):
+                    self._disable_database_storage(self._missing_runtime_table_reason(), error=exc)
+                return None
+            if not updated:
+                raise SessionVersionConflict(normalized_session_id)
+            return expected_version + 1
+
         try:
             if dialect_name == "sqlite":
                 from sqlalchemy.dialects.sqlite import insert as dialect_insert
@@ -315,19 +407,14 @@ class SessionManager:
             stmt = dialect_insert(table).values(**values)
             stmt = stmt.on_conflict_do_update(
                 index_elements=["session_id"],
-                set_={
-                    "user_id": user_id,
-                    "payload_json": payload_json,
-                    "updated_at": now,
-                },
-            )
+                set_={**updated_values, "version": table.c.version + 1},
+            ).returning(table.c.version)
             with bind.begin() as connection:
-                connection.execute(stmt)
-            return
+                return int(connection.execute(stmt).scalar_one())
         except Exception as exc:
             if self._is_missing_runtime_table_error(exc):
                 self._disable_database_storage(self._missing_runtime_table_reason(), error=exc)
-                return
+                return None
             pass
 
         try:
@@ -335,17 +422,20 @@ class SessionManager:
                 updated = connection.execute(
                     table.update()
                     .where(table.c.session_id == normalized_session_id)
-                    .values(
-                        user_id=user_id,
-                        payload_json=payload_json,
-                        updated_at=now,
-                    )
+                    .values(version=table.c.version + 1, **updated_values)
                 ).rowcount
                 if not updated:
                     connection.execute(table.insert().values(**values))
+                    return 1
+                return int(
+                    connection.execute(
+                        select(table.c.version).where(table.c.session_id == normalized_session_id)
+                    ).scalar_one()
+                )
         except Exception as exc:
             if self._is_missing_runtime_table_error(exc):
                 self._disable_database_storage(self._missing_runtime_table_reason(), error=exc)
+            return None
 
     def _load_session_record(self, session_id: str) -> Optional[Dict]:
         normalized_session_id = self._normalize_session_id(session_id)
@@ -366,46 +456,364 @@ class SessionManager:
         try:
             with bind.connect() as connection:
                 row = connection.execute(
-                    select(table.c.payload_json).where(table.c.session_id == normalized_session_id)
+                    select(table.c.payload_json, table.c.version)
+                    .where(table.c.session_id == normalized_session_id)
                 ).first()
         except Exception as exc:
             if self._is_missing_runtime_table_error(exc):
                 self._disable_database_storage(self._missing_runtime_table_reason(), error=exc)
             return self.sessions.get(normalized_session_id)
         if row is None:
-            self.sessions.pop(normalized_session_id, None)
+            self._forget_cached_session(normalized_session_id)
             return None
 
         try:
             payload = json.loads(row[0])
         except (TypeError, json.JSONDecodeError):
-            self.sessions.pop(normalized_session_id, None)
+            self._forget_cached_session(normalized_session_id)
             return None
 
         session = self._decode_special_types(payload)
         if not isinstance(session, dict):
-            self.sessions.pop(normalized_session_id, None)
+            self._forget_cached_session(normalized_session_id)
             return None
         self.sessions[normalized_session_id] = session
+        self._session_versions[normalized_session_id] = int(row[1] or 0)
         return session
 
+    def _load_stored_version(self, session_id: str) -> Optional[int]:
+        """Read only the version column (cheap PK lookup) for cache validation."""
+        if not self._database_runtime_table_ready():
+            return None
+
+        from database import RuntimeSessionState
+        from sqlalchemy import select
+
+        table = RuntimeSessionState.__table__
+        bind = self._database_bind()
+        if bind is None:
+            return None
+        try:
+            with bind.connect() as connection:
+                return connection.execute(
+                    select(table.c.version).where(table.c.session_id == session_id)
+                ).scalar()
+        except Exception as exc:
+            if self._is_missing_runtime_table_error(exc):
+                self._disable_database_storage(self._missing_runtime_table_reason(), error=exc)
+            return None
+
+    def _forget_cached_session(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+        self._session_versions.pop(session_id, None)
+
+    def _commit_session(self, session_id: str, session: Dict, expected_version: Optional[int] = None) -> None:
+        self.sessions[session_id] = session
+        new_version = self._persist_session_record(session_id, session, expected_version=expected_version)
+        if new_version is None:
+            if self._database_runtime_table_ready():
+                # The write failed: keep the version of the row actually stored so the
+                # next compare-and-swap still matches it, and leave the timeline dirty.
+                return
+            new_version = self._session_versions.get(session_id, 0) + 1
+        self._session_versions[session_id] = new_version
+        metadata = session.get("metadata") or {}
+        timeline = metadata.get("breathing_timeline")
+        if isinstance(timeline, BreathingTimeline):
+            # Any session write carries the timeline along; nothing left to flush.
+            timeline.dirty = False
+            cached = self._timelines.get(session_id)
+            if (
+                cached is not None
+                and cached is not timeline
+                and not cached.dirty
+                and cached.to_dict() == timeline.to_dict()
+            ):
+                # Reloaded copy of the cached timeline: keep serving the cached object.
+                metadata["breathing_timeline"] = timeline = cached
+            if cached is timeline:
+                self._timeline_versions[session_id] = new_version
+
+    def session_lock(self, session_id: str) -> threading.RLock:
+        """Per-session re-entrant lock serializing read-modify-write cycles in this process."""
+        normalized_session_id = self._normalize_session_id(session_id)
+        with self._session_locks_guard:
+            lock = self._session_locks.get(normalized_session_id)
+            if lock is None:
+                lock = threading.RLock()
+                self._session_locks[normalized_session_id] = lock
+            return lock
+
+    def get_breathing_timeline(self, session_id: str) -> Optional[BreathingTimeline]:
+        """
+        Return the session's breathing timeline without writing the session.
+
+        The object is reused across ticks, including after the session itself was
+        reloaded, as long as the stored row version is the one it was read at or
+        written with. New or changed timelines are marked dirty and stored by the
+        next session write or by `flush_breathing_timeline`.
+        """
+        normalized_session_id = self._normalize_session_id(session_id)
+        session = self.get_session(normalized_session_id)
+        if session is None:
+            self._timelines.pop(normalized_session_id, None)
+            self._timeline_versions.pop(normalized_session_id, None)
+            return None
+
+        metadata = session.setdefault("metadata", {})
+        stored = metadata.get("breathing_timeline")
+        cached = self._timelines.get(normalized_session_id)
+        version = self._session_versions.get(normalized_session_id, 0)
+        if cached is not None and (
+            stored is cached
+            or cached.dirty
+            or self._timeline_versions.get(normalized_session_id) == version
+        ):
+            metadata["breathing_timeline"] = cached
+            return cached
+
+        if isinstance(stored, BreathingTimeline):
+            timeline = stored
+        elif isinstance(stored, dict):
+            timeline = BreathingTimeline.from_dict(stored)
+        else:
+            timeline = BreathingTimeline()
+            timeline.dirty = True
+        metadata["breathing_timeline"] = timeline
+        self._timelines[normalized_session_id] = timeline
+        self._timeline_versions[normalized_session_id] = version
+        return timeline
+
+    def flush_breathing_timeline(self, session_id: str) -> bool:
+        """Persist the session's breathing timeline if it changed since the last write."""
+        normalized_session_id = self._normalize_session_id(session_id)
+        timeline = self._timelines.get(normalized_session_id)
+        if timeline is None or not timeline.dirty:
+            return False
+
+        def _apply(session: Dict) -> None:
+            session.setdefault("metadata", {})["breathing_timeline"] = timeline
+
+        return self.update_session(normalized_session_id, _apply) is not None
+
+    def get_session_version(self, session_id: str) -> int:
+        """Version of the cached copy of a session (0 if never stored)."""
+        return self._session_versions.get(self._normalize_session_id(session_id), 0)
+
     def save_session(self, session_id: str, session: Dict) -> None:
+        """Store a session unconditionally (last writer wins)."""
         normalized_session_id = self._normalize_session_id(session_id)
         if not normalized_session_id:
             return
-        self.sessions[normalized_session_id] = session
-        self._persist_session_record(normalized_session_id, session)
+        with self.session_lock(normalized_session_id):
+            self._commit_session(normalized_session_id, session)
+
+    def update_session(
+        self,
+        session_id: str,
+        mutator: Callable[[Dict], None],
+        *,
+        max_attempts: Optional[int] = None,
+    ) -> Optional[Dict]:
+        """
+        Apply `mutator` to a session and store it with compare-and-swap.
+
+        The first attempt uses the cached copy; if another worker wrote the session
+        in the meantime the write is rejected, the session is reloaded and the
+        mutator re-applied. Mutators must therefore be safe to re-run.
+
+        Returns:
+            The stored session, or None if the session does not exist
+
+        Raises:
+            SessionVersionConflict: If every attempt lost to a concurrent writer
+        """
+        normalized_session_id = self._normalize_session_id(session_id)
+        if not normalized_session_id:
+            return None
+        attempts = max(1, int(max_attempts or self.DEFAULT_UPDATE_ATTEMPTS))
+
+        with self.session_lock(normalized_session_id):
+            for attempt in range(attempts):
+                session = self.get_session(
+                    normalized_session_id,
+                    refresh=attempt > 0 and self._uses_database_storage(),
+                )
+                if session is None:
+                    return None
+                expected_version = self._session_versions.get(normalized_session_id, 0)
+                mutator(session)
+                try:
+                    self._commit_session(normalized_session_id, session, expected_version=expected_version)
+                    return session
+                except SessionVersionConflict:
+                    continue
+        raise SessionVersionConflict(normalized_session_id)
 
     def save_workout_state(self, session_id: str, workout_state: Optional[Dict]) -> None:
+        def _apply(session: Dict) -> None:
+            if workout_state is None:
+                session.pop("workout_state", None)
+            else:
+                session["workout_state"] = workout_state
+            session["updated_at"] = datetime.now().isoformat()
+
+        self.update_session(session_id, _apply)
+
+    def _encode_state_value(self, value: Any) -> str:
+        def _default(item: Any):
+            if isinstance(item, deque):
+                return list(item)
+            return self._encode_special_types(item)
+
+        return json.dumps(value, default=_default, sort_keys=True, ensure_ascii=True)
+
+    def snapshot_workout_state(self, workout_state: Optional[Dict]) -> Dict[str, Any]:
+        """
+        Baseline of a workout state as loaded at the start of a tick.
+
+        `commit_workout_tick` diffs against it to find what the tick changed.
+        Mapping values (the zone engine, latency strategy, ...) are also
+        snapshotted per field so two ticks touching different fields both land.
+        """
+        baseline: Dict[str, Any] = {}
+        for key, value in (workout_state or {}).items():
+            fields = None
+            if isinstance(value, (dict, ZoneEngineState)):
+                fields = {field: self._encode_state_value(item) for field, item in value.items()}
+            baseline[key] = (self._encode_state_value(value), fields)
+        return baseline
+
+    def _workout_state_changes(self, workout_state: Dict, baseline: Dict[str, Any]) -> List[tuple]:
+        changes: List[tuple] = []
+        for key in [key for key in baseline if key not in workout_state]:
+            changes.append(("drop", key, None, None))
+        for key, value in workout_state.items():
+            encoded, fields = baseline.get(key, (None, None))
+            if encoded == self._encode_state_value(value):
+                continue
+            if fields is None or not isinstance(value, (dict, ZoneEngineState)):
+                changes.append(("set", key, None, value))
+                continue
+            for field, item in value.items():
+                if fields.get(field) != self._encode_state_value(item):
+                    changes.append(("set_field", key, field, item))
+            for field in fields:
+                if field not in value:
+                    changes.append(("drop_field", key, field, None))
+        return changes
+
+    @staticmethod
+    def _apply_workout_state_changes(target: Dict, changes: List[tuple]) -> None:
+        for kind, key, field, value in changes:
+            if kind == "drop":
+                target.pop(key, None)
+            elif kind == "set":
+                target[key] = copy.deepcopy(value)
+            elif kind == "set_field":
+                container = target.get(key)
+                if not isinstance(container, (dict, ZoneEngineState)):
+                    container = target[key] = ZoneEngineState() if key == "zone_engine" else {}
+                container[field] = copy.deepcopy(value)
+            elif kind == "drop_field":
+                container = target.get(key)
+                if isinstance(container, (dict, ZoneEngineState)):
+                    container.pop(field, None)
+
+    def commit_workout_tick(
+        self,
+        session_id: str,
+        workout_state: Dict,
+        baseline: Dict[str, Any],
+        *,
+        breath_analysis: Optional[Dict] = None,
+        coaching_output: Optional[str] = None,
+        phase: Optional[str] = None,
+        elapsed_seconds: Optional[int] = None,
+    ) -> Optional[Dict]:
+        """
+        Store one continuous-coaching tick with a single compare-and-swap write.
+
+        The tick works on the workout state it loaded. Writing that copy back
+        would overwrite whatever another worker stored meanwhile, so only the
+        keys/fields the tick changed (relative to `baseline`) are replayed onto
+        the freshly loaded state, followed by this tick's history appends. A
+        dirty breathing timeline rides along in the same write.
+        """
+        normalized_session_id = self._normalize_session_id(session_id)
+        changes = self._workout_state_changes(workout_state, baseline)
+        timeline = self._timelines.get(normalized_session_id)
+
+        def _apply(session: Dict) -> None:
+            target = session.get("workout_state")
+            if target is not workout_state:
+                # Reloaded (or first) copy: replay this tick's edits onto it.
+                if not isinstance(target, dict):
+                    target = session["workout_state"] = self._new_workout_state()
+                self._apply_workout_state_changes(target, changes)
+            self._apply_tick_update(
+                target,
+                breath_analysis=breath_analysis,
+                coaching_output=coaching_output,
+                phase=phase,
+                elapsed_seconds=elapsed_seconds,
+            )
+            if timeline is not None and timeline.dirty:
+                session.setdefault("metadata", {})["breathing_timeline"] = timeline
+            session["updated_at"] = datetime.now().isoformat()
+
+        return self.update_session(normalized_session_id, _apply)
+
+    def set_strategic_insight(self, session_id: str, insight: Dict) -> None:
+        """
+        Store a background-generated strategic insight on the session.
+
+        Kept beside `workout_state`, not inside it, so a tick saving its own
+        copy of the workout state cannot overwrite a freshly stored insight.
+        """
+        def _apply(session: Dict) -> None:
+            session["strategic_insight"] = dict(insight)
+
+        self.update_session(session_id, _apply)
+
+    def peek_strategic_insight(self, session_id: str) -> Optional[Dict]:
+        """Guidance of the stored insight while it is unconsumed, without marking it."""
         session = self.get_session(session_id)
-        if session is None:
-            return
-        if workout_state is None:
-            session.pop("workout_state", None)
-        else:
-            session["workout_state"] = workout_state
-        session["updated_at"] = datetime.now().isoformat()
-        self.save_session(session_id, session)
+        insight = (session or {}).get("strategic_insight")
+        if not isinstance(insight, dict) or insight.get("consumed"):
+            return None
+        return dict(insight.get("guidance") or {}) or None
+
+    def take_strategic_insight(self, session_id: str) -> Optional[Dict]:
+        """
+        Return the stored insight's guidance once, or None when nothing new is ready.
+
+        Reads the cached session (ticks refresh it via `get_workout_state`)
+        and only writes when there is an unconsumed insight to mark.
+        """
+        session = self.get_session(session_id)
+        insight = (session or {}).get("strategic_insight")
+        if not isinstance(insight, dict) or insight.get("consumed"):
+            return None
+        taken: Dict = {}
+
+        def _apply(current: Dict) -> None:
+            taken.clear()
+            stored = current.get("strategic_insight")
+            if isinstance(stored, dict) and not stored.get("consumed"):
+                taken.update(stored.get("guidance") or {})
+                stored["consumed"] = True
+
+        self.update_session(session_id, _apply)
+        return taken or None
+
+    def get_strategic_insight_elapsed(self, session_id: str) -> Optional[int]:
+        """Workout time at which the stored insight was requested, if any."""
+        session = self.get_session(session_id)
+        insight = (session or {}).get("strategic_insight")
+        if not isinstance(insight, dict) or insight.get("elapsed_seconds") is None:
+            return None
+        return int(insight["elapsed_seconds"])
 
     def create_session(
         self,
@@ -448,6 +856,11 @@ class SessionManager:
             return None
         if self._uses_database_storage() and (refresh or normalized_session_id not in self.sessions):
             return self._load_session_record(normalized_session_id)
+        if self.shared_store and self._uses_database_storage():
+            # Another worker may have written since we cached it; reload only on version drift.
+            stored_version = self._load_stored_version(normalized_session_id)
+            if stored_version is None or stored_version != self._session_versions.get(normalized_session_id):
+                return self._load_session_record(normalized_session_id)
         return self.sessions.get(normalized_session_id)
 
     def session_exists(self, session_id: str) -> bool:
@@ -468,17 +881,16 @@ class SessionManager:
             role: "user" or "assistant"
             content: Message content
         """
-        session = self.get_session(session_id)
-        if session is None:
-            raise ValueError(f"Session {session_id} not found")
+        def _apply(session: Dict) -> None:
+            session.setdefault("messages", []).append({
+                "role": role,
+                "content": content,
+                "timestamp": datetime.now().isoformat()
+            })
+            session["updated_at"] = datetime.now().isoformat()
 
-        session.setdefault("messages", []).append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat()
-        })
-        session["updated_at"] = datetime.now().isoformat()
-        self.save_session(session_id, session)
+        if self.update_session(session_id, _apply) is None:
+            raise ValueError(f"Session {session_id} not found")
 
     def get_messages(
         self,
@@ -516,18 +928,22 @@ class SessionManager:
 
     def set_persona(self, session_id: str, persona: str):
         """Change session persona."""
-        session = self.get_session(session_id)
-        if session is not None:
+        def _apply(session: Dict) -> None:
             session["persona"] = persona
             session["updated_at"] = datetime.now().isoformat()
-            self.save_session(session_id, session)
+
+        self.update_session(session_id, _apply)
 
     def delete_session(self, session_id: str):
         """Delete session and all messages."""
         normalized_session_id = self._normalize_session_id(session_id)
         if not normalized_session_id:
             return
-        self.sessions.pop(normalized_session_id, None)
+        self._forget_cached_session(normalized_session_id)
+        self._timelines.pop(normalized_session_id, None)
+        self._timeline_versions.pop(normalized_session_id, None)
+        with self._session_locks_guard:
+            self._session_locks.pop(normalized_session_id, None)
         if self._database_runtime_table_ready():
             from database import RuntimeSessionState
 
@@ -546,97 +962,181 @@ class SessionManager:
                     self._disable_database_storage(self._missing_runtime_table_reason(), error=exc)
         print(f"🗑️  Deleted session: {normalized_session_id}")
 
-    def list_sessions(self, user_id: Optional[str] = None) -> List[Dict]:
-        """
-        List all sessions.
-
-        Args:
-            user_id: Filter by user_id (optional)
-
-        Returns:
-            List of session summaries
-        """
-        if not self._database_runtime_table_ready():
-            sessions = []
-            for session_id, session in self.sessions.items():
-                if user_id and session["user_id"] != user_id:
-                    continue
-
-                sessions.append({
-                    "session_id": session_id,
-                    "user_id": session["user_id"],
-                    "persona": session["persona"],
-                    "message_count": len(session["messages"]),
-                    "created_at": session["created_at"],
-                    "updated_at": session["updated_at"]
-                })
-            return sessions
+    @staticmethod
+    def _encode_list_cursor(updated_at: str, session_id: str) -> str:
+        raw = json.dumps([updated_at, session_id], ensure_ascii=True).encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
+    @staticmethod
+    def _decode_list_cursor(cursor: Optional[str]) -> Optional[tuple]:
+        normalized = str(cursor or "").strip()
+        if not normalized:
+            return None
+        try:
+            padded = normalized + "=" * (-len(normalized) % 4)
+            decoded = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii"))
+        except (ValueError, TypeError, UnicodeError):
+            raise ValueError("Invalid session list cursor")
+        if (
+            not isinstance(decoded, list)
+            or len(decoded) != 2
+            or not all(isinstance(item, str) for item in decoded)
+        ):
+            raise ValueError("Invalid session list cursor")
+        return decoded[0], decoded[1]
+
+    def _list_memory_session_summaries(
+        self,
+        user_id: Optional[str],
+        limit: Optional[int],
+        after: Optional[tuple],
+    ) -> List[Dict]:
+        summaries = []
+        for session_id, session in self.sessions.items():
+            if user_id and session.get("user_id") != user_id:
+                continue
+            summaries.append({
+                "session_id": session_id,
+                "user_id": session.get("user_id"),
+                "persona": session.get("persona", "personal_trainer"),
+                "message_count": len(session.get("messages", [])),
+                "created_at": session.get("created_at"),
+                "updated_at": session.get("updated_at"),
+            })
+        summaries.sort(key=lambda item: (str(item["updated_at"] or ""), item["session_id"]), reverse=True)
+        if after is not None:
+            summaries = [
+                item for item in summaries
+                if (str(item["updated_at"] or ""), item["session_id"]) < after
+            ]
+        if limit is not None:
+            summaries = summaries[:limit]
+        return summaries
+
+    def _list_database_session_summaries(
+        self,
+        bind,
+        user_id: Optional[str],
+        limit: Optional[int],
+        after: Optional[tuple],
+    ) -> List[Dict]:
         from database import RuntimeSessionState
-        from sqlalchemy import select
+        from sqlalchemy import and_, or_, select
 
         table = RuntimeSessionState.__table__
-        stmt = select(table.c.session_id)
+        stmt = select(
+            table.c.session_id,
+            table.c.user_id,
+            table.c.persona,
+            table.c.message_count,
+            table.c.created_at,
+            table.c.updated_at,
+        )
         if user_id:
             stmt = stmt.where(table.c.user_id == user_id)
+        if after is not None:
+            try:
+                after_updated_at = datetime.fromisoformat(after[0])
+            except ValueError:
+                raise ValueError("Invalid session list cursor")
+            stmt = stmt.where(
+                or_(
+                    table.c.updated_at < after_updated_at,
+                    and_(table.c.updated_at == after_updated_at, table.c.session_id < after[1]),
+                )
+            )
+        stmt = stmt.order_by(table.c.updated_at.desc(), table.c.session_id.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        with bind.connect() as connection:
+            rows = connection.execute(stmt).all()
+        return [
+            {
+                "session_id": row.session_id,
+                "user_id": row.user_id,
+                "persona": row.persona or "personal_trainer",
+                "message_count": int(row.message_count or 0),
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            }
+            for row in rows
+        ]
+
+    def _list_session_summaries(
+        self,
+        user_id: Optional[str],
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None,
+    ) -> List[Dict]:
+        if not self._database_runtime_table_ready():
+            return self._list_memory_session_summaries(user_id, limit, after)
 
         bind = self._database_bind()
         if bind is None:
-            sessions = []
-            for session_id, session in self.sessions.items():
-                if user_id and session["user_id"] != user_id:
-                    continue
-                sessions.append({
-                    "session_id": session_id,
-                    "user_id": session["user_id"],
-                    "persona": session["persona"],
-                    "message_count": len(session["messages"]),
-                    "created_at": session["created_at"],
-                    "updated_at": session["updated_at"]
-                })
-            return sessions
+            return self._list_memory_session_summaries(user_id, limit, after)
         try:
-            with bind.connect() as connection:
-                session_ids = [row[0] for row in connection.execute(stmt)]
+            return self._list_database_session_summaries(bind, user_id, limit, after)
+        except ValueError:
+            raise
         except Exception as exc:
             if self._is_missing_runtime_table_error(exc):
                 self._disable_database_storage(self._missing_runtime_table_reason(), error=exc)
-            sessions = []
-            for session_id, session in self.sessions.items():
-                if user_id and session["user_id"] != user_id:
-                    continue
-                sessions.append({
-                    "session_id": session_id,
-                    "user_id": session["user_id"],
-                    "persona": session["persona"],
-                    "message_count": len(session["messages"]),
-                    "created_at": session["created_at"],
-                    "updated_at": session["updated_at"]
-                })
-            return sessions
-
-        sessions = []
-        for session_id in session_ids:
-            session = self.get_session(session_id, refresh=True)
-            if session is None:
-                continue
-            sessions.append({
-                "session_id": session_id,
-                "user_id": session.get("user_id"),
-                "persona": session.get("persona", "personal_trainer"),
-                "message_count": len(session.get("messages", [])),
-                "created_at": session.get("created_at"),
-                "updated_at": session.get("updated_at"),
-            })
-        return sessions
+            return self._list_memory_session_summaries(user_id, limit, after)
+
+    def list_sessions(self, user_id: Optional[str] = None) -> List[Dict]:
+        """
+        List all sessions, most recently updated first.
+
+        Args:
+            user_id: Filter by user_id (optional)
+
+        Returns:
+            List of session summaries
+        """
+        return self._list_session_summaries(user_id)
+
+    def list_sessions_page(
+        self,
+        user_id: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict:
+        """
+        List one page of session summaries using keyset pagination.
+
+        Summaries come from columns maintained on write, so a page costs a
+        single query regardless of how much history each session holds.
+
+        Args:
+            user_id: Filter by user_id (optional)
+            limit: Max sessions per page (clamped to 1-200)
+            cursor: Opaque `next_cursor` from the previous page (optional)
+
+        Returns:
+            {"sessions": [...], "next_cursor": str | None}
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        page_size = max(1, min(200, int(limit)))
+        after = self._decode_list_cursor(cursor)
+        # Fetch one extra row to learn whether another page exists.
+        summaries = self._list_session_summaries(user_id, limit=page_size + 1, after=after)
+        next_cursor = None
+        if len(summaries) > page_size:
+            summaries = summaries[:page_size]
+            last = summaries[-1]
+            next_cursor = self._encode_list_cursor(str(last["updated_at"] or ""), last["session_id"])
+        return {"sessions": summaries, "next_cursor": next_cursor}
 
     def clear_messages(self, session_id: str):
         """Clear all messages from session but keep session."""
-        session = self.get_session(session_id)
-        if session is not None:
+        def _apply(session: Dict) -> None:
             session["messages"] = []
             session["updated_at"] = datetime.now().isoformat()
-            self.save_session(session_id, session)
+
+        self.update_session(session_id, _apply)
 
     def export_session(self, session_id: str) -> str:
         """Export session as JSON."""
@@ -649,23 +1149,14 @@ class SessionManager:
     # CONTINUOUS COACHING STATE MANAGEMENT
     # ============================================
 
-    def init_workout_state(self, session_id: str, phase: str = "warmup", training_level: str = "intermediate"):
-        """
-        Initialize workout state tracking for continuous coaching.
-
-        Args:
-            session_id: Session identifier
-            phase: Starting phase ("warmup", "intense", "cooldown")
-            training_level: User's training level for emotional escalation tuning
-        """
-        session = self.get_session(session_id)
-        if session is None:
-            raise ValueError(f"Session {session_id} not found")
-
-        session["workout_state"] = {
+    @staticmethod
+    def _new_workout_state(phase: str = "warmup", training_level: str = "intermediate") -> Dict:
+        return {
             "current_phase": phase,
             "breath_history": [],
             "coaching_history": [],
+            # Rolling EMA/median/min/max per breath metric, folded in as entries land.
+            "breath_aggregates": {},
             "last_coaching_time": None,
             "last_pattern_time": None,  # STEP 4: Track when last pattern insight was given
             "elapsed_seconds": 0,
@@ -681,8 +1172,22 @@ class SessionManager:
                 "last_latency_provider": None,
             },
         }
-        session["updated_at"] = datetime.now().isoformat()
-        self.save_session(session_id, session)
+
+    def init_workout_state(self, session_id: str, phase: str = "warmup", training_level: str = "intermediate"):
+        """
+        Initialize workout state tracking for continuous coaching.
+
+        Args:
+            session_id: Session identifier
+            phase: Starting phase ("warmup", "intense", "cooldown")
+            training_level: User's training level for emotional escalation tuning
+        """
+        def _apply(session: Dict) -> None:
+            session["workout_state"] = self._new_workout_state(phase, training_level)
+            session["updated_at"] = datetime.now().isoformat()
+
+        if self.update_session(session_id, _apply) is None:
+            raise ValueError(f"Session {session_id} not found")
 
     def update_workout_state(
         self,
@@ -702,22 +1207,35 @@ class SessionManager:
             phase: Updated workout phase
             elapsed_seconds: Total workout time
         """
-        session = self.get_session(session_id)
-        if session is None:
-            return
+        def _apply(session: Dict) -> None:
+            # Initialize if not exists
+            if "workout_state" not in session:
+                session["workout_state"] = self._new_workout_state()
+            self._apply_tick_update(
+                session["workout_state"],
+                breath_analysis=breath_analysis,
+                coaching_output=coaching_output,
+                phase=phase,
+                elapsed_seconds=elapsed_seconds,
+            )
+            session["updated_at"] = datetime.now().isoformat()
 
-        # Initialize if not exists
-        if "workout_state" not in session:
-            self.init_workout_state(session_id)
-            session = self.get_session(session_id)
-            if session is None:
-                return
+        self.update_session(session_id, _apply)
 
-        workout_state = session["workout_state"]
+    def _apply_tick_update(
+        self,
+        workout_state: Dict,
+        *,
+        breath_analysis: Optional[Dict] = None,
+        coaching_output: Optional[str] = None,
+        phase: Optional[str] = None,
+        elapsed_seconds: Optional[int] = None,
+    ) -> None:
+        """Append one tick's breath/coaching history and advance phase, time and emotion."""
 
         # Update breath history
         if breath_analysis:
-            workout_state["breath_history"].append({
+            entry = {
                 "timestamp": datetime.now().isoformat(),
                 "intensity": breath_analysis.get("intensity", "unknown"),
                 "intensity_score": breath_analysis.get("intensity_score"),
@@ -732,24 +1250,25 @@ class SessionManager:
                 "dominant_frequency": breath_analysis.get("dominant_frequency"),
                 "interval_state": breath_analysis.get("interval_state"),
                 "interval_zone": breath_analysis.get("interval_zone")
-            })
-
-            # Keep only last 10 breath analyses
-            if len(workout_state["breath_history"]) > 10:
-                workout_state["breath_history"] = workout_state["breath_history"][-10:]
+            }
+            # Bounded in place: only the last BREATH_HISTORY_CAPACITY analyses are kept
+            append_bounded(workout_state.setdefault("breath_history", []), entry, BREATH_HISTORY_CAPACITY)
+            workout_state["breath_aggregates"] = update_breath_aggregates(
+                workout_state.get("breath_aggregates"),
+                entry,
+                alpha=getattr(config, "BREATH_SMOOTHING_ALPHA", 0.5),
+                raw=breath_analysis.get("raw_features"),
+            )
 
         # Update coaching history
         if coaching_output:
-            workout_state["coaching_history"].append({
-                "timestamp": datetime.now().isoformat(),
-                "text": coaching_output
-            })
+            append_bounded(
+                workout_state.setdefault("coaching_history", []),
+                {"timestamp": datetime.now().isoformat(), "text": coaching_output},
+                COACHING_HISTORY_CAPACITY,
+            )
             workout_state["last_coaching_time"] = datetime.now().isoformat()
 
-            # Keep only last 10 coaching messages
-            if len(workout_state["coaching_history"]) > 10:
-                workout_state["coaching_history"] = workout_state["coaching_history"][-10:]
-
         # Update phase
         if phase:
             workout_state["current_phase"] = phase
@@ -760,14 +1279,11 @@ class SessionManager:
 
         # Update emotional state based on breath analysis
         if breath_analysis:
-            self._update_emotional_state(session_id, breath_analysis, coaching_output is None)
-
-        session["updated_at"] = datetime.now().isoformat()
-        self.save_session(session_id, session)
+            self._update_emotional_state(workout_state, breath_analysis, coaching_output is None)
 
     def _update_emotional_state(
         self,
-        session_id: str,
+        workout_state: Dict,
         breath_analysis: Dict,
         coach_was_silent: bool
     ):
@@ -776,11 +1292,6 @@ class SessionManager:
 
         Determines if user is struggling based on phase-intensity mismatch.
         """
-        session = self.get_session(session_id)
-        if session is None:
-            return
-        workout_state = session.get("workout_state", {})
-
         # Get or create emotional state
         emotional_data = workout_state.get("emotional_state", {})
         emotional_state = EmotionalState.from_dict(emotional_data)
@@ -855,7 +1366,7 @@ class SessionManager:
         Get coaching context for intelligence decisions.
 
         Returns:
-            Dict with breath_history, coaching_history, and metadata
+            Dict with breath_history, coaching_history, breath_aggregates, and metadata
         """
         workout_state = self.get_workout_state(session_id)
 
@@ -863,6 +1374,7 @@ class SessionManager:
             return {
                 "breath_history": [],
                 "coaching_history": [],
+                "breath_aggregates": {},
                 "last_coaching_time": None,
                 "phase": "warmup",
                 "elapsed_seconds": 0
@@ -871,6 +1383,7 @@ class SessionManager:
         return {
             "breath_history": workout_state.get("breath_history", []),
             "coaching_history": workout_state.get("coaching_history", []),
+            "breath_aggregates": workout_state.get("breath_aggregates", {}),
             "last_coaching_time": workout_state.get("last_coaching_time"),
             "phase": workout_state.get("current_phase", "warmup"),
             "elapsed_seconds": workout_state.get("elapsed_seconds", 0)
@@ -19,6 +19,8 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+from usage_ledger import record_response_usage, record_usage
+
 logger = logging.getLogger(__name__)
 _ANTHROPIC_CLASS = None
 
@@ -147,6 +149,7 @@ class StrategicBrain:
             # Check cache first (avoid redundant API calls)
             if context_key in self._cache:
                 self._cache_hits += 1
+                record_usage("claude", mode="strategic", cache_hit=True)
                 logger.info(f"💾 Cache hit! (hits: {self._cache_hits}, misses: {self._cache_misses})")
                 return self._cache[context_key]
 
@@ -175,6 +178,7 @@ class StrategicBrain:
                 }]
             )
 
+            record_response_usage("claude", haiku_response, mode="strategic", prompt_text=prompt)
             response_text = haiku_response.content[0].text.strip()
 
             # Check if Haiku wants to escalate
@@ -192,6 +196,7 @@ class StrategicBrain:
                     }]
                 )
 
+                record_response_usage("claude_sonnet", sonnet_response, mode="strategic", prompt_text=prompt)
                 response_text = sonnet_response.content[0].text.strip()
 
             # Parse Claude's response into structured guidance
@@ -424,6 +429,7 @@ Closing statement. Max 12 words."""
                 system="You are a coaching intelligence module. Be concise. No explanations. Calm, authoritative tone. Max 12 words.",
                 messages=[{"role": "user", "content": prompt}]
             )
+            record_response_usage("claude", message, mode="session_summary", prompt_text=prompt)
 
             return message.content[0].text.strip()
 
@@ -0,0 +1,175 @@
+"""
+Background strategic insight generation for continuous coaching.
+
+`StrategicBrain.get_strategic_insight` makes a synchronous Anthropic call on a
+cache miss, which must never sit inside a `/coach/continuous` tick. Ticks call
+`maybe_schedule` instead: when a session is due (first insight after
+STRATEGIC_INSIGHT_FIRST_AFTER_SECONDS, then every
+STRATEGIC_INSIGHT_INTERVAL_SECONDS of workout time) a snapshot of its breath
+and coaching history is handed to a small worker pool. The finished insight is
+stored on the session through `store`, and a later tick picks it up with
+`SessionManager.take_strategic_insight` only once it is ready.
+
+At most one job per session is in flight; a slow or failing provider only
+delays the next insight, never a tick.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _coaching_texts(coaching_history: List[Any], limit: int = 5) -> List[str]:
+    texts = []
+    for entry in (coaching_history or [])[-limit:]:
+        text = entry.get("text") if isinstance(entry, dict) else entry
+        if text:
+            texts.append(str(text))
+    return texts
+
+
+class StrategicInsightScheduler:
+    """Runs strategic insight calls per session off the request path."""
+
+    def __init__(
+        self,
+        *,
+        store: Callable[[str, Dict[str, Any]], None],
+        brain_factory: Callable[[], Any],
+        app=None,
+        max_workers: int = 1,
+        first_after_seconds: int = 120,
+        interval_seconds: int = 180,
+        max_tracked_sessions: int = 1024,
+    ):
+        self._store = store
+        self._brain_factory = brain_factory
+        self._app = app
+        self.first_after_seconds = max(0, int(first_after_seconds))
+        self.interval_seconds = max(1, int(interval_seconds))
+        self.max_tracked_sessions = max(1, int(max_tracked_sessions))
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)),
+            thread_name_prefix="strategic-insight",
+        )
+        self._lock = threading.Lock()
+        self._in_flight: set = set()
+        # session_id -> workout elapsed seconds of the last scheduled job
+        self._last_scheduled: "OrderedDict[str, int]" = OrderedDict()
+        self._stats = {"scheduled": 0, "completed": 0, "empty": 0, "failed": 0, "skipped_unavailable": 0}
+
+    def is_due(self, session_id: str, elapsed_seconds: int, last_generated_elapsed: Optional[int] = None) -> bool:
+        with self._lock:
+            if session_id in self._in_flight:
+                return False
+            last = self._last_scheduled.get(session_id)
+        if last_generated_elapsed is not None:
+            last = max(last or 0, int(last_generated_elapsed))
+        elapsed_seconds = int(elapsed_seconds or 0)
+        if last is None:
+            return elapsed_seconds >= self.first_after_seconds
+        if elapsed_seconds < last:  # workout restarted under the same session
+            return elapsed_seconds >= self.first_after_seconds
+        return elapsed_seconds - last >= self.interval_seconds
+
+    def maybe_schedule(
+        self,
+        session_id: str,
+        *,
+        phase: str,
+        elapsed_seconds: int,
+        breath_history: List[Dict],
+        coaching_history: List[Any],
+        language: str = "en",
+        last_generated_elapsed: Optional[int] = None,
+    ) -> bool:
+        """Queue an insight job when the session is due. Never blocks on the provider."""
+        if not session_id or not self.is_due(session_id, elapsed_seconds, last_generated_elapsed):
+            return False
+        elapsed_seconds = int(elapsed_seconds or 0)
+        with self._lock:
+            if session_id in self._in_flight:
+                return False
+            self._in_flight.add(session_id)
+            self._last_scheduled[session_id] = elapsed_seconds
+            self._last_scheduled.move_to_end(session_id)
+            while len(self._last_scheduled) > self.max_tracked_sessions:
+                self._last_scheduled.popitem(last=False)
+            self._stats["scheduled"] += 1
+        job = {
+            "phase": phase,
+            "elapsed_seconds": elapsed_seconds,
+            # Snapshot now; the tick keeps mutating the live workout state.
+            "breath_history": [dict(entry) for entry in (breath_history or [])[-10:]],
+            "coaching_history": _coaching_texts(coaching_history),
+            "language": language,
+        }
+        try:
+            self._executor.submit(self._run, session_id, job)
+        except RuntimeError:  # executor shut down
+            with self._lock:
+                self._in_flight.discard(session_id)
+            return False
+        return True
+
+    def _run(self, session_id: str, job: Dict[str, Any]) -> None:
+        outcome = "failed"
+        try:
+            if self._app is not None:
+                with self._app.app_context():
+                    outcome = self._generate(session_id, job)
+            else:
+                outcome = self._generate(session_id, job)
+        except Exception:
+            logger.warning("Strategic insight job failed for session %s", session_id, exc_info=True)
+        finally:
+            with self._lock:
+                self._in_flight.discard(session_id)
+                self._stats[outcome] += 1
+
+    def _generate(self, session_id: str, job: Dict[str, Any]) -> str:
+        brain = self._brain_factory()
+        if brain is None or not brain.is_available():
+            return "skipped_unavailable"
+        guidance = brain.get_strategic_insight(
+            breath_history=job["breath_history"],
+            coaching_history=job["coaching_history"],
+            phase=job["phase"],
+            elapsed_seconds=job["elapsed_seconds"],
+            language=job["language"],
+        )
+        if not guidance:
+            return "empty"
+        self._store(
+            session_id,
+            {
+                "guidance": guidance,
+                "phase": job["phase"],
+                "elapsed_seconds": job["elapsed_seconds"],
+                "generated_at": datetime.now().isoformat(),
+                "consumed": False,
+            },
+        )
+        return "completed"
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            self._last_scheduled.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "in_flight": len(self._in_flight),
+                "tracked_sessions": len(self._last_scheduled),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,160 @@
+"""
+Sentence-level pipelining for streamed talk answers.
+
+`/coach/talk` used to wait for the full completion and then synthesize the
+whole answer. In streaming mode tokens are cut into sentences as they
+arrive (`sentences_from_tokens`), and `stream_sentence_audio` sends each
+sentence to TTS as soon as it is complete. The client gets sentence
+i + audio while sentence i+1 is still being generated, so time to first
+audio is roughly time to first sentence plus one short synthesis.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…])\s+")
+
+
+class SentenceSegmenter:
+    """Incrementally split streamed text into sentences."""
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = max(1, int(min_chars))
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return sentences completed by it."""
+        self._buffer += text or ""
+        parts = _SENTENCE_END_RE.split(self._buffer)
+        if len(parts) < 2:
+            return []
+        # The last part has no terminating whitespace yet; keep it buffered.
+        self._buffer = parts.pop()
+        sentences: List[str] = []
+        pending = ""
+        for part in parts:
+            pending = f"{pending} {part}".strip() if pending else part.strip()
+            # Very short fragments ("Ok.", "Dr.") ride along with the next sentence.
+            if len(pending) >= self.min_chars:
+                sentences.append(pending)
+                pending = ""
+        if pending:
+            self._buffer = f"{pending} {self._buffer}" if self._buffer else pending + " "
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever is left once the stream ends."""
+        rest = " ".join(self._buffer.split())
+        self._buffer = ""
+        return [rest] if rest else []
+
+
+def sentences_from_tokens(tokens: Iterable[str], *, min_chars: int = 12) -> Iterator[str]:
+    """Yield complete sentences from a token stream as soon as each one ends."""
+    segmenter = SentenceSegmenter(min_chars=min_chars)
+    for token in tokens:
+        for sentence in segmenter.feed(token):
+            yield sentence
+    for sentence in segmenter.flush():
+        yield sentence
+
+
+def stream_sentence_audio(
+    items: Iterator[T],
+    synthesize: Callable[[T], R],
+    *,
+    executor: Executor,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[Tuple[T, R]]:
+    """
+    Yield `(item, synthesize(item))` in order while synthesis overlaps generation.
+
+    `items` is consumed on a helper thread so a slow token stream never blocks
+    delivery of audio that is already synthesized. Closing the returned
+    generator (client disconnect) stops consumption, closes `items` and cancels
+    synthesis that has not started yet. Past `deadline` (time.monotonic()) no
+    new items are taken; those already queued for synthesis are still delivered,
+    and a stream cut before its first item raises TimeoutError.
+    """
+    events: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+    stop = threading.Event()
+
+    def _produce() -> None:
+        try:
+            for item in items:
+                if stop.is_set():
+                    break
+                events.put(("item", item))
+        except BaseException as exc:  # re-raised on the consumer side
+            events.put(("error", exc))
+        finally:
+            close = getattr(items, "close", None)
+            if stop.is_set() and callable(close):
+                close()
+            events.put(("end", None))
+
+    # The producer keeps the caller's context (usage ledger scope).
+    threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(_produce,),
+        name="talk-stream-producer",
+        daemon=True,
+    ).start()
+
+    pending: deque = deque()
+    ended = False
+    cut = False
+    delivered = 0
+    error: Optional[BaseException] = None
+    try:
+        while True:
+            while pending and pending[0][1].done():
+                item, future = pending.popleft()
+                delivered += 1
+                yield item, future.result()
+            if ended and not pending:
+                if error is not None:
+                    raise error
+                if cut and not delivered:
+                    raise TimeoutError("talk stream produced nothing before its deadline")
+                return
+            wait = timeout
+            if deadline is not None and not ended:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    stop.set()
+                    ended = cut = True
+                    continue
+                wait = remaining if wait is None else min(wait, remaining)
+            try:
+                kind, value = events.get(timeout=wait)
+            except queue.Empty:
+                if deadline is not None and not ended and time.monotonic() >= deadline:
+                    continue
+                raise TimeoutError("talk stream stalled") from None
+            if cut:
+                continue  # past the deadline: only pending synthesis is still delivered
+            if kind == "item":
+                future = executor.submit(synthesize, value)
+                future.add_done_callback(lambda _done: events.put(("synthesized", None)))
+                pending.append((value, future))
+            elif kind == "error":
+                error = value  # deliver what was already generated first
+            elif kind == "end":
+                ended = True
+    finally:
+        stop.set()
+        for _item, future in pending:
+            future.cancel()
@@ -1,14 +1,20 @@
 import os
 import sys
+import time
 import uuid
 
 import pytest
 from flask.testing import FlaskClient
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep housekeeping inline and deterministic in tests; maintenance tests drive jobs directly.
+os.environ.setdefault("MAINTENANCE_SCHEDULER_ENABLED", "false")
+os.environ.setdefault("USAGE_LEDGER_FLUSH_INTERVAL_SECONDS", "0")
+os.environ.setdefault("BRAIN_SHARED_HEALTH_SYNC_SECONDS", "0")
 
 import auth
 import main
+from brain_router import BrainRouter
 
 
 _MOBILE_AUTH_PATHS = {"/coach/continuous", "/coach/talk"}
@@ -52,3 +58,56 @@ def _inject_mobile_auth_for_authenticated_routes(monkeypatch):
 @pytest.fixture(autouse=True)
 def _accept_synthetic_test_audio(monkeypatch):
     monkeypatch.setattr(main, "_validate_audio_upload_signature", lambda _file: True)
+
+
+class FakeClock:
+    """Manually advanced clock for time-windowed components: `clock.now += 30`."""
+
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+class FakeBrain:
+    """Realtime-coaching stub: returns `text` (or "Cue number N.") after `delay`, or raises when `fail`."""
+
+    def __init__(self, text: str | None = None, delay: float = 0.0, fail: bool = False):
+        self.text = text
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def get_realtime_coaching(self, breath_data, phase):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return self.text if self.text is not None else f"Cue number {self.calls}."
+
+
+@pytest.fixture
+def fake_brain():
+    """The FakeBrain class, for building provider stubs."""
+    return FakeBrain
+
+
+@pytest.fixture
+def stub_router(monkeypatch):
+    """Build a priority-routing BrainRouter over `brains` (name -> stub, in order), then config."""
+
+    def _build(brains: dict) -> BrainRouter:
+        router = BrainRouter(brain_type="config")
+        router.use_priority_routing = True
+        router.priority_brains = list(brains) + ["config"]
+        monkeypatch.setattr(router, "_is_brain_available", lambda _: True)
+        monkeypatch.setattr(router, "_get_brain_instance", lambda name: brains[name])
+        return router
+
+    return _build
@@ -11,6 +11,7 @@ from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.x509.oid import NameOID
 
+import app_store_runtime
 from app_store_runtime import AppStorePayloadError, decode_app_store_signed_payload, derive_app_store_status
 
 
@@ -107,6 +108,38 @@ def test_decode_app_store_signed_payload_rejects_untrusted_root():
         raise AssertionError("Expected AppStorePayloadError for untrusted root")
 
 
+def test_validated_certificate_chain_is_reused_but_signature_is_still_checked():
+    app_store_runtime.clear_certificate_chain_cache()
+    signed_payload, root_fingerprint = _build_signed_payload()
+
+    for _ in range(3):
+        payload = decode_app_store_signed_payload(signed_payload, trusted_root_sha256s={root_fingerprint})
+        assert payload["transactionId"] == "tx_chain_123"
+
+    stats = app_store_runtime.get_certificate_chain_cache_stats()
+    assert stats["chain_validations"] == 1
+    assert stats["cache_hits"] == 2
+
+    header, _body, signature = signed_payload.split(".")
+    forged_body = base64.urlsafe_b64encode(b'{"transactionId":"forged"}').decode("ascii").rstrip("=")
+    try:
+        decode_app_store_signed_payload(
+            f"{header}.{forged_body}.{signature}",
+            trusted_root_sha256s={root_fingerprint},
+        )
+    except AppStorePayloadError as exc:
+        assert str(exc) == "signature_verification_failed"
+    else:  # pragma: no cover - explicit failure branch
+        raise AssertionError("Expected AppStorePayloadError for forged payload")
+
+    try:
+        decode_app_store_signed_payload(signed_payload, trusted_root_sha256s={"deadbeef"})
+    except AppStorePayloadError as exc:
+        assert str(exc) == "untrusted_root_certificate"
+    else:  # pragma: no cover - explicit failure branch
+        raise AssertionError("Expected AppStorePayloadError for untrusted root")
+
+
 def test_derive_app_store_status_preserves_access_for_cancel_until_expiry():
     future = datetime.now(timezone.utc) + timedelta(days=10)
     assert derive_app_store_status(
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import async_runtime
+
+
+def test_coroutines_share_one_background_loop():
+    async def _loop_and_thread():
+        return asyncio.get_running_loop(), threading.current_thread().name
+
+    first_loop, thread_name = async_runtime.run_coroutine(_loop_and_thread())
+    second_loop, _ = async_runtime.run_coroutine(_loop_and_thread())
+
+    assert first_loop is second_loop is async_runtime.get_event_loop()
+    assert thread_name == "async-runtime"
+    assert threading.current_thread().name != "async-runtime"
+
+
+def test_run_coroutine_times_out_and_cancels():
+    cancelled = threading.Event()
+
+    async def _slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        async_runtime.run_coroutine(_slow(), timeout=0.05)
+    assert cancelled.wait(timeout=1)
+
+
+def test_iterate_async_closes_generator_when_consumer_stops():
+    closed = threading.Event()
+
+    async def _tokens():
+        try:
+            for index in range(100):
+                yield f"t{index}"
+        finally:
+            closed.set()
+
+    tokens = async_runtime.iterate_async(_tokens())
+    assert [next(tokens), next(tokens)] == ["t0", "t1"]
+    tokens.close()
+
+    assert closed.wait(timeout=1)
+
+
+def test_iterate_async_yields_every_item():
+    async def _tokens():
+        for token in ("a", "b", "c"):
+            await asyncio.sleep(0)
+            yield token
+
+    assert list(async_runtime.iterate_async(_tokens())) == ["a", "b", "c"]
+
+
+def test_iterate_async_applies_backpressure_to_the_producer():
+    produced = []
+
+    async def _tokens():
+        for index in range(50):
+            produced.append(index)
+            yield index
+
+    tokens = async_runtime.iterate_async(_tokens(), max_buffered=4)
+    assert next(tokens) == 0
+    time.sleep(0.05)
+
+    # The pump stops reading once the buffer is full instead of draining the provider.
+    assert len(produced) <= 6
+    assert list(tokens) == list(range(1, 50))
+
+
+def test_iterate_async_times_out_and_cancels_a_stalled_stream():
+    cancelled = threading.Event()
+
+    async def _stalled():
+        yield "first"
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        yield "never"
+
+    tokens = async_runtime.iterate_async(_stalled(), item_timeout=0.05)
+    assert next(tokens) == "first"
+    with pytest.raises(TimeoutError):
+        next(tokens)
+
+    assert cancelled.wait(timeout=1)
+    assert async_runtime.get_stream_stats()["timed_out"] >= 1
+
+
+def test_iterate_async_reraises_provider_errors_after_buffered_items():
+    async def _failing():
+        yield "a"
+        raise RuntimeError("provider reset")
+
+    tokens = async_runtime.iterate_async(_failing())
+    assert next(tokens) == "a"
+    with pytest.raises(RuntimeError, match="provider reset"):
+        next(tokens)
+
+
+def test_shared_http_clients_are_process_singletons():
+    assert async_runtime.shared_http_client() is async_runtime.shared_http_client()
+    assert async_runtime.shared_async_http_client() is async_runtime.shared_async_http_client()
+    assert async_runtime.get_runtime_stats()["loop_running"] is True
+
+
+def test_grok_brain_uses_shared_transport():
+    from brains.grok_brain import GrokBrain
+
+    brain = GrokBrain(api_key="test-key")
+
+    assert brain.client._client is async_runtime.shared_http_client()
+    assert brain.async_client._client is async_runtime.shared_async_http_client()
+
+
+def test_gemini_sdk_calls_stay_off_the_shared_loop():
+    from brains.gemini_brain import GeminiBrain
+
+    threads = []
+
+    class _Chunk:
+        def __init__(self, text):
+            self.text = text
+
+    class _Model:
+        def generate_content(self, prompt, stream=False, **_kwargs):
+            threads.append(threading.current_thread().name)
+            if not stream:
+                return _Chunk("Full answer.")
+
+            def _chunks():
+                for text in ("Keep ", "going."):
+                    threads.append(threading.current_thread().name)
+                    yield _Chunk(text)
+
+            return _chunks()
+
+    brain = GeminiBrain.__new__(GeminiBrain)
+    brain.model = "gemini-test"
+    brain._make_model = lambda system_prompt=None: _Model()
+    messages = [{"role": "user", "content": "How am I doing?"}]
+
+    streamed = list(async_runtime.iterate_async(brain.stream_chat(messages)))
+    answer = async_runtime.run_coroutine(brain.chat(messages))
+
+    assert "".join(streamed) == "Keep going."
+    assert answer == "Full answer."
+    assert threads and "async-runtime" not in threads
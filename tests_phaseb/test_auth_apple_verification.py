@@ -13,16 +13,13 @@ class _FakeSigningKey:
     key = "fake-signing-key"
 
 
-class _FakeJWKClient:
-    def __init__(self, _: str):
-        pass
-
+class _FakeJWKSCache:
     def get_signing_key_from_jwt(self, _: str):
         return _FakeSigningKey()
 
 
 def _mock_jwks(monkeypatch):
-    monkeypatch.setattr(auth.jwt, "PyJWKClient", _FakeJWKClient)
+    monkeypatch.setattr(auth, "_APPLE_JWKS", _FakeJWKSCache())
 
 
 def test_verify_apple_token_success_with_mocked_jwks(monkeypatch):
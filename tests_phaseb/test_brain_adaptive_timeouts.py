@@ -0,0 +1,183 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from brain_router import BrainRouter
+from latency_histogram import LatencyHistogram
+
+
+def _adaptive_config(monkeypatch, **overrides):
+    values = {
+        "BRAIN_TIMEOUT": 1.2,
+        "BRAIN_TIMEOUTS": {"grok": 6.0},
+        "BRAIN_MODE_TIMEOUTS": {},
+        "BRAIN_SLOW_THRESHOLD": 3.0,
+        "BRAIN_SLOW_THRESHOLDS": {"grok": 6.5},
+        "BRAIN_ADAPTIVE_TIMEOUTS_ENABLED": True,
+        "BRAIN_ADAPTIVE_MIN_SAMPLES": 10,
+        "BRAIN_ADAPTIVE_TIMEOUT_PERCENTILE": 0.99,
+        "BRAIN_ADAPTIVE_SLOW_PERCENTILE": 0.9,
+        "BRAIN_ADAPTIVE_HEADROOM": 1.5,
+        "BRAIN_ADAPTIVE_MIN_SECONDS": 0.8,
+        "BRAIN_ADAPTIVE_MAX_FACTOR": 1.0,
+    }
+    values.update(overrides)
+    for name, value in values.items():
+        monkeypatch.setattr(config, name, value, raising=False)
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for value in range(1, 101):
+        histogram.record(value / 100.0)
+
+    assert histogram.count() == 100
+    assert abs(histogram.percentile(0.5) - 0.5) <= 0.5 * 0.05
+    assert abs(histogram.percentile(0.99) - 0.99) <= 0.99 * 0.05
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 100
+    assert sum(count for _bound, count in snapshot["buckets"]) == 100
+
+
+def test_histogram_window_rolls_old_samples_out(fake_clock):
+    histogram = LatencyHistogram(window_seconds=60, slices=3, clock=fake_clock)
+    for _ in range(10):
+        histogram.record(5.0)
+    fake_clock.now += 45
+    for _ in range(10):
+        histogram.record(0.5)
+
+    assert histogram.count() == 20
+    fake_clock.now += 40
+    assert histogram.count() == 10
+    assert histogram.percentile(0.99) < 0.6
+    fake_clock.now += 120
+    assert histogram.percentile(0.5) is None
+
+
+def test_timeout_stays_configured_until_enough_samples(monkeypatch):
+    _adaptive_config(monkeypatch)
+    router = BrainRouter(brain_type="config")
+    for _ in range(5):
+        router._record_latency("grok", 1.0, "realtime_coach")
+
+    assert router._get_brain_timeout("grok", "realtime_coach") == 6.0
+
+
+def test_timeout_shrinks_to_observed_percentile_per_mode(monkeypatch):
+    _adaptive_config(monkeypatch)
+    router = BrainRouter(brain_type="config")
+    for _ in range(20):
+        router._record_latency("grok", 1.0, "realtime_coach")
+        router._record_latency("grok", 3.0, "question_qa")
+
+    realtime = router._get_brain_timeout("grok", "realtime_coach")
+    assert 1.4 <= realtime <= 1.6
+    assert router._get_brain_timeout("grok", "chat") == 6.0
+    qa = router._get_brain_timeout("grok", "chat", latency_mode="question_qa")
+    assert 4.3 <= qa <= 4.8
+
+
+def test_adaptive_budgets_respect_bounds(monkeypatch):
+    _adaptive_config(monkeypatch)
+    router = BrainRouter(brain_type="config")
+    for _ in range(20):
+        router._record_latency("grok", 0.05, "realtime_coach")
+        router._record_latency("openai", 5.0, "realtime_coach")
+
+    assert router._get_brain_timeout("grok", "realtime_coach") == 0.8
+    assert router._get_brain_timeout("openai", "realtime_coach") == 1.2
+
+    monkeypatch.setattr(config, "BRAIN_ADAPTIVE_MAX_FACTOR", 2.0, raising=False)
+    assert router._get_brain_timeout("openai", "realtime_coach") == 2.4
+
+
+def test_slow_threshold_follows_observed_latency(monkeypatch):
+    _adaptive_config(monkeypatch)
+    router = BrainRouter(brain_type="config")
+    for _ in range(20):
+        router._record_latency("grok", 1.0, "realtime_coach")
+
+    threshold = router._get_slow_threshold("grok")
+    assert 1.4 <= threshold <= 1.6
+    router.brain_stats["grok"]["avg_latency"] = 2.5
+    assert router._is_brain_available("grok") is False
+
+
+def test_health_check_exposes_histograms(monkeypatch):
+    _adaptive_config(monkeypatch)
+    router = BrainRouter(brain_type="config")
+    for _ in range(3):
+        router._record_latency("grok", 0.4, "zone_rewrite")
+
+    histograms = router.health_check()["latency_histograms"]
+
+    assert histograms["grok"]["zone_rewrite"]["count"] == 3
+    assert histograms["grok"]["zone_rewrite"]["timeout"] == 6.0
+    assert histograms["grok"]["all"]["slow_threshold"] == 6.5
+    assert histograms["grok"]["all"]["p50"] is not None
+
+
+def test_timeouts_widen_the_budget_for_a_slow_provider(monkeypatch):
+    _adaptive_config(monkeypatch, BRAIN_ADAPTIVE_MAX_FACTOR=2.0)
+    router = BrainRouter(brain_type="config")
+    for _ in range(20):
+        router._record_latency("grok", 1.0, "realtime_coach")
+    tightened = router._get_brain_timeout("grok", "realtime_coach")
+    assert tightened < 2.0
+
+    # The provider slows down: every call now hits the tightened timeout.
+    timeout = tightened
+    for _ in range(10):
+        router._record_call_timeout("grok", latency=timeout, timeout=timeout, cancelled=True, mode="realtime_coach")
+        widened = router._get_brain_timeout("grok", "realtime_coach")
+        assert widened >= timeout
+        timeout = widened
+
+    assert timeout > tightened * 2
+    assert timeout <= 12.0
+
+
+def test_provider_call_receives_the_widened_budget(monkeypatch):
+    from types import SimpleNamespace
+
+    from brains.grok_brain import GrokBrain
+
+    _adaptive_config(monkeypatch, BRAIN_ADAPTIVE_MAX_FACTOR=2.0, BRAIN_CLIENT_TIMEOUT_MARGIN_SECONDS=0.25)
+    router = BrainRouter(brain_type="config")
+    brain = GrokBrain(api_key="xai-test-key", model="grok-3-mini")
+    sent_timeouts = []
+
+    def _create(**kwargs):
+        sent_timeouts.append(kwargs["timeout"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="Ease off."))], usage=None)
+
+    monkeypatch.setattr(brain.client.chat.completions, "create", _create)
+    for _ in range(20):
+        router._record_latency("grok", 7.0, "realtime_coach")
+    budget = router._get_brain_timeout("grok", "realtime_coach")
+    assert budget > 6.0
+
+    rewrite = lambda: brain.rewrite_zone_event_text("Back off.", language="en", event_type="above_zone")
+    assert router._call_brain_with_timeout("grok", rewrite, budget, mode="realtime_coach") == "Ease off."
+    assert sent_timeouts[-1] == budget - 0.25
+    # Outside a routed call the provider keeps its configured timeout.
+    rewrite()
+    assert sent_timeouts[-1] == config.GROK_CLIENT_TIMEOUT_SECONDS
+
+
+def test_provider_timeout_counts_as_a_timeout_not_a_failure(monkeypatch):
+    _adaptive_config(monkeypatch)
+    router = BrainRouter(brain_type="config")
+
+    class APITimeoutError(Exception):
+        pass
+
+    def _slow():
+        raise APITimeoutError("Request timed out.")
+
+    assert router._call_brain_with_timeout("grok", _slow, 2.0, mode="realtime_coach") is None
+    assert router._call_outcome("grok")["status"] == "timeout"
+    assert router.brain_stats["grok"]["failures"] == 0
@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import brain_health
+import config
+import main
+from brain_health import SharedBrainHealth
+from brain_router import BrainRouter
+from database import BrainHealthState, db
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memory_store(monkeypatch):
+    monkeypatch.setattr(brain_health, "_MEMORY_ROWS", {})
+
+
+def _worker(worker_id: str, backend: str = "memory") -> SharedBrainHealth:
+    return SharedBrainHealth(backend=backend, worker_id=worker_id)
+
+
+def _router(registry: SharedBrainHealth) -> BrainRouter:
+    router = BrainRouter(brain_type="config")
+    router.shared_health = registry
+    return router
+
+
+def test_cooldown_published_by_one_worker_reaches_the_other():
+    worker_a, worker_b = _worker("a"), _worker("b")
+
+    worker_a.publish_cooldown("grok", time.time() + 30, "timeout")
+    assert worker_b.cooldown("grok") is None  # not synced yet
+    assert worker_b.sync()
+
+    until, reason, owner = worker_b.cooldown("grok")
+    assert reason == "timeout"
+    assert owner == "a"
+    assert until > time.time()
+    # A worker's own cooldowns are held by its router, not read back.
+    worker_a.sync()
+    assert worker_a.cooldown("grok") is None
+    assert worker_b.cooldown("grok", now_ts=until + 1) is None
+
+
+def test_router_timeout_steers_other_workers_away(monkeypatch):
+    monkeypatch.setattr(config, "BRAIN_TIMEOUT_COOLDOWN_SECONDS", 30, raising=False)
+    router_a, router_b = _router(_worker("a")), _router(_worker("b"))
+
+    router_a._record_call_timeout("grok", latency=4.0, timeout=4.0, cancelled=False)
+    router_b.shared_health.sync()
+
+    assert router_b._is_brain_available("grok") is False
+    assert router_b._get_skip_reason("grok").startswith("shared_cooldown (timeout")
+    router_b.priority_brains = ["grok"]
+    assert router_b.get_brain_stats()["grok"]["on_shared_cooldown"] is True
+    assert router_b.get_brain_stats()["grok"]["shared_cooldown_reason"] == "timeout"
+    assert router_b._is_brain_available("config") is True
+
+
+def test_init_failures_stay_local():
+    router_a, router_b = _router(_worker("a")), _router(_worker("b"))
+
+    router_a._set_cooldown("openai", seconds=5)
+    router_b.shared_health.sync()
+
+    assert router_b._is_brain_available("openai") is True
+
+
+def test_cold_worker_uses_cluster_latency_for_slow_check(monkeypatch):
+    monkeypatch.setattr(config, "BRAIN_SLOW_THRESHOLDS", {"grok": 6.5}, raising=False)
+    router_a, router_b = _router(_worker("a")), _router(_worker("b"))
+    for _ in range(5):
+        router_a._record_latency("grok", 9.0)
+    router_a.brain_stats["grok"]["avg_latency"] = 9.0
+
+    router_a.publish_health_stats()
+    router_a.shared_health.sync()
+    router_b.shared_health.sync()
+
+    assert router_b.shared_health.cluster_latency("grok") == pytest.approx(9.0)
+    assert router_b._is_brain_available("grok") is False
+    assert router_b._get_skip_reason("grok").startswith("too_slow")
+    assert router_b.shared_health.snapshot()["brains"]["grok"]["workers"] == 1
+
+
+def test_unchanged_stats_are_not_republished_every_sync():
+    now = [1_000.0]
+    worker = SharedBrainHealth(backend="memory", worker_id="a", stats_interval_seconds=30, clock=lambda: now[0])
+
+    assert worker.publish_stats("grok", avg_latency=1.0, p90_latency=1.5, calls=10) is True
+    worker.sync()
+    now[0] += 2
+    # More calls at the same latency is not a material change.
+    assert worker.publish_stats("grok", avg_latency=1.05, p90_latency=1.5, calls=12) is False
+    assert worker.publish_stats("grok", avg_latency=1.5, p90_latency=1.5, calls=14) is True
+    worker.sync()
+    assert worker.publish_stats("grok", avg_latency=1.5, p90_latency=1.5, calls=15, timeouts=1) is True
+    worker.sync()
+    assert worker.publish_stats("grok", avg_latency=1.5, p90_latency=1.5, calls=16, timeouts=1) is False
+    now[0] += 30
+    assert worker.publish_stats("grok", avg_latency=1.5, p90_latency=1.5, calls=16, timeouts=1) is True
+
+
+def test_cooldowns_arrive_between_full_reloads():
+    now = [1_000.0]
+    worker_a = SharedBrainHealth(backend="memory", worker_id="a", clock=lambda: now[0])
+    worker_b = SharedBrainHealth(backend="memory", worker_id="b", stats_interval_seconds=30, clock=lambda: now[0])
+    worker_a.publish_stats("grok", avg_latency=2.0, calls=5)
+    worker_a.sync()
+    worker_b.sync()
+    assert worker_b.snapshot()["full_reloads"] == 1
+
+    now[0] += 2
+    worker_a.publish_cooldown("grok", now[0] + 30, "timeout")
+    worker_b.sync()
+
+    assert worker_b.cooldown("grok")[1] == "timeout"
+    assert worker_b.cluster_latency("grok") == pytest.approx(2.0)  # from the last full reload
+    assert worker_b.snapshot()["full_reloads"] == 1
+    now[0] += 30
+    worker_b.sync()
+    assert worker_b.snapshot()["full_reloads"] == 2
+
+
+def test_database_backend_shares_rows_between_workers():
+    worker_a = _worker("test-db-a", backend="database")
+    worker_b = _worker("test-db-b", backend="database")
+
+    with main.app.app_context():
+        BrainHealthState.query.filter(BrainHealthState.worker_id.like("test-db-%")).delete(synchronize_session=False)
+        db.session.commit()
+        try:
+            worker_a.publish_cooldown("gemini", time.time() + 300, "quota_limited")
+            worker_a.publish_stats("gemini", avg_latency=1.5, calls=4)
+            assert worker_a.sync()
+            # Re-publishing updates the same row instead of adding one.
+            worker_a.publish_stats("gemini", avg_latency=2.0, calls=6)
+            assert worker_a.sync()
+            assert worker_b.sync()
+
+            assert worker_b.cooldown("gemini")[1] == "quota_limited"
+            assert worker_b.cluster_latency("gemini") == pytest.approx(2.0)
+            assert BrainHealthState.query.filter_by(worker_id="test-db-a").count() == 1
+        finally:
+            BrainHealthState.query.filter(BrainHealthState.worker_id.like("test-db-%")).delete(synchronize_session=False)
+            db.session.commit()
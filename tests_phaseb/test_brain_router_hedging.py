@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from brain_router import BrainRouter
+
+
+@pytest.fixture(autouse=True)
+def _hedging_config(monkeypatch):
+    monkeypatch.setattr(config, "BRAIN_HEDGING_ENABLED", True, raising=False)
+    monkeypatch.setattr(config, "BRAIN_HEDGE_MIN_SAMPLES", 3, raising=False)
+    monkeypatch.setattr(config, "BRAIN_HEDGE_MIN_DELAY_SECONDS", 0.01, raising=False)
+    monkeypatch.setattr(config, "BRAIN_HEDGE_PERCENTILE", 0.9, raising=False)
+    monkeypatch.setattr(config, "BRAIN_TIMEOUTS", {"grok": 2.0, "openai": 2.0}, raising=False)
+    monkeypatch.setattr(config, "BRAIN_MODE_TIMEOUTS", {}, raising=False)
+
+
+def _seed_latency(router: BrainRouter, brain_name: str, latency: float, count: int = 5) -> None:
+    for _ in range(count):
+        router._record_latency(brain_name, latency, "realtime_coach")
+
+
+def test_slow_primary_is_hedged_and_backup_wins(stub_router, fake_brain):
+    slow = fake_brain("slow cue", 0.6)
+    fast = fake_brain("fast cue", 0.01)
+    router = stub_router({"grok": slow, "openai": fast})
+    _seed_latency(router, "grok", 0.05)
+
+    started = time.time()
+    result = router.get_coaching_response({}, mode="realtime_coach", language="en")
+    elapsed = time.time() - started
+
+    assert result == "fast cue"
+    assert elapsed < 0.5
+    meta = router.get_last_route_meta()
+    assert meta["provider"] == "openai"
+    assert [entry["status"] for entry in meta["attempted"]] == ["hedge_lost", "success"]
+
+    stats = router.get_brain_stats()
+    assert stats["grok"]["hedge_triggers"] == 1
+    assert stats["openai"]["hedges"] == 1
+    assert stats["openai"]["hedge_wins"] == 1
+    assert stats["openai"]["hedge_win_rate"] == 1.0
+    assert stats["grok"]["timeouts"] == 0
+
+
+def test_fast_primary_does_not_hedge(stub_router, fake_brain):
+    primary = fake_brain("primary cue", 0.0)
+    backup = fake_brain("backup cue", 0.0)
+    router = stub_router({"grok": primary, "openai": backup})
+    _seed_latency(router, "grok", 0.3)
+
+    assert router.get_coaching_response({}, mode="realtime_coach", language="en") == "primary cue"
+    assert backup.calls == 0
+    assert router.get_brain_stats()["openai"]["hedges"] == 0
+
+
+def test_no_hedging_without_latency_samples(stub_router, fake_brain):
+    slow = fake_brain("slow cue", 0.2)
+    backup = fake_brain("backup cue", 0.0)
+    router = stub_router({"grok": slow, "openai": backup})
+
+    assert router.get_coaching_response({}, mode="realtime_coach", language="en") == "slow cue"
+    assert backup.calls == 0
+
+
+def test_failed_call_starts_backup_immediately(stub_router, fake_brain):
+    backup = fake_brain("backup cue", 0.0)
+    router = stub_router({"grok": fake_brain(fail=True), "openai": backup})
+    _seed_latency(router, "grok", 0.5)
+
+    assert router.get_coaching_response({}, mode="realtime_coach", language="en") == "backup cue"
+    meta = router.get_last_route_meta()
+    assert [entry["status"] for entry in meta["attempted"]] == ["failure", "success"]
+    assert router.get_brain_stats()["grok"]["failures"] == 1
@@ -0,0 +1,78 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from brain_router import BrainRouter, RouteResult
+
+
+@pytest.fixture(autouse=True)
+def _plain_routing_config(monkeypatch):
+    monkeypatch.setattr(config, "BRAIN_CUE_CACHE_ENABLED", False, raising=False)
+    monkeypatch.setattr(config, "BRAIN_HEDGING_ENABLED", False, raising=False)
+    monkeypatch.setattr(config, "BRAIN_TIMEOUTS", {"grok": 2.0, "openai": 2.0}, raising=False)
+
+
+def test_route_result_carries_text_provider_and_attempts(stub_router, fake_brain):
+    router = stub_router({"grok": fake_brain("", fail=True), "openai": fake_brain("Open stride.")})
+
+    result = router.route_coaching_response({}, "intense", mode="realtime_coach", language="en")
+
+    assert isinstance(result, RouteResult)
+    assert result.text == "Open stride."
+    assert result.provider == "openai"
+    assert result.source == "ai"
+    assert result.cache_hit is False
+    assert [attempt["status"] for attempt in result.attempts] == ["failure", "success"]
+    assert result.latency_ms >= 0
+
+
+def test_concurrent_requests_keep_their_own_route_meta(monkeypatch, stub_router, fake_brain):
+    brains = {"grok": fake_brain("Grok cue."), "openai": fake_brain("OpenAI cue.")}
+    failing_grok = fake_brain("", delay=0.15, fail=True)
+    router = stub_router(brains)
+    # Only the "fails" request sees grok fail; the other request's grok call succeeds meanwhile.
+    monkeypatch.setattr(
+        router,
+        "_get_brain_instance",
+        lambda name: failing_grok if name == "grok" and threading.current_thread().name == "fails" else brains[name],
+    )
+    results = {}
+
+    def _failing_request():
+        results["fails"] = router.route_coaching_response({}, "intense", mode="realtime_coach", language="en")
+
+    def _fast_request():
+        time.sleep(0.05)
+        results["fast"] = router.route_coaching_response({}, "intense", mode="realtime_coach", language="en")
+        results["fast_meta"] = router.get_last_route_meta()
+
+    threads = [threading.Thread(target=_failing_request, name="fails"), threading.Thread(target=_fast_request, name="fast")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results["fails"].provider == "openai"
+    assert [attempt["status"] for attempt in results["fails"].attempts] == ["failure", "success"]
+    assert results["fast"].provider == "grok"
+    assert results["fast_meta"]["provider"] == "grok"
+    assert router.get_last_route_meta()["status"] == "uninitialized"
+
+
+def test_recent_outputs_are_bounded_per_session(monkeypatch):
+    monkeypatch.setattr(config, "BRAIN_RECENT_CUE_WINDOW", 2, raising=False)
+    router = BrainRouter(brain_type="config")
+
+    for text in ("One.", "Two.", "Three."):
+        router._record_recent_output("s-1", text)
+    assert router._get_recent_outputs("s-1") == ["Two.", "Three."]
+
+    monkeypatch.setattr(config, "BRAIN_RECENT_CUE_WINDOW", 3, raising=False)
+    router._record_recent_output("s-1", "Four.")
+    assert router._get_recent_outputs("s-1") == ["Two.", "Three.", "Four."]
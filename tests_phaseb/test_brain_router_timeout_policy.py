@@ -97,7 +97,7 @@ def test_route_metadata_reports_config_fallback_after_failure(monkeypatch):
     monkeypatch.setattr(router, "_is_brain_available", lambda _: True)
     monkeypatch.setattr(router, "_get_brain_instance", lambda _: _FakeBrain())
 
-    def _fail_call(brain_name, fn, timeout):
+    def _fail_call(brain_name, fn, timeout, mode=None):
         router.brain_last_outcome[brain_name] = {"status": "timeout", "timeout": timeout}
         return None
 
@@ -0,0 +1,157 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from breathing_timeline import BreathingTimeline
+from session_manager import SessionManager
+
+
+def _new_session(manager: SessionManager, session_id: str, metadata: dict | None = None) -> None:
+    manager.save_session(
+        session_id,
+        {
+            "session_id": session_id,
+            "user_id": None,
+            "persona": "personal_trainer",
+            "messages": [],
+            "created_at": "2026-03-24T10:00:00",
+            "updated_at": "2026-03-24T10:00:00",
+            "metadata": metadata or {},
+        },
+    )
+
+
+def test_timeline_is_materialized_once_without_session_writes(monkeypatch):
+    manager = SessionManager()
+    session_id = "session_timeline_registry"
+    _new_session(manager, session_id, {"breathing_timeline": {"cues_given": 2, "current_phase": "warmup"}})
+
+    writes = []
+    original_commit = manager._commit_session
+    monkeypatch.setattr(
+        manager,
+        "_commit_session",
+        lambda *args, **kwargs: writes.append(args[0]) or original_commit(*args, **kwargs),
+    )
+
+    first = manager.get_breathing_timeline(session_id)
+    second = manager.get_breathing_timeline(session_id)
+
+    assert first is second
+    assert first.cues_given == 2
+    assert first.dirty is False
+    assert writes == []
+
+
+def test_flush_persists_only_dirty_timelines():
+    with main.app.app_context():
+        manager = SessionManager(storage_backend="database")
+        session_id = "session_timeline_flush"
+        _new_session(manager, session_id)
+        try:
+            timeline = manager.get_breathing_timeline(session_id)
+            assert timeline.dirty is True
+            assert manager.flush_breathing_timeline(session_id) is True
+            assert manager.flush_breathing_timeline(session_id) is False
+
+            timeline.get_breathing_cue(phase="warmup", elapsed_seconds=5, language="en")
+            assert timeline.dirty is True
+            assert manager.flush_breathing_timeline(session_id) is True
+
+            reader = SessionManager(storage_backend="database")
+            stored = reader.get_breathing_timeline(session_id)
+            assert isinstance(stored, BreathingTimeline)
+            assert stored.cues_given == 1
+            assert stored.current_phase == "warmup"
+        finally:
+            manager.delete_session(session_id)
+
+
+def test_session_write_clears_dirty_flag():
+    manager = SessionManager()
+    session_id = "session_timeline_piggyback"
+    _new_session(manager, session_id)
+    timeline = manager.get_breathing_timeline(session_id)
+    timeline.get_breathing_cue(phase="intense", elapsed_seconds=30, language="en")
+
+    manager.add_message(session_id, "user", "hello")
+
+    assert timeline.dirty is False
+    assert manager.flush_breathing_timeline(session_id) is False
+
+
+def test_timeline_survives_refresh_until_version_changes():
+    with main.app.app_context():
+        manager = SessionManager(storage_backend="database")
+        other = SessionManager(storage_backend="database")
+        session_id = "session_timeline_refresh"
+        _new_session(manager, session_id)
+        try:
+            manager.init_workout_state(session_id, phase="warmup")
+            timeline = manager.get_breathing_timeline(session_id)
+            manager.flush_breathing_timeline(session_id)
+
+            # Each tick refreshes the session from the DB; the timeline is kept.
+            manager.get_workout_state(session_id)
+            assert manager.get_breathing_timeline(session_id) is timeline
+
+            other.add_message(session_id, "user", "from another worker")
+            manager.get_workout_state(session_id)
+            assert manager.get_breathing_timeline(session_id) is not timeline
+        finally:
+            manager.delete_session(session_id)
+
+
+def test_tick_commit_stores_dirty_timeline_in_the_same_write(monkeypatch):
+    with main.app.app_context():
+        manager = SessionManager(storage_backend="database")
+        session_id = "session_timeline_tick_commit"
+        _new_session(manager, session_id)
+        try:
+            manager.init_workout_state(session_id, phase="warmup")
+            workout_state = manager.get_workout_state(session_id)
+            baseline = manager.snapshot_workout_state(workout_state)
+            timeline = manager.get_breathing_timeline(session_id)
+            timeline.get_breathing_cue(phase="warmup", elapsed_seconds=5, language="en")
+
+            writes = []
+            original_commit = manager._commit_session
+            monkeypatch.setattr(
+                manager,
+                "_commit_session",
+                lambda *args, **kwargs: writes.append(args[0]) or original_commit(*args, **kwargs),
+            )
+            manager.commit_workout_tick(session_id, workout_state, baseline, elapsed_seconds=5)
+
+            assert writes == [session_id]
+            assert timeline.dirty is False
+            assert manager.flush_breathing_timeline(session_id) is False
+            stored = SessionManager(storage_backend="database").get_breathing_timeline(session_id)
+            assert stored.cues_given == 1
+        finally:
+            manager.delete_session(session_id)
+
+
+def test_clean_timeline_is_kept_when_the_tick_commit_reloads():
+    with main.app.app_context():
+        manager = SessionManager(storage_backend="database")
+        other = SessionManager(storage_backend="database")
+        session_id = "session_timeline_tick_reload"
+        _new_session(manager, session_id)
+        try:
+            manager.init_workout_state(session_id, phase="warmup")
+            workout_state = manager.get_workout_state(session_id)
+            baseline = manager.snapshot_workout_state(workout_state)
+            timeline = manager.get_breathing_timeline(session_id)
+            manager.flush_breathing_timeline(session_id)
+
+            # Another worker writes mid-tick, so the tick's commit reloads the session.
+            other.add_message(session_id, "user", "from another worker")
+            manager.commit_workout_tick(session_id, workout_state, baseline, elapsed_seconds=5)
+
+            assert manager.get_workout_state(session_id)["elapsed_seconds"] == 5
+            assert manager.get_breathing_timeline(session_id) is timeline
+        finally:
+            manager.delete_session(session_id)
@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from cue_cache import CueCache, build_cue_cache_key
+
+
+@pytest.fixture
+def cue_cache_router(monkeypatch, stub_router):
+    monkeypatch.setattr(config, "BRAIN_CUE_CACHE_ENABLED", True, raising=False)
+    monkeypatch.setattr(config, "BRAIN_CUE_CACHE_VARIANTS", 2, raising=False)
+    monkeypatch.setattr(config, "BRAIN_RECENT_CUE_WINDOW", 1, raising=False)
+    return lambda brain: stub_router({"grok": brain})
+
+
+def test_key_ignores_noise_and_skips_safety_states():
+    base = {"intensity": "moderate", "volume": 40, "tempo": 18, "emotional_intensity": 0.52}
+    noisy = dict(base, volume=75, tempo=22, emotional_intensity=0.48)
+
+    assert build_cue_cache_key(base, "intense", "en", None) == build_cue_cache_key(noisy, "intense", "en", None)
+    assert build_cue_cache_key(base, "intense", "en", None) != build_cue_cache_key(base, "intense", "no", None)
+    assert build_cue_cache_key(dict(base, intensity="critical"), "intense", "en", None) is None
+    assert build_cue_cache_key(dict(base, safety_override=True), "intense", "en", None) is None
+
+
+def test_variants_fill_then_rotate_avoiding_recent():
+    cache = CueCache(variants=3)
+    key = ("intense", "moderate")
+    for cue in ("A.", "B."):
+        cache.put(key, cue)
+    assert cache.get(key) is None
+
+    cache.put(key, "C.")
+    assert [cache.get(key) for _ in range(3)] == ["A.", "B.", "C."]
+    assert cache.get(key, recent=["a.", "B."]) == "C."
+    assert cache.get(key, recent=["A.", "B.", "C."]) is None
+    assert cache.stats()["repeat_misses"] == 1
+
+
+def test_ttl_and_size_bounds(fake_clock):
+    cache = CueCache(variants=1, ttl_seconds=60, max_keys=2, clock=fake_clock)
+    cache.put(("a",), "A.")
+    cache.put(("b",), "B.")
+    cache.put(("c",), "C.")
+    assert cache.get(("a",)) is None
+    assert cache.get(("c",)) == "C."
+
+    fake_clock.now += 61
+    assert cache.get(("c",)) is None
+    assert cache.stats()["keys"] == 1
+
+
+def test_router_serves_repeated_state_from_cache(cue_cache_router, fake_brain):
+    brain = fake_brain()
+    router = cue_cache_router(brain)
+    breath = {"intensity": "moderate", "session_id": "s-1"}
+
+    cues = [router.get_coaching_response(breath, "intense", language="en") for _ in range(5)]
+
+    assert brain.calls == 2
+    assert cues[:2] == ["Cue number 1.", "Cue number 2."]
+    assert all(cues[i] != cues[i + 1] for i in range(len(cues) - 1))
+    assert router.get_last_route_meta()["source"] == "ai_cache"
+    assert router.health_check()["cue_cache"]["hits"] == 3
+
+
+def test_router_cache_can_be_disabled(monkeypatch, cue_cache_router, fake_brain):
+    brain = fake_brain()
+    router = cue_cache_router(brain)
+    monkeypatch.setattr(config, "BRAIN_CUE_CACHE_ENABLED", False, raising=False)
+
+    for _ in range(4):
+        router.get_coaching_response({"intensity": "moderate"}, "intense", language="en")
+
+    assert brain.calls == 4
@@ -0,0 +1,116 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import auth
+from jwks_cache import JWKSCache, parse_cache_control_max_age
+
+
+def _key_pair(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, public_jwk
+
+
+class _LocalFetcher:
+    def __init__(self, *jwks, max_age=None):
+        self.keys = list(jwks)
+        self.max_age = max_age
+        self.calls = 0
+
+    def __call__(self, _url):
+        self.calls += 1
+        return {"keys": list(self.keys)}, self.max_age
+
+
+def _token(private_key, kid: str, **claims) -> str:
+    payload = {"sub": "user-1", "exp": int(time.time()) + 600, **claims}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_parse_cache_control_max_age():
+    assert parse_cache_control_max_age("public, max-age=19468, must-revalidate") == 19468.0
+    assert parse_cache_control_max_age("no-cache") is None
+    assert parse_cache_control_max_age(None) is None
+
+
+def test_keys_are_fetched_once_while_fresh(fake_clock):
+    private_key, public_jwk = _key_pair("k1")
+    fetcher = _LocalFetcher(public_jwk, max_age=600)
+    cache = JWKSCache("https://keys.test", fetcher=fetcher, clock=fake_clock)
+
+    token = _token(private_key, "k1")
+    for _ in range(3):
+        key = cache.get_signing_key_from_jwt(token)
+        assert jwt.decode(token, key.key, algorithms=["RS256"])["sub"] == "user-1"
+
+    assert fetcher.calls == 1
+    assert cache.stats()["hits"] == 3
+
+
+def test_stale_keys_are_served_while_refreshing_in_background(fake_clock):
+    _private_key, public_jwk = _key_pair("k1")
+    fetcher = _LocalFetcher(public_jwk, max_age=60)
+    scheduled = []
+    cache = JWKSCache("https://keys.test", fetcher=fetcher, clock=fake_clock, scheduler=scheduled.append)
+
+    cache.get_signing_key("k1")
+    fake_clock.now += 120
+    assert cache.get_signing_key("k1").key_id == "k1"
+    cache.get_signing_key("k1")
+
+    assert fetcher.calls == 1
+    assert len(scheduled) == 1
+    scheduled[0]()
+    assert fetcher.calls == 2
+    assert cache.stats()["expires_in_seconds"] == 60.0
+
+
+def test_unknown_kid_triggers_throttled_refetch(fake_clock):
+    _old_private, old_jwk = _key_pair("old")
+    new_private, new_jwk = _key_pair("new")
+    fetcher = _LocalFetcher(old_jwk, max_age=3600)
+    cache = JWKSCache("https://keys.test", fetcher=fetcher, clock=fake_clock, kid_miss_min_interval_seconds=30)
+
+    cache.get_signing_key("old")
+    fetcher.keys.append(new_jwk)
+    assert cache.get_signing_key_from_jwt(_token(new_private, "new")).key_id == "new"
+    assert fetcher.calls == 2
+
+    with pytest.raises(jwt.PyJWKClientError):
+        cache.get_signing_key("forged")
+    assert fetcher.calls == 2
+    assert cache.stats()["kid_miss_throttled"] == 1
+
+
+def test_verify_google_token_uses_cached_keys(monkeypatch):
+    private_key, public_jwk = _key_pair("g1")
+    fetcher = _LocalFetcher(public_jwk, max_age=3600)
+    monkeypatch.setattr(auth, "_GOOGLE_JWKS", JWKSCache(auth.GOOGLE_JWKS_URL, fetcher=fetcher))
+    monkeypatch.setattr(auth.config, "GOOGLE_CLIENT_IDS", ["client-1"], raising=False)
+
+    token = _token(
+        private_key,
+        "g1",
+        aud="client-1",
+        iss="https://accounts.google.com",
+        email="g@example.com",
+        name="G User",
+    )
+    for _ in range(2):
+        info = auth.verify_google_token(token)
+        assert info["provider_id"] == "user-1"
+        assert info["email"] == "g@example.com"
+    assert fetcher.calls == 1
+
+    wrong_audience = _token(private_key, "g1", aud="other", iss="https://accounts.google.com")
+    with pytest.raises(ValueError):
+        auth.verify_google_token(wrong_audience)
@@ -0,0 +1,80 @@
+import os
+import sys
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+import pytest
+
+import auth
+import main
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    auth.clear_jwt_cache()
+    yield
+    auth.clear_jwt_cache()
+
+
+def test_decode_jwt_verifies_each_token_once(monkeypatch):
+    token = auth.create_jwt("user-cache", "cache@example.com")
+    verifications = []
+    original_decode = jwt.decode
+    monkeypatch.setattr(auth.jwt, "decode", lambda *args, **kwargs: verifications.append(1) or original_decode(*args, **kwargs))
+
+    first = auth.decode_jwt(token)
+    first["user_id"] = "mutated"
+    second = auth.decode_jwt(token)
+
+    assert second["user_id"] == "user-cache"
+    assert len(verifications) == 1
+    stats = auth.get_jwt_cache_stats()
+    assert stats["cache_hits"] == 1
+    assert stats["cache_misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cached_claims_are_not_served_past_exp(monkeypatch):
+    issued_at = auth._utcnow() - timedelta(minutes=5)
+    token = jwt.encode(
+        {"user_id": "user-expiring", "iat": issued_at, "exp": issued_at + timedelta(minutes=6)},
+        auth.JWT_SECRET,
+        algorithm=auth.JWT_ALGORITHM,
+    )
+    assert auth.decode_jwt(token)["user_id"] == "user-expiring"
+
+    real_time = auth.time.time
+    monkeypatch.setattr(auth.time, "time", lambda: real_time() + 120)
+    monkeypatch.setattr(auth.jwt, "decode", lambda *args, **kwargs: (_ for _ in ()).throw(jwt.ExpiredSignatureError()))
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        auth.decode_jwt(token)
+
+
+def test_invalid_tokens_are_not_cached():
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidTokenError):
+            auth.decode_jwt("not-a-token")
+    assert auth.get_jwt_cache_stats()["entries"] == 0
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(auth.config, "JWT_VERIFY_CACHE_MAX_ENTRIES", 2, raising=False)
+    for index in range(3):
+        auth.decode_jwt(auth.create_jwt(f"user-{index}"))
+
+    stats = auth.get_jwt_cache_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_request_helpers_share_the_cache():
+    token = auth.create_jwt("user-shared")
+    with main.app.test_request_context("/", headers={"Authorization": f"Bearer {token}"}):
+        assert auth.get_request_auth_user_id() == "user-shared"
+    with main.app.test_request_context("/", headers={"Authorization": f"Bearer {token}"}):
+        assert auth.get_request_auth_user_id() == "user-shared"
+
+    assert auth.get_jwt_cache_stats()["cache_hits"] == 1
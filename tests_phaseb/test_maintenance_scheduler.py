@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import main
+import maintenance
+from database import EmailAuthCode, MaintenanceLease, RateLimitCounter, RateLimitState, db
+
+
+def _utcnow_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture
+def app_context():
+    with main.app.app_context():
+        MaintenanceLease.query.delete(synchronize_session=False)
+        db.session.commit()
+        yield
+        MaintenanceLease.query.delete(synchronize_session=False)
+        EmailAuthCode.query.filter(EmailAuthCode.email.like("maint-%")).delete(synchronize_session=False)
+        RateLimitCounter.query.filter(RateLimitCounter.rule_name.like("test.maint%")).delete(synchronize_session=False)
+        RateLimitState.query.filter(RateLimitState.rule_name.like("test.maint%")).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_delete_in_chunks_removes_only_matching_rows(app_context):
+    email = f"maint-{uuid.uuid4().hex[:8]}@example.com"
+    now = _utcnow_naive()
+    for offset in range(5):
+        db.session.add(EmailAuthCode(email=email, code_hash="x", expires_at=now - timedelta(minutes=offset + 1)))
+    db.session.add(EmailAuthCode(email=email, code_hash="y", expires_at=now + timedelta(minutes=10)))
+    db.session.commit()
+
+    removed = maintenance.delete_in_chunks(
+        EmailAuthCode,
+        EmailAuthCode.email == email,
+        EmailAuthCode.expires_at < now,
+        chunk_size=2,
+    )
+
+    assert removed == 5
+    assert [row.code_hash for row in EmailAuthCode.query.filter_by(email=email).all()] == ["y"]
+
+
+def test_rate_limit_purge_handles_composite_keys(app_context):
+    now_ts = time.time()
+    old = _utcnow_naive() - timedelta(days=30)
+    db.session.add(RateLimitCounter(subject_key="s", rule_name="test.maint:60", window_start=0, window_seconds=60, count=1, updated_at=old))
+    db.session.add(RateLimitState(subject_key="s", rule_name="test.maint.gone", tat=now_ts - 5, interval_seconds=1, window_seconds=60))
+    db.session.add(RateLimitState(subject_key="s", rule_name="test.maint.live", tat=now_ts + 30, interval_seconds=1, window_seconds=60))
+    db.session.commit()
+
+    assert maintenance.purge_expired_rate_limits(now_ts) >= 2
+    assert RateLimitCounter.query.filter_by(rule_name="test.maint:60").count() == 0
+    assert [row.rule_name for row in RateLimitState.query.filter(RateLimitState.rule_name.like("test.maint%"))] == [
+        "test.maint.live"
+    ]
+
+
+def test_lease_has_a_single_holder_until_it_expires(app_context):
+    assert maintenance.try_acquire_lease("test", "worker-a", 60, 1_000.0) is True
+    assert maintenance.try_acquire_lease("test", "worker-b", 60, 1_010.0) is False
+    assert maintenance.try_acquire_lease("test", "worker-a", 60, 1_020.0) is True
+    assert maintenance.try_acquire_lease("test", "worker-b", 60, 1_100.0) is True
+    assert db.session.get(MaintenanceLease, "test").holder == "worker-b"
+
+
+def test_scheduler_runs_due_jobs_on_leader_only(app_context):
+    calls = []
+    clock = {"now": 10_000.0}
+    jobs = [
+        maintenance.MaintenanceJob("fast", lambda now_ts: calls.append(("fast", now_ts)) or 2, 60),
+        maintenance.MaintenanceJob("slow", lambda now_ts: calls.append(("slow", now_ts)) or 0, 3600),
+    ]
+    leader = maintenance.MaintenanceScheduler(main.app, jobs, holder="leader", clock=lambda: clock["now"])
+    follower = maintenance.MaintenanceScheduler(main.app, jobs, holder="follower", clock=lambda: clock["now"])
+
+    assert leader.run_pending() == {"fast": 2, "slow": 0}
+    assert follower.run_pending() == {}
+
+    clock["now"] += 120
+    assert leader.run_pending() == {"fast": 2}
+
+    stats = leader.stats()
+    assert stats["leader"] is True
+    assert stats["jobs"]["fast"]["runs"] == 2
+    assert stats["jobs"]["fast"]["removed_total"] == 4
+    assert stats["jobs"]["slow"]["runs"] == 1
+    assert stats["jobs"]["fast"]["last_duration_ms"] >= 0
+    assert follower.stats()["leader"] is False
+    assert len(calls) == 3
+
+
+def test_failing_job_is_counted_and_does_not_stop_others(app_context):
+    def _boom(_now_ts):
+        raise RuntimeError("boom")
+
+    jobs = [
+        maintenance.MaintenanceJob("broken", _boom, 60),
+        maintenance.MaintenanceJob("ok", lambda _now_ts: 1, 60),
+    ]
+    scheduler = maintenance.MaintenanceScheduler(main.app, jobs, holder="solo")
+
+    assert scheduler.run_pending() == {"broken": 0, "ok": 1}
+    assert scheduler.stats()["jobs"]["broken"]["failures"] == 1
+
+
+def test_local_jobs_run_in_every_process(app_context):
+    calls = []
+    jobs = [
+        maintenance.MaintenanceJob("db", lambda _now_ts: calls.append("db") or 0, 60),
+        maintenance.MaintenanceJob("disk", lambda _now_ts: calls.append("disk") or 3, 60, local=True),
+    ]
+    leader = maintenance.MaintenanceScheduler(main.app, jobs, holder="leader")
+    follower = maintenance.MaintenanceScheduler(main.app, jobs, holder="follower")
+
+    assert leader.run_pending() == {"db": 0, "disk": 3}
+    assert follower.run_pending() == {"disk": 3}
+    assert follower.stats()["leader"] is False
+    assert calls == ["db", "disk", "disk"]
+    assert next(job for job in maintenance.build_default_jobs() if job.name == "tts_audio_cache").local is True
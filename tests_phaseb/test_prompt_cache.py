@@ -0,0 +1,83 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prompt_cache
+from brains.grok_brain import GrokBrain
+from persona_manager import PersonaManager, get_coach_prompt
+from prompt_cache import PromptCache
+
+
+def test_compiled_builds_once_per_key_and_tracks_hits():
+    cache = PromptCache()
+    builds = []
+
+    def _build():
+        builds.append(1)
+        return "prompt"
+
+    assert cache.compiled("persona_system", ("a", "en"), _build) == "prompt"
+    assert cache.compiled("persona_system", ("a", "en"), _build) == "prompt"
+    assert cache.compiled("persona_system", ("a", "no"), _build) == "prompt"
+
+    assert len(builds) == 2
+    stats = cache.stats()["surfaces"]["persona_system"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_lru_bound_and_surface_invalidation():
+    cache = PromptCache(max_entries=2)
+    cache.compiled("a", 1, lambda: "one")
+    cache.compiled("a", 2, lambda: "two")
+    cache.compiled("b", 1, lambda: "three")
+
+    assert cache.stats()["entries"] == 2
+    cache.invalidate("b")
+    assert cache.stats()["entries"] == 1
+    assert cache.compiled("a", 2, lambda: "rebuilt") == "two"
+
+
+def test_record_bytes_reports_utf8_size():
+    cache = PromptCache()
+    cache.record_bytes("grok_realtime", "Kjør på")
+    cache.record_bytes("grok_realtime", "abc")
+
+    stats = cache.stats()["surfaces"]["grok_realtime"]
+    assert stats["calls"] == 2
+    assert stats["bytes_last"] == 3
+    assert stats["bytes_max"] == len("Kjør på".encode("utf-8"))
+    assert stats["bytes_avg"] == (stats["bytes_total"] // 2)
+
+
+def test_persona_system_prompt_is_memoized_and_reloadable(monkeypatch):
+    first = PersonaManager.get_system_prompt("personal_trainer", language="en", emotional_mode="peak")
+    assert PersonaManager.get_system_prompt("personal_trainer", language="en", emotional_mode="peak") is first
+    assert get_coach_prompt("realtime_coach", "no") is get_coach_prompt("realtime_coach", "no")
+
+    monkeypatch.setitem(PersonaManager.PERSONAS, "personal_trainer", "Updated persona.")
+    PersonaManager.reload_prompts()
+    try:
+        updated = PersonaManager.get_system_prompt("personal_trainer", language="en", emotional_mode="peak")
+        assert updated.startswith("Updated persona.")
+    finally:
+        monkeypatch.undo()
+        PersonaManager.reload_prompts()
+
+
+def test_grok_realtime_prompt_keeps_a_stable_prefix():
+    brain = GrokBrain(api_key="xai-test-key", model="grok-3-mini")
+    common = dict(phase="intense", intensity="moderate", language="en", persona="personal_trainer")
+
+    plain = brain._build_realtime_system_prompt(**common)
+    personalized = brain._build_realtime_system_prompt(
+        **common,
+        user_name="Ada",
+        recent_cues=["Hold it."],
+        coaching_reason="pace_drift",
+    )
+
+    assert personalized.startswith(plain)
+    assert "Athlete's name: Ada" in personalized[len(plain):]
+    assert prompt_cache.get_prompt_cache_stats()["surfaces"]["grok_realtime"]["calls"] >= 2
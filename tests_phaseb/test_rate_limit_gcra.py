@@ -0,0 +1,77 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import auth
+import main
+from database import RateLimitCounter, RateLimitState, db
+
+
+@pytest.fixture
+def gcra_limiter(monkeypatch):
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_BYPASS_FOR_TESTS", False, raising=False)
+    monkeypatch.setenv("RATE_LIMIT_BYPASS_FOR_TESTS", "false")
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_STORAGE_BACKEND", "database", raising=False)
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_ALGORITHM", "gcra", raising=False)
+    clock = {"now": 1_800_000_000.0}
+    monkeypatch.setattr(auth.time, "time", lambda: clock["now"])
+    yield clock
+    with main.app.app_context():
+        RateLimitState.query.filter(RateLimitState.rule_name.like("test.gcra%")).delete(synchronize_session=False)
+        RateLimitCounter.query.filter(RateLimitCounter.rule_name.like("test.gcra%")).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _evaluate(policy):
+    with main.app.test_request_context("/"):
+        return policy.evaluate()
+
+
+def test_gcra_allows_burst_then_one_request_per_interval(gcra_limiter):
+    policy = auth.RateLimitPolicy("test.gcra", ((4, 60),), key_func=lambda: "gcra-subject")
+
+    for expected in (1, 2, 3, 4):
+        decision = _evaluate(policy)
+        assert decision.allowed is True
+        assert decision.counts == (("test.gcra:60", expected),)
+
+    blocked = _evaluate(policy)
+    assert blocked.allowed is False
+    assert blocked.tripped_rule == "test.gcra:60"
+    assert blocked.retry_after == 15
+
+    gcra_limiter["now"] += 15
+    assert _evaluate(policy).allowed is True
+    assert _evaluate(policy).allowed is False
+
+
+def test_gcra_has_no_window_boundary_burst(gcra_limiter):
+    policy = auth.RateLimitPolicy("test.gcra.edge", ((4, 60),), key_func=lambda: "edge-subject")
+    gcra_limiter["now"] = 1_800_000_059.0  # one second before a fixed-window boundary
+
+    assert all(_evaluate(policy).allowed for _ in range(4))
+    gcra_limiter["now"] += 2
+    assert _evaluate(policy).allowed is False
+
+
+def test_gcra_keeps_one_row_per_subject_and_rule(gcra_limiter):
+    policy = auth.RateLimitPolicy("test.gcra.rows", ((3, 60), (10, 3600)), key_func=lambda: "rows-subject")
+
+    for _ in range(5):
+        _evaluate(policy)
+        gcra_limiter["now"] += 70
+
+    with main.app.app_context():
+        rows = RateLimitState.query.filter_by(subject_key="auto:rows-subject").all()
+        assert sorted(row.rule_name for row in rows) == ["test.gcra.rows:3600", "test.gcra.rows:60"]
+        assert RateLimitCounter.query.filter(RateLimitCounter.rule_name.like("test.gcra.rows%")).count() == 0
+
+
+def test_windowless_rules_stay_on_counters(gcra_limiter):
+    policy = auth.RateLimitPolicy("test.gcra.lifetime", ((1, 0),), key_func=lambda: "lifetime-subject")
+
+    assert _evaluate(policy).allowed is True
+    assert _evaluate(policy).allowed is False
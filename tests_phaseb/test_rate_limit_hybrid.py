@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import auth
+import main
+from database import RateLimitCounter, db
+
+
+@pytest.fixture
+def hybrid_limiter(monkeypatch):
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_BYPASS_FOR_TESTS", False, raising=False)
+    monkeypatch.setenv("RATE_LIMIT_BYPASS_FOR_TESTS", "false")
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_STORAGE_BACKEND", "hybrid", raising=False)
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_HYBRID_FLUSH_INTERVAL_SECONDS", 3600.0, raising=False)
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_HYBRID_MAX_UNSYNCED", 3, raising=False)
+    monkeypatch.setattr(auth, "_LAST_RATE_LIMIT_FLUSH_AT", time.time())
+    auth._HYBRID_RATE_LIMIT_COUNTERS.clear()
+    with main.app.app_context():
+        RateLimitCounter.query.filter(RateLimitCounter.rule_name.like("test.hybrid%")).delete(synchronize_session=False)
+        db.session.commit()
+    yield
+    auth._HYBRID_RATE_LIMIT_COUNTERS.clear()
+    with main.app.app_context():
+        RateLimitCounter.query.filter(RateLimitCounter.rule_name.like("test.hybrid%")).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _hit(limit: int, subject: str = "worker-subject"):
+    with main.app.test_request_context("/"):
+        return auth.enforce_rate_limit(limit, 3600, key_prefix="test.hybrid", key_func=lambda: subject)
+
+
+def _stored_count(subject: str = "worker-subject") -> int:
+    with main.app.app_context():
+        rows = RateLimitCounter.query.filter_by(subject_key=f"auto:{subject}", rule_name="test.hybrid:3600").all()
+        return sum(int(row.count) for row in rows)
+
+
+def test_hybrid_limiter_batches_database_writes(hybrid_limiter, monkeypatch):
+    calls = []
+    original = auth._add_rate_limit_counts
+    monkeypatch.setattr(
+        auth,
+        "_add_rate_limit_counts",
+        lambda increments, now_ts: calls.append(list(increments)) or original(increments, now_ts),
+    )
+
+    for _ in range(2):
+        assert _hit(10) is None
+    assert calls == []
+    assert _stored_count() == 0
+
+    assert _hit(10) is None
+    assert len(calls) == 1
+    assert calls[0][0][4] == 3
+    assert _stored_count() == 3
+
+
+def test_hybrid_limiter_blocks_once_local_count_exceeds_limit(hybrid_limiter):
+    for _ in range(4):
+        assert _hit(4) is None
+
+    blocked = _hit(4)
+    assert blocked is not None
+    assert blocked.status_code == 429
+
+
+def test_hybrid_limiter_learns_counts_from_other_workers_on_flush(hybrid_limiter):
+    assert _hit(5) is None
+
+    now_ts = time.time()
+    with main.app.app_context():
+        window_start = auth._rate_limit_window_start(now_ts, 3600)
+        auth._add_rate_limit_counts([("auto:worker-subject", "test.hybrid:3600", window_start, 3600, 10)], now_ts)
+        assert auth.flush_rate_limit_counters() == 1
+
+    blocked = _hit(5)
+    assert blocked is not None
+    assert blocked.status_code == 429
+    assert _stored_count() == 11
+
+
+def test_background_flusher_keeps_request_path_in_memory(hybrid_limiter, monkeypatch):
+    import threading
+
+    flush_threads = []
+    original = auth._add_rate_limit_counts
+    monkeypatch.setattr(
+        auth,
+        "_add_rate_limit_counts",
+        lambda increments, now_ts: flush_threads.append(threading.current_thread().name)
+        or original(increments, now_ts),
+    )
+    assert auth.start_rate_limit_flusher(main.app) is True
+    try:
+        for _ in range(3):
+            assert _hit(10) is None
+
+        deadline = time.time() + 2.0
+        while _stored_count() < 3 and time.time() < deadline:
+            time.sleep(0.02)
+        assert _stored_count() == 3
+        assert flush_threads and set(flush_threads) == {"rate-limit-flush"}
+    finally:
+        flusher = auth._RATE_LIMIT_FLUSHER
+        auth._RATE_LIMIT_FLUSHER_STOP.set()
+        auth._RATE_LIMIT_FLUSH_WAKE.set()
+        flusher.join(timeout=2)
+        monkeypatch.setattr(auth, "_RATE_LIMIT_FLUSHER", None)
@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import auth
+import main
+from database import RateLimitCounter, db
+
+
+@pytest.fixture
+def database_limiter(monkeypatch):
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_BYPASS_FOR_TESTS", False, raising=False)
+    monkeypatch.setenv("RATE_LIMIT_BYPASS_FOR_TESTS", "false")
+    monkeypatch.setattr(auth.config, "RATE_LIMIT_STORAGE_BACKEND", "database", raising=False)
+    yield
+    with main.app.app_context():
+        RateLimitCounter.query.filter(RateLimitCounter.rule_name.like("test.policy%")).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def test_policy_resolves_subject_once_and_counts_all_windows_in_one_call(database_limiter, monkeypatch):
+    resolutions = []
+    calls = []
+    original = auth._add_rate_limit_counts
+    monkeypatch.setattr(
+        auth,
+        "_add_rate_limit_counts",
+        lambda increments, now_ts: calls.append(list(increments)) or original(increments, now_ts),
+    )
+    policy = auth.RateLimitPolicy(
+        "test.policy",
+        ((5, 60), (50, 3600)),
+        key_func=lambda: resolutions.append(1) or "policy-subject",
+    )
+
+    with main.app.test_request_context("/"):
+        decision = policy.evaluate()
+
+    assert decision.allowed is True
+    assert len(resolutions) == 1
+    assert len(calls) == 1
+    assert [item[1] for item in calls[0]] == ["test.policy:60", "test.policy:3600"]
+    assert decision.counts == (("test.policy:60", 1), ("test.policy:3600", 1))
+
+
+def test_policy_reports_the_rule_that_tripped(database_limiter):
+    policy = auth.RateLimitPolicy("test.policy.trip", ((2, 60), (10, 3600)), key_func=lambda: "trip-subject")
+
+    with main.app.test_request_context("/"):
+        assert policy.enforce() is None
+        assert policy.enforce() is None
+        decision = policy.evaluate()
+        blocked = policy.enforce()
+
+    assert decision.allowed is False
+    assert decision.tripped_rule == "test.policy.trip:60"
+    assert 1 <= decision.retry_after <= 60
+    assert blocked.status_code == 429
+    assert int(blocked.headers["Retry-After"]) <= 60
+
+
+def test_policy_rejects_duplicate_windows():
+    with pytest.raises(ValueError):
+        auth.RateLimitPolicy("test.policy.dup", ((1, 60), (2, 60)))
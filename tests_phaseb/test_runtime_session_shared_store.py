@@ -0,0 +1,174 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import main
+from session_manager import SessionManager, SessionVersionConflict
+from zone_engine_state import ZoneEngineState
+
+
+def _new_session(manager: SessionManager, session_id: str) -> None:
+    manager.save_session(
+        session_id,
+        {
+            "session_id": session_id,
+            "user_id": None,
+            "persona": "personal_trainer",
+            "messages": [],
+            "created_at": "2026-03-22T10:00:00",
+            "updated_at": "2026-03-22T10:00:00",
+            "metadata": {},
+        },
+    )
+
+
+def test_interleaved_workers_do_not_lose_writes():
+    with main.app.app_context():
+        worker_a = SessionManager(storage_backend="database")
+        worker_b = SessionManager(storage_backend="database")
+        session_id = "session_shared_store_interleaved"
+        _new_session(worker_a, session_id)
+        try:
+            worker_a.init_workout_state(session_id, phase="warmup")
+            worker_b.get_session(session_id)
+
+            # Worker A writes; worker B still holds the stale cached copy.
+            worker_a.add_message(session_id, "user", "first")
+            worker_b.add_message(session_id, "user", "second")
+            worker_b.update_workout_state(session_id, phase="intense", elapsed_seconds=300)
+
+            reader = SessionManager(storage_backend="database")
+            contents = [message["content"] for message in reader.get_messages(session_id)]
+            assert contents == ["first", "second"]
+            assert reader.get_workout_state(session_id)["current_phase"] == "intense"
+            assert reader.get_session_version(session_id) == worker_b.get_session_version(session_id)
+        finally:
+            worker_a.delete_session(session_id)
+
+
+def test_interleaved_ticks_keep_both_workout_state_updates():
+    with main.app.app_context():
+        worker_a = SessionManager(storage_backend="database")
+        worker_b = SessionManager(storage_backend="database")
+        session_id = "session_shared_store_interleaved_ticks"
+        _new_session(worker_a, session_id)
+        try:
+            worker_a.init_workout_state(session_id, phase="intense")
+            state_a = worker_a.get_workout_state(session_id)
+            state_a["zone_engine"] = ZoneEngineState()
+            worker_a.save_workout_state(session_id, state_a)
+
+            # Both workers load the same version and start a tick.
+            state_a = worker_a.get_workout_state(session_id)
+            baseline_a = worker_a.snapshot_workout_state(state_a)
+            state_b = worker_b.get_workout_state(session_id)
+            baseline_b = worker_b.snapshot_workout_state(state_b)
+
+            state_a["zone_engine"]["confirmed_zone_status"] = "above_zone"
+            state_a["is_first_breath"] = False
+            state_b["zone_engine"]["phase_id"] = 3
+            state_b["latency_strategy"]["pending_rich_followup"] = True
+
+            worker_a.commit_workout_tick(
+                session_id, state_a, baseline_a,
+                breath_analysis={"intensity": "intense", "tempo": 30},
+                coaching_output="Ease off.",
+                elapsed_seconds=300,
+            )
+            # Worker B's copy is stale now; its commit retries on the fresh state.
+            worker_b.commit_workout_tick(
+                session_id, state_b, baseline_b,
+                breath_analysis={"intensity": "moderate", "tempo": 20},
+                elapsed_seconds=308,
+            )
+
+            stored = SessionManager(storage_backend="database").get_workout_state(session_id)
+            assert [entry["tempo"] for entry in stored["breath_history"]] == [30, 20]
+            assert [entry["text"] for entry in stored["coaching_history"]] == ["Ease off."]
+            assert stored["zone_engine"]["confirmed_zone_status"] == "above_zone"
+            assert stored["zone_engine"]["phase_id"] == 3
+            assert stored["is_first_breath"] is False
+            assert stored["latency_strategy"]["pending_rich_followup"] is True
+            assert stored["elapsed_seconds"] == 308
+        finally:
+            worker_a.delete_session(session_id)
+
+
+def test_shared_store_reads_pick_up_other_worker_writes():
+    with main.app.app_context():
+        worker_a = SessionManager(storage_backend="database", shared_store=True)
+        worker_b = SessionManager(storage_backend="database", shared_store=True)
+        session_id = "session_shared_store_reads"
+        _new_session(worker_a, session_id)
+        try:
+            assert worker_b.get_session(session_id)["persona"] == "personal_trainer"
+            worker_a.set_persona(session_id, "toxic_mode")
+            assert worker_b.get_session(session_id)["persona"] == "toxic_mode"
+        finally:
+            worker_a.delete_session(session_id)
+
+
+def test_update_session_raises_after_exhausting_attempts(monkeypatch):
+    with main.app.app_context():
+        manager = SessionManager(storage_backend="database")
+        session_id = "session_shared_store_conflict"
+        _new_session(manager, session_id)
+        try:
+            def _always_conflict(*_args, **_kwargs):
+                raise SessionVersionConflict(session_id)
+
+            monkeypatch.setattr(manager, "_persist_session_record", _always_conflict)
+            with pytest.raises(SessionVersionConflict):
+                manager.update_session(session_id, lambda session: None, max_attempts=2)
+        finally:
+            monkeypatch.undo()
+            manager.delete_session(session_id)
+
+
+def test_failed_persist_keeps_the_stored_version(monkeypatch):
+    with main.app.app_context():
+        manager = SessionManager(storage_backend="database")
+        session_id = "session_shared_store_failed_persist"
+        _new_session(manager, session_id)
+        try:
+            manager.init_workout_state(session_id, phase="intense")
+            timeline = manager.get_breathing_timeline(session_id)
+            stored_version = manager.get_session_version(session_id)
+
+            with monkeypatch.context() as patched:
+                patched.setattr(manager, "_persist_session_record", lambda *_args, **_kwargs: None)
+                timeline.dirty = True
+                manager.add_message(session_id, "user", "lost write")
+
+            assert manager.get_session_version(session_id) == stored_version
+            assert timeline.dirty is True
+            # The next write still matches the stored row and carries both changes.
+            manager.add_message(session_id, "user", "next write")
+            reader = SessionManager(storage_backend="database")
+            assert [message["content"] for message in reader.get_messages(session_id)] == ["lost write", "next write"]
+            assert reader.get_session_version(session_id) == stored_version + 1
+            assert timeline.dirty is False
+        finally:
+            manager.delete_session(session_id)
+
+
+def test_memory_backend_serializes_concurrent_updates():
+    manager = SessionManager()
+    session_id = "session_memory_concurrent"
+    _new_session(manager, session_id)
+
+    def _append(index: int) -> None:
+        manager.add_message(session_id, "user", f"message {index}")
+
+    threads = [threading.Thread(target=_append, args=(index,)) for index in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(manager.get_messages(session_id)) == 20
+    assert manager.get_session_version(session_id) == 21
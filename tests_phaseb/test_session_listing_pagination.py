@@ -0,0 +1,84 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import main
+from database import RuntimeSessionState, db
+from session_manager import SessionManager
+
+
+def _seed_sessions(manager: SessionManager, user_id: str, count: int) -> list:
+    session_ids = []
+    for index in range(count):
+        session_id = f"session_{user_id}_{index}"
+        manager.save_session(
+            session_id,
+            {
+                "session_id": session_id,
+                "user_id": None,
+                "owner": user_id,
+                "persona": "toxic_mode" if index % 2 else "personal_trainer",
+                "messages": [{"role": "user", "content": "hi"}] * index,
+                "created_at": f"2026-03-20T10:00:{index:02d}",
+                "updated_at": f"2026-03-20T10:00:{index:02d}",
+                "metadata": {},
+            },
+        )
+        session_ids.append(session_id)
+    return session_ids
+
+
+def _collect_pages(manager: SessionManager, limit: int) -> list:
+    collected = []
+    cursor = None
+    while True:
+        page = manager.list_sessions_page(limit=limit, cursor=cursor)
+        collected.extend(page["sessions"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return collected
+
+
+def test_memory_listing_pages_newest_first_without_duplicates():
+    manager = SessionManager()
+    session_ids = _seed_sessions(manager, "pager", 5)
+
+    summaries = _collect_pages(manager, limit=2)
+
+    assert [item["session_id"] for item in summaries] == list(reversed(session_ids))
+    assert summaries[0]["message_count"] == 4
+    assert summaries[0]["persona"] == "personal_trainer"
+
+
+def test_database_listing_reads_summary_columns_without_decoding_payload(monkeypatch):
+    with main.app.app_context():
+        manager = SessionManager(storage_backend="database")
+        session_ids = _seed_sessions(manager, "db_pager", 3)
+        try:
+            row = db.session.get(RuntimeSessionState, session_ids[2])
+            assert row.persona == "personal_trainer"
+            assert row.message_count == 2
+
+            def _fail_load(*_args, **_kwargs):
+                raise AssertionError("listing must not load full session payloads")
+
+            monkeypatch.setattr(manager, "_load_session_record", _fail_load)
+            listed = [
+                item for item in _collect_pages(manager, limit=1)
+                if item["session_id"] in session_ids
+            ]
+            assert {item["session_id"] for item in listed} == set(session_ids)
+            counts = {item["session_id"]: item["message_count"] for item in listed}
+            assert counts == {session_ids[0]: 0, session_ids[1]: 1, session_ids[2]: 2}
+        finally:
+            for session_id in session_ids:
+                manager.delete_session(session_id)
+
+
+def test_listing_rejects_malformed_cursor():
+    manager = SessionManager()
+    with pytest.raises(ValueError):
+        manager.list_sessions_page(cursor="not-a-cursor")
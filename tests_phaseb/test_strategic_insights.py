@@ -0,0 +1,242 @@
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from session_manager import SessionManager
+from strategic_insights import StrategicInsightScheduler
+
+_GUIDANCE = {
+    "strategy": "restore_rhythm",
+    "tone": "calm_firm",
+    "message_goal": "stabilize",
+    "suggested_phrase": "Control the exhale.",
+}
+
+
+class _GatedBrain:
+    def __init__(self, guidance=_GUIDANCE):
+        self.guidance = guidance
+        self.release = threading.Event()
+        self.calls = []
+
+    def is_available(self):
+        return True
+
+    def get_strategic_insight(self, **kwargs):
+        self.calls.append(kwargs)
+        self.release.wait(timeout=5)
+        return self.guidance
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def _scheduler(manager, brain, **kwargs):
+    return StrategicInsightScheduler(
+        store=manager.set_strategic_insight,
+        brain_factory=lambda: brain,
+        first_after_seconds=kwargs.pop("first_after_seconds", 120),
+        interval_seconds=kwargs.pop("interval_seconds", 180),
+        **kwargs,
+    )
+
+
+def test_schedule_respects_first_delay_interval_and_single_flight():
+    manager = SessionManager(storage_backend="memory")
+    session_id = manager.create_session(user_id="strategic_user")
+    brain = _GatedBrain()
+    scheduler = _scheduler(manager, brain)
+    common = dict(phase="intense", breath_history=[], coaching_history=[], language="en")
+    try:
+        assert scheduler.maybe_schedule(session_id, elapsed_seconds=60, **common) is False
+        assert scheduler.maybe_schedule(session_id, elapsed_seconds=130, **common) is True
+        # Already in flight: later ticks do not queue duplicates.
+        assert scheduler.maybe_schedule(session_id, elapsed_seconds=400, **common) is False
+        brain.release.set()
+        assert _wait_for(lambda: scheduler.stats()["completed"] == 1)
+
+        assert scheduler.maybe_schedule(session_id, elapsed_seconds=200, **common) is False
+        assert scheduler.maybe_schedule(session_id, elapsed_seconds=310, **common) is True
+    finally:
+        brain.release.set()
+        scheduler.shutdown(wait=True)
+
+
+def test_insight_is_stored_on_session_and_taken_once():
+    manager = SessionManager(storage_backend="memory")
+    session_id = manager.create_session(user_id="strategic_user")
+    manager.init_workout_state(session_id, phase="intense")
+    brain = _GatedBrain()
+    brain.release.set()
+    scheduler = _scheduler(manager, brain)
+    try:
+        scheduler.maybe_schedule(
+            session_id,
+            phase="intense",
+            elapsed_seconds=150,
+            breath_history=[{"intensity": "intense", "tempo": 30}],
+            coaching_history=[{"timestamp": "t", "text": "Hold it."}],
+            language="no",
+        )
+        assert _wait_for(lambda: scheduler.stats()["completed"] == 1)
+    finally:
+        scheduler.shutdown(wait=True)
+
+    assert brain.calls[0]["coaching_history"] == ["Hold it."]
+    assert brain.calls[0]["language"] == "no"
+    # A tick saving its stale workout_state copy must not drop the insight.
+    manager.save_workout_state(session_id, manager.get_workout_state(session_id))
+    assert manager.get_strategic_insight_elapsed(session_id) == 150
+    assert manager.take_strategic_insight(session_id) == _GUIDANCE
+    assert manager.take_strategic_insight(session_id) is None
+
+
+def test_unavailable_brain_is_skipped_without_storing():
+    manager = SessionManager(storage_backend="memory")
+    session_id = manager.create_session(user_id="strategic_user")
+
+    class _Offline:
+        def is_available(self):
+            return False
+
+    scheduler = StrategicInsightScheduler(store=manager.set_strategic_insight, brain_factory=_Offline)
+    try:
+        scheduler.maybe_schedule(session_id, phase="warmup", elapsed_seconds=130, breath_history=[], coaching_history=[])
+        assert _wait_for(lambda: scheduler.stats()["skipped_unavailable"] == 1)
+    finally:
+        scheduler.shutdown(wait=True)
+    assert manager.take_strategic_insight(session_id) is None
+
+
+def _mock_breath_analysis(_path: str):
+    return {
+        "intensity": "moderate",
+        "tempo": 16.0,
+        "volume": 35.0,
+        "breath_regularity": 0.55,
+        "inhale_exhale_ratio": 0.7,
+        "signal_quality": 0.8,
+        "respiratory_rate": 16.0,
+    }
+
+
+def _tick(client, session_id, elapsed):
+    return client.post(
+        "/coach/continuous",
+        data={
+            "audio": (io.BytesIO(b"\0" * 9000), "chunk.wav"),
+            "session_id": session_id,
+            "phase": "intense",
+            "elapsed_seconds": str(elapsed),
+            "language": "en",
+            "persona": "personal_trainer",
+            "workout_mode": "easy_run",
+        },
+        content_type="multipart/form-data",
+    )
+
+
+def test_ticks_never_wait_for_the_strategic_call(monkeypatch):
+    monkeypatch.setattr(main.breath_analyzer, "analyze", _mock_breath_analysis)
+    monkeypatch.setattr(main.voice_intelligence, "add_human_variation", lambda text: text)
+    monkeypatch.setattr(main.config, "SERVER_CLOCK_ENABLED", False, raising=False)
+    brain = _GatedBrain()
+    scheduler = _scheduler(main.session_manager, brain, app=main.app)
+    monkeypatch.setattr(main, "strategic_insight_scheduler", scheduler)
+
+    session_id = main.session_manager.create_session(user_id="strategic_tick_user", persona="personal_trainer")
+    main.session_manager.init_workout_state(session_id, phase="intense")
+    client = main.app.test_client()
+    try:
+        started = time.perf_counter()
+        first = _tick(client, session_id, 130)
+        assert first.status_code == 200
+        assert first.get_json()["strategic_guidance"] is None
+        assert brain.calls  # scheduled, still blocked on the provider
+        assert time.perf_counter() - started < 4.0
+
+        brain.release.set()
+        assert _wait_for(lambda: scheduler.stats()["completed"] == 1)
+
+        # The next tick is silent: the insight is ready but stays unconsumed.
+        second = _tick(client, session_id, 140)
+        assert second.get_json()["should_speak"] is False
+        assert second.get_json()["strategic_guidance"] is None
+        assert main.session_manager.peek_strategic_insight(session_id) == _GUIDANCE
+    finally:
+        brain.release.set()
+        scheduler.shutdown(wait=True)
+
+
+def test_silent_tick_keeps_the_insight_for_the_next_spoken_cue(monkeypatch, tmp_path):
+    fake_audio = tmp_path / "dummy.mp3"
+    fake_audio.write_bytes(b"ID3")
+    rewrite_calls = []
+    speak = [False, True, True]
+
+    def _rewrite(*args, **kwargs):
+        rewrite_calls.append(kwargs)
+        return "Ease off a touch."
+
+    def _zone_tick(**kwargs):
+        return {
+            "handled": True,
+            "should_speak": speak.pop(0),
+            "reason": "above_zone",
+            "event_type": "above_zone",
+            "coach_text": "Back off a touch.",
+            "zone_status": "above_zone",
+            "heart_rate": 154,
+            "coaching_style": "normal",
+        }
+
+    monkeypatch.setattr(main, "generate_voice", lambda *args, **kwargs: str(fake_audio))
+    monkeypatch.setattr(main.breath_analyzer, "analyze", _mock_breath_analysis)
+    monkeypatch.setattr(main.voice_intelligence, "add_human_variation", lambda text: text)
+    monkeypatch.setattr(main, "evaluate_zone_tick", _zone_tick)
+    monkeypatch.setattr(main.config, "ZONE_EVENT_LLM_REWRITE_ENABLED", True, raising=False)
+    monkeypatch.setattr(main.config, "ZONE_EVENT_LLM_REWRITE_ALLOWED_EVENTS", ["above_zone"], raising=False)
+    monkeypatch.setattr(main.brain_router, "rewrite_zone_event_text", _rewrite)
+    brain = _GatedBrain()
+    brain.release.set()
+    scheduler = _scheduler(main.session_manager, brain, first_after_seconds=3600)
+    monkeypatch.setattr(main, "strategic_insight_scheduler", scheduler)
+
+    session_id = main.session_manager.create_session(user_id="strategic_input_user", persona="personal_trainer")
+    main.session_manager.init_workout_state(session_id, phase="intense")
+    main.session_manager.set_strategic_insight(
+        session_id,
+        {"guidance": _GUIDANCE, "phase": "intense", "elapsed_seconds": 400, "consumed": False},
+    )
+    client = main.app.test_client()
+    try:
+        silent = _tick(client, session_id, 410).get_json()
+        spoken = _tick(client, session_id, 420).get_json()
+        later = _tick(client, session_id, 430).get_json()
+    finally:
+        scheduler.shutdown(wait=True)
+
+    assert silent["should_speak"] is False
+    assert silent["strategic_guidance"] is None
+    assert "strategic_guidance" not in silent["breath_analysis"]
+
+    assert spoken["strategic_guidance"] == _GUIDANCE
+    assert spoken["breath_analysis"]["strategic_guidance"]["tone"] == "calm_firm"
+    assert rewrite_calls[0]["tone"] == "calm_firm"
+    assert spoken["text"] == "Ease off a touch."
+
+    # Used once: the following spoken cue goes back to the plain rewrite.
+    assert later["strategic_guidance"] is None
+    assert rewrite_calls[-1]["tone"] is None
+    assert main.session_manager.peek_strategic_insight(session_id) is None
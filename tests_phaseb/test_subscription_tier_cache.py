@@ -0,0 +1,108 @@
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import auth
+import main
+from database import User, UserSubscription, db
+
+
+@pytest.fixture
+def users():
+    created = []
+
+    def _create(tier: str = "free") -> str:
+        suffix = uuid.uuid4().hex[:10]
+        user = User(
+            email=f"tier-cache-{suffix}@example.com",
+            display_name=f"tier-cache-{suffix}",
+            auth_provider="email",
+            auth_provider_id=f"tier-cache-{suffix}",
+        )
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserSubscription(user_id=user.id, tier=tier))
+        db.session.commit()
+        created.append(user.id)
+        return user.id
+
+    auth.invalidate_user_subscription_tier()
+    with main.app.app_context():
+        yield _create
+        UserSubscription.query.filter(UserSubscription.user_id.in_(created)).delete(synchronize_session=False)
+        User.query.filter(User.id.in_(created)).delete(synchronize_session=False)
+        db.session.commit()
+    auth.invalidate_user_subscription_tier()
+
+
+def test_resolved_tier_is_cached_until_invalidated(users, monkeypatch):
+    monkeypatch.setattr(auth.config, "SUBSCRIPTION_TIER_CACHE_TTL_SECONDS", 60, raising=False)
+    user_id = users("free")
+    assert auth.resolve_user_subscription_tier(user_id) == "free"
+
+    UserSubscription.query.filter_by(user_id=user_id).update({"tier": "premium"})
+    db.session.commit()
+    assert auth.resolve_user_subscription_tier(user_id) == "free"
+
+    auth.invalidate_user_subscription_tier(user_id)
+    assert auth.resolve_user_subscription_tier(user_id) == "premium"
+
+
+def test_subscription_writes_invalidate_cached_tier(users, monkeypatch):
+    monkeypatch.setattr(auth.config, "SUBSCRIPTION_TIER_CACHE_TTL_SECONDS", 60, raising=False)
+    user_id = users("free")
+    assert auth.resolve_user_subscription_tier(user_id) == "free"
+
+    main._update_user_subscription_tier_record(user_id=user_id, status="active")
+    # Invalidation waits for the commit so no request can re-cache the old row.
+    assert user_id in auth._SUBSCRIPTION_TIER_CACHE
+    db.session.commit()
+
+    assert user_id not in auth._SUBSCRIPTION_TIER_CACHE
+    assert auth.resolve_user_subscription_tier(user_id) == "premium"
+
+
+def test_rolled_back_subscription_write_keeps_cached_tier(users, monkeypatch):
+    monkeypatch.setattr(auth.config, "SUBSCRIPTION_TIER_CACHE_TTL_SECONDS", 60, raising=False)
+    user_id = users("free")
+    assert auth.resolve_user_subscription_tier(user_id) == "free"
+
+    main._update_user_subscription_tier_record(user_id=user_id, status="active")
+    db.session.rollback()
+    db.session.commit()
+
+    assert user_id in auth._SUBSCRIPTION_TIER_CACHE
+    assert auth.resolve_user_subscription_tier(user_id) == "free"
+
+
+def test_zero_ttl_disables_cache(users, monkeypatch):
+    monkeypatch.setattr(auth.config, "SUBSCRIPTION_TIER_CACHE_TTL_SECONDS", 0, raising=False)
+    user_id = users("free")
+    assert auth.resolve_user_subscription_tier(user_id) == "free"
+
+    UserSubscription.query.filter_by(user_id=user_id).update({"tier": "premium"})
+    db.session.commit()
+    assert auth.resolve_user_subscription_tier(user_id) == "premium"
+
+
+def test_bulk_resolution_matches_single_user_resolution(users, monkeypatch):
+    monkeypatch.setattr(auth.config, "SUBSCRIPTION_TIER_CACHE_TTL_SECONDS", 0, raising=False)
+    free_id = users("free")
+    premium_id = users("premium")
+    override_id = users("free")
+    monkeypatch.setattr(auth.config, "PREMIUM_TIER_OVERRIDE_USER_IDS", {override_id}, raising=False)
+
+    tiers = auth.resolve_user_subscription_tiers([free_id, premium_id, override_id, free_id, "missing-user"])
+
+    assert tiers == {
+        free_id: "free",
+        premium_id: "premium",
+        override_id: "premium",
+        "missing-user": "free",
+    }
+    for user_id, tier in tiers.items():
+        assert auth.resolve_user_subscription_tier(user_id) == tier
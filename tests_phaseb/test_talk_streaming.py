@@ -0,0 +1,288 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+import main
+from brain_router import BrainRouter
+from talk_streaming import SentenceSegmenter, sentences_from_tokens, stream_sentence_audio
+
+_QUESTION = "How hard should I run my intervals today?"
+
+
+class _StreamingBrain:
+    def __init__(self, tokens, fail_after=None):
+        self.tokens = tokens
+        self.fail_after = fail_after
+
+    def supports_streaming(self):
+        return True
+
+    async def stream_chat(self, messages, system_prompt=None, **kwargs):
+        for index, token in enumerate(self.tokens):
+            if self.fail_after is not None and index >= self.fail_after:
+                yield "[Error: upstream reset]"
+                return
+            yield token
+
+
+def _router(monkeypatch, brains: dict) -> BrainRouter:
+    monkeypatch.setattr(config, "COACH_QA_MAX_SENTENCES", 5, raising=False)
+    router = BrainRouter(brain_type="config")
+    router.use_priority_routing = True
+    router.priority_brains = ["grok", "openai", "config"]
+    monkeypatch.setattr(router, "_is_brain_available", lambda _: True)
+    monkeypatch.setattr(router, "_get_brain_instance", lambda name: brains[name])
+    return router
+
+
+def test_segmenter_emits_sentences_as_they_end_and_merges_short_fragments():
+    segmenter = SentenceSegmenter(min_chars=12)
+
+    assert segmenter.feed("Hold this pace") == []
+    assert segmenter.feed(" for now. Ok. Breathe") == ["Hold this pace for now."]
+    assert segmenter.feed(" out slowly. ") == ["Ok. Breathe out slowly."]
+    assert segmenter.feed("Two more") == []
+    assert segmenter.flush() == ["Two more"]
+
+
+def test_sentences_from_tokens_flushes_the_tail():
+    tokens = ["Keep ", "your ", "cadence high. ", "Relax the ", "shoulders"]
+
+    assert list(sentences_from_tokens(tokens)) == ["Keep your cadence high.", "Relax the shoulders"]
+
+
+def test_stream_sentence_audio_overlaps_synthesis_with_generation():
+    started = {}
+
+    def _items():
+        for index in range(3):
+            time.sleep(0.05)
+            yield f"sentence {index}"
+
+    def _synthesize(text):
+        started[text] = time.perf_counter()
+        time.sleep(0.05)
+        return text.upper()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        begin = time.perf_counter()
+        results = list(stream_sentence_audio(_items(), _synthesize, executor=executor, timeout=2))
+        elapsed = time.perf_counter() - begin
+
+    assert results == [(f"sentence {i}", f"SENTENCE {i}") for i in range(3)]
+    # Serial generate-then-synthesize would take ~0.30s.
+    assert elapsed < 0.27
+    assert started["sentence 0"] < started["sentence 2"]
+
+
+def test_closing_the_stream_stops_the_producer():
+    closed = threading.Event()
+
+    def _items():
+        try:
+            for index in range(100):
+                time.sleep(0.01)
+                yield index
+        finally:
+            closed.set()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        stream = stream_sentence_audio(_items(), lambda item: item, executor=executor, timeout=2)
+        assert next(stream) == (0, 0)
+        stream.close()
+
+    assert closed.wait(timeout=2)
+
+
+def test_closing_the_stream_cancels_queued_synthesis():
+    release = threading.Event()
+    synthesized = []
+
+    def _synthesize(item):
+        synthesized.append(item)
+        if item == 0:
+            time.sleep(0.1)  # items 1 and 2 are queued behind it meanwhile
+        if item == 1:
+            release.wait(timeout=2)
+        return item
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        stream = stream_sentence_audio(iter(range(3)), _synthesize, executor=executor, timeout=2)
+        assert next(stream) == (0, 0)
+        stream.close()
+        release.set()
+
+    assert 2 not in synthesized
+
+
+def test_stream_deadline_stops_taking_items_but_delivers_pending_audio():
+    def _items():
+        yield "first"
+        time.sleep(5)
+        yield "late"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        begin = time.perf_counter()
+        results = list(
+            stream_sentence_audio(
+                _items(), str.upper, executor=executor, timeout=2, deadline=time.monotonic() + 0.2
+            )
+        )
+
+    assert results == [("first", "FIRST")]
+    assert time.perf_counter() - begin < 1.0
+
+
+def test_router_stream_yields_sentences_and_sets_meta(monkeypatch):
+    brain = _StreamingBrain(["Short answer", ": keep it easy. ", "Then ", "build the last ", "minute."])
+    router = _router(monkeypatch, {"grok": brain})
+
+    sentences = list(
+        router.stream_question_response(_QUESTION, language="en", restrict_brains=["grok"])
+    )
+
+    assert sentences == ["Short answer: keep it easy.", "Then build the last minute."]
+    meta = router.get_last_route_meta()
+    assert meta["provider"] == "grok"
+    assert meta["source"] == "ai_qna"
+    assert meta["streamed"] is True
+
+
+def test_router_stream_falls_through_when_first_brain_errors_before_output(monkeypatch):
+    brains = {
+        "grok": _StreamingBrain(["Never sent."], fail_after=0),
+        "openai": _StreamingBrain(["Easy effort today. ", "Save energy for Sunday."]),
+    }
+    router = _router(monkeypatch, brains)
+
+    sentences = list(router.stream_question_response(_QUESTION, language="en"))
+
+    assert sentences == ["Easy effort today.", "Save energy for Sunday."]
+    meta = router.get_last_route_meta()
+    assert meta["provider"] == "openai"
+    assert [attempt["status"] for attempt in meta["attempted"]] == ["failure", "success"]
+
+
+def test_router_stream_uses_fallback_when_every_brain_fails(monkeypatch):
+    router = _router(monkeypatch, {"grok": _StreamingBrain([], fail_after=0)})
+
+    sentences = list(
+        router.stream_question_response(_QUESTION, language="en", restrict_brains=["grok"])
+    )
+
+    assert sentences
+    assert router.get_last_route_meta()["status"] == "all_question_brains_failed_or_skipped"
+
+
+def test_router_stream_enforces_one_deadline_for_the_whole_answer(monkeypatch):
+    class _DribblingBrain(_StreamingBrain):
+        async def stream_chat(self, messages, system_prompt=None, **kwargs):
+            yield "Keep the first rep easy. "
+            for _ in range(30):
+                await asyncio.sleep(0.1)  # each token well inside the per-token timeout
+                yield "and "
+
+    router = _router(monkeypatch, {"grok": _DribblingBrain([])})
+
+    begin = time.perf_counter()
+    sentences = list(
+        router.stream_question_response(
+            _QUESTION, language="en", restrict_brains=["grok"], timeout_cap_seconds=0.8
+        )
+    )
+
+    assert sentences == ["Keep the first rep easy."]
+    assert time.perf_counter() - begin < 1.5
+    # Running out of answer budget is not a provider timeout.
+    assert router.brain_stats.get("grok", {}).get("timeouts", 0) == 0
+
+
+def _sse_events(response):
+    body = response.get_data(as_text=True)
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+def test_coach_talk_stream_sends_sentence_audio_events(monkeypatch, tmp_path):
+    fake_audio = tmp_path / "dummy.mp3"
+    fake_audio.write_bytes(b"ID3")
+    voiced = []
+
+    def _mock_generate_voice(text, language=None, persona=None, emotional_mode=None):
+        voiced.append(text)
+        return str(fake_audio)
+
+    def _mock_stream(*args, **kwargs):
+        main.brain_router._set_last_route_meta(provider="grok", source="ai_qna", status="success", mode="question_qa")
+        yield "Training builds endurance."
+        yield "It improves heart health."
+
+    monkeypatch.setattr(main, "generate_voice", _mock_generate_voice)
+    monkeypatch.setattr(main.brain_router, "stream_question_response", _mock_stream)
+    client = main.app.test_client()
+
+    response = client.post(
+        "/coach/talk",
+        json={
+            "message": "Why should I train?",
+            "context": "chat",
+            "response_mode": "stream",
+            "persona": "personal_trainer",
+            "language": "en",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = _sse_events(response)
+    sentences = [event for event in events if event["type"] == "sentence"]
+    assert [event["text"] for event in sentences] == ["Training builds endurance.", "It improves heart health."]
+    assert all(event["audio_url"].startswith("/download/") for event in sentences)
+    assert voiced == ["Training builds endurance.", "It improves heart health."]
+    done = events[-1]
+    assert done["type"] == "done"
+    assert done["provider"] == "grok"
+    assert done["text"] == "Training builds endurance. It improves heart health."
+    assert isinstance(done["first_audio_ms"], int)
+    assert done["fallback_used"] is False
+
+
+def test_coach_talk_stream_replaces_non_grok_workout_answer(monkeypatch, tmp_path):
+    fake_audio = tmp_path / "dummy.mp3"
+    fake_audio.write_bytes(b"ID3")
+
+    def _mock_stream(*args, **kwargs):
+        main.brain_router._set_last_route_meta(
+            provider="config",
+            source="config_fallback",
+            status="all_question_brains_failed_or_skipped",
+            mode="question_qa",
+        )
+        yield "Generic fallback."
+
+    monkeypatch.setattr(main, "generate_voice", lambda *args, **kwargs: str(fake_audio))
+    monkeypatch.setattr(main.brain_router, "stream_question_response", _mock_stream)
+    client = main.app.test_client()
+
+    response = client.post(
+        "/coach/talk",
+        json={
+            "message": "How long is left",
+            "context": "workout",
+            "stream_audio": True,
+            "persona": "personal_trainer",
+            "language": "en",
+        },
+    )
+
+    events = _sse_events(response)
+    sentences = [event for event in events if event["type"] == "sentence"]
+    assert sentences
+    assert sentences[0]["text"] != "Generic fallback."
+    assert events[-1]["fallback_used"] is True
@@ -0,0 +1,201 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import async_runtime
+import config
+import main
+import usage_ledger
+from brain_router import BrainRouter
+from database import UsageLedgerEntry, db
+from usage_ledger import UsageLedger, estimate_tokens, usage_from_response
+
+
+def _ledger(now_ts: float = 1_774_000_000.0) -> UsageLedger:
+    return UsageLedger(clock=lambda: now_ts)
+
+
+def test_usage_from_response_reads_openai_and_anthropic_shapes():
+    openai_style = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+    anthropic_style = SimpleNamespace(usage=SimpleNamespace(input_tokens=80, output_tokens=12))
+
+    assert usage_from_response(openai_style) == (120, 30)
+    assert usage_from_response(anthropic_style) == (80, 12)
+    assert usage_from_response(SimpleNamespace()) == (None, None)
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens([{"role": "user", "content": "abcd"}]) == 1
+
+
+def test_record_aggregates_by_scope_and_estimates_missing_usage(monkeypatch):
+    monkeypatch.setattr(
+        config,
+        "USAGE_PRICES_PER_MILLION_TOKENS",
+        {"grok": {"input": 1.0, "output": 2.0}},
+        raising=False,
+    )
+    ledger = _ledger()
+    usage_ledger.set_scope(endpoint="coach_talk", tier="free")
+    try:
+        ledger.record("grok", mode="chat", prompt_tokens=1_000, completion_tokens=500)
+        ledger.record("grok", mode="chat", prompt_text="x" * 400, completion_text="y" * 40)
+        ledger.record("grok", mode="chat", cache_hit=True, prompt_text="ignored")
+    finally:
+        usage_ledger.clear_scope()
+
+    summary = ledger.summary()
+    grok = summary["providers"]["grok"]
+    assert grok["calls"] == 3
+    assert grok["cache_hits"] == 1
+    assert grok["estimated_calls"] == 1
+    assert grok["prompt_tokens"] == 1_100
+    assert grok["completion_tokens"] == 510
+    assert grok["cost_usd"] == round((1_100 * 1.0 + 510 * 2.0) / 1_000_000, 6)
+    assert set(summary["endpoints"]) == {"coach_talk"}
+    assert set(summary["tiers"]) == {"free"}
+    assert summary["pending_keys"] == 1
+
+
+def test_flush_upserts_rows_and_feeds_tier_budget(monkeypatch):
+    monkeypatch.setattr(
+        config,
+        "USAGE_PRICES_PER_MILLION_TOKENS",
+        {"openai": {"input": 1_000_000.0, "output": 0.0}},
+        raising=False,
+    )
+    monkeypatch.setattr(config, "USAGE_DAILY_BUDGET_USD_BY_TIER", {"test_tier": 3.0}, raising=False)
+    now_ts = float(int(time.time() // 3600) * 3600 + 60)
+    ledger = _ledger(now_ts)
+
+    with main.app.app_context():
+        UsageLedgerEntry.query.filter_by(tier="test_tier").delete()
+        db.session.commit()
+        try:
+            ledger.record("openai", mode="chat", prompt_tokens=1, endpoint="chat_message", tier="test_tier")
+            ledger.record("openai", mode="chat", prompt_tokens=1, endpoint="chat_message", tier="test_tier")
+            assert ledger.flush(now_ts) == 1
+            assert ledger.summary()["pending_keys"] == 0
+            assert ledger.budget_exhausted("test_tier") is False
+
+            ledger.record("openai", mode="chat", prompt_tokens=1, endpoint="chat_message", tier="test_tier")
+            assert ledger.budget_exhausted("test_tier") is True
+            assert ledger.flush(now_ts) == 1
+
+            row = UsageLedgerEntry.query.filter_by(tier="test_tier").one()
+            assert row.calls == 3
+            assert row.prompt_tokens == 3
+            assert row.cost_usd == 3.0
+            assert ledger.tier_spend_today("test_tier") == 3.0
+            assert ledger.budget_exhausted("premium") is False
+        finally:
+            UsageLedgerEntry.query.filter_by(tier="test_tier").delete()
+            db.session.commit()
+
+
+def test_spend_reload_failure_does_not_requeue_committed_rows(monkeypatch):
+    monkeypatch.setattr(
+        config,
+        "USAGE_PRICES_PER_MILLION_TOKENS",
+        {"openai": {"input": 1_000_000.0, "output": 0.0}},
+        raising=False,
+    )
+    now_ts = float(int(time.time() // 3600) * 3600 + 60)
+    ledger = _ledger(now_ts)
+
+    def _reload_fails(_day_start):
+        raise RuntimeError("db went away")
+
+    with main.app.app_context():
+        UsageLedgerEntry.query.filter_by(tier="test_tier").delete()
+        db.session.commit()
+        try:
+            ledger.record("openai", mode="chat", prompt_tokens=2, endpoint="chat_message", tier="test_tier")
+            with monkeypatch.context() as patched:
+                patched.setattr(usage_ledger, "_load_tier_spend", _reload_fails)
+                assert ledger.flush(now_ts) == 1
+            assert ledger.summary()["pending_keys"] == 0
+            assert ledger.tier_spend_today("test_tier") == 2.0
+            assert ledger.flush(now_ts) == 0
+
+            row = UsageLedgerEntry.query.filter_by(tier="test_tier").one()
+            assert row.prompt_tokens == 2
+            assert row.cost_usd == 2.0
+        finally:
+            UsageLedgerEntry.query.filter_by(tier="test_tier").delete()
+            db.session.commit()
+
+
+def test_router_skips_brains_when_tier_budget_is_exhausted(monkeypatch):
+    ledger = usage_ledger.get_usage_ledger()
+    monkeypatch.setattr(ledger, "budget_exhausted", lambda tier=None: True)
+    router = BrainRouter(brain_type="config")
+
+    assert router._is_brain_available("grok") is False
+    assert router._get_skip_reason("grok") == "tier_budget_exhausted"
+    assert router._is_brain_available("config") is True
+
+
+def test_scope_follows_calls_onto_router_worker_threads(monkeypatch):
+    router = BrainRouter(brain_type="config")
+    seen = []
+
+    def _capture():
+        seen.append(usage_ledger.current_scope())
+        return "ok"
+
+    usage_ledger.set_scope(endpoint="coach_continuous", tier="premium")
+    try:
+        assert router._call_brain_with_timeout("grok", _capture, 2.0) == "ok"
+    finally:
+        usage_ledger.clear_scope()
+
+    assert seen == [{"endpoint": "coach_continuous", "tier": "premium"}]
+    assert usage_ledger.current_scope()["endpoint"] == "background"
+
+
+def test_tier_is_resolved_for_every_authenticated_request(monkeypatch):
+    monkeypatch.setattr(main, "get_request_auth_user_id", lambda: "user-premium")
+    monkeypatch.setattr(main, "resolve_user_subscription_tier", lambda user_id: "premium" if user_id else "free")
+
+    with main.app.test_request_context("/chat/message", method="POST"):
+        main._begin_usage_scope()
+        try:
+            assert usage_ledger.current_scope()["tier"] == "premium"
+        finally:
+            usage_ledger.clear_scope()
+
+
+def test_stt_duration_covers_compressed_uploads(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "USAGE_STT_FALLBACK_BITRATE_KBPS", 64.0, raising=False)
+    upload = tmp_path / "talk.m4a"
+    upload.write_bytes(b"\0" * 80_000)
+
+    assert main._stt_audio_seconds(SimpleNamespace(duration=12.5), str(upload)) == 12.5
+    by_usage = SimpleNamespace(usage=SimpleNamespace(type="duration", seconds=7))
+    assert main._stt_audio_seconds(by_usage, str(upload)) == 7.0
+    assert main._stt_audio_seconds(SimpleNamespace(text="hi"), str(upload)) == 10.0
+
+
+def test_gemini_stream_records_usage(monkeypatch):
+    from brains.gemini_brain import GeminiBrain
+
+    recorded = []
+    monkeypatch.setattr(
+        GeminiBrain,
+        "_record_usage",
+        lambda self, response, mode, prompt=None, completion=None: recorded.append((mode, completion)),
+    )
+
+    class _Model:
+        def generate_content(self, prompt, stream=False, **_kwargs):
+            return iter([SimpleNamespace(text="Easy "), SimpleNamespace(text="pace.")])
+
+    brain = GeminiBrain.__new__(GeminiBrain)
+    brain._make_model = lambda system_prompt=None: _Model()
+
+    chunks = list(async_runtime.iterate_async(brain.stream_chat([{"role": "user", "content": "Pace?"}])))
+
+    assert "".join(chunks) == "Easy pace."
+    assert recorded == [("chat_stream", "Easy pace.")]
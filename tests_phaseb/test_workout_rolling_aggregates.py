@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from rolling_metrics import BREATH_HISTORY_CAPACITY, append_bounded, fold_metric
+from session_manager import SessionManager
+
+
+def _breath(rate: float, intensity: str = "moderate") -> dict:
+    return {
+        "intensity": intensity,
+        "respiratory_rate": rate,
+        "volume": 40.0,
+        "signal_quality": 0.8,
+    }
+
+
+def test_append_bounded_keeps_newest_items_in_place():
+    history = [1, 2, 3]
+    same = history
+    append_bounded(history, 4, 3)
+    assert history is same
+    assert history == [2, 3, 4]
+
+
+def test_fold_metric_tracks_ema_and_extremes():
+    aggregate = None
+    for value in (10.0, 30.0, None, 20.0):
+        aggregate = fold_metric(aggregate, value, alpha=0.5)
+
+    assert aggregate["count"] == 3
+    assert aggregate["ema"] == 20.0
+    assert aggregate["min"] == 10.0
+    assert aggregate["max"] == 30.0
+
+
+def test_workout_state_size_is_constant_over_long_sessions():
+    manager = SessionManager()
+    session_id = manager.create_session("user-1", "personal_trainer")
+    manager.init_workout_state(session_id)
+
+    sizes = []
+    for tick in range(200):
+        manager.update_workout_state(
+            session_id,
+            breath_analysis=_breath(12.0 + (tick % 7), "intense" if tick % 2 else "calm"),
+            coaching_output=f"cue {tick}",
+            elapsed_seconds=tick * 5,
+        )
+        if tick in (50, 199):
+            sizes.append(len(json.dumps(manager.get_workout_state(session_id))))
+
+    state = manager.get_workout_state(session_id)
+    assert len(state["breath_history"]) == BREATH_HISTORY_CAPACITY
+    assert len(state["coaching_history"]) == 10
+    assert state["breath_history"][-1]["respiratory_rate"] == 12.0 + (199 % 7)
+
+    aggregates = state["breath_aggregates"]
+    rate = aggregates["metrics"]["respiratory_rate"]
+    assert rate["count"] == 200
+    assert rate["min"] == 12.0
+    assert rate["max"] == 18.0
+    assert aggregates["intensity_counts"] == {"calm": 100, "intense": 100}
+    assert abs(sizes[0] - sizes[1]) < 64
+
+
+def test_aggregates_fold_raw_readings_not_smoothed_entries():
+    manager = SessionManager()
+    session_id = manager.create_session("user-1", "personal_trainer")
+    manager.init_workout_state(session_id)
+
+    for raw_rate, smoothed_rate in ((10.0, 10.0), (30.0, 20.0)):
+        manager.update_workout_state(
+            session_id,
+            breath_analysis=dict(_breath(smoothed_rate), raw_features={"respiratory_rate": raw_rate}),
+        )
+
+    state = manager.get_workout_state(session_id)
+    assert [entry["respiratory_rate"] for entry in state["breath_history"]] == [10.0, 20.0]
+    rate = state["breath_aggregates"]["metrics"]["respiratory_rate"]
+    # alpha 0.5 over the raw 10 -> 30, not over the stored 10 -> 20.
+    assert rate["ema"] == 20.0
+    assert rate["max"] == 30.0
+
+
+def test_smoothing_uses_running_ema_when_available():
+    aggregates = {"metrics": {"respiratory_rate": {"ema": 20.0, "count": 5}}}
+    history = [{"respiratory_rate": 100.0}]
+
+    smoothed = main._smooth_breath_metrics({"respiratory_rate": 30.0}, history, aggregates)
+
+    assert smoothed["respiratory_rate"] == 25.0
+    assert smoothed["tempo"] == 25.0
+
+
+def test_smoothing_falls_back_to_history_window_without_aggregates():
+    history = [{"respiratory_rate": 10.0}, {"respiratory_rate": 20.0}]
+
+    smoothed = main._smooth_breath_metrics({"respiratory_rate": 30.0}, history)
+
+    assert smoothed["respiratory_rate"] == 22.5
@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_manager import SessionManager
+from zone_engine_state import (
+    BREATH_QUALITY_SAMPLES_CAPACITY,
+    ZONE_ENGINE_STATE_SCHEMA_VERSION,
+    ZoneEngineState,
+)
+from zone_event_motor import _zone_state
+
+
+def test_defaults_are_available_without_initialization():
+    state = ZoneEngineState()
+
+    assert state["confirmed_zone_status"] == "in_zone"
+    assert state.get("phase_id") == 0
+    assert state["metrics"]["total_main_set_ticks"] == 0
+    assert "watch_disconnect_pending_restore" in state
+    assert state.get("_pending_motivation_phrase_id", "missing") == "missing"
+
+
+def test_compact_round_trip_only_persists_non_default_fields():
+    state = ZoneEngineState()
+    state["phase_id"] = 3
+    state["main_started_emitted"] = True
+    state["structure_phrase_rotation_index"] = {"work": 2}
+    state.ring("recovery_samples", 24).append(42.0)
+
+    payload = state.to_dict()
+    assert payload["schema_version"] == ZONE_ENGINE_STATE_SCHEMA_VERSION
+    assert "confirmed_zone_status" not in payload
+    assert payload["metrics"] == {"recovery_samples": [42.0]}
+
+    restored = ZoneEngineState.from_dict(json.loads(json.dumps(payload)))
+    assert restored["phase_id"] == 3
+    assert restored["main_started_emitted"] is True
+    assert restored["structure_phrase_rotation_index"] == {"work": 2}
+    assert list(restored["metrics"]["recovery_samples"]) == [42.0]
+
+
+def test_load_validates_types_and_bounds_histories():
+    restored = ZoneEngineState.from_dict(
+        {
+            "phase_id": "not-a-number",
+            "zone_status_since": "12.5",
+            "countdown_fired_map": ["bad"],
+            "breath_quality_samples": list(range(100)),
+        }
+    )
+
+    assert restored["phase_id"] == 0
+    assert restored["zone_status_since"] == 12.5
+    assert restored["countdown_fired_map"] == {}
+    assert len(restored["breath_quality_samples"]) == BREATH_QUALITY_SAMPLES_CAPACITY
+    assert restored["breath_quality_samples"][-1] == 99
+
+
+def test_unknown_schema_version_starts_fresh():
+    restored = ZoneEngineState.from_dict({"schema_version": 999, "phase_id": 7})
+    assert restored["phase_id"] == 0
+
+
+def test_zone_state_upgrades_legacy_dict_and_survives_session_codec():
+    workout_state = {"zone_engine": {"phase_id": 2, "style_history": [{"elapsed": 10.0}]}}
+
+    state = _zone_state(workout_state)
+    assert isinstance(workout_state["zone_engine"], ZoneEngineState)
+    assert _zone_state(workout_state) is state
+    assert state["phase_id"] == 2
+
+    manager = SessionManager()
+    encoded = json.dumps({"workout_state": workout_state}, default=manager._encode_special_types)
+    decoded = manager._decode_special_types(json.loads(encoded))
+    restored = decoded["workout_state"]["zone_engine"]
+    assert isinstance(restored, ZoneEngineState)
+    assert list(restored["style_history"]) == [{"elapsed": 10.0}]
@@ -0,0 +1,121 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import main
+import zone_rewrite_bank
+from zone_rewrite_bank import RewriteInput, ZoneRewriteBank, build_bank, enumerate_seed_inputs, templatize
+
+
+def _verify(original, rewritten, event_type, language):
+    return main.verify_zone_event_rewrite(
+        original_event=original,
+        rewritten_phrase=rewritten,
+        event_type=event_type,
+        language=language,
+    )
+
+
+@pytest.fixture
+def bank_file(monkeypatch, tmp_path):
+    path = tmp_path / "zone_rewrite_bank.json"
+    monkeypatch.setattr(main.config, "ZONE_EVENT_REWRITE_BANK_PATH", str(path), raising=False)
+    monkeypatch.setattr(main.config, "ZONE_EVENT_REWRITE_BANK_ENABLED", True, raising=False)
+    monkeypatch.setattr(main.config, "ZONE_EVENT_LLM_REWRITE_ALLOWED_EVENTS", ["above_zone"], raising=False)
+    monkeypatch.setattr(zone_rewrite_bank, "_BANK", None)
+    yield path
+    zone_rewrite_bank._BANK = None
+
+
+def test_numbers_become_placeholders_and_are_refilled():
+    bank = ZoneRewriteBank()
+    assert templatize("Back off to 140-152 bpm.") == ("Back off to {n0}-{n1} bpm.", ["140", "152"])
+    assert bank.add("above_zone", "en", None, "normal", "Back off to 140-152 bpm.", "Ease down to 140-152 bpm.")
+    assert not bank.add("above_zone", "en", None, "normal", "Back off to 140-152 bpm.", "Ease down to 150 bpm.")
+
+    assert bank.pick("above_zone", "en", "personal_trainer", "normal", "Back off to 128-139 bpm.") == (
+        "Ease down to 128-139 bpm."
+    )
+
+
+def test_pick_rotates_and_misses_unknown_inputs():
+    bank = ZoneRewriteBank()
+    for rewrite in ("Ease back a bit.", "Back off slightly."):
+        bank.add("above_zone", "en", "personal_trainer", "normal", "Ease back slightly.", rewrite)
+
+    picks = [bank.pick("above_zone", "en", "personal_trainer", "normal", "Ease back slightly.") for _ in range(3)]
+    assert picks == ["Ease back a bit.", "Back off slightly.", "Ease back a bit."]
+    assert bank.pick("above_zone", "no", "personal_trainer", "normal", "Ro ned litt.") is None
+    assert bank.stats()["misses"] == 1
+
+
+def test_build_bank_keeps_only_verified_rewrites_and_round_trips(tmp_path):
+    inputs = [RewriteInput("above_zone", "en", "personal_trainer", "normal", "Back off to 140-152 bpm.")]
+    proposals = iter(["Back off to 150 bpm.", "Ease down to 140-152 bpm.", "Ease down to 140-152 bpm.", "Settle back to 140-152 bpm."])
+
+    bank = build_bank(inputs, lambda _item: next(proposals), _verify, variants=2, attempts_per_variant=2)
+    path = tmp_path / "bank.json"
+    bank.save(str(path))
+    loaded = ZoneRewriteBank.load(str(path))
+
+    assert loaded.version == zone_rewrite_bank.BANK_VERSION
+    assert loaded.variants("above_zone", "en", "personal_trainer", "normal", "Back off to 120-130 bpm.") == [
+        "Ease down to 120-130 bpm.",
+        "Settle back to 120-130 bpm.",
+    ]
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / "bank.json"
+    path.write_text('{"version": 99, "entries": []}', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        ZoneRewriteBank.load(str(path))
+
+
+def test_enumerated_inputs_are_motor_templates():
+    inputs = enumerate_seed_inputs(["above_zone"], languages=["en"], personas=["personal_trainer"])
+
+    assert {item.seed for item in inputs} == {"Ease off 10-15 seconds.", "Ease back slightly.", "Back off to 140-152 bpm."}
+
+
+def test_runtime_serves_bank_without_calling_llm(monkeypatch, bank_file):
+    bank = ZoneRewriteBank()
+    bank.add("above_zone", "en", "personal_trainer", "normal", "Back off to 140-152 bpm.", "Ease down to 140-152 bpm.")
+    bank.save(str(bank_file))
+    monkeypatch.setattr(main.config, "ZONE_EVENT_LLM_REWRITE_ENABLED", True, raising=False)
+
+    def _no_llm(*_args, **_kwargs):
+        raise AssertionError("live rewrite should not run on a bank hit")
+
+    monkeypatch.setattr(main.brain_router, "rewrite_zone_event_text", _no_llm)
+
+    text, meta = main._maybe_rephrase_zone_event_text(
+        base_text="Back off to 131-147 bpm.",
+        language="en",
+        persona="personal_trainer",
+        coaching_style="normal",
+        event_type="above_zone",
+    )
+
+    assert text == "Ease down to 131-147 bpm."
+    assert meta["source"] == "zone_event_bank"
+    assert meta["status"] == "bank_hit"
+
+
+def test_runtime_bank_miss_keeps_template_when_llm_disabled(monkeypatch, bank_file):
+    monkeypatch.setattr(main.config, "ZONE_EVENT_LLM_REWRITE_ENABLED", False, raising=False)
+
+    text, meta = main._maybe_rephrase_zone_event_text(
+        base_text="Ease back slightly.",
+        language="en",
+        persona="personal_trainer",
+        coaching_style="normal",
+        event_type="above_zone",
+    )
+
+    assert text == "Ease back slightly."
+    assert meta["status"] == "event_template"
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Precompute verified zone-event rewrites into the versioned rewrite bank.
+
+Every (event_type, language, persona, coaching_style, seed) the zone event
+motor can speak is rewritten by a provider brain, checked with
+`verify_zone_event_rewrite`, and stored in ZONE_EVENT_REWRITE_BANK_PATH.
+Existing entries are kept; only missing variants are generated.
+
+Usage examples:
+  python3 tools/build_zone_rewrite_bank.py --dry-run
+  python3 tools/build_zone_rewrite_bank.py --variants 4
+  python3 tools/build_zone_rewrite_bank.py --events above_zone,below_zone --languages en --brain openai
+  python3 tools/build_zone_rewrite_bank.py --fresh --output output/zone_rewrite_bank.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import config
+from zone_rewrite_bank import ZoneRewriteBank, build_bank, enumerate_seed_inputs
+
+
+def _csv(value: str | None, default: list[str]) -> list[str]:
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _create_brain(name: str):
+    if name == "grok":
+        from brains.grok_brain import GrokBrain
+
+        return GrokBrain()
+    if name == "openai":
+        from brains.openai_brain import OpenAIBrain
+
+        return OpenAIBrain()
+    if name == "claude":
+        from brains.claude_brain import ClaudeBrain
+
+        return ClaudeBrain()
+    raise SystemExit(f"Unsupported brain: {name}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the zone-event rewrite bank")
+    parser.add_argument("--events", help="Comma-separated event types (default: ZONE_EVENT_LLM_REWRITE_ALLOWED_EVENTS)")
+    parser.add_argument("--languages", default="en,no", help="Comma-separated languages")
+    parser.add_argument("--personas", default="personal_trainer,toxic_mode", help="Comma-separated personas")
+    parser.add_argument("--styles", default=",".join(config.SUPPORTED_COACHING_STYLES), help="Comma-separated coaching styles")
+    parser.add_argument("--variants", type=int, default=config.ZONE_EVENT_REWRITE_BANK_VARIANTS, help="Verified rewrites per input")
+    parser.add_argument("--attempts", type=int, default=3, help="Provider attempts per missing variant")
+    parser.add_argument("--brain", default="grok", choices=["grok", "openai", "claude"], help="Provider used for rewrites")
+    parser.add_argument("--output", default=config.ZONE_EVENT_REWRITE_BANK_PATH, help="Bank JSON path")
+    parser.add_argument("--fresh", action="store_true", help="Ignore the existing bank and rebuild from scratch")
+    parser.add_argument("--dry-run", action="store_true", help="List inputs without calling a provider")
+    args = parser.parse_args()
+
+    inputs = enumerate_seed_inputs(
+        _csv(args.events, list(config.ZONE_EVENT_LLM_REWRITE_ALLOWED_EVENTS)),
+        languages=_csv(args.languages, ["en", "no"]),
+        personas=_csv(args.personas, ["personal_trainer"]),
+        coaching_styles=_csv(args.styles, list(config.SUPPORTED_COACHING_STYLES)),
+    )
+    variants = max(1, int(args.variants))
+    print(f"{len(inputs)} inputs x {variants} variants -> {args.output}")
+
+    if args.dry_run:
+        for item in inputs:
+            print(f"  {item.event_type:<24} {item.language} {item.persona:<16} {item.coaching_style:<12} {item.seed!r}")
+        return 0
+
+    bank = None
+    if not args.fresh and os.path.exists(args.output):
+        bank = ZoneRewriteBank.load(args.output, max_variants=variants)
+        print(f"Extending existing bank: {bank.stats()}")
+
+    # Imported late: main builds the Flask app, which the dry run does not need.
+    from main import verify_zone_event_rewrite
+
+    brain = _create_brain(args.brain)
+
+    def _rewrite(item):
+        text = brain.rewrite_zone_event_text(
+            item.seed,
+            language=item.language,
+            persona=item.persona,
+            coaching_style=item.coaching_style,
+            event_type=item.event_type,
+        )
+        time.sleep(0.2)
+        return text
+
+    def _report(item, candidate, added, reason):
+        status = "OK  " if added else "SKIP"
+        print(f"  {status} {item.event_type}/{item.language}/{item.coaching_style}: {candidate!r} ({reason})")
+
+    bank = build_bank(
+        inputs,
+        _rewrite,
+        lambda original, rewritten, event_type, language: verify_zone_event_rewrite(
+            original_event=original,
+            rewritten_phrase=rewritten,
+            event_type=event_type,
+            language=language,
+        ),
+        variants=variants,
+        attempts_per_variant=max(1, int(args.attempts)),
+        bank=bank,
+        on_result=_report,
+    )
+    bank.save(args.output)
+    print(f"Saved {args.output}: {bank.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
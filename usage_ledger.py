@@ -0,0 +1,443 @@
+"""
+Token and cost ledger for provider calls.
+
+Every brain, strategic and STT call reports what it consumed: prompt and
+completion tokens from the provider response (or a local estimate when the
+response has no usage block), audio seconds for STT, and cache hits that
+avoided a call. Records are attributed to the provider, mode, Flask endpoint
+and subscription tier of the request that caused them.
+
+- the request scope (endpoint, tier) lives in a ContextVar; BrainRouter and
+  the async runtime copy it onto worker threads and loop tasks
+- records aggregate in memory per hour bucket and reach
+  `usage_ledger_entries` in batched upserts (one transaction per flush),
+  driven by a per-worker flusher thread
+- estimated cost uses the per-provider prices in
+  `USAGE_PRICES_PER_MILLION_TOKENS`; `budget_exhausted(tier)` compares the
+  day's spend (last synced cluster total plus unflushed local spend)
+  against `USAGE_DAILY_BUDGET_USD_BY_TIER`
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import math
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_SCOPE: ContextVar[Optional[Dict[str, str]]] = ContextVar("usage_scope", default=None)
+
+_FIELDS = ("calls", "cache_hits", "estimated_calls", "prompt_tokens", "completion_tokens", "audio_seconds", "cost_usd")
+
+
+# ------------------------------------------------------------------
+# Request scope
+# ------------------------------------------------------------------
+
+def set_scope(endpoint: Optional[str] = None, tier: Optional[str] = None) -> None:
+    """Start attributing usage on this context to `endpoint` / `tier`."""
+    _SCOPE.set({"endpoint": str(endpoint or "unknown"), "tier": str(tier or "unknown")})
+
+
+def update_scope(**fields: Optional[str]) -> None:
+    """Refine the current scope (e.g. once the caller's tier is known)."""
+    scope = _SCOPE.get()
+    if scope is None:
+        set_scope(**fields)
+        return
+    for name, value in fields.items():
+        if value:
+            # Mutated in place so worker threads that copied the context see it too.
+            scope[name] = str(value)
+
+
+def clear_scope() -> None:
+    _SCOPE.set(None)
+
+
+def current_scope() -> Dict[str, str]:
+    scope = _SCOPE.get()
+    if scope is None:
+        return {"endpoint": "background", "tier": "unknown"}
+    return dict(scope)
+
+
+# ------------------------------------------------------------------
+# Token helpers
+# ------------------------------------------------------------------
+
+def estimate_tokens(text: Any) -> int:
+    """Rough token count (~4 characters per token) for responses without usage data."""
+    if text is None:
+        return 0
+    if isinstance(text, (list, tuple)):
+        return sum(estimate_tokens(item) for item in text)
+    if isinstance(text, dict):
+        return estimate_tokens(text.get("content"))
+    return int(math.ceil(len(str(text)) / 4.0))
+
+
+def usage_from_response(response: Any) -> Tuple[Optional[int], Optional[int]]:
+    """(prompt_tokens, completion_tokens) from an OpenAI/xAI, Anthropic or Gemini response."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        prompt = getattr(usage, "prompt_tokens", None)
+        completion = getattr(usage, "completion_tokens", None)
+        if prompt is None and completion is None:
+            prompt = getattr(usage, "input_tokens", None)
+            completion = getattr(usage, "output_tokens", None)
+        if isinstance(prompt, int) or isinstance(completion, int):
+            return (
+                prompt if isinstance(prompt, int) else None,
+                completion if isinstance(completion, int) else None,
+            )
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is not None:
+        prompt = getattr(metadata, "prompt_token_count", None)
+        completion = getattr(metadata, "candidates_token_count", None)
+        if isinstance(prompt, int) or isinstance(completion, int):
+            return (
+                prompt if isinstance(prompt, int) else None,
+                completion if isinstance(completion, int) else None,
+            )
+    return None, None
+
+
+def estimate_cost_usd(
+    provider: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    audio_seconds: float = 0.0,
+) -> float:
+    prices = (getattr(config, "USAGE_PRICES_PER_MILLION_TOKENS", {}) or {}).get(provider) or {}
+    try:
+        cost = (
+            prompt_tokens * float(prices.get("input", 0.0))
+            + completion_tokens * float(prices.get("output", 0.0))
+        ) / 1_000_000.0
+    except (TypeError, ValueError, AttributeError):
+        cost = 0.0
+    if audio_seconds:
+        cost += audio_seconds / 60.0 * float(getattr(config, "USAGE_STT_PRICE_PER_MINUTE", 0.0))
+    return cost
+
+
+def _day_start(now_ts: float) -> int:
+    return int(now_ts // 86400) * 86400
+
+
+# ------------------------------------------------------------------
+# Ledger
+# ------------------------------------------------------------------
+
+class UsageLedger:
+    """In-memory usage aggregates with batched database flushes."""
+
+    def __init__(self, *, bucket_seconds: int = 3600, clock: Callable[[], float] = time.time):
+        self.bucket_seconds = max(60, int(bucket_seconds))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # (bucket_start, provider, mode, endpoint, tier) -> unflushed counters
+        self._pending: Dict[Tuple[int, str, str, str, str], Dict[str, float]] = {}
+        # (provider, mode, endpoint, tier) -> counters since process start
+        self._totals: Dict[Tuple[str, str, str, str], Dict[str, float]] = {}
+        # Cluster-wide spend per tier for `_synced_day`, as of the last flush.
+        self._synced_day = 0
+        self._synced_tier_spend: Dict[str, float] = {}
+        self._stats = {"flushes": 0, "flush_failures": 0, "spend_reload_failures": 0, "rows_flushed": 0}
+
+    def record(
+        self,
+        provider: str,
+        *,
+        mode: str,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        prompt_text: Any = None,
+        completion_text: Any = None,
+        audio_seconds: float = 0.0,
+        cache_hit: bool = False,
+        endpoint: Optional[str] = None,
+        tier: Optional[str] = None,
+    ) -> None:
+        if not bool(getattr(config, "USAGE_LEDGER_ENABLED", True)):
+            return
+        estimated = False
+        if not cache_hit:
+            if prompt_tokens is None and prompt_text is not None:
+                prompt_tokens, estimated = estimate_tokens(prompt_text), True
+            if completion_tokens is None and completion_text is not None:
+                completion_tokens, estimated = estimate_tokens(completion_text), True
+        prompt_tokens = max(0, int(prompt_tokens or 0))
+        completion_tokens = max(0, int(completion_tokens or 0))
+        audio_seconds = max(0.0, float(audio_seconds or 0.0))
+        scope = current_scope()
+        provider = str(provider or "unknown")
+        mode = str(mode or "unknown")
+        endpoint = str(endpoint or scope["endpoint"])
+        tier = str(tier or scope["tier"])
+        delta = {
+            "calls": 1,
+            "cache_hits": int(bool(cache_hit)),
+            "estimated_calls": int(estimated),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "audio_seconds": audio_seconds,
+            "cost_usd": 0.0 if cache_hit else estimate_cost_usd(provider, prompt_tokens, completion_tokens, audio_seconds),
+        }
+        now_ts = self._clock()
+        bucket_start = int(now_ts // self.bucket_seconds) * self.bucket_seconds
+        with self._lock:
+            for store, key in (
+                (self._pending, (bucket_start, provider, mode, endpoint, tier)),
+                (self._totals, (provider, mode, endpoint, tier)),
+            ):
+                entry = store.get(key)
+                if entry is None:
+                    entry = store[key] = dict.fromkeys(_FIELDS, 0)
+                for name, value in delta.items():
+                    entry[name] += value
+
+    def flush(self, now_ts: Optional[float] = None) -> int:
+        """
+        Upsert pending aggregates into `usage_ledger_entries` in one transaction.
+
+        Needs an app context. If the upsert fails the batch is merged back and
+        retried on the next flush; once it has committed it is never re-queued,
+        even when reloading the tier spend afterwards fails. Returns the number
+        of rows written.
+        """
+        now_ts = self._clock() if now_ts is None else now_ts
+        day_start = _day_start(now_ts)
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            try:
+                if batch:
+                    _upsert_usage_rows(batch, now_ts)
+            except Exception:
+                logger.warning("Usage ledger flush failed; keeping %s aggregate(s) for retry", len(batch), exc_info=True)
+                with self._lock:
+                    for key, values in batch.items():
+                        entry = self._pending.setdefault(key, dict.fromkeys(_FIELDS, 0))
+                        for name, value in values.items():
+                            entry[name] += value
+                    self._stats["flush_failures"] += 1
+                return 0
+            try:
+                tier_spend = _load_tier_spend(day_start)
+            except Exception:
+                logger.warning("Usage ledger tier spend reload failed; keeping the last synced totals", exc_info=True)
+                tier_spend = None
+            with self._lock:
+                if tier_spend is None:
+                    # The batch left _pending, so fold its cost into the last totals.
+                    if self._synced_day != day_start:
+                        self._synced_day, self._synced_tier_spend = day_start, {}
+                    tier_spend = dict(self._synced_tier_spend)
+                    for (bucket_start, _provider, _mode, _endpoint, tier), values in batch.items():
+                        if bucket_start >= day_start:
+                            tier_spend[tier] = tier_spend.get(tier, 0.0) + values["cost_usd"]
+                    self._stats["spend_reload_failures"] += 1
+                self._synced_day = day_start
+                self._synced_tier_spend = tier_spend
+                self._stats["flushes"] += 1
+                self._stats["rows_flushed"] += len(batch)
+            return len(batch)
+
+    def tier_spend_today(self, tier: str, now_ts: Optional[float] = None) -> float:
+        now_ts = self._clock() if now_ts is None else now_ts
+        day_start = _day_start(now_ts)
+        with self._lock:
+            synced = self._synced_tier_spend.get(tier, 0.0) if self._synced_day == day_start else 0.0
+            pending = sum(
+                values["cost_usd"]
+                for (bucket_start, _provider, _mode, _endpoint, entry_tier), values in self._pending.items()
+                if entry_tier == tier and bucket_start >= day_start
+            )
+        return synced + pending
+
+    def budget_exhausted(self, tier: Optional[str] = None) -> bool:
+        budgets = getattr(config, "USAGE_DAILY_BUDGET_USD_BY_TIER", {}) or {}
+        tier = tier or current_scope()["tier"]
+        try:
+            budget = float(budgets[tier])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return self.tier_spend_today(tier) >= budget
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals since process start, rolled up per provider, endpoint and tier."""
+        rollups: Dict[str, Dict[str, Dict[str, float]]] = {"providers": {}, "endpoints": {}, "tiers": {}, "modes": {}}
+        with self._lock:
+            for (provider, mode, endpoint, tier), values in self._totals.items():
+                for group, name in (("providers", provider), ("endpoints", endpoint), ("tiers", tier), ("modes", mode)):
+                    entry = rollups[group].setdefault(name, dict.fromkeys(_FIELDS, 0))
+                    for field_name in _FIELDS:
+                        entry[field_name] += values[field_name]
+            pending_keys = len(self._pending)
+            stats = dict(self._stats)
+        for group in rollups.values():
+            for entry in group.values():
+                entry["cost_usd"] = round(entry["cost_usd"], 6)
+                entry["audio_seconds"] = round(entry["audio_seconds"], 2)
+        return {**rollups, "pending_keys": pending_keys, **stats}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._totals.clear()
+            self._synced_tier_spend = {}
+            self._stats = {"flushes": 0, "flush_failures": 0, "spend_reload_failures": 0, "rows_flushed": 0}
+
+
+def _upsert_usage_rows(batch: Dict[Tuple[int, str, str, str, str], Dict[str, float]], now_ts: float) -> None:
+    from database import UsageLedgerEntry, db
+
+    now_dt = datetime.fromtimestamp(now_ts, tz=timezone.utc).replace(tzinfo=None)
+    rows = [
+        {
+            "bucket_start": bucket_start,
+            "provider": provider[:40],
+            "mode": mode[:40],
+            "endpoint": endpoint[:80],
+            "tier": tier[:20],
+            "calls": int(values["calls"]),
+            "cache_hits": int(values["cache_hits"]),
+            "estimated_calls": int(values["estimated_calls"]),
+            "prompt_tokens": int(values["prompt_tokens"]),
+            "completion_tokens": int(values["completion_tokens"]),
+            "audio_seconds": float(values["audio_seconds"]),
+            "cost_usd": float(values["cost_usd"]),
+            "created_at": now_dt,
+            "updated_at": now_dt,
+        }
+        for (bucket_start, provider, mode, endpoint, tier), values in batch.items()
+    ]
+    table = UsageLedgerEntry.__table__
+    bind = db.session.get_bind()
+    dialect_name = bind.dialect.name if bind is not None else ""
+    key_columns = ("bucket_start", "provider", "mode", "endpoint", "tier")
+
+    if dialect_name in {"sqlite", "postgresql"}:
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        try:
+            stmt = dialect_insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(key_columns),
+                set_={
+                    **{name: table.c[name] + stmt.excluded[name] for name in _FIELDS},
+                    "updated_at": now_dt,
+                },
+            )
+            db.session.execute(stmt)
+            db.session.commit()
+            return
+        except Exception:
+            db.session.rollback()
+            raise
+
+    for values in rows:
+        row = db.session.get(UsageLedgerEntry, {name: values[name] for name in key_columns})
+        if row is None:
+            db.session.add(UsageLedgerEntry(**values))
+            continue
+        for name in _FIELDS:
+            setattr(row, name, (getattr(row, name) or 0) + values[name])
+        row.updated_at = now_dt
+    db.session.commit()
+
+
+def _load_tier_spend(day_start: int) -> Dict[str, float]:
+    from database import UsageLedgerEntry, db
+
+    rows = (
+        db.session.query(UsageLedgerEntry.tier, db.func.sum(UsageLedgerEntry.cost_usd))
+        .filter(UsageLedgerEntry.bucket_start >= day_start)
+        .group_by(UsageLedgerEntry.tier)
+        .all()
+    )
+    return {tier: float(total or 0.0) for tier, total in rows}
+
+
+_LEDGER = UsageLedger()
+
+
+def get_usage_ledger() -> UsageLedger:
+    return _LEDGER
+
+
+def record_usage(provider: str, **kwargs: Any) -> None:
+    """Record one provider call (or cache hit) on the process ledger; never raises."""
+    try:
+        _LEDGER.record(provider, **kwargs)
+    except Exception:
+        logger.debug("Usage ledger record failed", exc_info=True)
+
+
+def record_response_usage(provider: str, response: Any, *, mode: str, prompt_text: Any = None, completion_text: Any = None) -> None:
+    """Record a provider response, preferring its usage block over local estimates."""
+    prompt_tokens, completion_tokens = usage_from_response(response)
+    record_usage(
+        provider,
+        mode=mode,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        prompt_text=prompt_text,
+        completion_text=completion_text,
+    )
+
+
+# ------------------------------------------------------------------
+# Flusher
+# ------------------------------------------------------------------
+
+_FLUSHER: Optional[threading.Thread] = None
+_FLUSHER_STOP = threading.Event()
+
+
+def start_usage_ledger_flusher(app) -> bool:
+    """Flush this worker's aggregates every USAGE_LEDGER_FLUSH_INTERVAL_SECONDS (0 disables)."""
+    global _FLUSHER
+
+    interval = float(getattr(config, "USAGE_LEDGER_FLUSH_INTERVAL_SECONDS", 30.0))
+    if interval <= 0 or not bool(getattr(config, "USAGE_LEDGER_ENABLED", True)):
+        return False
+    if _FLUSHER is not None and _FLUSHER.is_alive():
+        return True
+
+    def _flush_once() -> None:
+        with app.app_context():
+            _LEDGER.flush()
+
+    def _loop() -> None:
+        while not _FLUSHER_STOP.wait(interval):
+            try:
+                _flush_once()
+            except Exception:
+                logger.warning("Usage ledger flush tick failed", exc_info=True)
+
+    def _final_flush() -> None:
+        _FLUSHER_STOP.set()
+        try:
+            _flush_once()
+        except Exception:
+            logger.debug("Final usage ledger flush failed", exc_info=True)
+
+    _FLUSHER_STOP.clear()
+    _FLUSHER = threading.Thread(target=_loop, name="usage-ledger", daemon=True)
+    _FLUSHER.start()
+    atexit.register(_final_flush)
+    return True
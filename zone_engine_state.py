@@ -0,0 +1,293 @@
+"""
+Typed per-session state for the deterministic zone event motor.
+
+`ZoneEngineState` replaces the setdefault-initialized `workout_state["zone_engine"]`
+dict. Known fields live in `__slots__` with their defaults applied once at
+construction, histories are fixed-capacity ring buffers, and the persisted form
+is versioned, validated on load and omits fields still at their default.
+
+The object keeps the mapping protocol (`state["key"]`, `get`, `setdefault`, `pop`,
+`in`) so the motor and its tests can keep addressing fields by name. Keys outside
+the schema (rotation indices, pending phrase ids, ...) are stored in `extras`.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ZONE_ENGINE_STATE_SCHEMA_VERSION = 1
+
+STYLE_HISTORY_CAPACITY = 64
+BREATH_QUALITY_SAMPLES_CAPACITY = 18
+RECOVERY_SAMPLES_CAPACITY = 24
+
+_MISSING = object()
+
+# (field, default, kind). Kinds drive validation on load:
+#   value - any JSON scalar kept as-is     str   - string or default
+#   float - coerced float or default       int   - coerced int or default
+#   bool  - truthiness                     map   - dict or empty dict
+#   ring  - fixed-capacity deque
+_FIELD_SPECS: Tuple[Tuple[str, Any, str], ...] = (
+    ("confirmed_zone_status", "in_zone", "str"),
+    ("zone_status_since", 0.0, "float"),
+    ("candidate_zone_status", "in_zone", "str"),
+    ("candidate_since", 0.0, "float"),
+    ("last_hr", None, "value"),
+    ("hr_quality_state", "unknown", "str"),
+    ("hr_poor_announced", False, "bool"),
+    ("movement_state", "unknown", "str"),
+    ("movement_candidate_state", "unknown", "str"),
+    ("movement_candidate_since", 0.0, "float"),
+    ("last_segment_key", None, "value"),
+    ("last_seen_segment_transition_key", None, "value"),
+    ("last_transition_context_key", None, "value"),
+    ("last_announced_structure_transition_key", None, "value"),
+    ("last_ingested_client_spoken_cue_id", None, "value"),
+    ("style_last_any_elapsed", None, "value"),
+    ("style_last_by_type", None, "map"),
+    ("style_history", STYLE_HISTORY_CAPACITY, "ring"),
+    ("last_sustained_event_elapsed", None, "map"),
+    ("last_above_zone_elapsed", None, "value"),
+    ("phase_id", 0, "int"),
+    ("event_last_elapsed_seconds", None, "value"),
+    ("sensor_mode", None, "value"),
+    ("sensor_mode_candidate", None, "value"),
+    ("sensor_mode_candidate_since", None, "value"),
+    ("notice_watch_disconnected_sent", False, "bool"),
+    ("notice_no_sensors_sent", False, "bool"),
+    ("notice_watch_restored_sent", False, "bool"),
+    ("watch_disconnect_pending_restore", False, "bool"),
+    ("countdown_fired_map", None, "map"),
+    ("session_finished", False, "bool"),
+    ("main_started_emitted", False, "bool"),
+    ("hr_signal_state", None, "value"),
+    ("hr_valid_streak_seconds", 0.0, "float"),
+    ("hr_invalid_streak_seconds", 0.0, "float"),
+    ("last_spoken_elapsed", None, "value"),
+    ("breath_reliable_streak_seconds", 0.0, "float"),
+    ("breath_unreliable_streak_seconds", 0.0, "float"),
+    ("breath_quality_samples", BREATH_QUALITY_SAMPLES_CAPACITY, "ring"),
+    ("last_high_priority_spoken_elapsed", None, "value"),
+    ("last_motivation_spoken_elapsed", None, "value"),
+    ("last_max_silence_elapsed", None, "value"),
+    ("last_max_silence_phase_id", None, "value"),
+    ("motivation_phrase_last_spoken_elapsed", None, "map"),
+)
+
+_METRIC_SPECS: Tuple[Tuple[str, Any, str], ...] = (
+    ("total_main_set_ticks", 0, "int"),
+    ("in_zone_ticks", 0, "int"),
+    ("above_zone_ticks", 0, "int"),
+    ("below_zone_ticks", 0, "int"),
+    ("poor_ticks", 0, "int"),
+    ("overshoots", 0, "int"),
+    ("recovery_samples", RECOVERY_SAMPLES_CAPACITY, "ring"),
+    ("main_set_seconds", 0.0, "float"),
+    ("hr_valid_main_set_seconds", 0.0, "float"),
+    ("zone_valid_main_set_seconds", 0.0, "float"),
+    ("in_target_zone_valid_seconds", 0.0, "float"),
+    ("interval_work_zone_valid_seconds", 0.0, "float"),
+    ("interval_work_in_target_seconds", 0.0, "float"),
+    ("interval_recovery_zone_valid_seconds", 0.0, "float"),
+    ("interval_recovery_in_target_seconds", 0.0, "float"),
+    ("target_enforced_main_set_seconds", 0.0, "float"),
+    ("last_elapsed_seconds", None, "value"),
+)
+
+_FIELD_KINDS: Dict[str, Tuple[Any, str]] = {name: (default, kind) for name, default, kind in _FIELD_SPECS}
+_METRIC_KINDS: Dict[str, Tuple[Any, str]] = {name: (default, kind) for name, default, kind in _METRIC_SPECS}
+
+
+def ensure_ring_capacity(buffer: Any, capacity: int) -> deque:
+    """Return `buffer` as a deque holding at most `capacity` newest items."""
+    capacity = max(1, int(capacity))
+    if isinstance(buffer, deque) and buffer.maxlen == capacity:
+        return buffer
+    return deque(buffer if isinstance(buffer, Iterable) else (), maxlen=capacity)
+
+
+def _coerce(value: Any, default: Any, kind: str) -> Any:
+    if kind == "ring":
+        items = value if isinstance(value, (list, tuple, deque)) else ()
+        return deque(items, maxlen=int(default))
+    if kind == "map":
+        return dict(value) if isinstance(value, dict) else {}
+    if value is None:
+        return default
+    if kind == "value":
+        return value
+    if kind == "str":
+        return value if isinstance(value, str) else default
+    if kind == "bool":
+        return bool(value)
+    try:
+        if kind == "float":
+            return float(value)
+        if kind == "int":
+            return int(value)
+    except (TypeError, ValueError):
+        return default
+    return value
+
+
+def _default_for(default: Any, kind: str) -> Any:
+    if kind == "ring":
+        return deque(maxlen=int(default))
+    if kind == "map":
+        return {}
+    return default
+
+
+def _is_default(value: Any, default: Any, kind: str) -> bool:
+    if kind in {"ring", "map"}:
+        return len(value) == 0
+    return value == default and type(value) is type(default)
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, deque):
+        return list(value)
+    return value
+
+
+def _build_metrics(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    source = data if isinstance(data, dict) else {}
+    metrics = {name: _coerce(source.get(name), default, kind) for name, default, kind in _METRIC_SPECS}
+    for key, value in source.items():
+        metrics.setdefault(key, value)
+    return metrics
+
+
+class ZoneEngineState:
+    """Slot-backed zone engine state with a dict-compatible access surface."""
+
+    __slots__ = tuple(name for name, _default, _kind in _FIELD_SPECS) + ("metrics", "extras")
+
+    def __init__(self) -> None:
+        for name, default, kind in _FIELD_SPECS:
+            setattr(self, name, _default_for(default, kind))
+        self.metrics: Dict[str, Any] = _build_metrics(None)
+        self.extras: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Mapping protocol
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_KINDS or key == "metrics":
+            return getattr(self, key)
+        return self.extras[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        spec = _FIELD_KINDS.get(key)
+        if spec is not None:
+            default, kind = spec
+            if kind == "ring" and not isinstance(value, deque):
+                value = _coerce(value, default, kind)
+            setattr(self, key, value)
+        elif key == "metrics":
+            self.metrics = _build_metrics(value)
+        else:
+            self.extras[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_KINDS or key == "metrics" or key in self.extras
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _FIELD_KINDS
+        yield "metrics"
+        yield from self.extras
+
+    def __len__(self) -> int:
+        return len(_FIELD_KINDS) + 1 + len(self.extras)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_KINDS or key == "metrics":
+            return getattr(self, key)
+        return self.extras.get(key, default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_KINDS or key == "metrics":
+            return getattr(self, key)
+        return self.extras.setdefault(key, default)
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        if key in _FIELD_KINDS or key == "metrics":
+            raise KeyError(f"Cannot remove schema field {key!r} from ZoneEngineState")
+        if default is _MISSING:
+            return self.extras.pop(key)
+        return self.extras.pop(key, default)
+
+    def keys(self):
+        return list(iter(self))
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def ring(self, key: str, capacity: int) -> deque:
+        """Return the ring buffer stored at `key`, resized to `capacity` if needed."""
+        target = self.metrics if key == "recovery_samples" else None
+        current = target[key] if target is not None else self[key]
+        buffer = ensure_ring_capacity(current, capacity)
+        if buffer is not current:
+            if target is not None:
+                target[key] = buffer
+            else:
+                setattr(self, key, buffer)
+        return buffer
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize compactly: schema version plus fields that differ from defaults."""
+        payload: Dict[str, Any] = {"schema_version": ZONE_ENGINE_STATE_SCHEMA_VERSION}
+        for name, default, kind in _FIELD_SPECS:
+            value = getattr(self, name)
+            if not _is_default(value, default, kind):
+                payload[name] = _serialize(value)
+        metrics = {}
+        for name, value in self.metrics.items():
+            spec = _METRIC_KINDS.get(name)
+            if spec is not None and _is_default(value, spec[0], spec[1]):
+                continue
+            metrics[name] = _serialize(value)
+        if metrics:
+            payload["metrics"] = metrics
+        for key, value in self.extras.items():
+            payload[key] = _serialize(value)
+        return payload
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ZoneEngineState":
+        state = cls()
+        if not isinstance(data, dict):
+            return state
+
+        schema_version = data.get("schema_version", ZONE_ENGINE_STATE_SCHEMA_VERSION)
+        if schema_version != ZONE_ENGINE_STATE_SCHEMA_VERSION:
+            # Unknown layouts are dropped rather than half-interpreted; the motor
+            # re-derives its state within a few ticks.
+            logger.warning("Discarding zone engine state with schema_version=%r", schema_version)
+            return state
+
+        for key, value in data.items():
+            if key == "schema_version":
+                continue
+            spec = _FIELD_KINDS.get(key)
+            if spec is not None:
+                setattr(state, key, _coerce(value, spec[0], spec[1]))
+            elif key == "metrics":
+                state.metrics = _build_metrics(value)
+            else:
+                state.extras[key] = value
+        return state
+
+    def __repr__(self) -> str:
+        return f"ZoneEngineState({self.to_dict()!r})"
@@ -16,6 +16,7 @@ import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from breath_reliability import summarize_breath_quality, is_breath_quality_reliable
+from zone_engine_state import STYLE_HISTORY_CAPACITY, ZoneEngineState
 from phrase_review_v2 import build_runtime_event_phrase_map, get_workout_phrase_text
 from workout_cue_catalog import (
     event_cooldown_key,
@@ -901,70 +902,13 @@ def normalize_interval_template(template: Optional[str], config_module) -> str:
     return getattr(config_module, "DEFAULT_INTERVAL_TEMPLATE", "4x4")
 
 
-def _zone_state(workout_state: Dict[str, Any]) -> Dict[str, Any]:
-    state = workout_state.setdefault("zone_engine", {})
-    state.setdefault("confirmed_zone_status", "in_zone")
-    state.setdefault("zone_status_since", 0.0)
-    state.setdefault("candidate_zone_status", "in_zone")
-    state.setdefault("candidate_since", 0.0)
-    state.setdefault("last_hr", None)
-    state.setdefault("hr_quality_state", "unknown")
-    state.setdefault("hr_poor_announced", False)
-    state.setdefault("movement_state", "unknown")
-    state.setdefault("movement_candidate_state", "unknown")
-    state.setdefault("movement_candidate_since", 0.0)
-    state.setdefault("last_segment_key", None)
-    state.setdefault("last_seen_segment_transition_key", None)
-    state.setdefault("last_transition_context_key", None)
-    state.setdefault("last_announced_structure_transition_key", None)
-    state.setdefault("last_ingested_client_spoken_cue_id", None)
-    state.setdefault("style_last_any_elapsed", None)
-    state.setdefault("style_last_by_type", {})
-    state.setdefault("style_history", [])
-    state.setdefault("last_sustained_event_elapsed", {})
-    state.setdefault("last_above_zone_elapsed", None)
-    state.setdefault("phase_id", 0)
-    state.setdefault("event_last_elapsed_seconds", None)
-    state.setdefault("sensor_mode", None)
-    state.setdefault("sensor_mode_candidate", None)
-    state.setdefault("sensor_mode_candidate_since", None)
-    state.setdefault("notice_watch_disconnected_sent", False)
-    state.setdefault("notice_no_sensors_sent", False)
-    state.setdefault("notice_watch_restored_sent", False)
-    state.setdefault("watch_disconnect_pending_restore", False)
-    state.setdefault("countdown_fired_map", {})
-    state.setdefault("session_finished", False)
-    state.setdefault("main_started_emitted", False)
-    state.setdefault("hr_signal_state", None)
-    state.setdefault("hr_valid_streak_seconds", 0.0)
-    state.setdefault("hr_invalid_streak_seconds", 0.0)
-    state.setdefault("last_spoken_elapsed", None)
-    state.setdefault("breath_reliable_streak_seconds", 0.0)
-    state.setdefault("breath_unreliable_streak_seconds", 0.0)
-    state.setdefault("breath_quality_samples", [])
-    state.setdefault("last_high_priority_spoken_elapsed", None)
-    state.setdefault("last_motivation_spoken_elapsed", None)
-    state.setdefault("last_max_silence_elapsed", None)
-    state.setdefault("last_max_silence_phase_id", None)
-    state.setdefault("motivation_phrase_last_spoken_elapsed", {})
-    metrics = state.setdefault("metrics", {})
-    metrics.setdefault("total_main_set_ticks", 0)
-    metrics.setdefault("in_zone_ticks", 0)
-    metrics.setdefault("above_zone_ticks", 0)
-    metrics.setdefault("below_zone_ticks", 0)
-    metrics.setdefault("poor_ticks", 0)
-    metrics.setdefault("overshoots", 0)
-    metrics.setdefault("recovery_samples", [])
-    metrics.setdefault("main_set_seconds", 0.0)
-    metrics.setdefault("hr_valid_main_set_seconds", 0.0)
-    metrics.setdefault("zone_valid_main_set_seconds", 0.0)
-    metrics.setdefault("in_target_zone_valid_seconds", 0.0)
-    metrics.setdefault("interval_work_zone_valid_seconds", 0.0)
-    metrics.setdefault("interval_work_in_target_seconds", 0.0)
-    metrics.setdefault("interval_recovery_zone_valid_seconds", 0.0)
-    metrics.setdefault("interval_recovery_in_target_seconds", 0.0)
-    metrics.setdefault("target_enforced_main_set_seconds", 0.0)
-    metrics.setdefault("last_elapsed_seconds", None)
+def _zone_state(workout_state: Dict[str, Any]) -> ZoneEngineState:
+    state = workout_state.get("zone_engine")
+    if isinstance(state, ZoneEngineState):
+        return state
+    # First tick of the session, or state restored from a plain dict (legacy payloads/tests).
+    state = ZoneEngineState.from_dict(state if isinstance(state, dict) else None)
+    workout_state["zone_engine"] = state
     return state
 
 
@@ -1473,19 +1417,17 @@ def _update_hr_signal_state(
 
 def _update_breath_reliability(
     *,
-    state: Dict[str, Any],
+    state: ZoneEngineState,
     breath_signal_quality: Any,
     breath_summary: Any,
     dt_seconds: float,
     config_module,
 ) -> bool:
-    samples = state.setdefault("breath_quality_samples", [])
+    max_samples = int(getattr(config_module, "CS_BREATH_MIN_RELIABLE_SAMPLES", 6)) * 3
+    samples = state.ring("breath_quality_samples", max(12, max_samples))
     current_quality = _safe_float(breath_signal_quality)
     if current_quality is not None:
         samples.append(current_quality)
-    max_samples = int(getattr(config_module, "CS_BREATH_MIN_RELIABLE_SAMPLES", 6)) * 3
-    if len(samples) > max(12, max_samples):
-        del samples[:-max(12, max_samples)]
 
     quality_summary = summarize_breath_quality(
         breath_data={"signal_quality": current_quality} if current_quality is not None else {},
@@ -1997,7 +1939,7 @@ def _event_group(event_type: str) -> str:
 
 def _allow_style_event(
     *,
-    state: Dict[str, Any],
+    state: ZoneEngineState,
     event_type: str,
     style: str,
     elapsed_seconds: int,
@@ -2019,13 +1961,15 @@ def _allow_style_event(
     if cue_group == "instruction" and hr_quality_state == "poor":
         min_any += 15
 
-    history = state.setdefault("style_history", [])
+    history = state.ring("style_history", max(STYLE_HISTORY_CAPACITY, max_cues))
     pruned = []
     for item in history:
         item_elapsed = _safe_float(item.get("elapsed"))
         if item_elapsed is not None and (float(elapsed_seconds) - item_elapsed) <= 600.0:
             pruned.append(item)
-    state["style_history"] = pruned
+    if len(pruned) != len(history):
+        history.clear()
+        history.extend(pruned)
 
     if len(pruned) >= max_cues and not is_phase_change:
         return False, "style_budget_limit"
@@ -2046,7 +1990,7 @@ def _allow_style_event(
 
     state["style_last_any_elapsed"] = float(elapsed_seconds)
     last_by_type[cooldown_key] = float(elapsed_seconds)
-    state["style_history"].append(
+    history.append(
         {
             "elapsed": float(elapsed_seconds),
             "event": event_type,
@@ -3185,12 +3129,8 @@ def evaluate_zone_tick(
         last_above = _safe_float(state.get("last_above_zone_elapsed"))
         if last_above is not None and float(elapsed_seconds) >= last_above:
             recovery_seconds = max(0.0, float(elapsed_seconds) - last_above)
-            metrics = state.setdefault("metrics", {})
-            samples = metrics.setdefault("recovery_samples", [])
-            samples.append(recovery_seconds)
             max_samples = int(getattr(config_module, "ZONE_PERSONALIZATION_MAX_RECOVERY_SAMPLES", 24))
-            if len(samples) > max_samples:
-                del samples[:-max_samples]
+            state.ring("recovery_samples", max_samples).append(recovery_seconds)
         state["last_above_zone_elapsed"] = None
 
     _update_metrics(
@@ -0,0 +1,330 @@
+"""
+Precomputed rewrite bank for deterministic zone-event text.
+
+The zone event motor speaks a finite set of template sentences per
+(event_type, language, persona, coaching_style). Instead of asking an LLM to
+rephrase them on every tick (0.9s budget, seed text on timeout), a batch job
+(`tools/build_zone_rewrite_bank.py`) precomputes verified rewrites per input
+and stores them as a versioned JSON bank. At runtime `pick()` rotates through
+the banked rewrites; the live LLM rewrite (ZONE_EVENT_LLM_REWRITE_ENABLED)
+is only an optional fallback for inputs the bank does not cover.
+
+Numbers are stored as placeholders ("Back off to {n0}-{n1} bpm."), so one
+entry serves every heart-rate target and rewrites always carry the seed's
+own numbers.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+BANK_VERSION = 1
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)?")
+_PLACEHOLDER_RE = re.compile(r"\{n(\d+)\}")
+_STYLES = {"minimal", "normal", "motivational"}
+
+
+@dataclass(frozen=True)
+class RewriteInput:
+    event_type: str
+    language: str
+    persona: str
+    coaching_style: str
+    seed: str
+
+
+def templatize(text: str) -> Tuple[str, List[str]]:
+    """Replace numeric tokens with ordered placeholders; returns (template, numbers)."""
+    numbers: List[str] = []
+
+    def _placeholder(match: re.Match) -> str:
+        numbers.append(match.group(0))
+        return "{n%d}" % (len(numbers) - 1)
+
+    return _NUMBER_RE.sub(_placeholder, str(text or "").strip()), numbers
+
+
+def fill(template: str, numbers: List[str]) -> Optional[str]:
+    """Put numbers back into a template; None when the template needs more than given."""
+    missing = False
+
+    def _number(match: re.Match) -> str:
+        nonlocal missing
+        index = int(match.group(1))
+        if index >= len(numbers):
+            missing = True
+            return ""
+        return numbers[index]
+
+    filled = _PLACEHOLDER_RE.sub(_number, template)
+    return None if missing else filled
+
+
+def _normalize_input(
+    event_type: Optional[str],
+    language: Optional[str],
+    persona: Optional[str],
+    coaching_style: Optional[str],
+) -> Tuple[str, str, str, str]:
+    style = (coaching_style or "normal").strip().lower()
+    return (
+        (event_type or "zone_event").strip().lower(),
+        "no" if (language or "").strip().lower().startswith("no") else "en",
+        (persona or "personal_trainer").strip().lower(),
+        style if style in _STYLES else "normal",
+    )
+
+
+def _key(event_type, language, persona, coaching_style, seed_template: str) -> str:
+    return "|".join(_normalize_input(event_type, language, persona, coaching_style) + (seed_template,))
+
+
+class ZoneRewriteBank:
+    """In-memory bank of templated rewrites with per-input rotation."""
+
+    def __init__(self, *, version: int = BANK_VERSION, generated_at: Optional[str] = None, max_variants: int = 8):
+        self.version = int(version)
+        self.generated_at = generated_at
+        self.max_variants = max(1, int(max_variants))
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "added": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        event_type: str,
+        language: str,
+        persona: Optional[str],
+        coaching_style: Optional[str],
+        seed: str,
+        rewrite: str,
+    ) -> bool:
+        """Add a rewrite of `seed`; False when it is a duplicate or its numbers differ from the seed's."""
+        seed_template, seed_numbers = templatize(seed)
+        rewrite_template, rewrite_numbers = templatize(rewrite)
+        if not rewrite_template or rewrite_numbers != seed_numbers:
+            return False
+        return self._add_template(event_type, language, persona, coaching_style, seed_template, rewrite_template)
+
+    def _add_template(self, event_type, language, persona, coaching_style, seed_template: str, rewrite_template: str) -> bool:
+        if not rewrite_template or " ".join(rewrite_template.lower().split()) == " ".join(seed_template.lower().split()):
+            return False
+        key = _key(event_type, language, persona, coaching_style, seed_template)
+        event, lang, persona_key, style = _normalize_input(event_type, language, persona, coaching_style)
+        with self._lock:
+            entry = self._entries.setdefault(
+                key,
+                {
+                    "event_type": event,
+                    "language": lang,
+                    "persona": persona_key,
+                    "coaching_style": style,
+                    "seed": seed_template,
+                    "rewrites": [],
+                },
+            )
+            existing = {" ".join(item.lower().split()) for item in entry["rewrites"]}
+            if " ".join(rewrite_template.lower().split()) in existing:
+                return False
+            entry["rewrites"].append(rewrite_template)
+            if len(entry["rewrites"]) > self.max_variants:
+                del entry["rewrites"][: len(entry["rewrites"]) - self.max_variants]
+            self._stats["added"] += 1
+        return True
+
+    def variants(self, event_type, language, persona, coaching_style, seed: str) -> List[str]:
+        seed_template, numbers = templatize(seed)
+        entry = self._entries.get(_key(event_type, language, persona, coaching_style, seed_template))
+        if not entry:
+            return []
+        return [text for text in (fill(item, numbers) for item in entry["rewrites"]) if text]
+
+    def pick(self, event_type, language, persona, coaching_style, seed: str) -> Optional[str]:
+        """Next banked rewrite for this input (round robin), or None when the bank has none."""
+        seed_template, numbers = templatize(seed)
+        key = _key(event_type, language, persona, coaching_style, seed_template)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry or not entry["rewrites"]:
+                self._stats["misses"] += 1
+                return None
+            index = self._cursors.get(key, 0) % len(entry["rewrites"])
+            self._cursors[key] = index + 1
+            self._stats["hits"] += 1
+            template = entry["rewrites"][index]
+        return fill(template, numbers)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = [dict(entry, rewrites=list(entry["rewrites"])) for _name, entry in sorted(self._entries.items())]
+        return {"version": self.version, "generated_at": self.generated_at, "entries": entries}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any], *, max_variants: int = 8) -> "ZoneRewriteBank":
+        version = int(payload.get("version") or 0)
+        if version != BANK_VERSION:
+            raise ValueError(f"unsupported zone rewrite bank version {version} (expected {BANK_VERSION})")
+        bank = cls(version=version, generated_at=payload.get("generated_at"), max_variants=max_variants)
+        for entry in payload.get("entries") or []:
+            for rewrite in entry.get("rewrites") or []:
+                # Stored seeds/rewrites are already templated.
+                bank._add_template(
+                    entry.get("event_type"),
+                    entry.get("language"),
+                    entry.get("persona"),
+                    entry.get("coaching_style"),
+                    entry.get("seed") or "",
+                    str(rewrite or "").strip(),
+                )
+        bank._stats["added"] = 0
+        return bank
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, ensure_ascii=False, indent=2)
+            handle.write("\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, *, max_variants: int = 8) -> "ZoneRewriteBank":
+        with open(path, "r", encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle), max_variants=max_variants)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "version": self.version,
+                "generated_at": self.generated_at,
+                "inputs": len(self._entries),
+                "rewrites": sum(len(entry["rewrites"]) for entry in self._entries.values()),
+            }
+
+
+def enumerate_seed_inputs(
+    event_types: Iterable[str],
+    *,
+    languages: Iterable[str] = ("en", "no"),
+    personas: Iterable[str] = ("personal_trainer", "toxic_mode"),
+    coaching_styles: Iterable[str] = ("minimal", "normal", "motivational"),
+    segments: Iterable[str] = ("work", "recovery"),
+    sample_targets: Iterable[Tuple[Optional[int], Optional[int]]] = ((None, None), (140, 152)),
+) -> List[RewriteInput]:
+    """Every distinct (event, language, persona, style, seed) the zone event motor can speak."""
+    from zone_event_motor import _event_text
+
+    inputs: List[RewriteInput] = []
+    seen = set()
+    for event_type in event_types:
+        for language in languages:
+            for style in coaching_styles:
+                for segment in segments:
+                    for target_low, target_high in sample_targets:
+                        try:
+                            seed = _event_text(
+                                event_type=event_type,
+                                language=language,
+                                style=style,
+                                target_low=target_low,
+                                target_high=target_high,
+                                segment=segment,
+                            )
+                        except Exception:
+                            seed = None
+                        if not seed or not str(seed).strip():
+                            continue
+                        for persona in personas:
+                            key = _key(event_type, language, persona, style, templatize(seed)[0])
+                            if key in seen:
+                                continue
+                            seen.add(key)
+                            inputs.append(RewriteInput(event_type, language, persona, style, str(seed).strip()))
+    return inputs
+
+
+def build_bank(
+    inputs: Iterable[RewriteInput],
+    rewrite_fn: Callable[[RewriteInput], str],
+    verify_fn: Callable[[str, str, str, str], Tuple[bool, str]],
+    *,
+    variants: int,
+    attempts_per_variant: int = 2,
+    bank: Optional[ZoneRewriteBank] = None,
+    on_result: Optional[Callable[[RewriteInput, str, bool, str], None]] = None,
+) -> ZoneRewriteBank:
+    """
+    Fill `bank` with up to `variants` verified rewrites per input.
+
+    `verify_fn(original, rewritten, event_type, language)` has the signature of
+    `main.verify_zone_event_rewrite`; rejected and duplicate rewrites are retried
+    up to `attempts_per_variant` times per missing variant.
+    """
+    bank = bank or ZoneRewriteBank(max_variants=variants)
+    bank.generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for item in inputs:
+        have = len(bank.variants(item.event_type, item.language, item.persona, item.coaching_style, item.seed))
+        budget = max(0, variants - have) * max(1, int(attempts_per_variant))
+        while have < variants and budget > 0:
+            budget -= 1
+            try:
+                candidate = (rewrite_fn(item) or "").strip()
+            except Exception as exc:
+                logger.warning("Zone rewrite generation failed for %s/%s: %s", item.event_type, item.language, exc)
+                candidate = ""
+            if not candidate:
+                continue
+            verified, reason = verify_fn(item.seed, candidate, item.event_type, item.language)
+            added = bool(verified) and bank.add(
+                item.event_type, item.language, item.persona, item.coaching_style, item.seed, candidate
+            )
+            if on_result is not None:
+                on_result(item, candidate, added, reason if not verified else ("accepted" if added else "duplicate"))
+            if added:
+                have += 1
+    return bank
+
+
+_BANK: Optional[ZoneRewriteBank] = None
+_BANK_SOURCE: Optional[Tuple[str, Optional[float]]] = None
+_BANK_LOCK = threading.Lock()
+
+
+def get_zone_rewrite_bank() -> ZoneRewriteBank:
+    """Process-wide bank loaded from ZONE_EVENT_REWRITE_BANK_PATH (reloaded when the file changes)."""
+    global _BANK, _BANK_SOURCE
+
+    path = str(getattr(config, "ZONE_EVENT_REWRITE_BANK_PATH", "") or "")
+    try:
+        mtime = os.path.getmtime(path) if path else None
+    except OSError:
+        mtime = None
+    with _BANK_LOCK:
+        if _BANK is not None and _BANK_SOURCE == (path, mtime):
+            return _BANK
+        max_variants = max(1, int(getattr(config, "ZONE_EVENT_REWRITE_BANK_VARIANTS", 4))) * 2
+        bank = ZoneRewriteBank(max_variants=max_variants)
+        if mtime is not None:
+            try:
+                bank = ZoneRewriteBank.load(path, max_variants=max_variants)
+                logger.info("Loaded zone rewrite bank: %s", bank.stats())
+            except Exception as exc:
+                logger.warning("Zone rewrite bank unavailable (%s): %s", path, exc)
+        _BANK, _BANK_SOURCE = bank, (path, mtime)
+        return _BANK